@@ -0,0 +1,38 @@
+"""Add user_game_daily_count table.
+
+Revision ID: 20251226_0007
+Revises: 20251225_0006
+Create Date: 2025-12-26
+
+Per-user per-day per-game play counter maintained in the play transaction, so
+status endpoints no longer COUNT(*) the game logs with func.date(created_at).
+Populate existing days with scripts/backfill_game_daily_count.py.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0007"
+down_revision = "20251225_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_game_daily_count",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+        sa.Column(
+            "feature_type",
+            sa.Enum("ROULETTE", "DICE", "LOTTERY", "RANKING", "SEASON_PASS", "NONE", name="featuretype"),
+            nullable=False,
+        ),
+        sa.Column("play_date", sa.Date(), nullable=False),
+        sa.Column("play_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.PrimaryKeyConstraint("user_id", "feature_type", "play_date"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("user_game_daily_count")
@@ -0,0 +1,43 @@
+"""Add side_effect_outbox table.
+
+Revision ID: 20251226_0008
+Revises: 20251226_0007
+Create Date: 2025-12-26
+
+Play side effects (team battle points, season pass internal-win stamp, survey
+triggers) staged in the play transaction and drained by
+scripts/run_side_effect_worker.py.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+revision = "20251226_0008"
+down_revision = "20251226_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "side_effect_outbox",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("effect_type", sa.String(length=50), nullable=False),
+        sa.Column("payload_json", sa.JSON().with_variant(mysql.JSON(), "mysql"), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False, server_default="PENDING"),
+        sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("available_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("last_error", sa.String(length=255), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False, server_default=sa.text("CURRENT_TIMESTAMP")),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_side_effect_outbox_user_id", "side_effect_outbox", ["user_id"])
+    op.create_index("ix_side_effect_outbox_status_available", "side_effect_outbox", ["status", "available_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_side_effect_outbox_status_available", table_name="side_effect_outbox")
+    op.drop_index("ix_side_effect_outbox_user_id", table_name="side_effect_outbox")
+    op.drop_table("side_effect_outbox")
@@ -0,0 +1,25 @@
+"""Add user.token_version.
+
+Revision ID: 20251226_0009
+Revises: 20251226_0008
+Create Date: 2025-12-26
+
+JWTs carry the user's token_version (`tv`); bumping it invalidates previously
+issued tokens without a per-request user lookup.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0009"
+down_revision = "20251226_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("user", sa.Column("token_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    op.drop_column("user", "token_version")
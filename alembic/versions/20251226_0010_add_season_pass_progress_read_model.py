@@ -0,0 +1,28 @@
+"""Add season_pass_progress.claimed_levels_mask / last_checkin_date.
+
+Revision ID: 20251226_0010
+Revises: 20251226_0009
+Create Date: 2025-12-26
+
+Season pass status reads claimed levels and today's check-in from the progress row
+instead of scanning reward/stamp logs. Existing rows keep NULL and are rebuilt lazily
+(or by scripts/recover_season_pass_auto_claims.py).
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0010"
+down_revision = "20251226_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("season_pass_progress", sa.Column("last_checkin_date", sa.Date(), nullable=True))
+    op.add_column("season_pass_progress", sa.Column("claimed_levels_mask", sa.BigInteger(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("season_pass_progress", "claimed_levels_mask")
+    op.drop_column("season_pass_progress", "last_checkin_date")
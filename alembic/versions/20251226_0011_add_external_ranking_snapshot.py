@@ -0,0 +1,36 @@
+"""Add external_ranking_snapshot.
+
+Revision ID: 20251226_0011
+Revises: 20251226_0010
+Create Date: 2025-12-26
+
+Materialized leaderboard (one row per rank) rebuilt after every external ranking write;
+GET /api/ranking/today pages it by rank and looks up the caller by user_id.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0011"
+down_revision = "20251226_0010"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "external_ranking_snapshot",
+        sa.Column("rank", sa.Integer(), primary_key=True, autoincrement=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("user_name", sa.String(length=100), nullable=True),
+        sa.Column("deposit_amount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("play_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("memo", sa.String(length=255), nullable=True),
+        sa.Column("version", sa.BigInteger(), nullable=False),
+        sa.Column("built_at", sa.DateTime(), nullable=False),
+        sa.UniqueConstraint("user_id", name="uq_external_ranking_snapshot_user"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("external_ranking_snapshot")
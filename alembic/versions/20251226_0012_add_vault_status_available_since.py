@@ -0,0 +1,53 @@
+"""Add vault_status.available_since and sweeper indexes.
+
+Revision ID: 20251226_0012
+Revises: 20251226_0011
+Create Date: 2025-12-26
+
+The Vault2 transition sweeper filters on columns instead of parsing
+progress_json["available_since"] per row. Existing AVAILABLE rows are backfilled
+from the JSON value.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0012"
+down_revision = "20251226_0011"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("vault_status", sa.Column("available_since", sa.DateTime(), nullable=True))
+    op.create_index("ix_vault_status_state_expires_at", "vault_status", ["state", "expires_at"])
+    op.create_index("ix_vault_status_state_available_since", "vault_status", ["state", "available_since"])
+
+    bind = op.get_bind()
+    vault_status = sa.table(
+        "vault_status",
+        sa.column("id", sa.Integer()),
+        sa.column("state", sa.String()),
+        sa.column("progress_json", sa.JSON()),
+        sa.column("available_since", sa.DateTime()),
+    )
+    rows = bind.execute(
+        sa.select(vault_status.c.id, vault_status.c.progress_json).where(vault_status.c.state != "LOCKED")
+    ).all()
+    for row_id, payload in rows:
+        raw = payload.get("available_since") if isinstance(payload, dict) else None
+        if not raw:
+            continue
+        try:
+            since = datetime.fromisoformat(str(raw))
+        except ValueError:
+            continue
+        bind.execute(vault_status.update().where(vault_status.c.id == row_id).values(available_since=since))
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vault_status_state_available_since", table_name="vault_status")
+    op.drop_index("ix_vault_status_state_expires_at", table_name="vault_status")
+    op.drop_column("vault_status", "available_since")
@@ -0,0 +1,100 @@
+"""Add vault_status_event and move progress_json["events"] into it.
+
+Revision ID: 20251226_0013
+Revises: 20251226_0012
+Create Date: 2025-12-26
+
+Vault2 accrual/unlock events become append-only rows paged via GET /api/vault/events;
+vault_status.progress_json no longer grows with every accrual.
+"""
+
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0013"
+down_revision = "20251226_0012"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vault_status_event",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("status_id", sa.Integer(), sa.ForeignKey("vault_status.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), nullable=False),
+        sa.Column("program_id", sa.Integer(), sa.ForeignKey("vault_program.id"), nullable=False),
+        sa.Column("event_type", sa.String(length=30), nullable=False),
+        sa.Column("amount", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("trigger", sa.String(length=50), nullable=True),
+        sa.Column("meta_json", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_vault_status_event_status_id", "vault_status_event", ["status_id"])
+    op.create_index("ix_vault_status_event_user_id_id", "vault_status_event", ["user_id", "id"])
+
+    bind = op.get_bind()
+    vault_status = sa.table(
+        "vault_status",
+        sa.column("id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("program_id", sa.Integer()),
+        sa.column("progress_json", sa.JSON()),
+    )
+    vault_status_event = sa.table(
+        "vault_status_event",
+        sa.column("status_id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("program_id", sa.Integer()),
+        sa.column("event_type", sa.String()),
+        sa.column("amount", sa.Integer()),
+        sa.column("trigger", sa.String()),
+        sa.column("meta_json", sa.JSON()),
+        sa.column("created_at", sa.DateTime()),
+    )
+    rows = bind.execute(
+        sa.select(vault_status.c.id, vault_status.c.user_id, vault_status.c.program_id, vault_status.c.progress_json)
+        .where(vault_status.c.progress_json.is_not(None))
+    ).all()
+    for row_id, user_id, program_id, payload in rows:
+        if not isinstance(payload, dict) or "events" not in payload:
+            continue
+        events = payload.get("events")
+        inserts = []
+        for event in events if isinstance(events, list) else []:
+            if not isinstance(event, dict):
+                continue
+            try:
+                created_at = datetime.fromisoformat(str(event.get("at")))
+            except ValueError:
+                created_at = datetime.utcnow()
+            try:
+                amount = int(event.get("amount") or 0)
+            except (TypeError, ValueError):
+                amount = 0
+            inserts.append(
+                {
+                    "status_id": row_id,
+                    "user_id": user_id,
+                    "program_id": program_id,
+                    "event_type": str(event.get("type") or "UNKNOWN")[:30],
+                    "amount": amount,
+                    "trigger": event.get("trigger"),
+                    "meta_json": event.get("meta"),
+                    "created_at": created_at,
+                }
+            )
+        if inserts:
+            bind.execute(vault_status_event.insert(), inserts)
+        remaining = {key: value for key, value in payload.items() if key != "events"}
+        bind.execute(
+            vault_status.update().where(vault_status.c.id == row_id).values(progress_json=remaining or None)
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_vault_status_event_user_id_id", table_name="vault_status_event")
+    op.drop_index("ix_vault_status_event_status_id", table_name="vault_status_event")
+    op.drop_table("vault_status_event")
@@ -0,0 +1,24 @@
+"""Index user.vault_locked_expires_at.
+
+Revision ID: 20251226_0014
+Revises: 20251226_0013
+Create Date: 2025-12-26
+
+Phase 1 locked-balance expiry moves from per-request writes in /api/vault/status to a
+background job (scripts/run_vault_locked_expiry.py) that range-scans this column.
+"""
+
+from alembic import op
+
+revision = "20251226_0014"
+down_revision = "20251226_0013"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_user_vault_locked_expires_at", "user", ["vault_locked_expires_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_user_vault_locked_expires_at", table_name="user")
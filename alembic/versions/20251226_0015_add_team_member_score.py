@@ -0,0 +1,87 @@
+"""Add team_member_score and team_score.last_event_at.
+
+Revision ID: 20251226_0015
+Revises: 20251226_0014
+Create Date: 2025-12-26
+
+Contributor lists, contributor/me, the leaderboard and daily settlement read materialized
+per-user totals instead of grouping team_event_log on every call. Both are backfilled
+from team_event_log; scripts/rebuild_team_member_scores.py can recompute them later.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0015"
+down_revision = "20251226_0014"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("team_score", sa.Column("last_event_at", sa.DateTime(), nullable=True))
+    op.create_table(
+        "team_member_score",
+        sa.Column("season_id", sa.Integer(), sa.ForeignKey("team_season.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("team.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("points", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("game_points", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_event_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("idx_team_member_score_points", "team_member_score", ["season_id", "team_id", "points"])
+
+    log = sa.table(
+        "team_event_log",
+        sa.column("season_id", sa.Integer()),
+        sa.column("team_id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("action", sa.String()),
+        sa.column("delta", sa.Integer()),
+        sa.column("created_at", sa.DateTime()),
+    )
+    member_score = sa.table(
+        "team_member_score",
+        sa.column("season_id", sa.Integer()),
+        sa.column("team_id", sa.Integer()),
+        sa.column("user_id", sa.Integer()),
+        sa.column("points", sa.BigInteger()),
+        sa.column("game_points", sa.BigInteger()),
+        sa.column("last_event_at", sa.DateTime()),
+    )
+    team_score = sa.table(
+        "team_score",
+        sa.column("season_id", sa.Integer()),
+        sa.column("team_id", sa.Integer()),
+        sa.column("last_event_at", sa.DateTime()),
+    )
+
+    totals = (
+        sa.select(
+            log.c.season_id,
+            log.c.team_id,
+            log.c.user_id,
+            sa.func.coalesce(sa.func.sum(log.c.delta), 0),
+            sa.func.coalesce(sa.func.sum(sa.case((log.c.action == "GAME_PLAY", log.c.delta), else_=0)), 0),
+            sa.func.max(log.c.created_at),
+        )
+        .where(log.c.user_id.is_not(None))
+        .group_by(log.c.season_id, log.c.team_id, log.c.user_id)
+    )
+    op.execute(
+        member_score.insert().from_select(
+            ["season_id", "team_id", "user_id", "points", "game_points", "last_event_at"], totals
+        )
+    )
+    latest = (
+        sa.select(sa.func.max(log.c.created_at))
+        .where(log.c.season_id == team_score.c.season_id, log.c.team_id == team_score.c.team_id)
+        .scalar_subquery()
+    )
+    op.execute(team_score.update().values(last_event_at=latest))
+
+
+def downgrade() -> None:
+    op.drop_index("idx_team_member_score_points", table_name="team_member_score")
+    op.drop_table("team_member_score")
+    op.drop_column("team_score", "last_event_at")
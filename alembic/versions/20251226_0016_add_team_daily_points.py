@@ -0,0 +1,79 @@
+"""Add team_daily_points (running daily GAME_PLAY point counter).
+
+Revision ID: 20251226_0016
+Revises: 20251226_0015
+Create Date: 2025-12-26
+
+TeamBattleService.add_points enforces DAILY_POINT_CAP with one capped upsert on this
+row instead of SUM(team_event_log.delta) over the user's history. Today's counters are
+backfilled so the cap carries across the deploy; "today" uses settings.timezone, the same
+day key as TeamBattleService._local_date.
+"""
+
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.config import get_settings
+
+revision = "20251226_0016"
+down_revision = "20251226_0015"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "team_daily_points",
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("user.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("points", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("last_grant", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+    )
+
+    tz = ZoneInfo(get_settings().timezone)
+    now = datetime.now(timezone.utc)
+    local_day = now.astimezone(tz).date()
+    start_local = datetime(local_day.year, local_day.month, local_day.day, tzinfo=tz)
+    start_utc = start_local.astimezone(timezone.utc).replace(tzinfo=None)
+    end_utc = (start_local + timedelta(days=1)).astimezone(timezone.utc).replace(tzinfo=None)
+
+    log = sa.table(
+        "team_event_log",
+        sa.column("user_id", sa.Integer()),
+        sa.column("action", sa.String()),
+        sa.column("delta", sa.Integer()),
+        sa.column("created_at", sa.DateTime()),
+    )
+    daily = sa.table(
+        "team_daily_points",
+        sa.column("user_id", sa.Integer()),
+        sa.column("day", sa.Date()),
+        sa.column("points", sa.Integer()),
+        sa.column("last_grant", sa.Integer()),
+        sa.column("updated_at", sa.DateTime()),
+    )
+    today = (
+        sa.select(
+            log.c.user_id,
+            sa.literal(local_day, sa.Date()),
+            sa.func.sum(log.c.delta),
+            sa.literal(0, sa.Integer()),
+            sa.literal(now.replace(tzinfo=None), sa.DateTime()),
+        )
+        .where(
+            log.c.user_id.is_not(None),
+            log.c.action == "GAME_PLAY",
+            log.c.created_at >= start_utc,
+            log.c.created_at < end_utc,
+        )
+        .group_by(log.c.user_id)
+    )
+    op.execute(daily.insert().from_select(["user_id", "day", "points", "last_grant", "updated_at"], today))
+
+
+def downgrade() -> None:
+    op.drop_table("team_daily_points")
@@ -0,0 +1,43 @@
+"""Add team_score_shard (sharded pending team score deltas).
+
+Revision ID: 20251226_0017
+Revises: 20251226_0016
+Create Date: 2025-12-26
+
+TeamBattleService.add_points upserts one of SCORE_SHARDS rows per team/season (picked by
+user id) instead of read-modify-writing team_score, so busy teams no longer serialize on
+one row. Reads sum team_score and the shards; scripts/compact_team_scores.py folds the
+shards back into team_score. Existing team_score rows are the starting base, so no backfill.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0017"
+down_revision = "20251226_0016"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "team_score_shard",
+        sa.Column("season_id", sa.Integer(), sa.ForeignKey("team_season.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("team_id", sa.Integer(), sa.ForeignKey("team.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("shard", sa.SmallInteger(), primary_key=True, autoincrement=False),
+        sa.Column("points", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("last_event_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    # Fold pending deltas into team_score first so no points are lost.
+    op.execute(
+        """
+        UPDATE team_score SET points = points + COALESCE((
+            SELECT SUM(s.points) FROM team_score_shard s
+            WHERE s.season_id = team_score.season_id AND s.team_id = team_score.team_id
+        ), 0)
+        """
+    )
+    op.drop_table("team_score_shard")
@@ -0,0 +1,50 @@
+"""Add dashboard_hourly_rollup and created_at indexes on the dashboard source logs.
+
+Revision ID: 20251226_0018
+Revises: 20251226_0017
+Create Date: 2025-12-26
+
+/admin/api/dashboard/metrics reads per-hour rollups (sums plus HyperLogLog sketches of
+players and logged-in users) instead of scanning the logs for every window. Rows are
+filled by scripts/run_dashboard_rollup.py and, for missing hours, on first read; the
+rollup queries range-scan the logs by created_at, hence the new indexes.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "20251226_0018"
+down_revision = "20251226_0017"
+branch_labels = None
+depends_on = None
+
+_INDEXES = (
+    ("ix_roulette_log_created_at", "roulette_log", "created_at"),
+    ("ix_dice_log_created_at", "dice_log", "created_at"),
+    ("ix_lottery_log_created_at", "lottery_log", "created_at"),
+    ("ix_user_game_wallet_ledger_created_at", "user_game_wallet_ledger", "created_at"),
+    ("ix_user_activity_event_created_at", "user_activity_event", "created_at"),
+    ("ix_user_last_login_at", "user", "last_login_at"),
+)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "dashboard_hourly_rollup",
+        sa.Column("hour_start", sa.DateTime(), primary_key=True),
+        sa.Column("plays", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("player_sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("active_sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("ticket_usage", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("session_seconds", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("session_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("computed_at", sa.DateTime(), nullable=False),
+    )
+    for name, table, column in _INDEXES:
+        op.create_index(name, table, [column])
+
+
+def downgrade() -> None:
+    for name, table, _column in reversed(_INDEXES):
+        op.drop_index(name, table_name=table)
+    op.drop_table("dashboard_hourly_rollup")
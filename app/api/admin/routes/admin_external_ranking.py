@@ -10,6 +10,7 @@ from app.schemas.external_ranking import (
     ExternalRankingEntry,
     ExternalRankingListResponse,
     ExternalRankingUpdate,
+    ExternalRankingUpsertReport,
 )
 from app.services.admin_external_ranking_service import AdminExternalRankingService
 from app.models.user import User
@@ -40,30 +41,13 @@ def list_external_ranking(db: Session = Depends(get_db)) -> ExternalRankingListR
     return ExternalRankingListResponse(items=items)
 
 
-@router.post("/", response_model=ExternalRankingListResponse)
+@router.post("/", response_model=ExternalRankingUpsertReport)
 def upsert_external_ranking(
     payloads: List[ExternalRankingCreate],
     db: Session = Depends(get_db),
-) -> ExternalRankingListResponse:
-    rows = AdminExternalRankingService.upsert_many(db, payloads)
-    user_map = {
-        row.id: row.external_id
-        for row in db.query(User.id, User.external_id).filter(User.id.in_([r.user_id for r in rows])).all()
-    }
-    items = [
-        ExternalRankingEntry(
-            id=row.id,
-            user_id=row.user_id,
-            external_id=user_map.get(row.user_id),
-            deposit_amount=row.deposit_amount,
-            play_count=row.play_count,
-            memo=row.memo,
-            created_at=row.created_at,
-            updated_at=row.updated_at,
-        )
-        for row in rows
-    ]
-    return ExternalRankingListResponse(items=items)
+) -> ExternalRankingUpsertReport:
+    report = AdminExternalRankingService.upsert_many(db, payloads)
+    return ExternalRankingUpsertReport(**report)
 
 
 @router.put("/{user_id}", response_model=ExternalRankingEntry)
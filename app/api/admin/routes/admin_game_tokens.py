@@ -1,4 +1,7 @@
 """Admin endpoints for granting game tokens."""
+import csv
+import io
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import desc, literal, literal_column
 from sqlalchemy.orm import Session
@@ -11,6 +14,9 @@ from app.models.game_wallet import UserGameWallet
 from app.models.game_wallet_ledger import UserGameWalletLedger
 from app.models.user import User
 from app.schemas.game_tokens import (
+    BulkGrantGameTokensRequest,
+    BulkGrantGameTokensResponse,
+    BulkGrantGameTokensResult,
     GrantGameTokensRequest,
     GrantGameTokensResponse,
     LedgerEntry,
@@ -19,7 +25,7 @@ from app.schemas.game_tokens import (
     TokenBalance,
 )
 from app.schemas.base import to_kst_iso
-from app.services.game_wallet_service import GameWalletService
+from app.services.game_wallet_service import BulkGrantRow, GameWalletService
 
 router = APIRouter(prefix="/admin/api/game-tokens", tags=["admin-game-tokens"])
 wallet_service = GameWalletService()
@@ -44,6 +50,48 @@ def grant_tokens(payload: GrantGameTokensRequest, db: Session = Depends(get_db))
     return GrantGameTokensResponse(user_id=user_id, token_type=payload.token_type, balance=balance, external_id=external)
 
 
+def _parse_bulk_rows(payload: BulkGrantGameTokensRequest) -> list[BulkGrantRow]:
+    rows = [BulkGrantRow(external_id=item.external_id.strip(), token_type=item.token_type.strip(), amount=item.amount) for item in payload.items]
+    if payload.csv:
+        reader = csv.DictReader(io.StringIO(payload.csv.strip()))
+        if not reader.fieldnames or not {"external_id", "token_type", "amount"} <= {f.strip() for f in reader.fieldnames}:
+            raise HTTPException(status_code=400, detail="INVALID_CSV_HEADER")
+        for record in reader:
+            if None in record:
+                # More fields than the header: DictReader puts the extras in a list under None.
+                raise HTTPException(status_code=400, detail=f"INVALID_CSV_ROW:{reader.line_num}")
+            record = {k.strip(): (v or "").strip() for k, v in record.items()}
+            try:
+                amount = int(record["amount"])
+            except ValueError:
+                amount = 0
+            rows.append(BulkGrantRow(external_id=record["external_id"], token_type=record["token_type"], amount=amount))
+    if not rows:
+        raise HTTPException(status_code=400, detail="NO_ROWS")
+    return rows
+
+
+@router.post("/bulk-grant", response_model=BulkGrantGameTokensResponse)
+def bulk_grant_tokens(payload: BulkGrantGameTokensRequest, db: Session = Depends(get_db)):
+    """Grant tokens to many users at once (JSON items and/or CSV text) with per-row results."""
+    rows = wallet_service.bulk_grant(db, _parse_bulk_rows(payload), reason=payload.reason or "BULK_GRANT", label=payload.label)
+    results = [
+        BulkGrantGameTokensResult(
+            row=index,
+            external_id=row.external_id,
+            token_type=row.token_type,
+            amount=row.amount,
+            status=row.status,
+            user_id=row.user_id,
+            balance=row.balance,
+            error=row.error,
+        )
+        for index, row in enumerate(rows, start=1)
+    ]
+    granted = sum(1 for r in results if r.status == "OK")
+    return BulkGrantGameTokensResponse(total=len(results), granted=granted, failed=len(results) - granted, results=results)
+
+
 @router.post("/revoke", response_model=GrantGameTokensResponse)
 def revoke_tokens(payload: RevokeGameTokensRequest, db: Session = Depends(get_db)):
     user_id = _resolve_user_id(db, payload.user_id, payload.external_id)
@@ -66,7 +66,7 @@ def delete_team(team_id: int, db: Session = Depends(get_db)):
 
 @router.post("/teams/points", response_model=TeamScoreResponse)
 def add_points(payload: TeamPointsRequest, db: Session = Depends(get_db)):
-    return service.add_points(
+    log = service.add_points(
         db,
         team_id=payload.team_id,
         delta=payload.delta,
@@ -77,6 +77,7 @@ def add_points(payload: TeamPointsRequest, db: Session = Depends(get_db)):
         enforce_usage=False,
         auto_join_if_missing=True,
     )
+    return service.get_team_score(db, team_id=log.team_id, season_id=log.season_id)
 
 
 @router.post("/seasons/{season_id}/settle")
@@ -99,6 +100,7 @@ def auto_balance(payload: TeamAutoBalanceRequest, db: Session = Depends(get_db))
             target_date=payload.target_date,
             weight_deposit=payload.weight_deposit,
             weight_play=payload.weight_play,
+            team_ids=payload.team_ids,
         )
     else:
         result = service.compute_balanced_teams(
@@ -107,12 +109,14 @@ def auto_balance(payload: TeamAutoBalanceRequest, db: Session = Depends(get_db))
             target_date=payload.target_date,
             weight_deposit=payload.weight_deposit,
             weight_play=payload.weight_play,
+            team_ids=payload.team_ids,
         )
     return TeamAutoBalanceResponse(
         season_id=result["season_id"],
         target_date=result["target_date"],
         teams=result["teams"],
         totals=result["totals"],
-        team1_count=result.get("team1_count", len(result.get("assignments", [[], []])[0])),
-        team2_count=result.get("team2_count", len(result.get("assignments", [[], []])[1])),
+        team_counts=result["team_counts"],
+        team1_count=result["team_counts"][0],
+        team2_count=result["team_counts"][1],
     )
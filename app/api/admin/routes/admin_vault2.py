@@ -18,8 +18,9 @@ service = Vault2Service()
 def tick_vault2_transitions(limit: int = 500, db: Session = Depends(get_db)) -> dict:
     """Run Vault2 transition tick (locked→available→expired).
 
-    Intended for manual runs or scheduling (cron) in operations.
+    Intended for manual runs; scripts/run_vault2_sweeper.py runs it continuously.
+    `limit` is the chunk size (the whole backlog is processed).
     """
 
-    updated = service.apply_transitions(db, limit=limit, commit=True)
-    return {"updated": int(updated)}
+    stats = service.sweep_transitions(db, chunk_size=limit, commit=True)
+    return {"updated": stats["available"] + stats["expired"], **stats}
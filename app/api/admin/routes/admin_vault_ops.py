@@ -42,15 +42,14 @@ def _build_admin_state(service: VaultService, db: Session, user_id: int) -> Vaul
     if user is None:
         raise HTTPException(status_code=404, detail="USER_NOT_FOUND")
 
-    locked_balance = int(getattr(user, "vault_locked_balance", 0) or 0)
+    locked_balance, expires_at = service.effective_locked(user, now)
     available_balance = int(getattr(user, "vault_available_balance", 0) or 0)
     cash_balance = int(getattr(user, "cash_balance", 0) or 0)
-    expires_at = getattr(user, "vault_locked_expires_at", None)
 
     return VaultAdminStateResponse(
         user_id=user.id,
         eligible=eligible,
-        vault_balance=int(getattr(user, "vault_balance", 0) or 0),
+        vault_balance=locked_balance,
         locked_balance=locked_balance,
         available_balance=available_balance,
         cash_balance=cash_balance,
@@ -6,6 +6,7 @@ from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import auth_cache
 from app.core.config import get_settings
 from app.core.security import decode_access_token
 from app.db.session import SessionLocal
@@ -56,9 +57,20 @@ def get_current_user_id(
     except (TypeError, ValueError) as exc:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="TOKEN_INVALID") from exc
 
-    user_exists = db.execute(select(User.id).where(User.id == user_id)).scalar_one_or_none()
-    if user_exists is None:
+    if auth_cache.is_revoked(payload.get("jti")):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="TOKEN_REVOKED")
+
+    # Usually served from the auth cache, so the request runs no auth query at all.
+    state = auth_cache.get_auth_state(
+        user_id, lambda: db.execute(select(User.token_version, User.status).where(User.id == user_id)).one_or_none()
+    )
+    if state is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="TOKEN_INVALID")
+    token_version, user_status = state
+    if int(payload.get("tv") or 0) < token_version:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="TOKEN_REVOKED")
+    if user_status != "ACTIVE":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="USER_INACTIVE")
 
     return user_id
 
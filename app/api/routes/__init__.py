@@ -8,6 +8,7 @@ from app.api.routes import (
 	auth,
 	dice,
 	health,
+	metrics,
 	lottery,
 	ranking,
 	roulette,
@@ -24,6 +25,7 @@ from app.api.routes import (
 
 api_router = APIRouter()
 api_router.include_router(health.router, prefix="", tags=["health"])
+api_router.include_router(metrics.router, tags=["metrics"])
 api_router.include_router(today_feature.router)
 api_router.include_router(auth.router)
 api_router.include_router(activity.router)
@@ -4,10 +4,10 @@ from datetime import datetime
 
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from sqlalchemy.exc import IntegrityError
 from uuid import uuid4
 
 from app.api.deps import get_current_user_id, get_db
+from app.db.idempotency import insert_if_absent
 from app.models.user_activity import UserActivity
 from app.models.user_activity_event import UserActivityEvent
 from app.schemas.activity import ActivityEventType, ActivityRecordRequest, ActivityRecordResponse
@@ -43,26 +43,19 @@ def record_activity(
 
     if should_persist_event:
         event_id = str(payload.event_id or uuid4())
-        try:
-            db.add(
-                UserActivityEvent(
-                    user_id=user_id,
-                    event_id=event_id,
-                    event_type=payload.event_type.value,
-                    duration_seconds=duration_seconds,
-                )
-            )
-            db.flush()
-        except IntegrityError:
-            db.rollback()
-            # If an explicit event_id is duplicated, return current state for idempotency.
-            if payload.event_id is not None:
-                activity = _get_or_create_activity(db, user_id)
-                db.refresh(activity)
-                return ActivityRecordResponse(user_id=user_id, updated_at=activity.updated_at)
-            # Auto-generated ids should be unique; if not, continue without failing the request.
-            activity = _get_or_create_activity(db, user_id)
-            db.refresh(activity)
+        written = insert_if_absent(
+            db,
+            UserActivityEvent,
+            {
+                "user_id": user_id,
+                "event_id": event_id,
+                "event_type": payload.event_type.value,
+                "duration_seconds": duration_seconds,
+                "created_at": now,
+            },
+        )
+        if not written:
+            # Duplicate event_id: return current state without mutating counters (idempotent replay).
             return ActivityRecordResponse(user_id=user_id, updated_at=activity.updated_at)
 
     if payload.event_type == ActivityEventType.ROULETTE_PLAY:
@@ -2,11 +2,13 @@
 from datetime import datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.security import HTTPAuthorizationCredentials
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 
-from app.api.deps import get_db
-from app.core.security import create_access_token, verify_password
+from app.api.deps import bearer_scheme, get_db
+from app.core.auth_cache import auth_cache
+from app.core.security import create_access_token, decode_access_token, verify_password
 from app.models.user import User
 from app.models.feature import UserEventLog
 
@@ -45,6 +47,8 @@ def issue_token(payload: TokenRequest, request: Request, db: Session = Depends(g
         user = db.get(User, payload.user_id)
     if user is None:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="USER_NOT_FOUND")
+    if user.status != "ACTIVE":
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="USER_INACTIVE")
     # Capture client IP best-effort
     client_ip = request.client.host if request.client else None
     if not client_ip:
@@ -84,7 +88,7 @@ def issue_token(payload: TokenRequest, request: Request, db: Session = Depends(g
         db.rollback()
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="LOGIN_FAILED")
 
-    token = create_access_token(user_id=user.id)
+    token = create_access_token(user_id=user.id, token_version=user.token_version or 0)
     return TokenResponse(
         access_token=token,
         user=AuthUser(
@@ -95,3 +99,15 @@ def issue_token(payload: TokenRequest, request: Request, db: Session = Depends(g
             level=user.level,
         ),
     )
+
+
+@router.post("/logout", summary="Revoke the current JWT")
+def logout(credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme)) -> dict[str, str]:
+    """Reject this token's `jti` for the rest of its lifetime (per API process)."""
+
+    if credentials is None or not credentials.credentials:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="AUTH_REQUIRED")
+    payload = decode_access_token(credentials.credentials)
+    if payload.get("jti"):
+        auth_cache.revoke_jti(payload["jti"], float(payload.get("exp") or 0))
+    return {"result": "OK"}
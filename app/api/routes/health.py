@@ -1,5 +1,9 @@
 """Health check endpoint."""
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+
+from app.core import metrics
+from app.db.instrumentation import pool_stats
+from app.db.session import engine
 
 router = APIRouter()
 
@@ -9,3 +13,15 @@ def health_check() -> dict[str, str]:
     """Return service health information."""
 
     return {"status": "ok"}
+
+
+@router.get("/health/db-pool", summary="DB connection pool stats")
+def db_pool_stats() -> dict:
+    """Checkout count, connections in use, overflow and checkout wait times for this worker.
+
+    Hidden (404) unless METRICS_ENABLED is on, like /metrics.
+    """
+
+    if not metrics.registry.enabled:
+        raise HTTPException(status_code=404, detail="METRICS_DISABLED")
+    return pool_stats.snapshot(engine)
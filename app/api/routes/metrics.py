@@ -0,0 +1,37 @@
+"""Prometheus scrape endpoint."""
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from app.core import metrics
+from app.db.instrumentation import pool_stats
+from app.db.session import engine
+
+router = APIRouter()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _db_pool_gauges():
+    snapshot = pool_stats.snapshot(engine)
+    yield "db_pool_in_use", "Connections currently checked out.", snapshot["in_use"]
+    yield "db_pool_wait_max_seconds", "Longest wait for a pooled connection.", snapshot["wait_max_ms"] / 1000
+    if "overflow" in snapshot:
+        yield "db_pool_size", "Configured pool size.", snapshot["pool_size"]
+        yield "db_pool_overflow", "Connections opened beyond pool_size.", snapshot["overflow"]
+
+
+def _db_pool_counters():
+    snapshot = pool_stats.snapshot(engine)
+    yield "db_pool_checkouts_total", "Connection checkouts since start.", snapshot["checkouts"]
+    yield "db_pool_wait_seconds_total", "Total time spent waiting for a pooled connection.", snapshot["wait_total_ms"] / 1000
+
+
+metrics.registry.register_gauges(_db_pool_gauges)
+metrics.registry.register_counters(_db_pool_counters)
+
+
+@router.get("/metrics", include_in_schema=False)
+def scrape_metrics() -> PlainTextResponse:
+    if not metrics.registry.enabled:
+        raise HTTPException(status_code=404, detail="METRICS_DISABLED")
+    return PlainTextResponse(metrics.registry.render(), media_type=CONTENT_TYPE)
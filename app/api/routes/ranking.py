@@ -1,7 +1,7 @@
 """Ranking API routes."""
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user_id, get_db
@@ -12,11 +12,33 @@ router = APIRouter(prefix="/api/ranking", tags=["ranking"])
 service = RankingService()
 
 
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak If-None-Match comparison: any listed tag (or "*") matching etag, ignoring W/."""
+
+    if not if_none_match:
+        return False
+    opaque = etag.removeprefix("W/")
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
 @router.get("/today", response_model=RankingTodayResponse)
 def ranking_today(
+    request: Request,
+    response: Response,
     top_n: int = Query(10, ge=1, le=100, alias="top"),
+    offset: int = Query(0, ge=0),
     db: Session = Depends(get_db),
     user_id: int = Depends(get_current_user_id),
-) -> RankingTodayResponse:
+) -> RankingTodayResponse | Response:
     today = date.today()
-    return service.get_today_ranking(db=db, user_id=user_id, now=today, top_n=top_n)
+    etag = service.get_today_etag(db=db, user_id=user_id, now=today, top_n=top_n, offset=offset)
+    cache_headers = {"ETag": etag, "Cache-Control": "private, no-cache"} if etag else {}
+    if etag and _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=cache_headers)
+    response.headers.update(cache_headers)
+    # get_today_etag already checked that the RANKING feature is active.
+    return service.get_today_ranking(db=db, user_id=user_id, now=today, top_n=top_n, offset=offset, feature_checked=True)
@@ -2,12 +2,12 @@
 
 from datetime import datetime
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_db, get_current_user_id
 from app.models.game_wallet import GameTokenType, UserGameWallet
-from app.schemas.vault2 import VaultProgramResponse, VaultTopItem
+from app.schemas.vault2 import VaultEventItem, VaultEventPageResponse, VaultProgramResponse, VaultTopItem
 from app.schemas.vault import VaultFillResponse, VaultStatusResponse
 from app.services.vault2_service import Vault2Service
 from app.services.vault_service import VaultService
@@ -34,9 +34,8 @@ def status(db: Session = Depends(get_db), user_id: int = Depends(get_current_use
 
     recommended_action = None
     cta_payload = None
-    locked_balance = int(getattr(user, "vault_locked_balance", 0) or 0)
-    expires_at = getattr(user, "vault_locked_expires_at", None)
-    locked_unexpired = locked_balance > 0 and (expires_at is None or expires_at > now)
+    locked_balance, expires_at = service.effective_locked(user, now)
+    locked_unexpired = locked_balance > 0
 
     if eligible and locked_unexpired:
         ticket_token_types = (GameTokenType.DICE_TOKEN, GameTokenType.ROULETTE_COIN, GameTokenType.LOTTERY_TICKET)
@@ -55,8 +54,8 @@ def status(db: Session = Depends(get_db), user_id: int = Depends(get_current_use
 
     unlock_rules_json = None
     if eligible:
-        computed = service.phase1_unlock_rules_json(now=now)
-        program = v2_service.get_default_program(db, ensure=True)
+        computed = service.phase1_unlock_rules_json(now=now, db=db)
+        program = v2_service.get_program_snapshot(db, ensure=True)
         override = getattr(program, "unlock_rules_json", None)
         if isinstance(override, dict) and override:
             unlock_rules_json = _deep_merge_dict(computed, override)
@@ -69,7 +68,7 @@ def status(db: Session = Depends(get_db), user_id: int = Depends(get_current_use
             "title": "내 금고",
             "desc": "적립된 보관금은 특정 조건 달성 시 즉시 출금 가능한 캐시로 해금됩니다.",
         }
-        program = v2_service.get_default_program(db, ensure=True)
+        program = v2_service.get_program_snapshot(db, ensure=True)
         override = getattr(program, "ui_copy_json", None)
         if isinstance(override, dict) and override:
             ui_copy_json = _deep_merge_dict(hardcoded_ui_copy, override)
@@ -78,7 +77,8 @@ def status(db: Session = Depends(get_db), user_id: int = Depends(get_current_use
 
     return VaultStatusResponse(
         eligible=eligible,
-        vault_balance=user.vault_balance or 0,
+        # vault_balance is the legacy mirror of locked.
+        vault_balance=locked_balance,
         locked_balance=locked_balance,
         available_balance=int(getattr(user, "vault_available_balance", 0) or 0),
         cash_balance=user.cash_balance or 0,
@@ -137,3 +137,27 @@ def top(db: Session = Depends(get_db)) -> list[VaultTopItem]:
         )
         for status, program in rows
     ]
+
+
+@router.get("/events", response_model=VaultEventPageResponse)
+def events(
+    limit: int = Query(20, ge=1, le=100),
+    before_id: int | None = Query(None, ge=1),
+    db: Session = Depends(get_db),
+    user_id: int = Depends(get_current_user_id),
+) -> VaultEventPageResponse:
+    rows = v2_service.list_events(db, user_id=user_id, limit=limit, before_id=before_id)
+    return VaultEventPageResponse(
+        items=[
+            VaultEventItem(
+                id=row.id,
+                event_type=row.event_type,
+                amount=int(row.amount or 0),
+                trigger=row.trigger,
+                meta_json=row.meta_json,
+                created_at=row.created_at,
+            )
+            for row in rows
+        ],
+        next_before_id=rows[-1].id if len(rows) == limit else None,
+    )
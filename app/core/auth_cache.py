@@ -0,0 +1,84 @@
+"""Per-process cache backing stateless JWT authentication.
+
+`get_current_user_id` used to SELECT the user on every request. It now trusts the signed
+token and only needs the user's current `(token_version, status)`, which is cached here for
+AUTH_CACHE_TTL_SECONDS (bounded LRU, AUTH_CACHE_MAX_ENTRIES); non-ACTIVE users are rejected.
+Admin user updates/deletes invalidate the entry in the local process; other workers see the
+change within the TTL.
+
+Revoking a single token by `jti` (logout) is also kept here. It is per process; to cut off
+every token of a user on all workers, bump `user.token_version` instead.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from app.core.config import get_settings
+
+
+class AuthCache:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._states: OrderedDict[int, tuple[float, tuple[int, str]]] = OrderedDict()
+        self._revoked: dict[str, float] = {}
+
+    def get_auth_state(
+        self, user_id: int, loader: Callable[[], tuple[int | None, str] | None]
+    ) -> tuple[int, str] | None:
+        """Return the cached `(token_version, status)` or load it; None (unknown user) is never cached."""
+
+        settings = get_settings()
+        ttl = float(settings.auth_cache_ttl_seconds or 0)
+        now = self._clock()
+        if ttl > 0:
+            with self._lock:
+                entry = self._states.get(user_id)
+                if entry is not None and entry[0] > now:
+                    self._states.move_to_end(user_id)
+                    return entry[1]
+
+        loaded = loader()
+        if loaded is None:
+            return None
+        state = (int(loaded[0] or 0), str(loaded[1]))
+        if ttl <= 0:
+            return state
+
+        with self._lock:
+            self._states[user_id] = (now + ttl, state)
+            self._states.move_to_end(user_id)
+            while len(self._states) > max(int(settings.auth_cache_max_entries or 1), 1):
+                self._states.popitem(last=False)
+        return state
+
+    def invalidate_user(self, user_id: int) -> None:
+        with self._lock:
+            self._states.pop(user_id, None)
+
+    def revoke_jti(self, jti: str, expires_at: float) -> None:
+        """Reject the token with this `jti` until `expires_at` (unix timestamp)."""
+
+        with self._lock:
+            self._revoked[jti] = expires_at
+            # Expired tokens fail signature validation anyway; keep the list bounded.
+            now = time.time()
+            for key in [k for k, exp in self._revoked.items() if exp <= now]:
+                del self._revoked[key]
+
+    def is_revoked(self, jti: str | None) -> bool:
+        if not jti:
+            return False
+        with self._lock:
+            return jti in self._revoked
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+            self._revoked.clear()
+
+
+auth_cache = AuthCache()
@@ -17,11 +17,28 @@ class Settings(BaseSettings):
     # Optional settings with defaults
     jwt_algorithm: str = Field("HS256", validation_alias=AliasChoices("JWT_ALGORITHM", "jwt_algorithm"))
     jwt_expire_minutes: int = Field(1440, validation_alias=AliasChoices("JWT_EXPIRE_MINUTES", "jwt_expire_minutes"))
+    # Per-process cache of token versions used by get_current_user_id (0 disables caching).
+    auth_cache_ttl_seconds: float = Field(30.0, validation_alias=AliasChoices("AUTH_CACHE_TTL_SECONDS", "auth_cache_ttl_seconds"))
+    auth_cache_max_entries: int = Field(100_000, validation_alias=AliasChoices("AUTH_CACHE_MAX_ENTRIES", "auth_cache_max_entries"))
     env: str = Field("local", validation_alias=AliasChoices("ENV", "env"))
     cors_origins: list[str] = Field(default_factory=list, validation_alias=AliasChoices("CORS_ORIGINS", "cors_origins"))
     log_level: str = Field("INFO", validation_alias=AliasChoices("LOG_LEVEL", "log_level"))
     timezone: str = Field("Asia/Seoul", validation_alias=AliasChoices("TIMEZONE", "timezone"))
 
+    # DB connection pool (ignored for SQLite). Size pool_size + max_overflow to the
+    # uvicorn threadpool (40 threads) so sync endpoints do not queue on the pool, and keep
+    # pool_recycle below MySQL wait_timeout.
+    db_pool_size: int = Field(20, validation_alias=AliasChoices("DB_POOL_SIZE", "db_pool_size"))
+    db_max_overflow: int = Field(20, validation_alias=AliasChoices("DB_MAX_OVERFLOW", "db_max_overflow"))
+    db_pool_timeout: float = Field(10.0, validation_alias=AliasChoices("DB_POOL_TIMEOUT", "db_pool_timeout"))
+    db_pool_recycle: int = Field(1800, validation_alias=AliasChoices("DB_POOL_RECYCLE", "db_pool_recycle"))
+    db_pool_pre_ping: bool = Field(True, validation_alias=AliasChoices("DB_POOL_PRE_PING", "db_pool_pre_ping"))
+    # Debug: add X-DB-Queries / X-DB-Time-Ms headers with per-request SQL statement count and time.
+    db_stats_headers: bool = Field(False, validation_alias=AliasChoices("DB_STATS_HEADERS", "db_stats_headers"))
+
+    # Prometheus-style /metrics endpoint and hot-path recording (no-op when off).
+    metrics_enabled: bool = Field(False, validation_alias=AliasChoices("METRICS_ENABLED", "metrics_enabled"))
+
     # Test mode: bypasses feature_schedule validation (all games accessible)
     test_mode: bool = Field(False, validation_alias=AliasChoices("TEST_MODE", "test_mode"))
 
@@ -141,6 +158,34 @@ class Settings(BaseSettings):
         ),
     )
 
+    # In-process cache for admin-managed game configs (see app/services/config_cache.py).
+    # 0 disables caching; admin edits invalidate the local process immediately.
+    config_cache_ttl_seconds: float = Field(
+        30.0,
+        validation_alias=AliasChoices(
+            "CONFIG_CACHE_TTL_SECONDS",
+            "config_cache_ttl_seconds",
+        ),
+    )
+
+    # Play side effects (team battle points, internal-win stamps, survey triggers) via outbox.
+    # Default OFF: hooks run inline in the play request unless the worker
+    # (scripts/run_side_effect_worker.py) is deployed.
+    enable_async_play_side_effects: bool = Field(
+        False,
+        validation_alias=AliasChoices(
+            "ENABLE_ASYNC_PLAY_SIDE_EFFECTS",
+            "enable_async_play_side_effects",
+        ),
+    )
+    side_effect_max_attempts: int = Field(
+        5,
+        validation_alias=AliasChoices(
+            "SIDE_EFFECT_MAX_ATTEMPTS",
+            "side_effect_max_attempts",
+        ),
+    )
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
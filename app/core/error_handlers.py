@@ -7,6 +7,7 @@ from fastapi.responses import JSONResponse
 from sqlalchemy.exc import OperationalError, ProgrammingError, SQLAlchemyError
 from starlette.status import HTTP_422_UNPROCESSABLE_ENTITY
 
+from app.core import metrics
 from app.core.exceptions import (
     DailyLimitReachedError,
     FeatureNotActiveError,
@@ -51,6 +52,7 @@ def register_exception_handlers(app: FastAPI) -> None:
         message = exc.detail if hasattr(exc, "detail") else str(exc)
         code = DETAIL_CODE_MAP.get(message, ERROR_MAP.get(exc.__class__, "UNKNOWN_ERROR"))
         status_code = getattr(exc, "status_code", 400)
+        metrics.APP_ERRORS.inc(code=code)
         return JSONResponse(status_code=status_code, content={"error": {"code": code, "message": message}})
 
     # Register the same handler for each custom exception type
@@ -0,0 +1,192 @@
+"""Minimal Prometheus-compatible metrics (counters, histograms, callback gauges/counters).
+
+Served at GET /metrics in the text exposition format (version 0.0.4). Recording is a no-op
+unless METRICS_ENABLED is on, so instrumented hot paths pay one attribute check when disabled.
+
+Values are per process: with several uvicorn workers, scrape each worker or aggregate
+in Prometheus.
+"""
+from __future__ import annotations
+
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: tuple[str, str] | None = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.enabled = False
+        self._metrics: list[_Metric] = []
+        self._callbacks: list[tuple[str, Callable[[], Iterable[tuple[str, str, float]]]]] = []
+
+    def register(self, metric: "_Metric") -> None:
+        self._metrics.append(metric)
+
+    def register_gauges(self, callback: Callable[[], Iterable[tuple[str, str, float]]]) -> None:
+        """`callback` yields (name, help, value) tuples evaluated at scrape time."""
+
+        self._callbacks.append(("gauge", callback))
+
+    def register_counters(self, callback: Callable[[], Iterable[tuple[str, str, float]]]) -> None:
+        """Like register_gauges, for monotonically increasing values kept elsewhere (`_total` names)."""
+
+        self._callbacks.append(("counter", callback))
+
+    def reset(self) -> None:
+        for metric in self._metrics:
+            metric.reset()
+
+    def render(self) -> str:
+        lines: list[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for kind, callback in self._callbacks:
+            for name, help_text, value in callback():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        registry.register(self)
+
+    def _key(self, labels: dict[str, str]) -> tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def reset(self) -> None:
+        """Drop all recorded values."""
+
+    @abstractmethod
+    def render(self) -> list[str]:
+        """Return the metric's exposition lines (HELP, TYPE and samples)."""
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, help_text, labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: str) -> None:
+        if not registry.enabled:
+            return
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> (per-bucket counts incl. +Inf, sum)
+        self._values: dict[tuple[str, ...], tuple[list[int], float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        if not registry.enabled:
+            return
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._values.get(key) or ([0] * (len(self.buckets) + 1), 0.0)
+            counts[index] += 1
+            self._values[key] = (counts, total + value)
+
+    def count(self, **labels: str) -> int:
+        entry = self._values.get(self._key(labels))
+        return sum(entry[0]) if entry else 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip((*self.buckets, float("inf")), counts):
+                    cumulative += count
+                    labels = _format_labels(self.labelnames, key, ("le", _format_value(bound)))
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+# Hot-path metrics. Label values must stay low-cardinality (no user ids).
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template.", ("method", "route", "status")
+)
+GAME_PLAYS = Counter("game_plays_total", "Committed game plays by game and outcome.", ("game", "outcome"))
+WALLET_DEBIT_FAILURES = Counter(
+    "wallet_debit_failures_total", "Token debits rejected for insufficient balance.", ("token_type",)
+)
+LOTTERY_STOCK_REDRAWS = Counter(
+    "lottery_stock_redraws_total", "Lottery draws repeated because a limited prize sold out concurrently."
+)
+APP_ERRORS = Counter("app_errors_total", "Domain errors returned to clients by error code.", ("code",))
+VAULT_ACCRUALS = Counter("vault_accruals_total", "Vault earn events recorded.", ("earn_type", "source"))
+VAULT_ACCRUAL_AMOUNT = Counter("vault_accrual_amount_total", "Amount accrued into vault locked balance.", ("earn_type",))
+VAULT_LOCKED_EXPIRED = Counter(
+    "vault_locked_expired_total", "Users whose Phase 1 locked balance was cleared by the expiry job."
+)
+VAULT_LOCKED_EXPIRED_AMOUNT = Counter(
+    "vault_locked_expired_amount_total", "Locked balance cleared by the Phase 1 expiry job."
+)
+VAULT2_TRANSITIONS = Counter(
+    "vault2_transitions_total", "Vault2 status rows moved by the transition sweeper.", ("transition",)
+)
+VAULT2_SWEEP_ROWS = Histogram(
+    "vault2_sweep_rows", "Rows moved per Vault2 sweeper tick.", buckets=(0, 1, 10, 100, 1000, 10000, 100000)
+)
@@ -4,16 +4,24 @@ from typing import Any, Dict
 
 import jwt
 import hashlib
+import uuid
 from fastapi import HTTPException, status
 
 from app.core.config import get_settings
 
 
-def create_access_token(user_id: int, expires_minutes: int | None = None) -> str:
+def create_access_token(user_id: int, expires_minutes: int | None = None, token_version: int = 0) -> str:
     settings = get_settings()
     now = datetime.now(timezone.utc)
     expire_delta = timedelta(minutes=expires_minutes or settings.jwt_expire_minutes)
-    payload: Dict[str, Any] = {"sub": str(user_id), "iat": now, "exp": now + expire_delta}
+    payload: Dict[str, Any] = {
+        "sub": str(user_id),
+        "iat": now,
+        "exp": now + expire_delta,
+        # `jti` identifies this token for revocation; `tv` must match user.token_version.
+        "jti": uuid.uuid4().hex,
+        "tv": int(token_version or 0),
+    }
     token = jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
     return token
 
@@ -10,6 +10,7 @@ from app.models import (  # noqa: F401
     AppUiConfig,
     ExternalRankingData,
     ExternalRankingRewardLog,
+    ExternalRankingSnapshot,
     GameTokenType,
     LotteryConfig,
     LotteryLog,
@@ -28,6 +29,9 @@ from app.models import (  # noqa: F401
     Team,
     TeamMember,
     TeamScore,
+    TeamScoreShard,
+    TeamMemberScore,
+    TeamDailyPoints,
     TeamEventLog,
     UserLevelProgress,
     UserLevelRewardLog,
@@ -35,6 +39,7 @@ from app.models import (  # noqa: F401
     User,
     UserCashLedger,
     UserGameWallet,
+    UserGameDailyCount,
     Survey,
     SurveyQuestion,
     SurveyOption,
@@ -49,6 +54,9 @@ from app.models import (  # noqa: F401
     NewMemberDiceLog,
     VaultProgram,
     VaultStatus,
+    VaultStatusEvent,
     VaultEarnEvent,
     TrialTokenBucket,
+    SideEffectOutbox,
+    DashboardHourlyRollup,
 )
@@ -0,0 +1,42 @@
+"""Insert-first idempotency primitive.
+
+Idempotency logs (vault earn events, activity events, ...) used to SELECT the key,
+then INSERT and catch IntegrityError. `insert_if_absent` does it in one statement:
+MySQL `INSERT IGNORE` / SQLite `INSERT ... ON CONFLICT DO NOTHING`, with a savepoint
+fallback elsewhere, and reports whether this call wrote the row.
+
+NOTE: `INSERT IGNORE` also downgrades other row errors (e.g. a missing FK parent) to
+warnings; those rows are reported as not written, never as written.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+
+def insert_if_absent(db: Session, model: Any, values: dict[str, Any]) -> bool:
+    """INSERT one row unless a unique key already holds it; True when this call wrote it.
+
+    Column defaults apply as for any Core insert. The session is not flushed and no ORM
+    instance is created, so read the row back if the caller needs it.
+    """
+
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(model).values(**values).prefix_with("IGNORE")
+        return db.execute(stmt).rowcount == 1
+    if dialect == "sqlite":
+        stmt = sqlite_insert(model).values(**values).on_conflict_do_nothing()
+        return db.execute(stmt).rowcount == 1
+
+    try:
+        with db.begin_nested():
+            db.execute(insert(model).values(**values))
+    except IntegrityError:
+        return False
+    return True
@@ -0,0 +1,119 @@
+"""Connection pool and per-request SQL instrumentation.
+
+- `InstrumentedQueuePool` times how long each checkout waited for a free connection.
+- Pool checkout/checkin listeners track connections in use; overflow comes from the pool.
+- Cursor execute listeners add statement count and DB time to the current request's
+  `RequestDbStats` (set by the HTTP middleware in app.main through a ContextVar), so N+1
+  regressions show up as a jump in X-DB-Queries.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+
+@dataclass
+class RequestDbStats:
+    statements: int = 0
+    db_time_ms: float = 0.0
+
+
+_request_db_stats: ContextVar[RequestDbStats | None] = ContextVar("request_db_stats", default=None)
+
+
+def start_request_stats() -> tuple[RequestDbStats, Token]:
+    stats = RequestDbStats()
+    return stats, _request_db_stats.set(stats)
+
+
+def end_request_stats(token: Token) -> None:
+    _request_db_stats.reset(token)
+
+
+def current_request_stats() -> RequestDbStats | None:
+    return _request_db_stats.get()
+
+
+class PoolStats:
+    """Process-wide pool counters (thread-safe)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.wait_total_seconds = 0.0
+        self.wait_max_seconds = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.wait_total_seconds += seconds
+            self.wait_max_seconds = max(self.wait_max_seconds, seconds)
+
+    def record_checkout(self) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.in_use += 1
+
+    def record_checkin(self) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def snapshot(self, engine: Engine | None = None) -> dict[str, Any]:
+        with self._lock:
+            data: dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "in_use": self.in_use,
+                "wait_total_ms": round(self.wait_total_seconds * 1000, 3),
+                "wait_max_ms": round(self.wait_max_seconds * 1000, 3),
+                "wait_avg_ms": round(self.wait_total_seconds * 1000 / self.checkouts, 3) if self.checkouts else 0.0,
+            }
+        pool = getattr(engine, "pool", None)
+        if isinstance(pool, QueuePool):
+            data.update({"pool_size": pool.size(), "checked_out": pool.checkedout(), "overflow": pool.overflow()})
+        return data
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long callers waited to get a connection."""
+
+    def _do_get(self):  # type: ignore[override]
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.record_wait(time.perf_counter() - started)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """Attach pool and statement listeners to `engine`."""
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        pool_stats.record_checkout()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record) -> None:
+        pool_stats.record_checkin()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        # Stored on the per-execution context so a failed statement leaves nothing behind.
+        context._db_stats_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+        stats = _request_db_stats.get()
+        started = getattr(context, "_db_stats_started", None)
+        if stats is not None and started is not None:
+            stats.statements += 1
+            stats.db_time_ms += (time.perf_counter() - started) * 1000
@@ -1,10 +1,27 @@
 """SQLAlchemy session and engine configuration."""
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import get_settings
+from app.db.instrumentation import InstrumentedQueuePool, instrument_engine
 
 settings = get_settings()
 
-engine = create_engine(settings.database_url, future=True)
+
+def _engine_kwargs() -> dict:
+    if make_url(settings.database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+
+engine = create_engine(settings.database_url, future=True, **_engine_kwargs())
+instrument_engine(engine)
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
@@ -1,14 +1,19 @@
 # /workspace/ch25/app/main.py
-from fastapi import FastAPI
+import time
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.routes import api_router
+from app.core import metrics
 from app.core.config import get_settings
 from app.core.error_handlers import register_exception_handlers
+from app.db.instrumentation import end_request_stats, start_request_stats
 
 settings = get_settings()
 
 app = FastAPI(title="XMAS 1Week Event System")
+metrics.registry.enabled = settings.metrics_enabled
 
 # Apply CORS: allow known local origins by default, avoid "*" when credentials are used.
 default_dev_origins = [
@@ -42,6 +47,28 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def request_instrumentation_middleware(request: Request, call_next):
+    """Per-request SQL stats (X-DB-* headers when DB_STATS_HEADERS is on) and latency histogram."""
+
+    started = time.perf_counter() if metrics.registry.enabled else 0.0
+    stats, token = start_request_stats()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request_stats(token)
+    if settings.db_stats_headers:
+        response.headers["X-DB-Queries"] = str(stats.statements)
+        response.headers["X-DB-Time-Ms"] = f"{stats.db_time_ms:.1f}"
+    if started:
+        # Route template (e.g. /api/dice/play) keeps label cardinality bounded.
+        route = getattr(request.scope.get("route"), "path", None) or "UNMATCHED"
+        metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started, method=request.method, route=route, status=str(response.status_code)
+        )
+    return response
+
+
 @app.on_event("startup")
 async def startup_event():
     print(f"Startup: CORS origins loaded: {cors_origins}", flush=True)
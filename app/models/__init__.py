@@ -3,7 +3,7 @@ from app.models.dice import DiceConfig, DiceLog
 from app.models.feature import FeatureConfig, FeatureSchedule, FeatureType, UserEventLog
 from app.models.game_wallet import GameTokenType, UserGameWallet
 from app.models.lottery import LotteryConfig, LotteryLog, LotteryPrize
-from app.models.external_ranking import ExternalRankingData, ExternalRankingRewardLog
+from app.models.external_ranking import ExternalRankingData, ExternalRankingRewardLog, ExternalRankingSnapshot
 from app.models.ranking import RankingDaily
 from app.models.roulette import RouletteConfig, RouletteLog, RouletteSegment
 from app.models.season_pass import (
@@ -13,9 +13,10 @@ from app.models.season_pass import (
     SeasonPassRewardLog,
     SeasonPassStampLog,
 )
-from app.models.team_battle import TeamSeason, Team, TeamMember, TeamScore, TeamEventLog
+from app.models.team_battle import TeamSeason, Team, TeamMember, TeamScore, TeamScoreShard, TeamMemberScore, TeamDailyPoints, TeamEventLog
 from app.models.level_xp import UserLevelProgress, UserLevelRewardLog, UserXpEventLog
 from app.models.game_wallet_ledger import UserGameWalletLedger
+from app.models.game_daily_count import UserGameDailyCount
 from app.models.user_cash_ledger import UserCashLedger
 from app.models.user import User
 from app.models.user_activity import UserActivity
@@ -24,10 +25,12 @@ from app.models.user_segment import UserSegment
 from app.models.segment_rule import SegmentRule
 from app.models.new_member_dice import NewMemberDiceEligibility, NewMemberDiceLog
 from app.models.app_ui_config import AppUiConfig
-from app.models.vault2 import VaultProgram, VaultStatus
+from app.models.vault2 import VaultProgram, VaultStatus, VaultStatusEvent
 from app.models.vault_earn_event import VaultEarnEvent
 from app.models.trial_token_bucket import TrialTokenBucket
 from app.models.admin_audit_log import AdminAuditLog
+from app.models.side_effect_outbox import SideEffectOutbox
+from app.models.dashboard_rollup import DashboardHourlyRollup
 from app.models.survey import (
     Survey,
     SurveyQuestion,
@@ -51,6 +54,9 @@ __all__ = [
     "Team",
     "TeamMember",
     "TeamScore",
+    "TeamScoreShard",
+    "TeamMemberScore",
+    "TeamDailyPoints",
     "TeamEventLog",
     "UserLevelProgress",
     "UserLevelRewardLog",
@@ -66,10 +72,12 @@ __all__ = [
     "LotteryPrize",
     "ExternalRankingData",
     "ExternalRankingRewardLog",
+    "ExternalRankingSnapshot",
     "RankingDaily",
     "UserGameWallet",
     "GameTokenType",
     "UserGameWalletLedger",
+    "UserGameDailyCount",
     "UserCashLedger",
     "Survey",
     "SurveyQuestion",
@@ -86,7 +94,10 @@ __all__ = [
     "AppUiConfig",
     "VaultProgram",
     "VaultStatus",
+    "VaultStatusEvent",
     "VaultEarnEvent",
     "TrialTokenBucket",
     "AdminAuditLog",
+    "SideEffectOutbox",
+    "DashboardHourlyRollup",
 ]
@@ -0,0 +1,25 @@
+"""Hourly rollup of admin dashboard metrics."""
+from datetime import datetime
+
+from sqlalchemy import BigInteger, Column, DateTime, Integer, LargeBinary
+
+from app.db.base_class import Base
+
+
+class DashboardHourlyRollup(Base):
+    """One row per UTC hour, maintained by DashboardRollupService.
+
+    Additive metrics are stored as sums; distinct users (players across roulette/dice/lottery,
+    logged-in users) as HyperLogLog sketches so any range of hours can be merged.
+    """
+
+    __tablename__ = "dashboard_hourly_rollup"
+
+    hour_start = Column(DateTime, primary_key=True)
+    plays = Column(Integer, nullable=False, default=0)
+    player_sketch = Column(LargeBinary, nullable=False)
+    active_sketch = Column(LargeBinary, nullable=False)
+    ticket_usage = Column(BigInteger, nullable=False, default=0)
+    session_seconds = Column(BigInteger, nullable=False, default=0)
+    session_count = Column(Integer, nullable=False, default=0)
+    computed_at = Column(DateTime, nullable=False, default=datetime.utcnow)
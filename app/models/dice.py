@@ -31,6 +31,7 @@ class DiceLog(Base):
     __tablename__ = "dice_log"
     __table_args__ = (
         Index("ix_dice_log_user_created_at", "user_id", "created_at"),
+        Index("ix_dice_log_created_at", "created_at"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
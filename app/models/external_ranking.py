@@ -1,7 +1,7 @@
 """External ranking data captured from other platforms and payout logs."""
 from datetime import datetime
 
-from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, String, UniqueConstraint
+from sqlalchemy import BigInteger, Column, Date, DateTime, ForeignKey, Integer, String, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -43,3 +43,20 @@ class ExternalRankingRewardLog(Base):
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
 
     data = relationship("ExternalRankingData", back_populates="reward_logs")
+
+
+class ExternalRankingSnapshot(Base):
+    """Materialized leaderboard rebuilt after every external ranking write (one row per rank)."""
+
+    __tablename__ = "external_ranking_snapshot"
+    __table_args__ = (UniqueConstraint("user_id", name="uq_external_ranking_snapshot_user"),)
+
+    rank = Column(Integer, primary_key=True, autoincrement=False)
+    user_id = Column(Integer, nullable=False)
+    user_name = Column(String(100), nullable=True)
+    deposit_amount = Column(Integer, nullable=False, default=0)
+    play_count = Column(Integer, nullable=False, default=0)
+    memo = Column(String(255), nullable=True)
+    # Identical for every row of one build and increasing across builds; used for ETags/caching.
+    version = Column(BigInteger, nullable=False)
+    built_at = Column(DateTime, nullable=False, default=datetime.utcnow)
@@ -0,0 +1,23 @@
+"""Per-user, per-day play counters for the daily games."""
+from datetime import datetime
+
+from sqlalchemy import Column, Date, DateTime, Enum as SAEnum, ForeignKey, Integer
+
+from app.db.base_class import Base
+from app.models.feature import FeatureType
+
+
+class UserGameDailyCount(Base):
+    """Number of plays a user made of one game on one (service-local) day.
+
+    Maintained in the play transaction so status endpoints read today's count with a
+    primary-key lookup instead of COUNT(*) over the game log with func.date(created_at).
+    """
+
+    __tablename__ = "user_game_daily_count"
+
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    feature_type = Column(SAEnum(FeatureType), primary_key=True)
+    play_date = Column(Date, primary_key=True)
+    play_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -52,6 +52,7 @@ class RouletteLog(Base):
     __tablename__ = "roulette_log"
     __table_args__ = (
         Index("ix_roulette_log_user_created_at", "user_id", "created_at"),
+        Index("ix_roulette_log_created_at", "created_at"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -1,5 +1,6 @@
 # /workspace/ch25/app/models/season_pass.py
 from sqlalchemy import (
+    BigInteger,
     Boolean,
     CheckConstraint,
     Column,
@@ -73,6 +74,10 @@ class SeasonPassProgress(Base):
     current_xp = Column(Integer, nullable=False, default=0)
     total_stamps = Column(Integer, nullable=False, default=0)
     last_stamp_date = Column(Date, nullable=True)
+    # Date of the last daily check-in stamp (period_key == date); answers "stamped today" without a log read.
+    last_checkin_date = Column(Date, nullable=True)
+    # Bit N set => reward for level N already logged. NULL = not computed yet (rebuilt from reward logs).
+    claimed_levels_mask = Column(BigInteger, nullable=True)
     created_at = Column(DateTime, server_default=func.now(), nullable=False)
     updated_at = Column(DateTime, server_default=func.now(), onupdate=func.now(), nullable=False)
 
@@ -0,0 +1,33 @@
+"""Outbox for play side effects (team battle points, season pass stamps, survey triggers).
+
+Rows are written in the game play transaction and drained by the side-effect worker
+(scripts/run_side_effect_worker.py), so those systems no longer run on the player's request.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import JSON, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.mysql import JSON as MySQLJSON
+
+from app.db.base_class import Base
+
+
+class SideEffectOutbox(Base):
+    __tablename__ = "side_effect_outbox"
+    __table_args__ = (Index("ix_side_effect_outbox_status_available", "status", "available_at", "id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # TEAM_POINTS / SEASON_PASS_INTERNAL_WIN / SURVEY_GAME_RESULT
+    effect_type = Column(String(50), nullable=False)
+    payload_json = Column(JSON().with_variant(MySQLJSON, "mysql"), nullable=False, default=dict)
+
+    # PENDING -> DONE, or FAILED once attempts are exhausted.
+    status = Column(String(20), nullable=False, default="PENDING")
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    last_error = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    processed_at = Column(DateTime, nullable=True)
@@ -1,7 +1,7 @@
 """Team battle core models (season, team, membership, scores, logs)."""
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Column, DateTime, ForeignKey, Integer, JSON, String, UniqueConstraint, Index
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, ForeignKey, Integer, JSON, SmallInteger, String, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 
 from app.db.base_class import Base
@@ -66,12 +66,65 @@ class TeamScore(Base):
     team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"), primary_key=True)
     season_id = Column(Integer, ForeignKey("team_season.id", ondelete="CASCADE"), primary_key=True)
     points = Column(BigInteger, nullable=False, default=0)
+    # MAX(team_event_log.created_at) for this team/season; leaderboard tie-breaker.
+    last_event_at = Column(DateTime, nullable=True)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     team = relationship("Team", back_populates="scores")
     season = relationship("TeamSeason", back_populates="scores")
 
 
+class TeamScoreShard(Base):
+    """Pending team score deltas, spread over TeamBattleService.SCORE_SHARDS rows per team/season.
+
+    add_points upserts the shard picked by user id instead of locking team_score, so concurrent
+    players of one team rarely touch the same row. A team's score is team_score.points plus the
+    sum of its shards; compact_team_scores folds the shards back into team_score.
+    """
+
+    __tablename__ = "team_score_shard"
+
+    season_id = Column(Integer, ForeignKey("team_season.id", ondelete="CASCADE"), primary_key=True)
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, autoincrement=False)
+    points = Column(BigInteger, nullable=False, default=0)
+    last_event_at = Column(DateTime, nullable=True)
+
+
+class TeamMemberScore(Base):
+    """Per-user contribution totals, maintained by TeamBattleService.add_points.
+
+    Materializes SUM(delta)/MAX(created_at) of team_event_log per (season, team, user);
+    `game_points` is the GAME_PLAY-only part used for reward eligibility.
+    """
+
+    __tablename__ = "team_member_score"
+    __table_args__ = (Index("idx_team_member_score_points", "season_id", "team_id", "points"),)
+
+    season_id = Column(Integer, ForeignKey("team_season.id", ondelete="CASCADE"), primary_key=True)
+    team_id = Column(Integer, ForeignKey("team.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    points = Column(BigInteger, nullable=False, default=0)
+    game_points = Column(BigInteger, nullable=False, default=0)
+    last_event_at = Column(DateTime, nullable=True)
+
+
+class TeamDailyPoints(Base):
+    """Running GAME_PLAY points per user per local (KST) day; enforces DAILY_POINT_CAP.
+
+    `last_grant` holds the points granted by the most recent upsert so the caller can read
+    back what the atomic capped increment actually added.
+    """
+
+    __tablename__ = "team_daily_points"
+
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    points = Column(Integer, nullable=False, default=0)
+    last_grant = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class TeamEventLog(Base):
     __tablename__ = "team_event_log"
     __table_args__ = (
@@ -18,7 +18,9 @@ class User(Base):
     level = Column(Integer, nullable=False, server_default="1", default=1)
     xp = Column(Integer, nullable=False, server_default="0", default=0)
     status = Column(String(20), nullable=False, default="ACTIVE")
-    last_login_at = Column(DateTime, nullable=True)
+    # Bumped when tokens must stop working (status/password change); JWTs carry it as `tv`.
+    token_version = Column(Integer, nullable=False, server_default="0", default=0)
+    last_login_at = Column(DateTime, nullable=True, index=True)
     last_login_ip = Column(String(45), nullable=True)
 
     # Money system
@@ -27,8 +29,8 @@ class User(Base):
     vault_locked_balance = Column(Integer, nullable=False, server_default="0", default=0)
     # Phase 1: reserved for future separation; does not expire.
     vault_available_balance = Column(Integer, nullable=False, server_default="0", default=0)
-    # Phase 1: expiration applies only to locked balance.
-    vault_locked_expires_at = Column(DateTime, nullable=True)
+    # Phase 1: expiration applies only to locked balance (indexed for the expiry job).
+    vault_locked_expires_at = Column(DateTime, nullable=True, index=True)
     cash_balance = Column(Integer, nullable=False, server_default="0", default=0)
     vault_fill_used_at = Column(DateTime, nullable=True)
 
@@ -14,6 +14,7 @@ class UserActivityEvent(Base):
     __table_args__ = (
         UniqueConstraint("event_id", name="uq_user_activity_event_event_id"),
         Index("ix_user_activity_event_user_created", "user_id", "created_at"),
+        Index("ix_user_activity_event_created_at", "created_at"),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -6,7 +6,7 @@ They exist to support a future Vault state machine rollout.
 
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, JSON, String
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, JSON, String
 
 from app.db.base_class import Base
 
@@ -33,6 +33,11 @@ class VaultProgram(Base):
 
 class VaultStatus(Base):
     __tablename__ = "vault_status"
+    __table_args__ = (
+        # Transition sweeper scans: LOCKED by expires_at, AVAILABLE by available_since.
+        Index("ix_vault_status_state_expires_at", "state", "expires_at"),
+        Index("ix_vault_status_state_available_since", "state", "available_since"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("user.id"), nullable=False, index=True)
@@ -47,6 +52,34 @@ class VaultStatus(Base):
 
     locked_at = Column(DateTime, nullable=True)
     expires_at = Column(DateTime, nullable=True)
+    # Set when the row first becomes AVAILABLE; drives the optional available -> expired grace window.
+    available_since = Column(DateTime, nullable=True)
 
     created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
     updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
+class VaultStatusEvent(Base):
+    """Append-only Vault2 event history (accruals, unlocks).
+
+    Replaces the unbounded progress_json["events"] list so writes to the hot
+    vault_status row stay constant-size.
+    """
+
+    __tablename__ = "vault_status_event"
+    __table_args__ = (
+        # History paging: newest first per user, keyset on id.
+        Index("ix_vault_status_event_user_id_id", "user_id", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    status_id = Column(Integer, ForeignKey("vault_status.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("user.id", ondelete="CASCADE"), nullable=False)
+    program_id = Column(Integer, ForeignKey("vault_program.id"), nullable=False)
+
+    event_type = Column(String(30), nullable=False)
+    amount = Column(Integer, nullable=False, server_default="0", default=0)
+    trigger = Column(String(50), nullable=True)
+    meta_json = Column(JSON, nullable=True)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
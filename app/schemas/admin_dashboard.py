@@ -18,3 +18,5 @@ class DashboardMetricsResponse(BaseModel):
     unique_players: MetricValue
     ticket_usage: MetricValue
     avg_session_time_seconds: MetricValue
+    missing_hours: int = Field(0, description="Hours of the current window not rolled up yet (counted as zero)")
+    previous_missing_hours: int = Field(0, description="Hours of the previous window not rolled up yet")
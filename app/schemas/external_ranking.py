@@ -40,3 +40,19 @@ class ExternalRankingEntry(BaseModel):
 
 class ExternalRankingListResponse(BaseModel):
     items: list[ExternalRankingEntry]
+
+
+class ExternalRankingUpsertReport(BaseModel):
+    """Summary of a bulk external ranking upload (rows are not echoed back)."""
+
+    received: int
+    created: int
+    updated: int
+    deposit_increased: int
+    xp_users: int
+    xp_added: int
+    level_ups: int
+    season_rewards: int
+    vault_signals: int
+    cooldown_deferred: int
+    top10_stamps: int
@@ -56,3 +56,36 @@ class LedgerEntry(BaseModel):
     label: str | None = None
     meta_json: dict | None = None
     created_at: str
+
+
+class BulkGrantGameTokensItem(BaseModel):
+    external_id: str
+    # Kept as plain str/int so a bad row is reported in the results instead of failing the whole request.
+    token_type: str
+    amount: int
+
+
+class BulkGrantGameTokensRequest(BaseModel):
+    items: list[BulkGrantGameTokensItem] = Field(default_factory=list)
+    # Alternative to `items`: CSV text with an `external_id,token_type,amount` header row.
+    csv: str | None = None
+    reason: str | None = None
+    label: str | None = None
+
+
+class BulkGrantGameTokensResult(BaseModel):
+    row: int
+    external_id: str
+    token_type: str
+    amount: int
+    status: str
+    user_id: int | None = None
+    balance: int | None = None
+    error: str | None = None
+
+
+class BulkGrantGameTokensResponse(BaseModel):
+    total: int
+    granted: int
+    failed: int
+    results: list[BulkGrantGameTokensResult]
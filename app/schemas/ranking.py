@@ -34,4 +34,6 @@ class RankingTodayResponse(BaseModel):
     my_entry: RankingEntry | None = None
     external_entries: list[ExternalRankingEntry] = []
     my_external_entry: ExternalRankingEntry | None = None
+    # Number of ranked users; external_entries is only the requested page.
+    external_total: int = 0
     feature_type: FeatureType
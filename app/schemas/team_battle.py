@@ -118,6 +118,7 @@ class TeamAutoBalanceRequest(BaseModel):
     apply: bool = Field(False, description="True면 즉시 팀 배정 반영")
     weight_deposit: float = Field(0.6, ge=0, le=1)
     weight_play: float = Field(0.4, ge=0, le=1)
+    team_ids: Optional[list[int]] = Field(None, description="배정할 팀 ID 목록 (2개 이상). 비우면 활성 팀 전체")
 
 
 class TeamAutoBalanceResponse(BaseModel):
@@ -125,6 +126,7 @@ class TeamAutoBalanceResponse(BaseModel):
     target_date: str
     teams: list[int]
     totals: list[float]
+    team_counts: list[int]
     team1_count: int
     team2_count: int
 
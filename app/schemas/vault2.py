@@ -76,3 +76,18 @@ class VaultTopItem(BaseModel):
     available_amount: int = 0
     expires_at: datetime | None = None
     progress_json: dict | None = None
+
+
+class VaultEventItem(BaseModel):
+    id: int
+    event_type: str
+    amount: int
+    trigger: str | None = None
+    meta_json: dict | None = None
+    created_at: datetime
+
+
+class VaultEventPageResponse(BaseModel):
+    items: list[VaultEventItem]
+    # Pass as before_id to fetch the next (older) page; None when exhausted.
+    next_before_id: int | None = None
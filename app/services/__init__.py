@@ -1,7 +1,13 @@
 """Service package exports."""
 from app.services.dice_service import DiceService
 from app.services.feature_service import FeatureService
-from app.services.game_common import GamePlayContext, apply_season_pass_stamp, enforce_daily_limit, log_game_play
+from app.services.game_common import (
+    GamePlayContext,
+    apply_season_pass_stamp,
+    enforce_daily_limit,
+    game_play_transaction,
+    log_game_play,
+)
 from app.services.lottery_service import LotteryService
 from app.services.ranking_service import RankingService
 from app.services.reward_service import RewardService
@@ -14,6 +20,7 @@ __all__ = [
     "GamePlayContext",
     "apply_season_pass_stamp",
     "enforce_daily_limit",
+    "game_play_transaction",
     "log_game_play",
     "LotteryService",
     "RankingService",
@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 
 from app.models.dice import DiceConfig
 from app.schemas.admin_dice import AdminDiceConfigCreate, AdminDiceConfigUpdate
+from app.services.config_cache import invalidate_dice_config
 
 
 class AdminDiceService:
@@ -41,6 +42,7 @@ class AdminDiceService:
         )
         db.add(config)
         db.commit()
+        invalidate_dice_config()
         db.refresh(config)
         return config
 
@@ -61,6 +63,7 @@ class AdminDiceService:
                 setattr(config, field, value)
         db.add(config)
         db.commit()
+        invalidate_dice_config()
         db.refresh(config)
         return config
 
@@ -70,5 +73,6 @@ class AdminDiceService:
         config.is_active = active
         db.add(config)
         db.commit()
+        invalidate_dice_config()
         db.refresh(config)
         return config
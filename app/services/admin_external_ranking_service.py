@@ -12,6 +12,7 @@ from app.models.season_pass import SeasonPassStampLog
 from app.schemas.external_ranking import ExternalRankingCreate, ExternalRankingUpdate
 from app.models.user import User
 from app.models.new_member_dice import NewMemberDiceEligibility
+from app.services.ranking_service import RankingService
 from app.services.vault_service import VaultService
 from app.services.season_pass_service import SeasonPassService
 from app.core.config import get_settings
@@ -23,6 +24,8 @@ class AdminExternalRankingService:
     STEP_AMOUNT = 100_000
     XP_PER_STEP = 20
     MAX_STEPS_PER_DAY = 50
+    # Users per upsert_many chunk (one commit and one IN query per table per chunk).
+    CHUNK_SIZE = 1000
 
 
     @staticmethod
@@ -52,110 +55,41 @@ class AdminExternalRankingService:
         return row
 
     @staticmethod
-    def upsert_many(db: Session, data: Iterable[ExternalRankingCreate]) -> list[ExternalRankingData]:
-        season_pass = SeasonPassService()
-        vault_service = VaultService()
-        settings = get_settings()
-        today = date.today()
-        now = datetime.utcnow()
-        step_amount = AdminExternalRankingService.STEP_AMOUNT
-        xp_per_step = AdminExternalRankingService.XP_PER_STEP
-        max_steps_per_day = AdminExternalRankingService.MAX_STEPS_PER_DAY
-        cooldown_minutes = max(settings.external_ranking_deposit_cooldown_minutes, 0)
-
-        existing_by_user = {row.user_id: row for row in db.execute(select(ExternalRankingData)).scalars().all()}
-        # Snapshot pre-update values per user to compute deltas correctly later
-        prev_snapshot: dict[int, dict] = {
-            row.user_id: {
-                "deposit_amount": row.deposit_amount,
-                "deposit_remainder": row.deposit_remainder or 0,
-                "daily_base_deposit": row.daily_base_deposit or 0,
-                "updated_at": row.updated_at,
-            }
-            for row in existing_by_user.values()
-        }
-        results: list[ExternalRankingData] = []
-
-        for payload in data:
-            user_id = AdminExternalRankingService._resolve_user_id(db, payload.user_id, payload.external_id)
-            row = existing_by_user.get(user_id)
-            prev_deposit = row.deposit_amount if row else 0
-            prev_play = row.play_count if row else 0
-
-            # Daily baseline reset happens before overwriting with today's totals
-            if row and row.last_daily_reset != today:
-                row.daily_base_deposit = row.deposit_amount
-                row.daily_base_play = row.play_count
-                row.deposit_remainder = 0
-                row.last_daily_reset = today
+    def _resolve_user_ids(db: Session, payloads: list[ExternalRankingCreate]) -> list[int]:
+        """Resolve every payload's user with a single IN query for the external_ids."""
+
+        external_ids = {p.external_id for p in payloads if not p.user_id and p.external_id}
+        id_by_external: dict[str, int] = {}
+        external_list = list(external_ids)
+        for start in range(0, len(external_list), AdminExternalRankingService.CHUNK_SIZE):
+            chunk = external_list[start : start + AdminExternalRankingService.CHUNK_SIZE]
+            id_by_external.update(
+                {
+                    external_id: user_id
+                    for user_id, external_id in db.execute(
+                        select(User.id, User.external_id).where(User.external_id.in_(chunk))
+                    ).all()
+                }
+            )
 
-            if row:
-                row.user_id = user_id
-                row.deposit_amount = payload.deposit_amount
-                row.play_count = payload.play_count
-                row.memo = payload.memo
+        user_ids: list[int] = []
+        for payload in payloads:
+            if payload.user_id:
+                user_ids.append(payload.user_id)
+            elif payload.external_id:
+                if payload.external_id not in id_by_external:
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="USER_NOT_FOUND")
+                user_ids.append(id_by_external[payload.external_id])
             else:
-                row = ExternalRankingData(
-                    user_id=user_id,
-                    deposit_amount=payload.deposit_amount,
-                    play_count=payload.play_count,
-                    memo=payload.memo,
-                    daily_base_deposit=0,
-                    daily_base_play=0,
-                    last_daily_reset=today,
-                )
-                db.add(row)
-                existing_by_user[user_id] = row
-            results.append(row)
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="USER_REQUIRED")
+        return user_ids
 
-        db.commit()
-        for row in results:
-            db.refresh(row)
-
-        # Personalization hook: if deposit_amount increased (vs pre-update snapshot), treat as "charge" update.
-        # We don't have per-transaction charge logs in this codebase; the best available timestamp is row.updated_at.
-        for row in results:
-            snap = prev_snapshot.get(row.user_id, {"deposit_amount": 0})
-            prev_amount = int(snap.get("deposit_amount") or 0)
-            new_amount = int(row.deposit_amount or 0)
-            if new_amount > prev_amount:
-                activity = db.query(UserActivity).filter(UserActivity.user_id == row.user_id).first()
-                if not activity:
-                    activity = UserActivity(user_id=row.user_id)
-                    db.add(activity)
-                activity.last_charge_at = row.updated_at
-
-                deposit_delta = new_amount - prev_amount
-
-                # Vault unlock hook (v1.0): deposit increase acts as "verification charge" trigger.
-                eligibility = db.execute(
-                    select(NewMemberDiceEligibility).where(NewMemberDiceEligibility.user_id == row.user_id)
-                ).scalar_one_or_none()
-                eligible_new_user = (
-                    eligibility is not None
-                    and bool(eligibility.is_eligible)
-                    and eligibility.revoked_at is None
-                    and (eligibility.expires_at is None or eligibility.expires_at > now)
-                )
-                if eligible_new_user:
-                    vault_service.handle_deposit_increase_signal(
-                        db,
-                        user_id=row.user_id,
-                        deposit_delta=deposit_delta,
-                        prev_amount=prev_amount,
-                        new_amount=new_amount,
-                        now=now,
-                        commit=False,
-                    )
-        db.commit()
-
-        # Season pass XP hooks (daily deltas) + weekly TOP10 stamp
+    @staticmethod
+    def _ensure_season(db: Session, season_pass: SeasonPassService, today: date) -> int | None:
         current_season = season_pass.get_current_season(db, today)
-        if not current_season and bool(getattr(settings, "test_mode", False)):
+        if not current_season and bool(getattr(get_settings(), "test_mode", False)):
             # In tests we want deposit->XP logic to be verifiable without needing explicit season seeds.
             # Keep this behavior strictly in TEST_MODE to avoid changing production behavior.
-            from datetime import timedelta
-
             from app.models.season_pass import SeasonPassConfig, SeasonPassLevel
 
             season = SeasonPassConfig(
@@ -181,76 +115,269 @@ class AdminExternalRankingService:
             db.add_all(levels)
             db.commit()
             current_season = season
+        return current_season.id if current_season else None
 
-        if not current_season:
-            return results
+    @staticmethod
+    def upsert_many(db: Session, data: Iterable[ExternalRankingCreate]) -> dict:
+        """Apply an external ranking upload and its deposit hooks; returns a summary report.
 
-        season_id = current_season.id
+        Rows are processed in chunks of CHUNK_SIZE users: each chunk reads existing rows,
+        activities and new-member eligibility with one IN query apiece, computes deposit
+        deltas/steps/XP in memory, applies XP through SeasonPassService.add_bonus_xp_bulk and
+        commits once. An upload listing the same user twice fails with DUPLICATE_USER before
+        anything is written.
+        """
 
-        for row in results:
-            # 예치: step_amount 단위당 XP 지급 + remainder 누적 (사용자별 이전 상태 기준)
-            snap = prev_snapshot.get(
-                row.user_id,
-                {"deposit_amount": 0, "deposit_remainder": 0, "daily_base_deposit": 0, "updated_at": None},
+        season_pass = SeasonPassService()
+        vault_service = VaultService()
+        settings = get_settings()
+        today = date.today()
+        now = datetime.utcnow()
+        step_amount = AdminExternalRankingService.STEP_AMOUNT
+        xp_per_step = AdminExternalRankingService.XP_PER_STEP
+        max_steps_per_day = AdminExternalRankingService.MAX_STEPS_PER_DAY
+        cooldown_minutes = max(settings.external_ranking_deposit_cooldown_minutes, 0)
+
+        payloads = list(data)
+        user_ids = AdminExternalRankingService._resolve_user_ids(db, payloads)
+        # Rows carry absolute totals, so two rows for one user are ambiguous; reject the upload.
+        payload_by_user: dict[int, ExternalRankingCreate] = {}
+        for user_id, payload in zip(user_ids, payloads):
+            if user_id in payload_by_user:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"DUPLICATE_USER:{user_id}")
+            payload_by_user[user_id] = payload
+
+        report = {
+            "received": len(payloads),
+            "created": 0,
+            "updated": 0,
+            "deposit_increased": 0,
+            "xp_users": 0,
+            "xp_added": 0,
+            "level_ups": 0,
+            "season_rewards": 0,
+            "vault_signals": 0,
+            "cooldown_deferred": 0,
+            "top10_stamps": 0,
+        }
+        season_id = AdminExternalRankingService._ensure_season(db, season_pass, today)
+
+        ordered_users = list(payload_by_user)
+        for start in range(0, len(ordered_users), AdminExternalRankingService.CHUNK_SIZE):
+            chunk = ordered_users[start : start + AdminExternalRankingService.CHUNK_SIZE]
+            AdminExternalRankingService._apply_chunk(
+                db,
+                [(user_id, payload_by_user[user_id]) for user_id in chunk],
+                season_pass=season_pass,
+                vault_service=vault_service,
+                season_id=season_id,
+                today=today,
+                now=now,
+                step_amount=step_amount,
+                xp_per_step=xp_per_step,
+                max_steps_per_day=max_steps_per_day,
+                cooldown_minutes=cooldown_minutes,
+                report=report,
             )
 
-            baseline = max(snap.get("deposit_amount", 0), row.daily_base_deposit or 0)
-            deposit_delta = max(row.deposit_amount - baseline, 0)
-            total_for_step = snap.get("deposit_remainder", 0) + deposit_delta
+        RankingService.rebuild_external_snapshot(db)
+        if season_id is not None:
+            report["top10_stamps"] = AdminExternalRankingService._stamp_weekly_top10(db, season_pass, season_id, today)
+        return report
+
+    @staticmethod
+    def _apply_chunk(
+        db: Session,
+        items: list[tuple[int, ExternalRankingCreate]],
+        *,
+        season_pass: SeasonPassService,
+        vault_service: VaultService,
+        season_id: int | None,
+        today: date,
+        now: datetime,
+        step_amount: int,
+        xp_per_step: int,
+        max_steps_per_day: int,
+        cooldown_minutes: int,
+        report: dict,
+    ) -> None:
+        user_ids = [user_id for user_id, _ in items]
+        existing_by_user = {
+            row.user_id: row
+            for row in db.execute(select(ExternalRankingData).where(ExternalRankingData.user_id.in_(user_ids)))
+            .scalars()
+            .all()
+        }
+
+        increased: dict[int, tuple[int, int]] = {}
+        xp_by_user: dict[int, int] = {}
+        for user_id, payload in items:
+            row = existing_by_user.get(user_id)
+            # Snapshot pre-update values to compute deltas correctly.
+            prev_amount = int(row.deposit_amount or 0) if row else 0
+            prev_remainder = int(row.deposit_remainder or 0) if row else 0
+            prev_updated_at = row.updated_at if row else None
+
+            if row:
+                # Daily baseline reset happens before overwriting with today's totals
+                if row.last_daily_reset != today:
+                    row.daily_base_deposit = row.deposit_amount
+                    row.daily_base_play = row.play_count
+                    row.deposit_remainder = 0
+                    row.last_daily_reset = today
+                row.deposit_amount = payload.deposit_amount
+                row.play_count = payload.play_count
+                row.memo = payload.memo
+                row.updated_at = now
+                report["updated"] += 1
+            else:
+                row = ExternalRankingData(
+                    user_id=user_id,
+                    deposit_amount=payload.deposit_amount,
+                    play_count=payload.play_count,
+                    memo=payload.memo,
+                    deposit_remainder=0,
+                    daily_base_deposit=0,
+                    daily_base_play=0,
+                    last_daily_reset=today,
+                    created_at=now,
+                    updated_at=now,
+                )
+                db.add(row)
+                report["created"] += 1
+
+            new_amount = int(row.deposit_amount or 0)
+            if new_amount > prev_amount:
+                increased[user_id] = (prev_amount, new_amount)
+
+            if season_id is None:
+                continue
+
+            # 예치: step_amount 단위당 XP 지급 + remainder 누적 (사용자별 이전 상태 기준)
+            baseline = max(prev_amount, row.daily_base_deposit or 0)
+            deposit_delta = max(new_amount - baseline, 0)
+            total_for_step = prev_remainder + deposit_delta
             deposit_steps = total_for_step // step_amount
-            remainder = total_for_step % step_amount
+            row.deposit_remainder = total_for_step % step_amount
 
             # 상한 적용 (0이면 무제한)
             if max_steps_per_day > 0:
                 deposit_steps = min(deposit_steps, max_steps_per_day)
 
             # 쿨다운: 최근 업데이트가 cooldown_minutes 이내면 지급만 보류하고 remainder만 저장
-            if deposit_steps > 0 and cooldown_minutes > 0 and snap.get("updated_at"):
-                if now - snap["updated_at"] < timedelta(minutes=cooldown_minutes):
-                    row.deposit_remainder = remainder
+            if deposit_steps > 0 and cooldown_minutes > 0 and prev_updated_at:
+                if now - prev_updated_at < timedelta(minutes=cooldown_minutes):
+                    report["cooldown_deferred"] += 1
                     continue
 
             if deposit_steps > 0 and xp_per_step > 0:
-                xp_to_add = deposit_steps * xp_per_step
-                season_pass.add_bonus_xp(db, user_id=row.user_id, xp_amount=xp_to_add, now=today)
-
-            row.deposit_remainder = remainder
+                xp_by_user[user_id] = deposit_steps * xp_per_step
 
             # 이용 횟수: 1회당 20 XP 지급 (일일 누적 대비 증분 계산)
             # play_count 기반 XP 지급은 비활성
 
-        # Weekly TOP10 (once per ISO week)
-        top10 = (
+        if increased:
+            report["deposit_increased"] += len(increased)
+            AdminExternalRankingService._apply_deposit_increase_hooks(db, vault_service, increased, now, report)
+
+        if xp_by_user:
+            xp_summary = season_pass.add_bonus_xp_bulk(db, xp_by_user, now=today, commit=False)
+            report["xp_users"] += xp_summary["users"]
+            report["xp_added"] += xp_summary["xp_added"]
+            report["level_ups"] += xp_summary["leveled_up"]
+            report["season_rewards"] += xp_summary["rewards"]
+
+        db.commit()
+
+    @staticmethod
+    def _apply_deposit_increase_hooks(
+        db: Session,
+        vault_service: VaultService,
+        increased: dict[int, tuple[int, int]],
+        now: datetime,
+        report: dict,
+    ) -> None:
+        # Personalization hook: a deposit_amount increase is treated as a "charge".
+        # We don't have per-transaction charge logs in this codebase; the upload time is the best timestamp.
+        user_ids = list(increased)
+        activity_by_user = {
+            activity.user_id: activity
+            for activity in db.execute(select(UserActivity).where(UserActivity.user_id.in_(user_ids))).scalars().all()
+        }
+        for user_id in user_ids:
+            activity = activity_by_user.get(user_id)
+            if activity is None:
+                activity = UserActivity(user_id=user_id)
+                db.add(activity)
+            activity.last_charge_at = now
+
+        # Vault unlock hook (v1.0): deposit increase acts as "verification charge" trigger.
+        eligibilities = db.execute(
+            select(NewMemberDiceEligibility).where(NewMemberDiceEligibility.user_id.in_(user_ids))
+        ).scalars().all()
+        for eligibility in eligibilities:
+            eligible_new_user = (
+                bool(eligibility.is_eligible)
+                and eligibility.revoked_at is None
+                and (eligibility.expires_at is None or eligibility.expires_at > now)
+            )
+            if not eligible_new_user:
+                continue
+            prev_amount, new_amount = increased[eligibility.user_id]
+            vault_service.handle_deposit_increase_signal(
+                db,
+                user_id=eligibility.user_id,
+                deposit_delta=new_amount - prev_amount,
+                prev_amount=prev_amount,
+                new_amount=new_amount,
+                now=now,
+                commit=False,
+            )
+            report["vault_signals"] += 1
+
+    @staticmethod
+    def _stamp_weekly_top10(db: Session, season_pass: SeasonPassService, season_id: int, today: date) -> int:
+        """Weekly TOP10 stamp (once per ISO week); returns the number of stamps added."""
+
+        top10_user_ids = (
             db.execute(
-                select(ExternalRankingData)
+                select(ExternalRankingData.user_id)
                 .order_by(ExternalRankingData.deposit_amount.desc(), ExternalRankingData.play_count.desc())
                 .limit(10)
             )
             .scalars()
             .all()
         )
+        if not top10_user_ids:
+            return 0
         iso_year, iso_week, _ = today.isocalendar()
         week_key = f"W{iso_year}-{iso_week:02d}"
-        for entry in top10:
-            existing_top = (
-                db.query(SeasonPassStampLog)
-                .filter(
-                    SeasonPassStampLog.user_id == entry.user_id,
+        already = set(
+            db.execute(
+                select(SeasonPassStampLog.user_id).where(
+                    SeasonPassStampLog.user_id.in_(top10_user_ids),
                     SeasonPassStampLog.season_id == season_id,
                     SeasonPassStampLog.source_feature_type == "EXTERNAL_RANKING_TOP10",
                     SeasonPassStampLog.period_key == f"TOP10_{week_key}",
                 )
-                .one_or_none()
             )
-            if not existing_top:
-                season_pass.maybe_add_stamp(
-                    db,
-                    user_id=entry.user_id,
-                    source_feature_type="EXTERNAL_RANKING_TOP10",
-                    now=today,
-                    period_key=f"TOP10_{week_key}",
-                )
-        return results
+            .scalars()
+            .all()
+        )
+        stamped = 0
+        for user_id in top10_user_ids:
+            if user_id in already:
+                continue
+            result = season_pass.maybe_add_stamp(
+                db,
+                user_id=user_id,
+                source_feature_type="EXTERNAL_RANKING_TOP10",
+                now=today,
+                period_key=f"TOP10_{week_key}",
+            )
+            if result is not None:
+                stamped += 1
+        return stamped
 
     @staticmethod
     def update(db: Session, user_id: int, payload: ExternalRankingUpdate) -> ExternalRankingData:
@@ -263,6 +390,8 @@ class AdminExternalRankingService:
                 continue
             setattr(row, key, value)
         db.add(row)
+        db.flush()
+        RankingService.rebuild_external_snapshot(db, commit=False)
         db.commit()
         db.refresh(row)
         return row
@@ -272,4 +401,5 @@ class AdminExternalRankingService:
         result = db.execute(delete(ExternalRankingData).where(ExternalRankingData.user_id == user_id))
         if result.rowcount == 0:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="EXTERNAL_RANKING_NOT_FOUND")
+        RankingService.rebuild_external_snapshot(db, commit=False)
         db.commit()
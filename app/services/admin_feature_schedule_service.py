@@ -11,6 +11,7 @@ from app.schemas.admin_feature_schedule import (
     AdminFeatureScheduleBase,
     AdminFeatureScheduleResponse,
 )
+from app.services.config_cache import invalidate_feature_config
 
 
 class AdminFeatureScheduleService:
@@ -45,6 +46,7 @@ class AdminFeatureScheduleService:
         except Exception:
             db.rollback()
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="INVALID_FEATURE_SCHEDULE")
+        invalidate_feature_config()
         db.refresh(schedule)
         return schedule
 
@@ -55,3 +57,4 @@ class AdminFeatureScheduleService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="SCHEDULE_NOT_FOUND")
         db.delete(schedule)
         db.commit()
+        invalidate_feature_config()
@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from app.core.exceptions import InvalidConfigError
 from app.models.lottery import LotteryConfig, LotteryPrize
 from app.schemas.admin_lottery import AdminLotteryConfigCreate, AdminLotteryConfigUpdate
+from app.services.config_cache import invalidate_lottery_config
 
 
 class AdminLotteryService:
@@ -73,6 +74,7 @@ class AdminLotteryService:
             AdminLotteryService._apply_prizes(config, data.prizes)
             db.add(config)
             db.commit()
+            invalidate_lottery_config()
             db.refresh(config)
             return config
         except InvalidConfigError as exc:
@@ -97,6 +99,7 @@ class AdminLotteryService:
                 AdminLotteryService._apply_prizes(config, data.prizes)
             db.add(config)
             db.commit()
+            invalidate_lottery_config()
             db.refresh(config)
             return config
         except InvalidConfigError as exc:
@@ -112,5 +115,6 @@ class AdminLotteryService:
         config.is_active = active
         db.add(config)
         db.commit()
+        invalidate_lottery_config()
         db.refresh(config)
         return config
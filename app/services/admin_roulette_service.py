@@ -6,6 +6,7 @@ from sqlalchemy.orm import Session
 from app.core.exceptions import InvalidConfigError
 from app.models.roulette import RouletteConfig, RouletteSegment
 from app.schemas.admin_roulette import AdminRouletteConfigCreate, AdminRouletteConfigUpdate
+from app.services.config_cache import invalidate_roulette_config
 
 
 class AdminRouletteService:
@@ -78,6 +79,7 @@ class AdminRouletteService:
             AdminRouletteService._apply_segments(db, config, data.segments)
             db.add(config)
             db.commit()
+            invalidate_roulette_config()
             db.refresh(config)
             return config
         except (InvalidConfigError, IntegrityError):
@@ -102,6 +104,7 @@ class AdminRouletteService:
                 AdminRouletteService._apply_segments(db, config, data.segments)
             db.add(config)
             db.commit()
+            invalidate_roulette_config()
             db.refresh(config)
             return config
         except (InvalidConfigError, IntegrityError):
@@ -117,6 +120,7 @@ class AdminRouletteService:
         config.is_active = active
         db.add(config)
         db.commit()
+        invalidate_roulette_config()
         db.refresh(config)
         return config
 
@@ -125,3 +129,4 @@ class AdminRouletteService:
         config = AdminRouletteService.get_config(db, config_id)
         db.delete(config)
         db.commit()
+        invalidate_roulette_config()
@@ -13,6 +13,7 @@ from app.schemas.admin_season import (
     AdminSeasonResponse,
     AdminSeasonUpdate,
 )
+from app.services.config_cache import invalidate_season_pass_config
 
 
 class AdminSeasonService:
@@ -66,6 +67,7 @@ class AdminSeasonService:
         season = SeasonPassConfig(**payload)
         db.add(season)
         db.commit()
+        invalidate_season_pass_config()
         db.refresh(season)
         return season
 
@@ -97,6 +99,7 @@ class AdminSeasonService:
 
             db.add(season)
             db.commit()
+            invalidate_season_pass_config()
             db.refresh(season)
         return season
 
@@ -106,5 +109,6 @@ class AdminSeasonService:
         season.is_active = False
         db.add(season)
         db.commit()
+        invalidate_season_pass_config()
         db.refresh(season)
         return season
@@ -4,6 +4,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select, and_
 from sqlalchemy.orm import Session
 
+from app.core.auth_cache import auth_cache
 from app.core.security import hash_password
 from app.models.user import User
 from app.models.team_battle import TeamMember
@@ -142,10 +143,16 @@ class AdminUserService:
             user.level = update_data["level"]
         if "xp" in update_data:
             user.xp = update_data["xp"]
+        revoke_tokens = False
         if "status" in update_data:
+            revoke_tokens = update_data["status"] != user.status
             user.status = update_data["status"]
         if "password" in update_data and update_data["password"]:
             user.password_hash = hash_password(update_data["password"])
+            revoke_tokens = True
+        if revoke_tokens:
+            # Tokens issued before this change stop working (see app/core/auth_cache.py).
+            user.token_version = int(user.token_version or 0) + 1
 
         # Handle XP/Season Level update (XP is the source of truth; level auto-derived)
         if "xp" in update_data or "season_level" in update_data:
@@ -170,6 +177,7 @@ class AdminUserService:
         db.add(user)
         db.commit()
         db.refresh(user)
+        auth_cache.invalidate_user(user.id)
         return AdminUserService._enrich_user_with_xp(db, user)
 
     @staticmethod
@@ -183,3 +191,4 @@ class AdminUserService:
         db.query(TeamMember).filter(TeamMember.user_id == user_id).delete(synchronize_session=False)
         db.delete(user)
         db.commit()
+        auth_cache.invalidate_user(user_id)
@@ -0,0 +1,366 @@
+"""In-process TTL cache for admin-managed game configuration.
+
+Game configs (roulette/dice/lottery), roulette segments, lottery prizes, feature
+config/schedule rows, season pass seasons/level tables and the vault program config change only when an admin edits
+them, yet every status/play call used to re-read them. Hot-path reads are served from immutable snapshots kept here; admin
+services call `invalidate_*` after commit so the next read reloads from the DB.
+
+Each namespace carries a version that increments on every invalidation. Derived structures
+(e.g. weighted samplers) can key on that version to be rebuilt exactly once per config edit.
+
+NOTE: The cache is per process. Other workers pick up admin edits when their entry's TTL
+(CONFIG_CACHE_TTL_SECONDS) expires; set it to 0 to disable caching entirely. Namespaces whose
+keys come from request parameters (ranking pages) get an entry limit and evict least recently
+used entries first.
+"""
+from __future__ import annotations
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass
+from datetime import date
+from typing import Any, TypeVar
+
+from app.core.config import get_settings
+from app.models.feature import FeatureType
+
+T = TypeVar("T")
+
+NS_ROULETTE = "roulette"
+NS_DICE = "dice"
+NS_LOTTERY = "lottery"
+NS_FEATURE = "feature"
+NS_SEASON_PASS = "season_pass"
+NS_RANKING = "ranking"
+NS_VAULT = "vault"
+
+# Max cached entries per namespace (LRU); namespaces not listed are unbounded.
+NAMESPACE_LIMITS = {NS_RANKING: 256}
+
+
+class ConfigCache:
+    """Thread-safe, namespaced TTL cache with per-namespace versions."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, limits: dict[str, int] | None = None) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple[str, Hashable], tuple[int, float, Any]] = {}
+        self._versions: dict[str, int] = {}
+        self._limits = dict(limits or {})
+        # Recency order of the keys of limited namespaces.
+        self._lru: dict[str, OrderedDict[Hashable, None]] = {ns: OrderedDict() for ns in self._limits}
+
+    @staticmethod
+    def _ttl_seconds() -> float:
+        return float(getattr(get_settings(), "config_cache_ttl_seconds", 0) or 0)
+
+    def version(self, namespace: str) -> int:
+        with self._lock:
+            return self._versions.get(namespace, 0)
+
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], T | None]) -> T | None:
+        """Return the cached value or call `loader` and cache its (non-None) result."""
+
+        ttl = self._ttl_seconds()
+        if ttl <= 0:
+            return loader()
+
+        cache_key = (namespace, key)
+        now = self._clock()
+        with self._lock:
+            version = self._versions.get(namespace, 0)
+            entry = self._entries.get(cache_key)
+            if entry is not None and entry[0] == version and entry[1] > now:
+                if namespace in self._lru:
+                    self._lru[namespace].move_to_end(key)
+                return entry[2]
+
+        value = loader()
+        if value is None:
+            # Missing config is an error path; never cache it so a fix is visible immediately.
+            return None
+
+        with self._lock:
+            # Skip storing if an invalidation raced with the load.
+            if self._versions.get(namespace, 0) == version:
+                self._entries[cache_key] = (version, now + ttl, value)
+                order = self._lru.get(namespace)
+                if order is not None:
+                    order[key] = None
+                    order.move_to_end(key)
+                    while len(order) > self._limits[namespace]:
+                        evicted, _ = order.popitem(last=False)
+                        self._entries.pop((namespace, evicted), None)
+        return value
+
+    def invalidate(self, *namespaces: str) -> None:
+        with self._lock:
+            for namespace in namespaces:
+                self._versions[namespace] = self._versions.get(namespace, 0) + 1
+                for cache_key in [k for k in self._entries if k[0] == namespace]:
+                    del self._entries[cache_key]
+                if namespace in self._lru:
+                    self._lru[namespace].clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            for namespace in list(self._versions):
+                self._versions[namespace] += 1
+            self._entries.clear()
+            for order in self._lru.values():
+                order.clear()
+
+
+config_cache = ConfigCache(limits=NAMESPACE_LIMITS)
+
+
+@dataclass(frozen=True)
+class RouletteConfigSnapshot:
+    id: int
+    name: str
+    max_daily_spins: int
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "RouletteConfigSnapshot":
+        return cls(id=row.id, name=row.name, max_daily_spins=row.max_daily_spins or 0)
+
+
+@dataclass(frozen=True)
+class RouletteSegmentSnapshot:
+    id: int
+    config_id: int
+    slot_index: int
+    label: str
+    reward_type: str
+    reward_amount: int
+    weight: int
+    is_jackpot: bool
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "RouletteSegmentSnapshot":
+        return cls(
+            id=row.id,
+            config_id=row.config_id,
+            slot_index=row.slot_index,
+            label=row.label,
+            reward_type=row.reward_type,
+            reward_amount=row.reward_amount,
+            weight=row.weight,
+            is_jackpot=bool(row.is_jackpot),
+        )
+
+
+@dataclass(frozen=True)
+class DiceConfigSnapshot:
+    id: int
+    name: str
+    max_daily_plays: int
+    win_reward_type: str
+    win_reward_amount: int
+    draw_reward_type: str
+    draw_reward_amount: int
+    lose_reward_type: str
+    lose_reward_amount: int
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "DiceConfigSnapshot":
+        return cls(
+            id=row.id,
+            name=row.name,
+            max_daily_plays=row.max_daily_plays or 0,
+            win_reward_type=row.win_reward_type,
+            win_reward_amount=row.win_reward_amount,
+            draw_reward_type=row.draw_reward_type,
+            draw_reward_amount=row.draw_reward_amount,
+            lose_reward_type=row.lose_reward_type,
+            lose_reward_amount=row.lose_reward_amount,
+        )
+
+
+@dataclass(frozen=True)
+class LotteryConfigSnapshot:
+    id: int
+    name: str
+    max_daily_tickets: int
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "LotteryConfigSnapshot":
+        return cls(id=row.id, name=row.name, max_daily_tickets=row.max_daily_tickets or 0)
+
+
+@dataclass(frozen=True)
+class LotteryPrizeSnapshot:
+    """Static prize definition; `stock` is the value at load time and must be refreshed before use."""
+
+    id: int
+    config_id: int
+    label: str
+    reward_type: str
+    reward_amount: int
+    weight: int
+    stock: int | None
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "LotteryPrizeSnapshot":
+        return cls(
+            id=row.id,
+            config_id=row.config_id,
+            label=row.label,
+            reward_type=row.reward_type,
+            reward_amount=row.reward_amount,
+            weight=row.weight,
+            stock=row.stock,
+        )
+
+
+@dataclass(frozen=True)
+class FeatureConfigSnapshot:
+    id: int
+    feature_type: FeatureType
+    title: str
+    page_path: str
+    is_enabled: bool
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "FeatureConfigSnapshot":
+        return cls(
+            id=row.id,
+            feature_type=row.feature_type,
+            title=row.title,
+            page_path=row.page_path,
+            is_enabled=bool(row.is_enabled),
+        )
+
+
+@dataclass(frozen=True)
+class FeatureScheduleSnapshot:
+    date: date
+    feature_type: FeatureType
+    is_active: bool
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "FeatureScheduleSnapshot":
+        return cls(date=row.date, feature_type=row.feature_type, is_active=bool(row.is_active))
+
+
+@dataclass(frozen=True)
+class SeasonPassSeasonSnapshot:
+    id: int
+    season_name: str
+    start_date: date
+    end_date: date
+    max_level: int
+    base_xp_per_stamp: int
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "SeasonPassSeasonSnapshot":
+        return cls(
+            id=row.id,
+            season_name=row.season_name,
+            start_date=row.start_date,
+            end_date=row.end_date,
+            max_level=row.max_level,
+            base_xp_per_stamp=row.base_xp_per_stamp,
+        )
+
+
+@dataclass(frozen=True)
+class SeasonPassLevelSnapshot:
+    level: int
+    required_xp: int
+    reward_type: str
+    reward_amount: int
+    auto_claim: bool
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "SeasonPassLevelSnapshot":
+        return cls(
+            level=row.level,
+            required_xp=row.required_xp,
+            reward_type=row.reward_type,
+            reward_amount=row.reward_amount,
+            auto_claim=bool(row.auto_claim),
+        )
+
+
+@dataclass(frozen=True)
+class VaultProgramSnapshot:
+    """VaultProgram with its JSON knobs pre-parsed; the JSON copies must be treated as read-only."""
+
+    id: int
+    key: str
+    duration_hours: int
+    # None means "not configured here" so callers fall back to env settings.
+    accrual_multiplier: float | None
+    enable_game_earn_events: bool | None
+    eligibility_mode: str
+    eligibility_allow: frozenset[int]
+    eligibility_block: frozenset[int]
+    available_grace_hours: int
+    config_json: dict
+    unlock_rules_json: dict | None
+    ui_copy_json: dict | None
+
+    @classmethod
+    def from_orm(cls, row: Any) -> "VaultProgramSnapshot":
+        config = copy.deepcopy(row.config_json) if isinstance(row.config_json, dict) else {}
+        rules = copy.deepcopy(row.unlock_rules_json) if isinstance(row.unlock_rules_json, dict) else None
+        ui_copy = copy.deepcopy(row.ui_copy_json) if isinstance(row.ui_copy_json, dict) else None
+
+        multiplier = None
+        if config.get("accrual_multiplier") is not None:
+            try:
+                multiplier = max(float(config["accrual_multiplier"]), 1.0)
+            except (TypeError, ValueError):
+                multiplier = None
+        game_earn = config.get("enable_game_earn_events")
+        try:
+            grace_hours = max(int((rules or {}).get("available_grace_hours") or 0), 0)
+        except (TypeError, ValueError):
+            grace_hours = 0
+
+        return cls(
+            id=row.id,
+            key=row.key,
+            duration_hours=int(row.duration_hours or 24),
+            accrual_multiplier=multiplier,
+            enable_game_earn_events=None if game_earn is None else bool(game_earn),
+            eligibility_mode=str(config.get("eligibility_mode") or "all").lower(),
+            eligibility_allow=frozenset(config.get("eligibility_allow") or ()),
+            eligibility_block=frozenset(config.get("eligibility_block") or ()),
+            available_grace_hours=grace_hours,
+            config_json=config,
+            unlock_rules_json=rules,
+            ui_copy_json=ui_copy,
+        )
+
+
+def invalidate_roulette_config() -> None:
+    config_cache.invalidate(NS_ROULETTE)
+
+
+def invalidate_dice_config() -> None:
+    config_cache.invalidate(NS_DICE)
+
+
+def invalidate_lottery_config() -> None:
+    config_cache.invalidate(NS_LOTTERY)
+
+
+def invalidate_feature_config() -> None:
+    config_cache.invalidate(NS_FEATURE)
+
+
+def invalidate_season_pass_config() -> None:
+    config_cache.invalidate(NS_SEASON_PASS)
+
+
+def invalidate_vault_config() -> None:
+    config_cache.invalidate(NS_VAULT)
+
+
+def invalidate_ranking_pages() -> None:
+    config_cache.invalidate(NS_RANKING)
@@ -0,0 +1,226 @@
+"""Hourly rollups behind the admin dashboard metrics.
+
+/admin/api/dashboard/metrics used to scan roulette/dice/lottery logs, the wallet ledger and
+activity events for both the current and the previous window on every cache miss. Each UTC
+hour is now rolled up once into dashboard_hourly_rollup; a range is answered from at most
+2 x 168 rows, with distinct users merged from per-hour HyperLogLog sketches.
+
+Late events: an hour keeps being recomputed by the background job
+(scripts/run_dashboard_rollup.py) until LATE_EVENT_HOURS after it closes; after that the row
+is final. Reads only roll up the open hour (once its row is older than REFRESH_SECONDS), so a
+request scans at most one hour of source logs; closed hours without a row count as zero and
+are reported as `missing_hours` until the job (or a --backfill-hours run) fills them.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models.dashboard_rollup import DashboardHourlyRollup
+from app.models.dice import DiceLog
+from app.models.game_wallet import GameTokenType
+from app.models.game_wallet_ledger import UserGameWalletLedger
+from app.models.lottery import LotteryLog
+from app.models.roulette import RouletteLog
+from app.models.user import User
+from app.models.user_activity_event import UserActivityEvent
+from app.services.hyperloglog import HyperLogLog
+
+HOUR = timedelta(hours=1)
+
+TICKET_TOKENS = (
+    GameTokenType.ROULETTE_COIN,
+    GameTokenType.DICE_TOKEN,
+    GameTokenType.LOTTERY_TICKET,
+)
+
+
+class DashboardRollupService:
+    """Maintain and read dashboard_hourly_rollup."""
+
+    LATE_EVENT_HOURS = 3  # closed hours are still recomputed this long after they end
+    REFRESH_SECONDS = 300  # open rows older than this are recomputed on read
+
+    @staticmethod
+    def hour_floor(dt: datetime) -> datetime:
+        return dt.replace(minute=0, second=0, microsecond=0)
+
+    @staticmethod
+    def compute_hour(db: Session, hour_start: datetime) -> dict:
+        """Scan the source logs of one hour and return the rollup row values."""
+
+        end = hour_start + HOUR
+        plays = 0
+        player_ids = []
+        for log in (RouletteLog, DiceLog, LotteryLog):
+            in_hour = (log.created_at >= hour_start, log.created_at < end)
+            plays += int(db.execute(select(func.count()).select_from(log).where(*in_hour)).scalar() or 0)
+            player_ids.append(select(log.user_id.label("user_id")).where(*in_hour))
+        players = HyperLogLog().update(db.execute(player_ids[0].union(*player_ids[1:])).scalars())
+
+        active = HyperLogLog().update(
+            db.execute(select(User.id).where(User.last_login_at >= hour_start, User.last_login_at < end)).scalars()
+        )
+
+        spent = db.execute(
+            select(func.coalesce(func.sum(UserGameWalletLedger.delta), 0)).where(
+                UserGameWalletLedger.created_at >= hour_start,
+                UserGameWalletLedger.created_at < end,
+                UserGameWalletLedger.token_type.in_(TICKET_TOKENS),
+                UserGameWalletLedger.delta < 0,
+            )
+        ).scalar()
+
+        session_seconds, session_count = db.execute(
+            select(func.coalesce(func.sum(UserActivityEvent.duration_seconds), 0), func.count()).where(
+                UserActivityEvent.event_type == "PLAY_DURATION",
+                UserActivityEvent.duration_seconds.isnot(None),
+                UserActivityEvent.duration_seconds > 0,
+                UserActivityEvent.created_at >= hour_start,
+                UserActivityEvent.created_at < end,
+            )
+        ).one()
+
+        return {
+            "hour_start": hour_start,
+            "plays": plays,
+            "player_sketch": players.to_bytes(),
+            "active_sketch": active.to_bytes(),
+            "ticket_usage": abs(int(spent or 0)),
+            "session_seconds": int(session_seconds or 0),
+            "session_count": int(session_count or 0),
+        }
+
+    @staticmethod
+    def _upsert(db: Session, values: dict) -> None:
+        updates = {key: value for key, value in values.items() if key != "hour_start"}
+        dialect = db.bind.dialect.name
+        if dialect == "mysql":
+            db.execute(mysql_insert(DashboardHourlyRollup).values(**values).on_duplicate_key_update(**updates))
+            return
+        if dialect == "sqlite":
+            db.execute(
+                sqlite_insert(DashboardHourlyRollup)
+                .values(**values)
+                .on_conflict_do_update(index_elements=[DashboardHourlyRollup.hour_start], set_=updates)
+            )
+            return
+        db.merge(DashboardHourlyRollup(**values))
+        db.flush()
+
+    def refresh(
+        self,
+        db: Session,
+        start: datetime,
+        end: datetime,
+        *,
+        now: datetime | None = None,
+        force: bool = False,
+        commit: bool = True,
+    ) -> int:
+        """Roll up the hours overlapping [start, end) that are missing or still open; returns the count.
+
+        force=True recomputes every hour in the range (backfills, manual corrections).
+        """
+
+        now = now or datetime.utcnow()
+        hour = self.hour_floor(start)
+        # Never roll up hours that have not started yet.
+        last = self.hour_floor(min(end - timedelta(microseconds=1), now))
+        computed = dict(
+            db.execute(
+                select(DashboardHourlyRollup.hour_start, DashboardHourlyRollup.computed_at).where(
+                    DashboardHourlyRollup.hour_start >= hour,
+                    DashboardHourlyRollup.hour_start <= last,
+                )
+            ).all()
+        )
+
+        refreshed = 0
+        while hour <= last:
+            computed_at = computed.get(hour)
+            stale = (
+                force
+                or computed_at is None
+                or (
+                    computed_at < hour + HOUR * (1 + self.LATE_EVENT_HOURS)
+                    and (now - computed_at).total_seconds() >= self.REFRESH_SECONDS
+                )
+            )
+            if stale:
+                values = self.compute_hour(db, hour)
+                values["computed_at"] = now
+                self._upsert(db, values)
+                refreshed += 1
+            hour += HOUR
+
+        if refreshed:
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+        return refreshed
+
+    def run(self, db: Session, now: datetime | None = None, commit: bool = True) -> dict:
+        """Background pass: recompute the current hour and the LATE_EVENT_HOURS before it."""
+
+        now = now or datetime.utcnow()
+        start = self.hour_floor(now) - HOUR * self.LATE_EVENT_HOURS
+        return {"hours": self.refresh(db, start, now, now=now, force=True, commit=commit)}
+
+    def window_metrics(self, db: Session, *, hours: int, now: datetime | None = None) -> tuple[dict, dict]:
+        """Return (current, previous) dashboard metrics for windows of `hours` hourly buckets.
+
+        The current window ends with the (partial) hour containing `now`; the previous one is
+        the `hours` buckets before it. Only the open hour is rolled up here; each summary's
+        `missing_hours` counts the buckets still without a row (summed as zero).
+        """
+
+        now = now or datetime.utcnow()
+        current_end = self.hour_floor(now) + HOUR
+        current_start = current_end - HOUR * hours
+        previous_start = current_start - HOUR * hours
+        self.refresh(db, current_end - HOUR, current_end, now=now)
+
+        rows = db.execute(
+            select(
+                DashboardHourlyRollup.hour_start,
+                DashboardHourlyRollup.plays,
+                DashboardHourlyRollup.player_sketch,
+                DashboardHourlyRollup.active_sketch,
+                DashboardHourlyRollup.ticket_usage,
+                DashboardHourlyRollup.session_seconds,
+                DashboardHourlyRollup.session_count,
+            ).where(
+                DashboardHourlyRollup.hour_start >= previous_start,
+                DashboardHourlyRollup.hour_start < current_end,
+            )
+        ).all()
+        current = self._summarize([row for row in rows if row.hour_start >= current_start], hours)
+        previous = self._summarize([row for row in rows if row.hour_start < current_start], hours)
+        return current, previous
+
+    @staticmethod
+    def _summarize(rows: list, hours: int) -> dict:
+        players = HyperLogLog()
+        active = HyperLogLog()
+        plays = tickets = session_seconds = session_count = 0
+        for row in rows:
+            players.merge(HyperLogLog.from_bytes(row.player_sketch))
+            active.merge(HyperLogLog.from_bytes(row.active_sketch))
+            plays += row.plays
+            tickets += row.ticket_usage
+            session_seconds += row.session_seconds
+            session_count += row.session_count
+        return {
+            "active_users": active.estimate(),
+            "game_participation": plays,
+            "unique_players": players.estimate(),
+            "ticket_usage": tickets,
+            "avg_session_time_seconds": session_seconds / session_count if session_count else None,
+            "missing_hours": hours - len(rows),
+        }
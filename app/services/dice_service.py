@@ -2,17 +2,26 @@
 from datetime import date, datetime
 import random
 
-from sqlalchemy import func, select
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.exceptions import InvalidConfigError
 from app.core.config import get_settings
 from app.models.dice import DiceConfig, DiceLog
 from app.models.feature import FeatureType
 from app.models.game_wallet import GameTokenType
 from app.schemas.dice import DicePlayResponse, DiceResult, DiceStatusResponse
+from app.services.config_cache import NS_DICE, DiceConfigSnapshot, config_cache
 from app.services.feature_service import FeatureService
-from app.services.game_common import GamePlayContext, log_game_play
+from app.services.game_common import (
+    GamePlayContext,
+    apply_internal_win_stamp,
+    game_play_transaction,
+    get_daily_play_count,
+    increment_daily_play_count,
+    log_game_play,
+)
 from app.services.game_wallet_service import GameWalletService
 from app.services.reward_service import RewardService
 from app.services.season_pass_service import SeasonPassService
@@ -25,15 +34,21 @@ class DiceService:
     BASE_GAME_XP = 3
     WIN_GAME_XP = 3
 
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        # Injectable RNG so draws can be replayed with a seeded random.Random for audits.
+        self.rng = rng or random.Random()
         self.feature_service = FeatureService()
         self.reward_service = RewardService()
         self.wallet_service = GameWalletService()
         self.season_pass_service = SeasonPassService()
         self.vault_service = VaultService()
 
-    def _get_today_config(self, db: Session) -> DiceConfig:
-        config = db.execute(select(DiceConfig).where(DiceConfig.is_active.is_(True))).scalar_one_or_none()
+    def _get_today_config(self, db: Session) -> DiceConfigSnapshot:
+        def load() -> DiceConfigSnapshot | None:
+            row = db.execute(select(DiceConfig).where(DiceConfig.is_active.is_(True))).scalar_one_or_none()
+            return DiceConfigSnapshot.from_orm(row) if row else None
+
+        config = config_cache.get_or_load(NS_DICE, "active", load)
         if config is None:
             raise InvalidConfigError("DICE_CONFIG_MISSING")
         return config
@@ -49,13 +64,7 @@ class DiceService:
         token_type = GameTokenType.DICE_TOKEN
         token_balance = self.wallet_service.get_balance(db, user_id, token_type)
 
-        today_plays = db.execute(
-            select(func.count()).select_from(DiceLog).where(
-                DiceLog.user_id == user_id,
-                DiceLog.config_id == config.id,
-                func.date(DiceLog.created_at) == today,
-            )
-        ).scalar_one()
+        today_plays = get_daily_play_count(db, user_id, FeatureType.DICE, today)
         # Daily cap removed: use 0 to denote unlimited.
         unlimited = 0
         remaining = 0
@@ -77,16 +86,8 @@ class DiceService:
         config = self._get_today_config(db)
         token_type = GameTokenType.DICE_TOKEN
 
-        today_plays = db.execute(
-            select(func.count()).select_from(DiceLog).where(
-                DiceLog.user_id == user_id,
-                DiceLog.config_id == config.id,
-                func.date(DiceLog.created_at) == today,
-            )
-        ).scalar_one()
-
-        user_dice = [random.randint(1, 6), random.randint(1, 6)]
-        dealer_dice = [random.randint(1, 6), random.randint(1, 6)]
+        user_dice = [self.rng.randint(1, 6), self.rng.randint(1, 6)]
+        dealer_dice = [self.rng.randint(1, 6), self.rng.randint(1, 6)]
         user_sum = sum(user_dice)
         dealer_sum = sum(dealer_dice)
 
@@ -107,89 +108,97 @@ class DiceService:
             reward_type = config.lose_reward_type
             reward_amount = config.lose_reward_amount
 
-        _, consumed_trial = self.wallet_service.require_and_consume_token(
-            db,
-            user_id,
-            token_type,
-            amount=1,
-            reason="DICE_PLAY",
-            label=f"{config.name} - {outcome}",
-            meta={"result": outcome},
-        )
+        settings = get_settings()
+        with game_play_transaction(db):
+            _, consumed_trial = self.wallet_service.require_and_consume_token(
+                db,
+                user_id,
+                token_type,
+                amount=1,
+                reason="DICE_PLAY",
+                label=f"{config.name} - {outcome}",
+                meta={"result": outcome},
+                commit=False,
+            )
+            increment_daily_play_count(db, user_id, FeatureType.DICE, today)
 
-        log_entry = DiceLog(
-            user_id=user_id,
-            config_id=config.id,
-            user_dice_1=user_dice[0],
-            user_dice_2=user_dice[1],
-            user_sum=user_sum,
-            dealer_dice_1=dealer_dice[0],
-            dealer_dice_2=dealer_dice[1],
-            dealer_sum=dealer_sum,
-            result=outcome,
-            reward_type=reward_type,
-            reward_amount=reward_amount,
-        )
-        db.add(log_entry)
-        db.commit()
-        db.refresh(log_entry)
-
-        total_earn = 0
-        # Vault Phase 1: idempotent game accrual (safe-guarded by feature flag).
-        total_earn += self.vault_service.record_game_play_earn_event(
-            db,
-            user_id=user_id,
-            game_type=FeatureType.DICE.value,
-            game_log_id=log_entry.id,
-            token_type=token_type.value,
-            outcome=outcome,
-            payout_raw={
-                "result": outcome,
-                "reward_type": reward_type,
-                "reward_amount": reward_amount,
-            },
-        )
+            log_entry = DiceLog(
+                user_id=user_id,
+                config_id=config.id,
+                user_dice_1=user_dice[0],
+                user_dice_2=user_dice[1],
+                user_sum=user_sum,
+                dealer_dice_1=dealer_dice[0],
+                dealer_dice_2=dealer_dice[1],
+                dealer_sum=dealer_sum,
+                result=outcome,
+                reward_type=reward_type,
+                reward_amount=reward_amount,
+            )
+            db.add(log_entry)
+            db.flush()
 
-        # Trial: optionally route reward into Vault instead of direct payout.
-        settings = get_settings()
-        if consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False)):
-            total_earn += self.vault_service.record_trial_result_earn_event(
+            total_earn = 0
+            # Vault Phase 1: idempotent game accrual (safe-guarded by feature flag).
+            total_earn += self.vault_service.record_game_play_earn_event(
                 db,
                 user_id=user_id,
                 game_type=FeatureType.DICE.value,
                 game_log_id=log_entry.id,
                 token_type=token_type.value,
-                reward_type=reward_type,
-                reward_amount=reward_amount,
-                payout_raw={"result": outcome},
+                outcome=outcome,
+                payout_raw={
+                    "result": outcome,
+                    "reward_type": reward_type,
+                    "reward_amount": reward_amount,
+                },
+                commit=False,
             )
 
-        xp_award = self.WIN_GAME_XP if outcome == "WIN" else self.BASE_GAME_XP
-        ctx = GamePlayContext(user_id=user_id, feature_type=FeatureType.DICE.value, today=today)
-        log_game_play(
-            ctx,
-            db,
-            {
-                "result": outcome,
-                "reward_type": reward_type,
-                "reward_amount": reward_amount,
-                "reward_label": f"{config.name} - {outcome}",
-                "xp_from_reward": xp_award,
-            },
-        )
-
-        if not (consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False))):
-            self.reward_service.deliver(
+            # Trial: optionally route reward into Vault instead of direct payout.
+            trial_to_vault = consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False))
+            if trial_to_vault:
+                total_earn += self.vault_service.record_trial_result_earn_event(
+                    db,
+                    user_id=user_id,
+                    game_type=FeatureType.DICE.value,
+                    game_log_id=log_entry.id,
+                    token_type=token_type.value,
+                    reward_type=reward_type,
+                    reward_amount=reward_amount,
+                    payout_raw={"result": outcome},
+                    commit=False,
+                )
+
+            xp_award = self.WIN_GAME_XP if outcome == "WIN" else self.BASE_GAME_XP
+            ctx = GamePlayContext(user_id=user_id, feature_type=FeatureType.DICE.value, today=today)
+            log_game_play(
+                ctx,
                 db,
-                user_id=user_id,
-                reward_type=reward_type,
-                reward_amount=reward_amount,
-                meta={"reason": "dice_play", "outcome": outcome, "game_xp": xp_award},
+                {
+                    "result": outcome,
+                    "reward_type": reward_type,
+                    "reward_amount": reward_amount,
+                    "reward_label": f"{config.name} - {outcome}",
+                    "xp_from_reward": xp_award,
+                },
+                commit=False,
             )
-        if outcome == "WIN":
-            self.season_pass_service.maybe_add_internal_win_stamp(db, user_id=user_id, now=today)
+
+            if not trial_to_vault:
+                self.reward_service.deliver(
+                    db,
+                    user_id=user_id,
+                    reward_type=reward_type,
+                    reward_amount=reward_amount,
+                    meta={"reason": "dice_play", "outcome": outcome, "game_xp": xp_award},
+                    commit=False,
+                )
+            if outcome == "WIN":
+                apply_internal_win_stamp(ctx, db, self.season_pass_service, commit=False)
         # 게임 설정 포인트를 레벨 XP 보너스로 반영
         season_pass = None  # 게임 1회당 자동 스탬프 발급을 중단하고, 조건 달성 시 별도 로직으로 처리
+        metrics.GAME_PLAYS.inc(game=FeatureType.DICE.value, outcome=outcome)
 
         return DicePlayResponse(
             result="OK",
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.core.config import get_settings
 from app.core.exceptions import FeatureNotActiveError, InvalidConfigError, NoFeatureTodayError
 from app.models.feature import FeatureConfig, FeatureSchedule, FeatureType
+from app.services.config_cache import NS_FEATURE, FeatureConfigSnapshot, FeatureScheduleSnapshot, config_cache
 
 
 class FeatureService:
@@ -26,7 +27,15 @@ class FeatureService:
         else:
             # If a date is provided, treat it as already aligned to KST.
             today = now
-        rows = db.execute(select(FeatureSchedule).where(FeatureSchedule.date == today)).scalars().all()
+        rows = config_cache.get_or_load(
+            NS_FEATURE,
+            ("schedule", today),
+            lambda: tuple(
+                FeatureScheduleSnapshot.from_orm(row)
+                for row in db.execute(select(FeatureSchedule).where(FeatureSchedule.date == today)).scalars().all()
+            )
+            or None,
+        )
         if not rows:
             raise NoFeatureTodayError()
         if len(rows) > 1:
@@ -36,7 +45,14 @@ class FeatureService:
             raise FeatureNotActiveError("FEATURE_NOT_ACTIVE")
         return schedule.feature_type
 
-    def validate_feature_active(self, db: Session, now: date | datetime, expected_type: FeatureType) -> FeatureConfig:
+    def _get_feature_config(self, db: Session, feature_type: FeatureType) -> FeatureConfigSnapshot | None:
+        def load() -> FeatureConfigSnapshot | None:
+            row = db.execute(select(FeatureConfig).where(FeatureConfig.feature_type == feature_type)).scalar_one_or_none()
+            return FeatureConfigSnapshot.from_orm(row) if row else None
+
+        return config_cache.get_or_load(NS_FEATURE, ("config", feature_type), load)
+
+    def validate_feature_active(self, db: Session, now: date | datetime, expected_type: FeatureType) -> FeatureConfigSnapshot:
         """Validate that the requested feature is enabled.
 
         Today-feature 게이트는 기본 OFF이며, FEATURE_GATE_ENABLED=true일 때만 일정 검증을 수행한다.
@@ -48,7 +64,7 @@ class FeatureService:
             if today_feature != expected_type:
                 raise FeatureNotActiveError()
 
-        config = db.execute(select(FeatureConfig).where(FeatureConfig.feature_type == expected_type)).scalar_one_or_none()
+        config = self._get_feature_config(db, expected_type)
         if config is None:
             raise NoFeatureTodayError()
         if not config.is_enabled:
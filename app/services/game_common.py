@@ -1,14 +1,28 @@
-"""Common helpers for game services (logging, season-pass hooks)."""
+"""Common helpers for game services (logging, season-pass hooks, play transaction)."""
+from collections.abc import Iterator
+from contextlib import contextmanager
 from dataclasses import dataclass
-from datetime import date
+from datetime import date, datetime
 from typing import Any, Optional
 
+from sqlalchemy import select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
 from app.core.exceptions import DailyLimitReachedError
-from app.models.feature import UserEventLog
+from app.models.feature import FeatureType, UserEventLog
+from app.models.game_daily_count import UserGameDailyCount
 from app.services.season_pass_service import SeasonPassService
-from app.services.team_battle_service import TeamBattleService
+from app.services.side_effect_outbox_service import (
+    EFFECT_SEASON_PASS_INTERNAL_WIN,
+    EFFECT_SURVEY_GAME_RESULT,
+    EFFECT_TEAM_POINTS,
+    apply_team_battle_points,
+    async_side_effects_enabled,
+    enqueue_side_effect,
+)
+from app.services.survey_trigger_service import SurveyTriggerService
 
 @dataclass
 class GamePlayContext:
@@ -21,7 +35,29 @@ class GamePlayContext:
     metadata: Optional[dict[str, Any]] = None
 
 
-def log_game_play(ctx: GamePlayContext, db: Session, result_payload: dict[str, Any]) -> None:
+@contextmanager
+def game_play_transaction(db: Session) -> Iterator[Session]:
+    """Unit of work for a single game play.
+
+    Every write staged inside the block (token debit + ledger, game log, vault earn events,
+    user_event_log, team battle points, reward delivery) must be called with commit=False so
+    it is only flushed; the block commits exactly once on exit.
+
+    Rollback contract: if anything raises inside the block the whole play is rolled back
+    (no token consumed, no log written) and the exception is re-raised. Best-effort hooks that
+    swallow their own business errors (team battle, season pass) stay non-blocking, but a
+    database error raised by their flush still aborts the play.
+    """
+
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def log_game_play(ctx: GamePlayContext, db: Session, result_payload: dict[str, Any], commit: bool = True) -> None:
     """Persist shared event logging across games into user_event_log."""
 
     entry = UserEventLog(
@@ -31,10 +67,94 @@ def log_game_play(ctx: GamePlayContext, db: Session, result_payload: dict[str, A
         meta_json=result_payload,
     )
     db.add(entry)
-    db.commit()
+    if commit:
+        db.commit()
+    else:
+        db.flush()
+
+    if async_side_effects_enabled():
+        # Drained by the side-effect worker; the play only pays for two outbox inserts.
+        effect_payload = {
+            "feature_type": ctx.feature_type,
+            "result": result_payload.get("result"),
+            "reward_type": result_payload.get("reward_type"),
+            "reward_amount": result_payload.get("reward_amount"),
+            "played_at": datetime.utcnow().isoformat(),
+        }
+        enqueue_side_effect(db, ctx.user_id, EFFECT_TEAM_POINTS, effect_payload)
+        enqueue_side_effect(db, ctx.user_id, EFFECT_SURVEY_GAME_RESULT, effect_payload)
+        if commit:
+            db.commit()
+        return
 
     # Opportunistically award team battle points; failures are non-blocking by design.
-    _log_team_battle_points(ctx, db, result_payload)
+    _log_team_battle_points(ctx, db, result_payload, commit=commit)
+    _log_survey_game_result(ctx, db, result_payload, commit=commit)
+
+
+def apply_internal_win_stamp(ctx: GamePlayContext, db: Session, season_pass_service: SeasonPassService, commit: bool = True) -> None:
+    """Season pass INTERNAL_WIN_50 check after a win: queued to the outbox or applied inline."""
+
+    if async_side_effects_enabled():
+        enqueue_side_effect(
+            db,
+            ctx.user_id,
+            EFFECT_SEASON_PASS_INTERNAL_WIN,
+            {"feature_type": ctx.feature_type, "play_date": ctx.today.isoformat()},
+        )
+        if commit:
+            db.commit()
+        return
+    season_pass_service.maybe_add_internal_win_stamp(db, user_id=ctx.user_id, now=ctx.today, commit=commit)
+
+
+def get_daily_play_count(db: Session, user_id: int, feature_type: FeatureType, day: date) -> int:
+    """Today's play count for one game: a primary-key lookup on user_game_daily_count."""
+
+    count = db.execute(
+        select(UserGameDailyCount.play_count).where(
+            UserGameDailyCount.user_id == user_id,
+            UserGameDailyCount.feature_type == feature_type,
+            UserGameDailyCount.play_date == day,
+        )
+    ).scalar_one_or_none()
+    return int(count or 0)
+
+
+def increment_daily_play_count(db: Session, user_id: int, feature_type: FeatureType, day: date) -> None:
+    """Add one play to the user's daily counter (upsert); call inside game_play_transaction."""
+
+    values = {"user_id": user_id, "feature_type": feature_type, "play_date": day, "play_count": 1, "updated_at": datetime.utcnow()}
+    dialect = db.bind.dialect.name
+    if dialect == "mysql":
+        stmt = mysql_insert(UserGameDailyCount).values(**values)
+        stmt = stmt.on_duplicate_key_update(
+            play_count=UserGameDailyCount.play_count + 1,
+            updated_at=stmt.inserted.updated_at,
+        )
+        db.execute(stmt)
+        return
+    if dialect == "sqlite":
+        stmt = sqlite_insert(UserGameDailyCount).values(**values)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[UserGameDailyCount.user_id, UserGameDailyCount.feature_type, UserGameDailyCount.play_date],
+            set_={"play_count": UserGameDailyCount.play_count + 1, "updated_at": stmt.excluded.updated_at},
+        )
+        db.execute(stmt)
+        return
+
+    result = db.execute(
+        update(UserGameDailyCount)
+        .where(
+            UserGameDailyCount.user_id == user_id,
+            UserGameDailyCount.feature_type == feature_type,
+            UserGameDailyCount.play_date == day,
+        )
+        .values(play_count=UserGameDailyCount.play_count + 1, updated_at=values["updated_at"])
+    )
+    if result.rowcount == 0:
+        db.add(UserGameDailyCount(**values))
+        db.flush()
 
 
 def enforce_daily_limit(limit: int, played: int) -> None:
@@ -55,34 +175,27 @@ def apply_season_pass_stamp(ctx: GamePlayContext, db: Session, xp_bonus: int = 0
         return None
 
 
-def _log_team_battle_points(ctx: GamePlayContext, db: Session, result_payload: dict[str, Any]) -> None:
+def _log_team_battle_points(ctx: GamePlayContext, db: Session, result_payload: dict[str, Any], commit: bool = True) -> None:
     """Bridge game plays into team battle scoring without breaking core flow."""
 
-    svc = TeamBattleService()
     try:
-        member = svc.get_membership(db, ctx.user_id)
-        if not member:
-            return
+        apply_team_battle_points(db, ctx.user_id, {**result_payload, "feature_type": ctx.feature_type}, commit=commit)
+    except Exception:
+        # Team battle should never block the main game play path.
+        return
 
-        season = svc.get_active_season(db) or svc.ensure_current_season(db)
 
-        meta = {
-            "feature_type": ctx.feature_type,
-            "result": result_payload.get("result"),
-            "reward_type": result_payload.get("reward_type"),
-            "reward_amount": result_payload.get("reward_amount"),
-        }
+def _log_survey_game_result(ctx: GamePlayContext, db: Session, result_payload: dict[str, Any], commit: bool = True) -> None:
+    """Inline counterpart of the SURVEY_GAME_RESULT outbox effect."""
 
-        svc.add_points(
+    try:
+        SurveyTriggerService().handle_game_result(
             db,
-            team_id=member.team_id,
-            delta=svc.POINTS_PER_PLAY,
-            action="GAME_PLAY",
             user_id=ctx.user_id,
-            season_id=season.id,
-            meta=meta,
-            enforce_usage=False,
+            feature_type=ctx.feature_type,
+            result=str(result_payload.get("result") or ""),
+            commit=commit,
         )
     except Exception:
-        # Team battle should never block the main game play path.
+        # Survey triggers should never block the main game play path.
         return
@@ -1,15 +1,39 @@
 """Game wallet service for per-feature tokens."""
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import insert, select, tuple_, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.config import get_settings
 from app.core.exceptions import InvalidConfigError, NotEnoughTokensError
 from app.models.game_wallet import GameTokenType, UserGameWallet
 from app.models.game_wallet_ledger import UserGameWalletLedger
 from app.models.trial_token_bucket import TrialTokenBucket
+from app.models.user import User
+
+BULK_GRANT_CHUNK_SIZE = 1000
+
+
+@dataclass
+class BulkGrantRow:
+    """One requested grant and, after `bulk_grant`, its outcome."""
+
+    external_id: str
+    token_type: str
+    amount: int
+    user_id: int | None = None
+    balance: int | None = None
+    status: str = "PENDING"
+    error: str | None = None
 
 
 class GameWalletService:
-    def _get_or_create_wallet(self, db: Session, user_id: int, token_type: GameTokenType) -> UserGameWallet:
+    def _get_or_create_wallet(self, db: Session, user_id: int, token_type: GameTokenType, commit: bool = True) -> UserGameWallet:
         wallet = (
             db.query(UserGameWallet)
             .filter(UserGameWallet.user_id == user_id, UserGameWallet.token_type == token_type)
@@ -18,11 +42,14 @@ class GameWalletService:
         if wallet is None:
             wallet = UserGameWallet(user_id=user_id, token_type=token_type, balance=0)
             db.add(wallet)
-            db.commit()
-            db.refresh(wallet)
+            if commit:
+                db.commit()
+                db.refresh(wallet)
+            else:
+                db.flush()
         return wallet
 
-    def _log_ledger(self, db: Session, user_id: int, token_type: GameTokenType, delta: int, balance_after: int, reason: str | None = None, label: str | None = None, meta: dict | None = None) -> None:
+    def _log_ledger(self, db: Session, user_id: int, token_type: GameTokenType, delta: int, balance_after: int, reason: str | None = None, label: str | None = None, meta: dict | None = None, commit: bool = True) -> None:
         entry = UserGameWalletLedger(
             user_id=user_id,
             token_type=token_type,
@@ -33,13 +60,16 @@ class GameWalletService:
             meta_json=meta or {},
         )
         db.add(entry)
-        db.commit()
+        if commit:
+            db.commit()
+        else:
+            db.flush()
 
     def get_balance(self, db: Session, user_id: int, token_type: GameTokenType) -> int:
         wallet = self._get_or_create_wallet(db, user_id, token_type)
         return wallet.balance
 
-    def _get_or_create_trial_bucket(self, db: Session, user_id: int, token_type: GameTokenType) -> TrialTokenBucket:
+    def _get_or_create_trial_bucket(self, db: Session, user_id: int, token_type: GameTokenType, commit: bool = True) -> TrialTokenBucket:
         bucket = (
             db.query(TrialTokenBucket)
             .filter(TrialTokenBucket.user_id == user_id, TrialTokenBucket.token_type == token_type)
@@ -48,8 +78,11 @@ class GameWalletService:
         if bucket is None:
             bucket = TrialTokenBucket(user_id=user_id, token_type=token_type, balance=0)
             db.add(bucket)
-            db.commit()
-            db.refresh(bucket)
+            if commit:
+                db.commit()
+                db.refresh(bucket)
+            else:
+                db.flush()
         return bucket
 
     def mark_trial_grant(self, db: Session, user_id: int, token_type: GameTokenType, amount: int) -> int:
@@ -68,66 +101,251 @@ class GameWalletService:
         db.refresh(bucket)
         return int(bucket.balance)
 
-    def require_and_consume_token(self, db: Session, user_id: int, token_type: GameTokenType, amount: int = 1, reason: str | None = None, label: str | None = None, meta: dict | None = None) -> tuple[int, bool]:
+    def _apply_delta(self, db: Session, user_id: int, token_type: GameTokenType, delta: int) -> int | None:
+        """Atomically add `delta` to the wallet balance in a single UPDATE.
+
+        Debits carry a `balance >= amount` guard so concurrent taps can never overdraw.
+        Returns the balance after the update, or None when no row matched
+        (wallet missing, or not enough balance for a debit).
+        """
+
+        stmt = update(UserGameWallet).where(
+            UserGameWallet.user_id == user_id,
+            UserGameWallet.token_type == token_type,
+        )
+        if delta < 0:
+            stmt = stmt.where(UserGameWallet.balance >= -delta)
+        result = db.execute(
+            stmt.values(balance=UserGameWallet.balance + delta, updated_at=datetime.utcnow()).execution_options(
+                synchronize_session="evaluate"
+            )
+        )
+        if result.rowcount == 0:
+            return None
+        # The UPDATE holds the row lock until commit, so this read sees our own write.
+        return int(
+            db.execute(
+                select(UserGameWallet.balance).where(
+                    UserGameWallet.user_id == user_id,
+                    UserGameWallet.token_type == token_type,
+                )
+            ).scalar_one()
+        )
+
+    def _credit(self, db: Session, user_id: int, token_type: GameTokenType, amount: int) -> int:
+        balance_after = self._apply_delta(db, user_id, token_type, amount)
+        if balance_after is None:
+            self._get_or_create_wallet(db, user_id, token_type, commit=False)
+            balance_after = self._apply_delta(db, user_id, token_type, amount)
+        return int(balance_after or 0)
+
+    def _consume_trial(self, db: Session, user_id: int, token_type: GameTokenType, amount: int) -> bool:
+        """Decrement the trial bucket by up to `amount`; True when trial-origin tokens were consumed."""
+
+        base = update(TrialTokenBucket).where(
+            TrialTokenBucket.user_id == user_id,
+            TrialTokenBucket.token_type == token_type,
+        )
+        result = db.execute(
+            base.where(TrialTokenBucket.balance >= amount)
+            .values(balance=TrialTokenBucket.balance - amount)
+            .execution_options(synchronize_session="evaluate")
+        )
+        if result.rowcount:
+            return True
+        # Fewer trial tokens than consumed: the remaining trial tokens are all used up.
+        result = db.execute(
+            base.where(TrialTokenBucket.balance > 0).values(balance=0).execution_options(synchronize_session="evaluate")
+        )
+        return bool(result.rowcount)
+
+    def require_and_consume_token(self, db: Session, user_id: int, token_type: GameTokenType, amount: int = 1, reason: str | None = None, label: str | None = None, meta: dict | None = None, commit: bool = True) -> tuple[int, bool]:
+        """Debit tokens with a conditional UPDATE and write the ledger in the same transaction.
+
+        With commit=False the writes are only flushed so the caller can commit them together
+        with the rest of its unit of work.
+        """
         if amount <= 0:
             raise InvalidConfigError("INVALID_TOKEN_AMOUNT")
 
         settings = get_settings()
-        wallet = self._get_or_create_wallet(db, user_id, token_type)
+        balance_after = self._apply_delta(db, user_id, token_type, -amount)
 
         # In test mode, auto-top-up to avoid blocking tests/demos.
-        if settings.test_mode and wallet.balance < amount:
-            wallet.balance = max(wallet.balance, amount)
-            db.add(wallet)
-            db.commit()
-            db.refresh(wallet)
+        if balance_after is None and settings.test_mode:
+            self._get_or_create_wallet(db, user_id, token_type, commit=False)
+            db.execute(
+                update(UserGameWallet)
+                .where(
+                    UserGameWallet.user_id == user_id,
+                    UserGameWallet.token_type == token_type,
+                    UserGameWallet.balance < amount,
+                )
+                .values(balance=amount)
+                .execution_options(synchronize_session="evaluate")
+            )
+            balance_after = self._apply_delta(db, user_id, token_type, -amount)
 
-        if wallet.balance < amount:
+        if balance_after is None:
+            metrics.WALLET_DEBIT_FAILURES.inc(token_type=token_type.value)
             raise NotEnoughTokensError("NOT_ENOUGH_TOKENS")
 
         # Determine whether this consumption used any trial-origin tokens.
-        # We treat it as trial consumption if we can decrement from the trial bucket.
-        consumed_trial_count = 0
         try:
-            bucket = self._get_or_create_trial_bucket(db, user_id, token_type)
-            if bucket.balance > 0:
-                consumed_trial_count = min(int(bucket.balance), int(amount))
-                bucket.balance = max(int(bucket.balance) - consumed_trial_count, 0)
-                db.add(bucket)
+            consumed_trial = self._consume_trial(db, user_id, token_type, amount)
         except Exception:
             # Fail-open: consuming tokens must not be blocked by trial bookkeeping.
-            consumed_trial_count = 0
+            consumed_trial = False
 
-        wallet.balance -= amount
-        db.add(wallet)
-        db.commit()
-        db.refresh(wallet)
         ledger_meta = dict(meta or {})
-        ledger_meta["consumed_trial"] = bool(consumed_trial_count > 0)
-        self._log_ledger(db, user_id=user_id, token_type=token_type, delta=-amount, balance_after=wallet.balance, reason=reason or "CONSUME", label=label, meta=ledger_meta)
-        return wallet.balance, bool(consumed_trial_count > 0)
+        ledger_meta["consumed_trial"] = consumed_trial
+        self._log_ledger(db, user_id=user_id, token_type=token_type, delta=-amount, balance_after=balance_after, reason=reason or "CONSUME", label=label, meta=ledger_meta, commit=commit)
+        return balance_after, consumed_trial
 
-    def grant_tokens(self, db: Session, user_id: int, token_type: GameTokenType, amount: int, reason: str | None = None, label: str | None = None, meta: dict | None = None) -> int:
+    def grant_tokens(self, db: Session, user_id: int, token_type: GameTokenType, amount: int, reason: str | None = None, label: str | None = None, meta: dict | None = None, commit: bool = True) -> int:
         if amount <= 0:
             raise InvalidConfigError("INVALID_TOKEN_AMOUNT")
-        wallet = self._get_or_create_wallet(db, user_id, token_type)
-        wallet.balance += amount
-        db.add(wallet)
-        db.commit()
-        db.refresh(wallet)
-        self._log_ledger(db, user_id=user_id, token_type=token_type, delta=amount, balance_after=wallet.balance, reason=reason or "GRANT", label=label, meta=meta)
-        return wallet.balance
+        balance_after = self._credit(db, user_id, token_type, amount)
+        self._log_ledger(db, user_id=user_id, token_type=token_type, delta=amount, balance_after=balance_after, reason=reason or "GRANT", label=label, meta=meta, commit=commit)
+        return balance_after
+
+    def grant_many(self, db: Session, user_id: int, grants: Iterable[tuple[GameTokenType, int]], reason: str | None = None, label: str | None = None, meta: dict | None = None, commit: bool = True) -> dict[GameTokenType, int]:
+        """Credit several token types (e.g. BUNDLE rewards) with one ledger row each and a single commit.
 
-    def revoke_tokens(self, db: Session, user_id: int, token_type: GameTokenType, amount: int, reason: str | None = None, label: str | None = None, meta: dict | None = None) -> int:
+        Returns the balance after the grant per token type.
+        """
+        items = [(token_type, int(amount)) for token_type, amount in grants]
+        if any(amount <= 0 for _, amount in items):
+            raise InvalidConfigError("INVALID_TOKEN_AMOUNT")
+
+        balances: dict[GameTokenType, int] = {}
+        for token_type, amount in items:
+            balances[token_type] = self._credit(db, user_id, token_type, amount)
+            self._log_ledger(db, user_id=user_id, token_type=token_type, delta=amount, balance_after=balances[token_type], reason=reason or "GRANT", label=label, meta=meta, commit=False)
+        if commit:
+            db.commit()
+        return balances
+
+    def revoke_tokens(self, db: Session, user_id: int, token_type: GameTokenType, amount: int, reason: str | None = None, label: str | None = None, meta: dict | None = None, commit: bool = True) -> int:
         """Admin-only token revocation; prevents negative balance."""
         if amount <= 0:
             raise InvalidConfigError("INVALID_TOKEN_AMOUNT")
-        wallet = self._get_or_create_wallet(db, user_id, token_type)
-        if wallet.balance < amount:
+        balance_after = self._apply_delta(db, user_id, token_type, -amount)
+        if balance_after is None:
             raise NotEnoughTokensError("NOT_ENOUGH_TOKENS")
-        wallet.balance -= amount
-        db.add(wallet)
-        db.commit()
-        db.refresh(wallet)
-        self._log_ledger(db, user_id=user_id, token_type=token_type, delta=-amount, balance_after=wallet.balance, reason=reason or "REVOKE", label=label, meta=meta)
-        return wallet.balance
+        self._log_ledger(db, user_id=user_id, token_type=token_type, delta=-amount, balance_after=balance_after, reason=reason or "REVOKE", label=label, meta=meta, commit=commit)
+        return balance_after
+
+    def bulk_grant(self, db: Session, rows: Sequence[BulkGrantRow], reason: str | None = None, label: str | None = None, meta: dict | None = None, chunk_size: int = BULK_GRANT_CHUNK_SIZE) -> Sequence[BulkGrantRow]:
+        """Grant tokens to many users by external_id using set-based statements.
+
+        Per chunk: one user lookup, one wallet upsert, one balance read-back and one
+        executemany ledger insert, then a commit. Invalid rows (unknown user/token type,
+        non-positive amount) are marked ERROR and skipped; a failed chunk is rolled back
+        and all of its rows are marked ERROR. Rows are updated in place and returned.
+        """
+
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            try:
+                self._bulk_grant_chunk(db, chunk, reason=reason or "GRANT", label=label, meta=meta)
+                db.commit()
+            except Exception as exc:
+                db.rollback()
+                for row in chunk:
+                    if row.status == "PENDING":
+                        row.status, row.error, row.balance = "ERROR", type(exc).__name__, None
+                continue
+            for row in chunk:
+                if row.status == "PENDING":
+                    row.status = "OK"
+        return rows
+
+    def _bulk_grant_chunk(self, db: Session, chunk: Sequence[BulkGrantRow], reason: str, label: str | None, meta: dict | None) -> None:
+        external_ids = {row.external_id for row in chunk if row.external_id}
+        user_ids: dict[str, int] = {}
+        if external_ids:
+            user_ids = dict(db.execute(select(User.external_id, User.id).where(User.external_id.in_(external_ids))).all())
+
+        valid: list[tuple[BulkGrantRow, GameTokenType]] = []
+        for row in chunk:
+            row.user_id = user_ids.get(row.external_id)
+            if row.user_id is None:
+                row.status, row.error = "ERROR", "USER_NOT_FOUND"
+                continue
+            try:
+                token_type = GameTokenType(row.token_type)
+            except ValueError:
+                row.status, row.error = "ERROR", "INVALID_TOKEN_TYPE"
+                continue
+            if row.amount <= 0:
+                row.status, row.error = "ERROR", "INVALID_TOKEN_AMOUNT"
+                continue
+            valid.append((row, token_type))
+        if not valid:
+            return
+
+        # Several rows may target the same wallet; apply their sum in one upsert.
+        totals: dict[tuple[int, GameTokenType], int] = {}
+        for row, token_type in valid:
+            key = (row.user_id, token_type)
+            totals[key] = totals.get(key, 0) + row.amount
+        self._upsert_wallet_credits(db, totals)
+
+        balances = {
+            (user_id, token_type): balance
+            for user_id, token_type, balance in db.execute(
+                select(UserGameWallet.user_id, UserGameWallet.token_type, UserGameWallet.balance).where(
+                    tuple_(UserGameWallet.user_id, UserGameWallet.token_type).in_(list(totals))
+                )
+            ).all()
+        }
+
+        # Walk rows backwards so each ledger row records the balance right after its own credit.
+        running = dict(balances)
+        ledger_rows: list[dict] = []
+        for row, token_type in reversed(valid):
+            key = (row.user_id, token_type)
+            row.balance = running[key]
+            running[key] -= row.amount
+            ledger_rows.append(
+                {
+                    "user_id": row.user_id,
+                    "token_type": token_type,
+                    "delta": row.amount,
+                    "balance_after": row.balance,
+                    "reason": reason,
+                    "label": label,
+                    "meta_json": meta or {},
+                }
+            )
+        ledger_rows.reverse()
+        db.execute(insert(UserGameWalletLedger), ledger_rows)
+
+    def _upsert_wallet_credits(self, db: Session, totals: dict[tuple[int, GameTokenType], int]) -> None:
+        now = datetime.utcnow()
+        values = [
+            {"user_id": user_id, "token_type": token_type, "balance": amount, "updated_at": now}
+            for (user_id, token_type), amount in totals.items()
+        ]
+        dialect = db.bind.dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(UserGameWallet).values(values)
+            stmt = stmt.on_duplicate_key_update(
+                balance=UserGameWallet.balance + stmt.inserted.balance,
+                updated_at=stmt.inserted.updated_at,
+            )
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(UserGameWallet).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[UserGameWallet.user_id, UserGameWallet.token_type],
+                set_={
+                    "balance": UserGameWallet.balance + stmt.excluded.balance,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        else:
+            for (user_id, token_type), amount in totals.items():
+                self._credit(db, user_id, token_type, amount)
+            return
+        db.execute(stmt)
@@ -0,0 +1,78 @@
+"""HyperLogLog distinct-count sketch for integer ids (user ids).
+
+A sketch is 2**precision one-byte registers (2 KiB at the default precision 11, ~2.3%
+standard error). Sketches of disjoint time buckets merge by register-wise max, so the
+distinct count of any range of hourly buckets is answered without touching the raw logs.
+Small cardinalities fall back to linear counting and are effectively exact.
+
+Ids are mixed with splitmix64, so the byte layout is stable across processes and can be
+stored (`to_bytes` / `from_bytes`).
+"""
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+
+DEFAULT_PRECISION = 11
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value: int) -> int:
+    """splitmix64 finalizer: a well-spread 64-bit hash of an integer."""
+
+    z = (value + 0x9E3779B97F4A7C15) & _MASK64
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+class HyperLogLog:
+    """Mutable sketch; `estimate()` returns the approximate number of distinct ids added."""
+
+    __slots__ = ("precision", "registers")
+
+    def __init__(self, precision: int = DEFAULT_PRECISION, registers: bytes | bytearray | None = None) -> None:
+        if not 4 <= precision <= 16:
+            raise ValueError("precision must be between 4 and 16")
+        size = 1 << precision
+        if registers is not None and len(registers) != size:
+            raise ValueError("register count does not match precision")
+        self.precision = precision
+        self.registers = bytearray(registers) if registers is not None else bytearray(size)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "HyperLogLog":
+        return cls(precision=(len(data) - 1).bit_length(), registers=data)
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.registers)
+
+    def add(self, value: int) -> None:
+        h = _mix64(value)
+        tail_bits = 64 - self.precision
+        idx = h >> tail_bits
+        tail = h & ((1 << tail_bits) - 1)
+        rank = tail_bits - tail.bit_length() + 1
+        if rank > self.registers[idx]:
+            self.registers[idx] = rank
+
+    def update(self, values: Iterable[int]) -> "HyperLogLog":
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other: "HyperLogLog") -> "HyperLogLog":
+        if other.precision != self.precision:
+            raise ValueError("cannot merge sketches of different precision")
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def estimate(self) -> int:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return int(round(m * math.log(m / zeros)))
+        return int(round(raw))
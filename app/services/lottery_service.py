@@ -1,24 +1,38 @@
 """Lottery service implementing status and play flows."""
+from dataclasses import replace
 from datetime import date, datetime
 import random
-import time
 
-from sqlalchemy import func, select
-from sqlalchemy.exc import DBAPIError
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.config import get_settings
-from app.core.exceptions import InvalidConfigError, LockAcquisitionError
+from app.core.exceptions import InvalidConfigError
 from app.models.feature import FeatureType
 from app.models.game_wallet import GameTokenType
 from app.models.lottery import LotteryConfig, LotteryLog, LotteryPrize
 from app.schemas.lottery import LotteryPlayResponse, LotteryPrizeSchema, LotteryStatusResponse
+from app.services.config_cache import (
+    NS_LOTTERY,
+    LotteryConfigSnapshot,
+    LotteryPrizeSnapshot,
+    config_cache,
+)
 from app.services.feature_service import FeatureService
-from app.services.game_common import GamePlayContext, log_game_play
+from app.services.game_common import (
+    GamePlayContext,
+    apply_internal_win_stamp,
+    game_play_transaction,
+    get_daily_play_count,
+    increment_daily_play_count,
+    log_game_play,
+)
 from app.services.game_wallet_service import GameWalletService
 from app.services.reward_service import RewardService
 from app.services.season_pass_service import SeasonPassService
 from app.services.vault_service import VaultService
+from app.services.weighted_sampler import AliasSampler
 
 
 class LotteryService:
@@ -26,27 +40,48 @@ class LotteryService:
 
     BASE_GAME_XP = 5
 
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        # Injectable RNG so draws can be replayed with a seeded random.Random for audits.
+        self.rng = rng or random.Random()
         self.feature_service = FeatureService()
         self.reward_service = RewardService()
         self.wallet_service = GameWalletService()
         self.season_pass_service = SeasonPassService()
         self.vault_service = VaultService()
 
-    def _get_today_config(self, db: Session) -> LotteryConfig:
-        config = db.execute(select(LotteryConfig).where(LotteryConfig.is_active.is_(True))).scalar_one_or_none()
+    def _get_today_config(self, db: Session) -> LotteryConfigSnapshot:
+        def load() -> LotteryConfigSnapshot | None:
+            row = db.execute(select(LotteryConfig).where(LotteryConfig.is_active.is_(True))).scalar_one_or_none()
+            return LotteryConfigSnapshot.from_orm(row) if row else None
+
+        config = config_cache.get_or_load(NS_LOTTERY, "active", load)
         if config is None:
             raise InvalidConfigError("LOTTERY_CONFIG_MISSING")
         return config
 
-    def _eligible_prizes(self, db: Session, config_id: int, lock: bool = False) -> list[LotteryPrize]:
-        prizes_stmt = select(LotteryPrize).where(LotteryPrize.config_id == config_id, LotteryPrize.is_active.is_(True))
-        if lock and db.bind and db.bind.dialect.name != "sqlite":
-            prizes_stmt = prizes_stmt.with_for_update()
-        try:
-            prizes = db.execute(prizes_stmt).scalars().all()
-        except DBAPIError as exc:
-            raise LockAcquisitionError("LOTTERY_LOCK_FAILED") from exc
+    def _cached_prizes(self, db: Session, config_id: int) -> list[LotteryPrizeSnapshot]:
+        """Active prize definitions from cache with stock re-read for stock-limited prizes only."""
+
+        def load() -> tuple[LotteryPrizeSnapshot, ...] | None:
+            rows = db.execute(
+                select(LotteryPrize).where(LotteryPrize.config_id == config_id, LotteryPrize.is_active.is_(True))
+            ).scalars().all()
+            # Only cache prize tables that can ever be drawn from; stock is checked per request.
+            if any(row.weight < 0 for row in rows) or sum(row.weight for row in rows if row.weight > 0) <= 0:
+                raise InvalidConfigError("INVALID_LOTTERY_CONFIG")
+            return tuple(LotteryPrizeSnapshot.from_orm(row) for row in rows)
+
+        prizes = list(config_cache.get_or_load(NS_LOTTERY, ("prizes", config_id), load) or ())
+        limited_ids = [p.id for p in prizes if p.stock is not None]
+        if limited_ids:
+            stock_by_id = dict(
+                db.execute(select(LotteryPrize.id, LotteryPrize.stock).where(LotteryPrize.id.in_(limited_ids))).all()
+            )
+            prizes = [replace(p, stock=stock_by_id.get(p.id, 0)) if p.stock is not None else p for p in prizes]
+        return prizes
+
+    def _eligible_prizes(self, db: Session, config_id: int) -> list[LotteryPrizeSnapshot]:
+        prizes = self._cached_prizes(db, config_id)
         eligible = [p for p in prizes if (p.stock is None or p.stock > 0)]
         for prize in eligible:
             if prize.weight < 0:
@@ -56,6 +91,43 @@ class LotteryService:
             raise InvalidConfigError("INVALID_LOTTERY_CONFIG")
         return eligible
 
+    @staticmethod
+    def _sampler(config_id: int, prizes) -> AliasSampler[int]:
+        """Alias table over prize indexes, keyed by the eligible set so sold-out prizes rebuild it."""
+
+        key = ("sampler", config_id, tuple((prize.id, prize.weight) for prize in prizes))
+        return config_cache.get_or_load(
+            NS_LOTTERY, key, lambda: AliasSampler(range(len(prizes)), [max(prize.weight, 0) for prize in prizes])
+        )
+
+    def _draw_and_reserve(self, db: Session, config_id: int, prizes: list[LotteryPrizeSnapshot]) -> LotteryPrizeSnapshot:
+        """Draw a prize and reserve one unit of stock for stock-limited prizes.
+
+        Unlimited prizes never touch the prize table. A limited prize is reserved with a
+        conditional `UPDATE ... SET stock = stock - 1 WHERE stock > 0`, which only row-locks that
+        prize until the play commits. If no row matched, another play took the last unit: the
+        prize is dropped from the pool and the draw is repeated over the remaining prizes.
+        """
+
+        pool = list(prizes)
+        while pool:
+            chosen = pool[self._sampler(config_id, pool).sample(self.rng)]
+            if chosen.stock is None:
+                return chosen
+            result = db.execute(
+                update(LotteryPrize)
+                .where(LotteryPrize.id == chosen.id, LotteryPrize.stock > 0)
+                .values(stock=LotteryPrize.stock - 1)
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 1:
+                return chosen
+            metrics.LOTTERY_STOCK_REDRAWS.inc()
+            pool = [p for p in pool if p.id != chosen.id]
+            if sum(p.weight for p in pool if p.weight > 0) <= 0:
+                break
+        raise InvalidConfigError("INVALID_LOTTERY_CONFIG")
+
     def get_status(self, db: Session, user_id: int, today: date) -> LotteryStatusResponse:
         self.feature_service.validate_feature_active(db, today, FeatureType.LOTTERY)
         config = self._get_today_config(db)
@@ -63,13 +135,7 @@ class LotteryService:
         token_balance = self.wallet_service.get_balance(db, user_id, token_type)
         prizes = self._eligible_prizes(db, config.id)
 
-        today_tickets = db.execute(
-            select(func.count()).select_from(LotteryLog).where(
-                LotteryLog.user_id == user_id,
-                LotteryLog.config_id == config.id,
-                func.date(LotteryLog.created_at) == today,
-            )
-        ).scalar_one()
+        today_tickets = get_daily_play_count(db, user_id, FeatureType.LOTTERY, today)
         # Daily cap removed: use 0 to denote unlimited.
         unlimited = 0
         remaining = 0
@@ -91,109 +157,94 @@ class LotteryService:
         self.feature_service.validate_feature_active(db, today, FeatureType.LOTTERY)
         config = self._get_today_config(db)
         token_type = GameTokenType.LOTTERY_TICKET
-        prizes = None
-        for attempt in range(3):
-            try:
-                prizes = self._eligible_prizes(db, config.id, lock=True)
-                break
-            except LockAcquisitionError:
-                if attempt == 2:
-                    raise
-                time.sleep(0.05)
-        assert prizes is not None
-
-        today_tickets = db.execute(
-            select(func.count()).select_from(LotteryLog).where(
-                LotteryLog.user_id == user_id,
-                LotteryLog.config_id == config.id,
-                func.date(LotteryLog.created_at) == today,
-            )
-        ).scalar_one()
-
-        weighted_pool: list[LotteryPrize] = []
-        for prize in prizes:
-            weighted_pool.extend([prize] * max(prize.weight, 0))
-        chosen = random.choice(weighted_pool)
-
-        _, consumed_trial = self.wallet_service.require_and_consume_token(
-            db,
-            user_id,
-            token_type,
-            amount=1,
-            reason="LOTTERY_PLAY",
-            label=chosen.label,
-            meta={"prize_id": chosen.id},
-        )
+        prizes = self._eligible_prizes(db, config.id)
 
-        if chosen.stock is not None:
-            chosen.stock -= 1
-            db.add(chosen)
+        settings = get_settings()
+        with game_play_transaction(db):
+            # Stock reservation happens inside the play transaction so a failed play releases it.
+            chosen = self._draw_and_reserve(db, config.id, prizes)
 
-        log_entry = LotteryLog(
-            user_id=user_id,
-            config_id=config.id,
-            prize_id=chosen.id,
-            reward_type=chosen.reward_type,
-            reward_amount=chosen.reward_amount,
-        )
-        db.add(log_entry)
-        db.commit()
-        db.refresh(log_entry)
-
-        # Vault Phase 1: idempotent game accrual (safe-guarded by feature flag).
-        self.vault_service.record_game_play_earn_event(
-            db,
-            user_id=user_id,
-            game_type=FeatureType.LOTTERY.value,
-            game_log_id=log_entry.id,
-            token_type=token_type.value,
-            outcome=None,
-            payout_raw={
-                "prize_id": chosen.id,
-                "reward_type": chosen.reward_type,
-                "reward_amount": chosen.reward_amount,
-            },
-        )
+            _, consumed_trial = self.wallet_service.require_and_consume_token(
+                db,
+                user_id,
+                token_type,
+                amount=1,
+                reason="LOTTERY_PLAY",
+                label=chosen.label,
+                meta={"prize_id": chosen.id},
+                commit=False,
+            )
+            increment_daily_play_count(db, user_id, FeatureType.LOTTERY, today)
 
-        # Trial: optionally route reward into Vault instead of direct payout.
-        settings = get_settings()
-        if consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False)):
-            self.vault_service.record_trial_result_earn_event(
+            log_entry = LotteryLog(
+                user_id=user_id,
+                config_id=config.id,
+                prize_id=chosen.id,
+                reward_type=chosen.reward_type,
+                reward_amount=chosen.reward_amount,
+            )
+            db.add(log_entry)
+            db.flush()
+
+            # Vault Phase 1: idempotent game accrual (safe-guarded by feature flag).
+            self.vault_service.record_game_play_earn_event(
                 db,
                 user_id=user_id,
                 game_type=FeatureType.LOTTERY.value,
                 game_log_id=log_entry.id,
                 token_type=token_type.value,
-                reward_type=chosen.reward_type,
-                reward_amount=chosen.reward_amount,
-                payout_raw={"prize_id": chosen.id},
+                outcome=None,
+                payout_raw={
+                    "prize_id": chosen.id,
+                    "reward_type": chosen.reward_type,
+                    "reward_amount": chosen.reward_amount,
+                },
+                commit=False,
             )
 
-        xp_award = self.BASE_GAME_XP
-        ctx = GamePlayContext(user_id=user_id, feature_type=FeatureType.LOTTERY.value, today=today)
-        log_game_play(
-            ctx,
-            db,
-            {
-                "prize_id": chosen.id,
-                "reward_type": chosen.reward_type,
-                "reward_amount": chosen.reward_amount,
-                "label": chosen.label,
-                "xp_from_reward": xp_award,
-            },
-        )
-
-        if not (consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False))):
-            self.reward_service.deliver(
+            # Trial: optionally route reward into Vault instead of direct payout.
+            trial_to_vault = consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False))
+            if trial_to_vault:
+                self.vault_service.record_trial_result_earn_event(
+                    db,
+                    user_id=user_id,
+                    game_type=FeatureType.LOTTERY.value,
+                    game_log_id=log_entry.id,
+                    token_type=token_type.value,
+                    reward_type=chosen.reward_type,
+                    reward_amount=chosen.reward_amount,
+                    payout_raw={"prize_id": chosen.id},
+                    commit=False,
+                )
+
+            xp_award = self.BASE_GAME_XP
+            ctx = GamePlayContext(user_id=user_id, feature_type=FeatureType.LOTTERY.value, today=today)
+            log_game_play(
+                ctx,
                 db,
-                user_id=user_id,
-                reward_type=chosen.reward_type,
-                reward_amount=chosen.reward_amount,
-                meta={"reason": "lottery_play", "prize_id": chosen.id, "game_xp": xp_award},
+                {
+                    "prize_id": chosen.id,
+                    "reward_type": chosen.reward_type,
+                    "reward_amount": chosen.reward_amount,
+                    "label": chosen.label,
+                    "xp_from_reward": xp_award,
+                },
+                commit=False,
             )
-        if chosen.reward_amount > 0:
-            self.season_pass_service.maybe_add_internal_win_stamp(db, user_id=user_id, now=today)
+
+            if not trial_to_vault:
+                self.reward_service.deliver(
+                    db,
+                    user_id=user_id,
+                    reward_type=chosen.reward_type,
+                    reward_amount=chosen.reward_amount,
+                    meta={"reason": "lottery_play", "prize_id": chosen.id, "game_xp": xp_award},
+                    commit=False,
+                )
+            if chosen.reward_amount > 0:
+                apply_internal_win_stamp(ctx, db, self.season_pass_service, commit=False)
         season_pass = None  # 게임 1회당 자동 스탬프 발급 제거
+        metrics.GAME_PLAYS.inc(game=FeatureType.LOTTERY.value, outcome=chosen.reward_type)
 
         return LotteryPlayResponse(
             result="OK",
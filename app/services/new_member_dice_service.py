@@ -88,7 +88,7 @@ class NewMemberDiceService:
                 base_target = max(prev_locked, 10_000)
                 base_delta = max(base_target - prev_locked, 0)
 
-                multiplier = VaultService.vault_accrual_multiplier(now_dt)
+                multiplier = VaultService.vault_accrual_multiplier(db, now_dt)
                 awarded_delta = max(int(round(base_delta * multiplier)), base_delta)
                 next_locked = prev_locked + awarded_delta
                 if next_locked < base_target:
@@ -1,15 +1,19 @@
 """Ranking service for daily leaderboard lookup."""
+import time
 from datetime import date, datetime
 
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select
 from sqlalchemy.orm import Session
 
-from app.models.external_ranking import ExternalRankingData
+from app.models.external_ranking import ExternalRankingData, ExternalRankingSnapshot
 from app.models.user import User
 from app.models.feature import FeatureType
 from app.schemas.ranking import ExternalRankingEntry, RankingTodayResponse
+from app.services.config_cache import NS_RANKING, config_cache, invalidate_ranking_pages
 from app.services.feature_service import FeatureService
 
+SNAPSHOT_INSERT_CHUNK_SIZE = 1000
+
 
 class RankingService:
     """Provide today's ranking list and the caller's position."""
@@ -17,12 +21,25 @@ class RankingService:
     def __init__(self) -> None:
         self.feature_service = FeatureService()
 
-    def get_today_ranking(self, db: Session, user_id: int, now: date | datetime, top_n: int = 10) -> RankingTodayResponse:
-        today = now.date() if isinstance(now, datetime) else now
-        self.feature_service.validate_feature_active(db, today, FeatureType.RANKING)
+    @staticmethod
+    def rebuild_external_snapshot(db: Session, commit: bool = True) -> int:
+        """Recompute external_ranking_snapshot from external_ranking_data; returns the row count.
 
-        external_rows = db.execute(
-            select(ExternalRankingData, User.nickname, User.external_id)
+        Called after every admin write to external ranking data, so reads never sort the full table.
+        """
+
+        built_at = datetime.utcnow()
+        previous = RankingService.get_snapshot_version(db) or 0
+        version = max(previous + 1, time.time_ns() // 1000)
+        rows = db.execute(
+            select(
+                ExternalRankingData.user_id,
+                ExternalRankingData.deposit_amount,
+                ExternalRankingData.play_count,
+                ExternalRankingData.memo,
+                User.nickname,
+                User.external_id,
+            )
             .join(User, User.id == ExternalRankingData.user_id, isouter=True)
             .order_by(
                 ExternalRankingData.deposit_amount.desc(),
@@ -30,28 +47,131 @@ class RankingService:
                 ExternalRankingData.user_id.asc(),
             )
         ).all()
-        external_entries = []
-        for idx, row in enumerate(external_rows):
-            display_name = row.nickname or row.external_id or ""
-            if not display_name:
-                display_name = "닉네임 없음"
-            external_entries.append(
-                ExternalRankingEntry(
-                    rank=idx + 1,
-                    user_id=row.ExternalRankingData.user_id,
-                    user_name=display_name,
-                    deposit_amount=row.ExternalRankingData.deposit_amount,
-                    play_count=row.ExternalRankingData.play_count,
-                    memo=row.ExternalRankingData.memo,
+
+        db.execute(delete(ExternalRankingSnapshot))
+        snapshot_rows = [
+            {
+                "rank": idx + 1,
+                "user_id": row.user_id,
+                "user_name": row.nickname or row.external_id or "닉네임 없음",
+                "deposit_amount": row.deposit_amount,
+                "play_count": row.play_count,
+                "memo": row.memo,
+                "version": version,
+                "built_at": built_at,
+            }
+            for idx, row in enumerate(rows)
+        ]
+        for start in range(0, len(snapshot_rows), SNAPSHOT_INSERT_CHUNK_SIZE):
+            db.execute(insert(ExternalRankingSnapshot), snapshot_rows[start : start + SNAPSHOT_INSERT_CHUNK_SIZE])
+
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        # Pages of earlier versions can never be served again.
+        invalidate_ranking_pages()
+        return len(snapshot_rows)
+
+    @staticmethod
+    def get_snapshot_version(db: Session) -> int | None:
+        """Return the version of the current leaderboard snapshot (None when empty)."""
+
+        return db.execute(select(ExternalRankingSnapshot.version).where(ExternalRankingSnapshot.rank == 1)).scalar()
+
+    def _snapshot_version(self, db: Session, today: date, feature_checked: bool = False) -> int | None:
+        """Return the snapshot version, building (and committing) the snapshot if data exists without one."""
+
+        if not feature_checked:
+            self.feature_service.validate_feature_active(db, today, FeatureType.RANKING)
+        version = self.get_snapshot_version(db)
+        if version is None and db.execute(select(ExternalRankingData.id).limit(1)).first():
+            # Data written before the snapshot existed (or by hand); build it once.
+            self.rebuild_external_snapshot(db)
+            version = self.get_snapshot_version(db)
+        return version
+
+    def get_today_etag(self, db: Session, user_id: int, now: date | datetime, top_n: int = 10, offset: int = 0) -> str | None:
+        """Return the ETag of the response get_today_ranking would build (None when there is no data).
+
+        Side effect: when external ranking rows exist but no snapshot was ever built (rows written
+        before the snapshot table or by hand), the snapshot is rebuilt and committed here, once.
+        """
+
+        today = now.date() if isinstance(now, datetime) else now
+        version = self._snapshot_version(db, today)
+        if version is None:
+            return None
+        return f'W/"{version}:{today.isoformat()}:{user_id}:{offset}:{top_n}"'
+
+    def get_today_ranking(
+        self,
+        db: Session,
+        user_id: int,
+        now: date | datetime,
+        top_n: int = 10,
+        offset: int = 0,
+        feature_checked: bool = False,
+    ) -> RankingTodayResponse:
+        """Return one page of the external leaderboard plus the caller's own entry.
+
+        feature_checked=True skips the RANKING feature check when the caller (the ETag path)
+        has already done it for this request.
+        """
+
+        today = now.date() if isinstance(now, datetime) else now
+        version = self._snapshot_version(db, today, feature_checked=feature_checked)
+
+        def load_total() -> int:
+            return (
+                db.execute(
+                    select(ExternalRankingSnapshot.rank).order_by(ExternalRankingSnapshot.rank.desc()).limit(1)
+                ).scalar()
+                or 0
+            )
+
+        def load_page() -> tuple[ExternalRankingEntry, ...] | None:
+            rows = (
+                db.execute(
+                    select(ExternalRankingSnapshot)
+                    .where(ExternalRankingSnapshot.rank > offset, ExternalRankingSnapshot.rank <= offset + top_n)
+                    .order_by(ExternalRankingSnapshot.rank)
                 )
+                .scalars()
+                .all()
             )
-        my_external_entry = next((entry for entry in external_entries if entry.user_id == user_id), None)
+            # Empty pages are not cached.
+            return tuple(self._to_entry(row) for row in rows) or None
+
+        page: tuple[ExternalRankingEntry, ...] = ()
+        total = 0
+        if version is not None:
+            # Pages are immutable per snapshot build, so the version is part of the key.
+            total = config_cache.get_or_load(NS_RANKING, (version, "total"), load_total) or 0
+            if offset < total:
+                page = config_cache.get_or_load(NS_RANKING, (version, offset, top_n), load_page) or ()
+
+        mine = db.execute(
+            select(ExternalRankingSnapshot).where(ExternalRankingSnapshot.user_id == user_id)
+        ).scalar_one_or_none()
 
         return RankingTodayResponse(
             date=today,
             entries=[],
             my_entry=None,
-            external_entries=external_entries,
-            my_external_entry=my_external_entry,
+            external_entries=list(page),
+            my_external_entry=self._to_entry(mine) if mine else None,
+            external_total=total,
             feature_type=FeatureType.RANKING,
         )
+
+    @staticmethod
+    def _to_entry(row: ExternalRankingSnapshot) -> ExternalRankingEntry:
+        return ExternalRankingEntry(
+            rank=row.rank,
+            user_id=row.user_id,
+            user_name=row.user_name,
+            deposit_amount=row.deposit_amount,
+            play_count=row.play_count,
+            memo=row.memo,
+        )
@@ -45,8 +45,11 @@ class RewardService:
         if user is None and db.bind and db.bind.dialect.name == "sqlite":
             user = User(id=user_id, external_id=f"test-user-{user_id}")
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            if commit:
+                db.commit()
+                db.refresh(user)
+            else:
+                db.flush()
 
         if user is None:
             raise InvalidConfigError("USER_NOT_FOUND")
@@ -76,7 +79,15 @@ class RewardService:
         # TODO: Integrate with coupon provider.
         _ = (db, user_id, coupon_type, meta)
 
-    def grant_ticket(self, db: Session, user_id: int, token_type: GameTokenType, amount: int, meta: dict[str, Any] | None = None) -> None:
+    def grant_ticket(
+        self,
+        db: Session,
+        user_id: int,
+        token_type: GameTokenType,
+        amount: int,
+        meta: dict[str, Any] | None = None,
+        commit: bool = True,
+    ) -> None:
         """Grant game tickets (roulette/dice/lottery) to the user wallet."""
 
         self.wallet_service.grant_tokens(
@@ -87,10 +98,22 @@ class RewardService:
             reason=(meta or {}).get("reason") or "LEVEL_REWARD",
             label=(meta or {}).get("label") or "AUTO_GRANT",
             meta=meta,
+            commit=commit,
         )
 
-    def deliver(self, db: Session, user_id: int, reward_type: str, reward_amount: int, meta: dict[str, Any] | None = None) -> None:
-        """Dispatch reward based on reward_type; no-op for NONE/zero."""
+    def deliver(
+        self,
+        db: Session,
+        user_id: int,
+        reward_type: str,
+        reward_amount: int,
+        meta: dict[str, Any] | None = None,
+        commit: bool = True,
+    ) -> None:
+        """Dispatch reward based on reward_type; no-op for NONE/zero.
+
+        With commit=False every write is only flushed and the caller owns the commit.
+        """
 
         if reward_amount == 0 or reward_type in {"NONE", "", None}:
             return
@@ -112,10 +135,10 @@ class RewardService:
                 if season_pass:
                     bonus_xp = (meta or {}).get("game_xp") or 0
                     total_xp = reward_amount + bonus_xp
-                    season_pass.add_bonus_xp(db, user_id=user_id, xp_amount=total_xp)
+                    season_pass.add_bonus_xp(db, user_id=user_id, xp_amount=total_xp, commit=commit)
             else:
                 # 어드민 수동 지급 등 게임 외 사유일 때만 현찰로 지급
-                self.grant_point(db, user_id=user_id, amount=reward_amount, reason=reason)
+                self.grant_point(db, user_id=user_id, amount=reward_amount, reason=reason, commit=commit)
             return
 
         if reward_type == "BUNDLE":
@@ -137,8 +160,16 @@ class RewardService:
                     (GameTokenType.DICE_TOKEN, 10),
                 ]
             
-            for token_type, amount in bundle_items:
-                self.grant_ticket(db, user_id=user_id, token_type=token_type, amount=amount, meta=meta)
+            if bundle_items:
+                self.wallet_service.grant_many(
+                    db,
+                    user_id=user_id,
+                    grants=bundle_items,
+                    reason=(meta or {}).get("reason") or "LEVEL_REWARD",
+                    label=(meta or {}).get("label") or "AUTO_GRANT",
+                    meta=meta,
+                    commit=commit,
+                )
             return
 
         if reward_type == "COUPON":
@@ -154,7 +185,7 @@ class RewardService:
         }
         if reward_type in ticket_map:
             token_type = ticket_map[reward_type]
-            self.grant_ticket(db, user_id=user_id, token_type=token_type, amount=reward_amount, meta=meta)
+            self.grant_ticket(db, user_id=user_id, token_type=token_type, amount=reward_amount, meta=meta, commit=commit)
             return
 
         # Unknown reward types are ignored but should be monitored.
@@ -1,24 +1,38 @@
 """Roulette service implementing status and play flows."""
 from datetime import date, datetime
 import random
-import time
 
-from sqlalchemy import func, select
-from sqlalchemy.exc import DBAPIError
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.config import get_settings
-from app.core.exceptions import InvalidConfigError, LockAcquisitionError
+from app.core.exceptions import InvalidConfigError
 from app.models.feature import FeatureType
 from app.models.game_wallet import GameTokenType
 from app.models.roulette import RouletteConfig, RouletteLog, RouletteSegment
 from app.schemas.roulette import RoulettePlayResponse, RouletteStatusResponse
+from app.services.config_cache import (
+    NS_ROULETTE,
+    RouletteConfigSnapshot,
+    RouletteSegmentSnapshot,
+    config_cache,
+    invalidate_roulette_config,
+)
 from app.services.feature_service import FeatureService
-from app.services.game_common import GamePlayContext, log_game_play
+from app.services.game_common import (
+    GamePlayContext,
+    apply_internal_win_stamp,
+    game_play_transaction,
+    get_daily_play_count,
+    increment_daily_play_count,
+    log_game_play,
+)
 from app.services.game_wallet_service import GameWalletService
 from app.services.reward_service import RewardService
 from app.services.season_pass_service import SeasonPassService
 from app.services.vault_service import VaultService
+from app.services.weighted_sampler import AliasSampler
 
 
 class RouletteService:
@@ -26,7 +40,9 @@ class RouletteService:
 
     BASE_GAME_XP = 5
 
-    def __init__(self) -> None:
+    def __init__(self, rng: random.Random | None = None) -> None:
+        # Injectable RNG so draws can be replayed with a seeded random.Random for audits.
+        self.rng = rng or random.Random()
         self.feature_service = FeatureService()
         self.reward_service = RewardService()
         self.wallet_service = GameWalletService()
@@ -48,6 +64,7 @@ class RouletteService:
         db.query(RouletteSegment).filter(RouletteSegment.config_id == config_id).delete()
         db.add_all([RouletteSegment(config_id=config_id, **segment) for segment in default_segments])
         db.commit()
+        invalidate_roulette_config()
         return db.execute(select(RouletteSegment).where(RouletteSegment.config_id == config_id).order_by(RouletteSegment.slot_index)).scalars().all()
 
     def _seed_default_config(self, db: Session) -> RouletteConfig:
@@ -60,26 +77,25 @@ class RouletteService:
         db.refresh(config)
         return config
 
-    def _get_today_config(self, db: Session) -> RouletteConfig:
-        config = db.execute(select(RouletteConfig).where(RouletteConfig.is_active.is_(True))).scalar_one_or_none()
+    def _get_today_config(self, db: Session) -> RouletteConfigSnapshot:
+        def load() -> RouletteConfigSnapshot | None:
+            row = db.execute(select(RouletteConfig).where(RouletteConfig.is_active.is_(True))).scalar_one_or_none()
+            return RouletteConfigSnapshot.from_orm(row) if row else None
+
+        config = config_cache.get_or_load(NS_ROULETTE, "active", load)
         if config is None:
             settings = get_settings()
             if settings.test_mode:
-                return self._seed_default_config(db)
+                return RouletteConfigSnapshot.from_orm(self._seed_default_config(db))
             raise InvalidConfigError("ROULETTE_CONFIG_MISSING")
         return config
 
-    def _get_segments(self, db: Session, config_id: int, lock: bool = False) -> list[RouletteSegment]:
-        settings = get_settings()
+    def _load_segments(self, db: Session, config_id: int) -> list[RouletteSegment]:
         stmt = select(RouletteSegment).where(RouletteSegment.config_id == config_id).order_by(RouletteSegment.slot_index)
-        if lock and db.bind and db.bind.dialect.name != "sqlite":
-            stmt = stmt.with_for_update()
-        try:
-            segments = db.execute(stmt).scalars().all()
-        except DBAPIError as exc:
-            raise LockAcquisitionError("ROULETTE_LOCK_FAILED") from exc
-        if len(segments) == 0 and settings.test_mode:
-            return self._seed_default_segments(db, config_id)
+        return db.execute(stmt).scalars().all()
+
+    @staticmethod
+    def _validate_segments(segments) -> None:
         if len(segments) != 6:
             raise InvalidConfigError("INVALID_ROULETTE_CONFIG")
         for segment in segments:
@@ -88,8 +104,34 @@ class RouletteService:
         total_weight = sum(segment.weight for segment in segments if segment.weight > 0)
         if total_weight <= 0:
             raise InvalidConfigError("INVALID_ROULETTE_CONFIG")
+
+    def _get_segments(self, db: Session, config_id: int) -> list[RouletteSegment | RouletteSegmentSnapshot]:
+        # Segments have no stock, so plays never need to lock them; reads come from the config cache.
+        settings = get_settings()
+
+        def load() -> tuple[RouletteSegmentSnapshot, ...] | None:
+            rows = self._load_segments(db, config_id)
+            if not rows:
+                return None
+            # Only validated segment sets are cached; a broken config keeps hitting the DB until fixed.
+            self._validate_segments(rows)
+            return tuple(RouletteSegmentSnapshot.from_orm(row) for row in rows)
+
+        segments = list(config_cache.get_or_load(NS_ROULETTE, ("segments", config_id), load) or ())
+        if len(segments) == 0 and settings.test_mode:
+            return self._seed_default_segments(db, config_id)
+        self._validate_segments(segments)
         return segments
 
+    @staticmethod
+    def _sampler(config_id: int, segments) -> AliasSampler[int]:
+        """Alias table over segment indexes, built once per (config version, weights)."""
+
+        key = ("sampler", config_id, tuple((seg.id, seg.weight) for seg in segments))
+        return config_cache.get_or_load(
+            NS_ROULETTE, key, lambda: AliasSampler(range(len(segments)), [max(seg.weight, 0) for seg in segments])
+        )
+
     def get_status(self, db: Session, user_id: int, today: date) -> RouletteStatusResponse:
         self.feature_service.validate_feature_active(db, today, FeatureType.ROULETTE)
         config = self._get_today_config(db)
@@ -97,13 +139,7 @@ class RouletteService:
         token_balance = self.wallet_service.get_balance(db, user_id, token_type)
         segments = self._get_segments(db, config.id)
 
-        today_spins = db.execute(
-            select(func.count()).select_from(RouletteLog).where(
-                RouletteLog.user_id == user_id,
-                RouletteLog.config_id == config.id,
-                func.date(RouletteLog.created_at) == today,
-            )
-        ).scalar_one()
+        today_spins = get_daily_play_count(db, user_id, FeatureType.ROULETTE, today)
         # Daily cap removed: use 0 to denote unlimited.
         unlimited = 0
         remaining = 0
@@ -125,106 +161,94 @@ class RouletteService:
         self.feature_service.validate_feature_active(db, today, FeatureType.ROULETTE)
         config = self._get_today_config(db)
         token_type = GameTokenType.ROULETTE_COIN
-        segments = None
-        for attempt in range(3):
-            try:
-                segments = self._get_segments(db, config.id, lock=True)
-                break
-            except LockAcquisitionError:
-                if attempt == 2:
-                    raise
-                time.sleep(0.05)
-        assert segments is not None
-
-        today_spins = db.execute(
-            select(func.count()).select_from(RouletteLog).where(
-                RouletteLog.user_id == user_id,
-                RouletteLog.config_id == config.id,
-                func.date(RouletteLog.created_at) == today,
-            )
-        ).scalar_one()
-
-        weighted_segments = []
-        for seg in segments:
-            weighted_segments.extend([seg] * max(seg.weight, 0))
-        chosen = random.choice(weighted_segments)
-
-        _, consumed_trial = self.wallet_service.require_and_consume_token(
-            db,
-            user_id,
-            token_type,
-            amount=1,
-            reason="ROULETTE_PLAY",
-            label=chosen.label,
-            meta={"segment_id": getattr(chosen, "id", None)},
-        )
+        segments = self._get_segments(db, config.id)
 
-        log_entry = RouletteLog(
-            user_id=user_id,
-            config_id=config.id,
-            segment_id=chosen.id,
-            reward_type=chosen.reward_type,
-            reward_amount=chosen.reward_amount,
-        )
-        db.add(log_entry)
-        db.commit()
-        db.refresh(log_entry)
-
-        total_earn = 0
-        # Vault Phase 1: idempotent game accrual (safe-guarded by feature flag).
-        total_earn += self.vault_service.record_game_play_earn_event(
-            db,
-            user_id=user_id,
-            game_type=FeatureType.ROULETTE.value,
-            game_log_id=log_entry.id,
-            token_type=token_type.value,
-            outcome=None,
-            payout_raw={
-                "segment_id": chosen.id,
-                "reward_type": chosen.reward_type,
-                "reward_amount": chosen.reward_amount,
-            },
-        )
+        chosen = segments[self._sampler(config.id, segments).sample(self.rng)]
 
         settings = get_settings()
-        if consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False)):
-            total_earn += self.vault_service.record_trial_result_earn_event(
+        with game_play_transaction(db):
+            _, consumed_trial = self.wallet_service.require_and_consume_token(
+                db,
+                user_id,
+                token_type,
+                amount=1,
+                reason="ROULETTE_PLAY",
+                label=chosen.label,
+                meta={"segment_id": getattr(chosen, "id", None)},
+                commit=False,
+            )
+            increment_daily_play_count(db, user_id, FeatureType.ROULETTE, today)
+
+            log_entry = RouletteLog(
+                user_id=user_id,
+                config_id=config.id,
+                segment_id=chosen.id,
+                reward_type=chosen.reward_type,
+                reward_amount=chosen.reward_amount,
+            )
+            db.add(log_entry)
+            db.flush()
+
+            total_earn = 0
+            # Vault Phase 1: idempotent game accrual (safe-guarded by feature flag).
+            total_earn += self.vault_service.record_game_play_earn_event(
                 db,
                 user_id=user_id,
                 game_type=FeatureType.ROULETTE.value,
                 game_log_id=log_entry.id,
                 token_type=token_type.value,
-                reward_type=chosen.reward_type,
-                reward_amount=chosen.reward_amount,
-                payout_raw={"segment_id": chosen.id},
+                outcome=None,
+                payout_raw={
+                    "segment_id": chosen.id,
+                    "reward_type": chosen.reward_type,
+                    "reward_amount": chosen.reward_amount,
+                },
+                commit=False,
             )
 
-        xp_award = self.BASE_GAME_XP
-        ctx = GamePlayContext(user_id=user_id, feature_type=FeatureType.ROULETTE.value, today=today)
-        log_game_play(
-            ctx,
-            db,
-            {
-                "segment_id": chosen.id,
-                "reward_type": chosen.reward_type,
-                "reward_amount": chosen.reward_amount,
-                "label": chosen.label,
-                "xp_from_reward": xp_award,
-            },
-        )
+            trial_to_vault = consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False))
+            if trial_to_vault:
+                total_earn += self.vault_service.record_trial_result_earn_event(
+                    db,
+                    user_id=user_id,
+                    game_type=FeatureType.ROULETTE.value,
+                    game_log_id=log_entry.id,
+                    token_type=token_type.value,
+                    reward_type=chosen.reward_type,
+                    reward_amount=chosen.reward_amount,
+                    payout_raw={"segment_id": chosen.id},
+                    commit=False,
+                )
 
-        # Deliver reward according to segment definition (unless trial routing is enabled).
-        if not (consumed_trial and bool(getattr(settings, "enable_trial_payout_to_vault", False))):
-            self.reward_service.deliver(
+            xp_award = self.BASE_GAME_XP
+            ctx = GamePlayContext(user_id=user_id, feature_type=FeatureType.ROULETTE.value, today=today)
+            log_game_play(
+                ctx,
                 db,
-                user_id=user_id,
-                reward_type=chosen.reward_type,
-                reward_amount=chosen.reward_amount,
-                meta={"reason": "roulette_spin", "segment_id": chosen.id, "game_xp": xp_award},
+                {
+                    "segment_id": chosen.id,
+                    "reward_type": chosen.reward_type,
+                    "reward_amount": chosen.reward_amount,
+                    "label": chosen.label,
+                    "xp_from_reward": xp_award,
+                },
+                commit=False,
             )
-        if chosen.reward_amount > 0:
-            self.season_pass_service.maybe_add_internal_win_stamp(db, user_id=user_id, now=today)
+
+            # Deliver reward according to segment definition (unless trial routing is enabled).
+            if not trial_to_vault:
+                self.reward_service.deliver(
+                    db,
+                    user_id=user_id,
+                    reward_type=chosen.reward_type,
+                    reward_amount=chosen.reward_amount,
+                    meta={"reason": "roulette_spin", "segment_id": chosen.id, "game_xp": xp_award},
+                    commit=False,
+                )
+            if chosen.reward_amount > 0:
+                apply_internal_win_stamp(ctx, db, self.season_pass_service, commit=False)
         season_pass = None  # 게임 1회당 자동 스탬프 발급을 중단하고, 조건 달성 시 별도 로직으로 처리
+        metrics.GAME_PLAYS.inc(game=FeatureType.ROULETTE.value, outcome=chosen.reward_type)
 
         return RoulettePlayResponse(
             result="OK",
@@ -3,10 +3,10 @@ from __future__ import annotations
 
 import logging
 from datetime import date, datetime
-from typing import Iterable
+from typing import Iterable, Sequence
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, select
+from sqlalchemy import and_, select, update
 from sqlalchemy.orm import Session
 
 from app.models.season_pass import (
@@ -18,8 +18,17 @@ from app.models.season_pass import (
 )
 from app.models.user import User
 from app.schemas.season_pass import SeasonPassStatusResponse
+from app.services.config_cache import (
+    NS_SEASON_PASS,
+    SeasonPassLevelSnapshot,
+    SeasonPassSeasonSnapshot,
+    config_cache,
+)
 from app.services.reward_service import RewardService
 
+# claimed_levels_mask is a signed 64-bit column: bits 0..62 are usable level flags.
+CLAIMED_MASK_MAX_LEVEL = 62
+
 
 class SeasonPassService:
     """Encapsulates season pass workflows (status, stamp, claim)."""
@@ -28,24 +37,44 @@ class SeasonPassService:
         self.reward_service = RewardService()
         self.logger = logging.getLogger(__name__)
 
-    def get_current_season(self, db: Session, now: date | datetime) -> SeasonPassConfig | None:
+    def get_current_season(self, db: Session, now: date | datetime) -> SeasonPassSeasonSnapshot | None:
         """Return the active season for the given date or None if not found."""
 
         today = now.date() if isinstance(now, datetime) else now
-        stmt = select(SeasonPassConfig).where(
-            and_(SeasonPassConfig.start_date <= today, SeasonPassConfig.end_date >= today)
-        )
-        seasons = db.execute(stmt).scalars().all()
-        if not seasons:
-            return None
-        if len(seasons) > 1:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="NO_ACTIVE_SEASON_CONFLICT",
+
+        def load() -> SeasonPassSeasonSnapshot | None:
+            stmt = select(SeasonPassConfig).where(
+                and_(SeasonPassConfig.start_date <= today, SeasonPassConfig.end_date >= today)
+            )
+            seasons = db.execute(stmt).scalars().all()
+            if not seasons:
+                return None
+            if len(seasons) > 1:
+                raise HTTPException(
+                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="NO_ACTIVE_SEASON_CONFLICT",
+                )
+            return SeasonPassSeasonSnapshot.from_orm(seasons[0])
+
+        return config_cache.get_or_load(NS_SEASON_PASS, ("season", today), load)
+
+    def get_levels(self, db: Session, season_id: int) -> tuple[SeasonPassLevelSnapshot, ...]:
+        """Return the season's level table ordered by level (cached per season id)."""
+
+        def load() -> tuple[SeasonPassLevelSnapshot, ...] | None:
+            rows = (
+                db.execute(
+                    select(SeasonPassLevel).where(SeasonPassLevel.season_id == season_id).order_by(SeasonPassLevel.level)
+                )
+                .scalars()
+                .all()
             )
-        return seasons[0]
+            # An empty table is a config gap; return None so it is not cached.
+            return tuple(SeasonPassLevelSnapshot.from_orm(row) for row in rows) or None
 
-    def get_or_create_progress(self, db: Session, user_id: int, season_id: int) -> SeasonPassProgress:
+        return config_cache.get_or_load(NS_SEASON_PASS, ("levels", season_id), load) or ()
+
+    def get_or_create_progress(self, db: Session, user_id: int, season_id: int, commit: bool = True) -> SeasonPassProgress:
         """Fetch existing progress or create an initial record."""
 
         stmt = select(SeasonPassProgress).where(
@@ -61,11 +90,15 @@ class SeasonPassService:
             current_level=1,
             current_xp=0,
             total_stamps=0,
+            claimed_levels_mask=0,
         )
         db.add(progress)
-        db.commit()
-        db.refresh(progress)
-        self._auto_claim_initial_level(db, progress)
+        if commit:
+            db.commit()
+            db.refresh(progress)
+        else:
+            db.flush()
+        self._auto_claim_initial_level(db, progress, commit=commit)
         return progress
 
     def get_status(self, db: Session, user_id: int, now: date | datetime) -> dict:
@@ -76,45 +109,37 @@ class SeasonPassService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NO_ACTIVE_SEASON")
 
         progress = self.get_or_create_progress(db, user_id=user_id, season_id=season.id)
-        levels = (
-            db.execute(
-                select(SeasonPassLevel).where(SeasonPassLevel.season_id == season.id).order_by(SeasonPassLevel.level)
-            )
-            .scalars()
-            .all()
-        )
-        reward_logs = db.execute(
-            select(SeasonPassRewardLog).where(
-                SeasonPassRewardLog.season_id == season.id, SeasonPassRewardLog.user_id == user_id
-            )
-        ).scalars().all()
-        claimed_levels = {log.level for log in reward_logs}
+        levels = self.get_levels(db, season.id)
 
-        recovered_levels = self._recover_missing_auto_claims(
-            db,
-            progress=progress,
-            season_id=season.id,
-            levels=levels,
-            claimed_levels=claimed_levels,
-        )
-        if recovered_levels:
-            claimed_levels.update(recovered_levels)
+        mask_missing = progress.claimed_levels_mask is None
+        claimed_levels = self._claimed_levels(db, progress, levels)
+        if mask_missing and progress.claimed_levels_mask is not None:
+            # One-time rebuild for progress rows created before the mask existed.
+            db.commit()
+
+        # Missed auto-claims are healed by recover_missing_auto_claims (scripts/recover_season_pass_auto_claims.py),
+        # not on this read path.
 
         today = now.date() if isinstance(now, datetime) else now
         # "오늘 스탬프"는 일일 체크인(오늘 날짜 period_key)만 인정합니다.
-        daily_key = today.isoformat()
-        stamped_today = (
-            db.execute(
-                select(SeasonPassStampLog).where(
-                    SeasonPassStampLog.user_id == user_id,
-                    SeasonPassStampLog.season_id == season.id,
-                    SeasonPassStampLog.period_key == daily_key,
-                    SeasonPassStampLog.date == today,
-                )
+        if progress.last_stamp_date != today:
+            stamped_today = False
+        elif progress.last_checkin_date is not None:
+            stamped_today = progress.last_checkin_date == today
+        else:
+            # Rows stamped before last_checkin_date was tracked.
+            daily_key = today.isoformat()
+            stamped_today = (
+                db.execute(
+                    select(SeasonPassStampLog.id).where(
+                        SeasonPassStampLog.user_id == user_id,
+                        SeasonPassStampLog.season_id == season.id,
+                        SeasonPassStampLog.period_key == daily_key,
+                        SeasonPassStampLog.date == today,
+                    )
+                ).first()
+                is not None
             )
-            .scalars()
-            .first()
-        )
 
         max_required = max((lvl.required_xp for lvl in levels), default=0)
         next_level_req = next((lvl.required_xp for lvl in levels if lvl.required_xp > progress.current_xp), max_required)
@@ -167,7 +192,7 @@ class SeasonPassService:
                 "next_level_xp": next_level_req,
             },
             "levels": level_payload,
-            "today": {"date": today, "stamped": stamped_today is not None},
+            "today": {"date": today, "stamped": stamped_today},
         }
 
     def add_stamp(
@@ -179,6 +204,7 @@ class SeasonPassService:
         now: date | datetime | None = None,
         stamp_count: int = 1,
         period_key: str | None = None,
+        commit: bool = True,
     ) -> dict:
         """Apply stamp(s): prevent duplicates, update XP, level-up, and log rewards."""
 
@@ -193,7 +219,7 @@ class SeasonPassService:
         if season is None:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NO_ACTIVE_SEASON")
 
-        progress = self.get_or_create_progress(db, user_id=user_id, season_id=season.id)
+        progress = self.get_or_create_progress(db, user_id=user_id, season_id=season.id, commit=commit)
 
         xp_to_add = season.base_xp_per_stamp * stamp_count + xp_bonus
         key = period_key or today.isoformat()
@@ -210,71 +236,24 @@ class SeasonPassService:
             if already:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ALREADY_STAMPED_TODAY")
         previous_level = progress.current_level
-        # Level 1 is the initial state; it should not be treated as a reward level.
-        reward_baseline_level = max(previous_level, 1)
         progress.current_xp += xp_to_add
         progress.total_stamps += stamp_count
         progress.last_stamp_date = today
+        if key == today.isoformat():
+            progress.last_checkin_date = today
 
-        achieved_levels = self._eligible_levels(db, season.id, progress.current_xp)
-        new_levels = [level for level in achieved_levels if level.level > reward_baseline_level]
-        rewards: list[dict] = []
-
-        for level in new_levels:
-            reward_logged = db.execute(
-                select(SeasonPassRewardLog).where(
-                    SeasonPassRewardLog.user_id == user_id,
-                    SeasonPassRewardLog.season_id == season.id,
-                    SeasonPassRewardLog.level == level.level,
-                )
-            ).scalar_one_or_none()
-            if reward_logged:
-                continue
-
-            if level.auto_claim:
-                reward_log = SeasonPassRewardLog(
-                    user_id=user_id,
-                    season_id=season.id,
-                    progress_id=progress.id,
-                    level=level.level,
-                    reward_type=level.reward_type,
-                    reward_amount=level.reward_amount,
-                    claimed_at=datetime.utcnow(),
-                )
-                db.add(reward_log)
-                reward_meta = {
-                    "season_id": season.id,
-                    "level": level.level,
-                    "source": "SEASON_PASS_AUTO_CLAIM",
-                    "trigger": "STAMP",
-                    "stamp_count": stamp_count,
-                    "xp_added": xp_to_add,
-                    "feature": source_feature_type,
-                }
-                try:
-                    self.reward_service.deliver(
-                        db,
-                        user_id=user_id,
-                        reward_type=level.reward_type,
-                        reward_amount=level.reward_amount,
-                        meta=reward_meta,
-                    )
-                except Exception:
-                    # Reward delivery failure should not block stamp flow; rely on logs for retry.
-                    pass
-                rewards.append(
-                    {
-                        "level": level.level,
-                        "reward_type": level.reward_type,
-                        "reward_amount": level.reward_amount,
-                        "auto_claim": level.auto_claim,
-                        "claimed_at": reward_log.claimed_at,
-                    }
-                )
-
-        progress.current_level = max(progress.current_level, previous_level)
-        if achieved_levels:
-            progress.current_level = max(progress.current_level, max(level.level for level in achieved_levels))
+        rewards = self._apply_level_ups(
+            db,
+            season_id=season.id,
+            progress=progress,
+            previous_level=previous_level,
+            meta={
+                "trigger": "STAMP",
+                "stamp_count": stamp_count,
+                "xp_added": xp_to_add,
+                "feature": source_feature_type,
+            },
+        )
 
         existing_stamp = db.execute(
             select(SeasonPassStampLog).where(
@@ -305,15 +284,10 @@ class SeasonPassService:
             )
             db.add(stamp_log)
 
-        db.commit()
-        db.refresh(progress)
-
-        # [Level Unification] Sync season level to global user level
-        user = db.get(User, user_id)
-        if user and user.level != progress.current_level:
-            user.level = progress.current_level
-            db.add(user)
+        if commit:
             db.commit()
+        else:
+            db.flush()
 
         leveled_up = progress.current_level > previous_level
         return {
@@ -333,6 +307,7 @@ class SeasonPassService:
         now: date | datetime | None = None,
         stamp_count: int = 1,
         period_key: str | None = None,
+        commit: bool = True,
     ) -> dict | None:
         """Best-effort stamp: ignore no-season or already-stamped errors."""
 
@@ -345,6 +320,7 @@ class SeasonPassService:
                 now=now,
                 stamp_count=stamp_count,
                 period_key=period_key,
+                commit=commit,
             )
         except HTTPException as exc:
             if exc.detail in {"ALREADY_STAMPED_TODAY", "NO_ACTIVE_SEASON"}:
@@ -357,6 +333,7 @@ class SeasonPassService:
         user_id: int,
         threshold: int = 50,
         now: date | datetime | None = None,
+        commit: bool = True,
     ) -> dict | None:
         """Award one stamp when total internal 게임 승리 횟수 >= threshold (once per season)."""
 
@@ -386,6 +363,7 @@ class SeasonPassService:
             now=today,
             stamp_count=1,
             period_key="INTERNAL_WIN_50",
+            commit=commit,
         )
 
     def get_internal_win_progress(
@@ -461,6 +439,7 @@ class SeasonPassService:
             progress_id=progress.id,
         )
         db.add(reward_log)
+        self._mark_claimed(progress, level)
         reward_meta = {
             "season_id": season.id,
             "level": level,
@@ -487,14 +466,215 @@ class SeasonPassService:
             "claimed_at": reward_log.claimed_at,
         }
 
-    def _eligible_levels(self, db: Session, season_id: int, current_xp: int) -> Iterable[SeasonPassLevel]:
-        """Return levels whose required XP is met."""
+    def _apply_level_ups(
+        self,
+        db: Session,
+        *,
+        season_id: int,
+        progress: SeasonPassProgress,
+        previous_level: int,
+        meta: dict,
+    ) -> list[dict]:
+        """Resolve levels reached by progress.current_xp and stage their auto-claim rewards.
+
+        Claimed levels are read in one query, reward logs/deliveries/the user level sync are
+        written without committing; the caller commits (or flushes) once.
+        """
+
+        levels = self.get_levels(db, season_id)
+        achieved_levels = [level for level in levels if level.required_xp <= progress.current_xp]
+        # Level 1 is the initial state; it should not be treated as a reward level.
+        reward_baseline_level = max(previous_level, 1)
+        auto_levels = [level for level in achieved_levels if level.level > reward_baseline_level and level.auto_claim]
+        rewards: list[dict] = []
+
+        if auto_levels:
+            claimed = set(
+                db.execute(
+                    select(SeasonPassRewardLog.level).where(
+                        SeasonPassRewardLog.user_id == progress.user_id,
+                        SeasonPassRewardLog.season_id == season_id,
+                        SeasonPassRewardLog.level.in_([level.level for level in auto_levels]),
+                    )
+                )
+                .scalars()
+                .all()
+            )
+            for level in auto_levels:
+                if level.level in claimed:
+                    continue
+                claimed_at = datetime.utcnow()
+                db.add(
+                    SeasonPassRewardLog(
+                        user_id=progress.user_id,
+                        season_id=season_id,
+                        progress_id=progress.id,
+                        level=level.level,
+                        reward_type=level.reward_type,
+                        reward_amount=level.reward_amount,
+                        claimed_at=claimed_at,
+                    )
+                )
+                self._mark_claimed(progress, level.level)
+                reward_meta = {
+                    "season_id": season_id,
+                    "level": level.level,
+                    "source": "SEASON_PASS_AUTO_CLAIM",
+                    **meta,
+                }
+                # The reward log is flushed before the savepoint, so a failed delivery keeps the
+                # log (for retry) without blocking the XP update.
+                savepoint = db.begin_nested()
+                try:
+                    self.reward_service.deliver(
+                        db,
+                        user_id=progress.user_id,
+                        reward_type=level.reward_type,
+                        reward_amount=level.reward_amount,
+                        meta=reward_meta,
+                        commit=False,
+                    )
+                    savepoint.commit()
+                except Exception:
+                    savepoint.rollback()
+                    self.logger.warning(
+                        "Season pass auto-claim delivery failed",
+                        extra={"user_id": progress.user_id, "season_id": season_id, "level": level.level},
+                        exc_info=True,
+                    )
+                rewards.append(
+                    {
+                        "level": level.level,
+                        "reward_type": level.reward_type,
+                        "reward_amount": level.reward_amount,
+                        "auto_claim": level.auto_claim,
+                        "claimed_at": claimed_at,
+                    }
+                )
+
+        progress.current_level = max(progress.current_level, previous_level)
+        if achieved_levels:
+            progress.current_level = max(progress.current_level, max(level.level for level in achieved_levels))
+
+        # [Level Unification] Sync season level to global user level
+        db.execute(
+            update(User)
+            .where(User.id == progress.user_id, User.level != progress.current_level)
+            .values(level=progress.current_level)
+        )
+        return rewards
+
+    @staticmethod
+    def _level_bit(level: int) -> int:
+        return 1 << level if 0 <= level <= CLAIMED_MASK_MAX_LEVEL else 0
+
+    def _mask_for(self, levels: Iterable[int]) -> int:
+        mask = 0
+        for level in levels:
+            mask |= self._level_bit(level)
+        return mask
+
+    def _mark_claimed(self, progress: SeasonPassProgress, level: int) -> None:
+        """Record a newly logged reward level on the progress row's claimed mask."""
+
+        if progress.claimed_levels_mask is None:
+            # Not built yet; the next status read rebuilds it from reward logs.
+            return
+        progress.claimed_levels_mask = int(progress.claimed_levels_mask) | self._level_bit(level)
+
+    def _claimed_levels(
+        self, db: Session, progress: SeasonPassProgress, levels: Sequence[SeasonPassLevelSnapshot]
+    ) -> set[int]:
+        """Return claimed levels from the progress mask, rebuilding it from reward logs when missing."""
 
-        return db.execute(
-            select(SeasonPassLevel)
-            .where(SeasonPassLevel.season_id == season_id, SeasonPassLevel.required_xp <= current_xp)
-            .order_by(SeasonPassLevel.level)
-        ).scalars().all()
+        mask = progress.claimed_levels_mask
+        if mask is not None and all(lvl.level <= CLAIMED_MASK_MAX_LEVEL for lvl in levels):
+            return {lvl.level for lvl in levels if int(mask) & self._level_bit(lvl.level)}
+
+        claimed = set(
+            db.execute(
+                select(SeasonPassRewardLog.level).where(
+                    SeasonPassRewardLog.season_id == progress.season_id,
+                    SeasonPassRewardLog.user_id == progress.user_id,
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if mask is None:
+            progress.claimed_levels_mask = self._mask_for(claimed)
+        return claimed
+
+    def recover_missing_auto_claims(
+        self,
+        db: Session,
+        season_id: int | None = None,
+        now: date | datetime | None = None,
+        batch_size: int = 500,
+    ) -> dict:
+        """Batch job: grant unlocked auto-claim levels missing reward logs and resync claimed masks.
+
+        Heals previously missed auto-claims (e.g., worker crash, delivery failure). Walks the
+        season's progress rows in id order and commits once per batch.
+        """
+
+        if season_id is None:
+            season = self.get_current_season(db, now or date.today())
+            if season is None:
+                return {"season_id": None, "scanned": 0, "recovered": 0, "masks_synced": 0}
+            season_id = season.id
+
+        levels = self.get_levels(db, season_id)
+        auto_levels = [lvl for lvl in levels if lvl.auto_claim]
+        stats = {"season_id": season_id, "scanned": 0, "recovered": 0, "masks_synced": 0}
+        if not levels:
+            return stats
+        min_auto_xp = min((lvl.required_xp for lvl in auto_levels), default=None)
+
+        last_id = 0
+        while True:
+            progresses = (
+                db.execute(
+                    select(SeasonPassProgress)
+                    .where(SeasonPassProgress.season_id == season_id, SeasonPassProgress.id > last_id)
+                    .order_by(SeasonPassProgress.id)
+                    .limit(batch_size)
+                )
+                .scalars()
+                .all()
+            )
+            if not progresses:
+                break
+            last_id = progresses[-1].id
+
+            claimed_by_user: dict[int, set[int]] = {p.user_id: set() for p in progresses}
+            for user_id, level in db.execute(
+                select(SeasonPassRewardLog.user_id, SeasonPassRewardLog.level).where(
+                    SeasonPassRewardLog.season_id == season_id,
+                    SeasonPassRewardLog.user_id.in_(list(claimed_by_user)),
+                )
+            ).all():
+                claimed_by_user[user_id].add(level)
+
+            for progress in progresses:
+                stats["scanned"] += 1
+                claimed = claimed_by_user[progress.user_id]
+                if min_auto_xp is not None and progress.current_xp >= min_auto_xp:
+                    recovered = self._recover_missing_auto_claims(
+                        db, progress=progress, season_id=season_id, levels=auto_levels, claimed_levels=claimed
+                    )
+                    stats["recovered"] += len(recovered)
+                    claimed |= recovered
+                # Reward logs are the source of truth; repair masks that drifted or were never built.
+                mask = self._mask_for(claimed)
+                if progress.claimed_levels_mask != mask:
+                    progress.claimed_levels_mask = mask
+                    stats["masks_synced"] += 1
+
+            db.commit()
+            db.expunge_all()
+
+        return stats
 
     def _recover_missing_auto_claims(
         self,
@@ -502,14 +682,10 @@ class SeasonPassService:
         *,
         progress: SeasonPassProgress,
         season_id: int,
-        levels: list[SeasonPassLevel],
+        levels: Sequence[SeasonPassLevelSnapshot],
         claimed_levels: set[int],
     ) -> set[int]:
-        """Grant any unlocked auto-claim levels that are missing reward logs.
-
-        This is a defensive guardrail to heal previously missed auto-claims
-        (e.g., worker crash, delivery failure) when a user fetches status.
-        """
+        """Grant unlocked auto-claim levels that are missing reward logs (caller commits)."""
 
         unlocked_auto_levels = [
             level for level in levels if level.auto_claim and level.required_xp <= progress.current_xp
@@ -524,8 +700,9 @@ class SeasonPassService:
                 "season_id": season_id,
                 "level": level.level,
                 "source": "SEASON_PASS_AUTO_CLAIM_RECOVERY",
-                "trigger": "STATUS",
+                "trigger": "BATCH",
             }
+            savepoint = db.begin_nested()
             try:
                 self.reward_service.deliver(
                     db,
@@ -533,39 +710,39 @@ class SeasonPassService:
                     reward_type=level.reward_type,
                     reward_amount=level.reward_amount,
                     meta=reward_meta,
+                    commit=False,
                 )
+                db.add(
+                    SeasonPassRewardLog(
+                        user_id=progress.user_id,
+                        season_id=season_id,
+                        progress_id=progress.id,
+                        level=level.level,
+                        reward_type=level.reward_type,
+                        reward_amount=level.reward_amount,
+                        claimed_at=datetime.utcnow(),
+                    )
+                )
+                savepoint.commit()
             except Exception:
+                savepoint.rollback()
                 self.logger.warning(
                     "Season pass auto-claim recovery failed",
                     extra={
                         "user_id": progress.user_id,
                         "season_id": season_id,
                         "level": level.level,
-                        "source": "STATUS",
+                        "source": "BATCH",
                         "current_xp": progress.current_xp,
                     },
                     exc_info=True,
                 )
                 continue
-
-            reward_log = SeasonPassRewardLog(
-                user_id=progress.user_id,
-                season_id=season_id,
-                progress_id=progress.id,
-                level=level.level,
-                reward_type=level.reward_type,
-                reward_amount=level.reward_amount,
-                claimed_at=datetime.utcnow(),
-            )
-            db.add(reward_log)
             granted.add(level.level)
 
-        if granted:
-            db.commit()
-
         return granted
 
-    def _auto_claim_initial_level(self, db: Session, progress: SeasonPassProgress) -> None:
+    def _auto_claim_initial_level(self, db: Session, progress: SeasonPassProgress, commit: bool = True) -> None:
         """Auto-claim level 1 reward on first season-pass creation (if configured as auto_claim)."""
 
         level_row = db.execute(
@@ -599,6 +776,7 @@ class SeasonPassService:
             claimed_at=datetime.utcnow(),
         )
         db.add(reward_log)
+        self._mark_claimed(progress, 1)
         reward_meta = {
             "season_id": progress.season_id,
             "level": 1,
@@ -611,14 +789,18 @@ class SeasonPassService:
                 reward_type=level_row.reward_type,
                 reward_amount=level_row.reward_amount,
                 meta=reward_meta,
+                commit=commit,
             )
         except Exception:
             # Do not block creation on delivery failure; rely on logs for retry.
             self.logger.warning(
                 "Season pass init auto-claim failed", extra={"user_id": progress.user_id, "season_id": progress.season_id, "level": 1}, exc_info=True
             )
-        db.commit()
-        db.refresh(reward_log)
+        if commit:
+            db.commit()
+            db.refresh(reward_log)
+        else:
+            db.flush()
 
     def add_bonus_xp(
         self,
@@ -626,6 +808,7 @@ class SeasonPassService:
         user_id: int,
         xp_amount: int,
         now: date | datetime | None = None,
+        commit: bool = True,
     ) -> dict:
         """Add raw XP without stamping (used for game 보상 포인트 → XP)."""
 
@@ -640,88 +823,228 @@ class SeasonPassService:
         if season is None:
             return {"added_xp": 0, "leveled_up": False, "rewards": []}
 
-        progress = self.get_or_create_progress(db, user_id=user_id, season_id=season.id)
+        progress = self.get_or_create_progress(db, user_id=user_id, season_id=season.id, commit=commit)
         previous_level = progress.current_level
-        # Level 1 is the initial state; it should not be treated as a reward level.
-        reward_baseline_level = max(previous_level, 1)
         progress.current_xp += xp_amount
         db.add(progress)
 
         # Do not mirror to global LevelXP here; external/bonus XP would double-grant game tokens
         # via LevelXPService auto rewards, causing overpayment.
 
-        achieved_levels = self._eligible_levels(db, season.id, progress.current_xp)
-        new_levels = [level for level in achieved_levels if level.level > reward_baseline_level]
-        rewards: list[dict] = []
+        rewards = self._apply_level_ups(
+            db,
+            season_id=season.id,
+            progress=progress,
+            previous_level=previous_level,
+            meta={"trigger": "BONUS_XP", "xp_added": xp_amount},
+        )
+
+        if commit:
+            db.commit()
+        else:
+            db.flush()
 
-        for level in new_levels:
-            reward_logged = db.execute(
-                select(SeasonPassRewardLog).where(
-                    SeasonPassRewardLog.user_id == user_id,
-                    SeasonPassRewardLog.season_id == season.id,
-                    SeasonPassRewardLog.level == level.level,
+        leveled_up = progress.current_level > previous_level
+        return {
+            "added_xp": xp_amount,
+            "leveled_up": leveled_up,
+            "current_level": progress.current_level,
+            "rewards": rewards,
+        }
+
+    def add_bonus_xp_bulk(
+        self,
+        db: Session,
+        xp_by_user: dict[int, int],
+        now: date | datetime | None = None,
+        commit: bool = True,
+    ) -> dict:
+        """Add raw XP to many users at once (external ranking uploads).
+
+        Equivalent to calling add_bonus_xp once per user (a dict holds one amount per user; callers
+        merge or reject duplicates first), but existing progress rows are read with one IN query
+        and everything is written in a single commit/flush.
+        """
+
+        xp_by_user = {user_id: xp for user_id, xp in xp_by_user.items() if xp > 0}
+        summary = {"users": 0, "xp_added": 0, "leveled_up": 0, "rewards": 0}
+        if not xp_by_user:
+            return summary
+
+        today = (now or date.today())
+        if isinstance(today, datetime):
+            today = today.date()
+
+        season = self.get_current_season(db, today)
+        if season is None:
+            return summary
+
+        progress_by_user = {
+            progress.user_id: progress
+            for progress in db.execute(
+                select(SeasonPassProgress).where(
+                    SeasonPassProgress.season_id == season.id, SeasonPassProgress.user_id.in_(list(xp_by_user))
                 )
-            ).scalar_one_or_none()
-            if reward_logged:
-                continue
+            )
+            .scalars()
+            .all()
+        }
+        created = [
+            SeasonPassProgress(
+                user_id=user_id,
+                season_id=season.id,
+                current_level=1,
+                current_xp=0,
+                total_stamps=0,
+                claimed_levels_mask=0,
+            )
+            for user_id in xp_by_user
+            if user_id not in progress_by_user
+        ]
+        if created:
+            db.add_all(created)
+            db.flush()
+            for progress in created:
+                self._auto_claim_initial_level(db, progress, commit=False)
+                progress_by_user[progress.user_id] = progress
+
+        for user_id, xp_amount in xp_by_user.items():
+            progress = progress_by_user[user_id]
+            previous_level = progress.current_level
+            progress.current_xp += xp_amount
+            rewards = self._apply_level_ups(
+                db,
+                season_id=season.id,
+                progress=progress,
+                previous_level=previous_level,
+                meta={"trigger": "BONUS_XP", "xp_added": xp_amount},
+            )
+            if progress.current_level > previous_level:
+                summary["leveled_up"] += 1
+            summary["rewards"] += len(rewards)
+            summary["users"] += 1
+            summary["xp_added"] += xp_amount
 
-            if level.auto_claim:
-                reward_log = SeasonPassRewardLog(
-                    user_id=user_id,
-                    season_id=season.id,
-                    progress_id=progress.id,
-                    level=level.level,
-                    reward_type=level.reward_type,
-                    reward_amount=level.reward_amount,
-                    claimed_at=datetime.utcnow(),
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return summary
+
+        today = (now or date.today())
+        if isinstance(today, datetime):
+            today = today.date()
+
+        season = self.get_current_season(db, today)
+        if season is None:
+            return summary
+        levels = self.get_levels(db, season.id)
+        user_ids = list(xp_by_user)
+
+        progress_by_user = {
+            progress.user_id: progress
+            for progress in db.execute(
+                select(SeasonPassProgress).where(
+                    SeasonPassProgress.season_id == season.id, SeasonPassProgress.user_id.in_(user_ids)
                 )
-                db.add(reward_log)
-                reward_meta = {
-                    "season_id": season.id,
-                    "level": level.level,
-                    "source": "SEASON_PASS_AUTO_CLAIM",
-                    "trigger": "BONUS_XP",
-                    "xp_added": xp_amount,
-                }
+            )
+            .scalars()
+            .all()
+        }
+        created = [
+            SeasonPassProgress(
+                user_id=user_id,
+                season_id=season.id,
+                current_level=1,
+                current_xp=0,
+                total_stamps=0,
+                claimed_levels_mask=0,
+            )
+            for user_id in user_ids
+            if user_id not in progress_by_user
+        ]
+        if created:
+            db.add_all(created)
+            db.flush()
+            progress_by_user.update({progress.user_id: progress for progress in created})
+        created_ids = {progress.user_id for progress in created}
+
+        claimed_by_user: dict[int, set[int]] = {user_id: set() for user_id in user_ids}
+        for user_id, level in db.execute(
+            select(SeasonPassRewardLog.user_id, SeasonPassRewardLog.level).where(
+                SeasonPassRewardLog.season_id == season.id, SeasonPassRewardLog.user_id.in_(user_ids)
+            )
+        ).all():
+            claimed_by_user[user_id].add(level)
+
+        new_levels: dict[int, int] = {}
+        for user_id, xp_amount in xp_by_user.items():
+            progress = progress_by_user[user_id]
+            previous_level = progress.current_level
+            progress.current_xp += xp_amount
+            achieved_levels = [level for level in levels if level.required_xp <= progress.current_xp]
+            # Level 1 is the initial state; only freshly created progress still owes its auto-claim.
+            reward_baseline_level = 0 if user_id in created_ids else max(previous_level, 1)
+
+            for level in achieved_levels:
+                if level.level <= reward_baseline_level or not level.auto_claim:
+                    continue
+                if level.level in claimed_by_user[user_id]:
+                    continue
+                db.add(
+                    SeasonPassRewardLog(
+                        user_id=user_id,
+                        season_id=season.id,
+                        progress_id=progress.id,
+                        level=level.level,
+                        reward_type=level.reward_type,
+                        reward_amount=level.reward_amount,
+                        claimed_at=datetime.utcnow(),
+                    )
+                )
+                self._mark_claimed(progress, level.level)
+                claimed_by_user[user_id].add(level.level)
+                summary["rewards"] += 1
+                savepoint = db.begin_nested()
                 try:
                     self.reward_service.deliver(
                         db,
                         user_id=user_id,
                         reward_type=level.reward_type,
                         reward_amount=level.reward_amount,
-                        meta=reward_meta,
+                        meta={
+                            "season_id": season.id,
+                            "level": level.level,
+                            "source": "SEASON_PASS_AUTO_CLAIM",
+                            "trigger": "BONUS_XP",
+                            "xp_added": xp_amount,
+                        },
+                        commit=False,
                     )
+                    savepoint.commit()
                 except Exception:
-                    # Reward delivery failure should not block XP flow; rely on logs for retry.
-                    pass
-                rewards.append(
-                    {
-                        "level": level.level,
-                        "reward_type": level.reward_type,
-                        "reward_amount": level.reward_amount,
-                        "auto_claim": level.auto_claim,
-                        "claimed_at": reward_log.claimed_at,
-                    }
-                )
-
-        progress.current_level = max(progress.current_level, previous_level)
-        if achieved_levels:
-            progress.current_level = max(progress.current_level, max(level.level for level in achieved_levels))
+                    savepoint.rollback()
+                    self.logger.warning(
+                        "Season pass auto-claim delivery failed",
+                        extra={"user_id": user_id, "season_id": season.id, "level": level.level},
+                        exc_info=True,
+                    )
 
-        db.commit()
-        db.refresh(progress)
+            if achieved_levels:
+                progress.current_level = max(progress.current_level, max(level.level for level in achieved_levels))
+            if progress.current_level > previous_level:
+                summary["leveled_up"] += 1
+            new_levels[user_id] = progress.current_level
+            summary["users"] += 1
+            summary["xp_added"] += xp_amount
 
         # [Level Unification] Sync season level to global user level
-        user = db.get(User, user_id)
-        if user and user.level != progress.current_level:
-            user.level = progress.current_level
-            db.add(user)
-            db.commit()
+        for user in db.execute(select(User).where(User.id.in_(user_ids))).scalars().all():
+            if user.level != new_levels[user.id]:
+                user.level = new_levels[user.id]
 
-        leveled_up = progress.current_level > previous_level
-        return {
-            "added_xp": xp_amount,
-            "leveled_up": leveled_up,
-            "current_level": progress.current_level,
-            "rewards": rewards,
-        }
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return summary
@@ -0,0 +1,156 @@
+"""Outbox for play side effects and the worker logic that drains it.
+
+With ENABLE_ASYNC_PLAY_SIDE_EFFECTS on, game plays only insert `side_effect_outbox` rows
+in their own transaction; `SideEffectOutboxService.drain` (run by
+scripts/run_side_effect_worker.py) applies them in batches. Each row is applied inside a
+SAVEPOINT: infrastructure errors are retried with exponential backoff until
+SIDE_EFFECT_MAX_ATTEMPTS, business rejections (HTTPException 4xx such as a daily team
+point cap) complete the row without retry.
+"""
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.side_effect_outbox import SideEffectOutbox
+from app.services.season_pass_service import SeasonPassService
+from app.services.survey_trigger_service import SurveyTriggerService
+from app.services.team_battle_service import TeamBattleService
+
+EFFECT_TEAM_POINTS = "TEAM_POINTS"
+EFFECT_SEASON_PASS_INTERNAL_WIN = "SEASON_PASS_INTERNAL_WIN"
+EFFECT_SURVEY_GAME_RESULT = "SURVEY_GAME_RESULT"
+
+STATUS_PENDING = "PENDING"
+STATUS_DONE = "DONE"
+STATUS_FAILED = "FAILED"
+
+
+def async_side_effects_enabled() -> bool:
+    return bool(getattr(get_settings(), "enable_async_play_side_effects", False))
+
+
+def enqueue_side_effect(db: Session, user_id: int, effect_type: str, payload: dict[str, Any] | None = None) -> SideEffectOutbox:
+    """Stage an outbox row in the caller's transaction (no flush/commit)."""
+
+    row = SideEffectOutbox(user_id=user_id, effect_type=effect_type, payload_json=payload or {}, status=STATUS_PENDING)
+    db.add(row)
+    return row
+
+
+def apply_team_battle_points(db: Session, user_id: int, payload: dict[str, Any], now: datetime | None = None, commit: bool = True) -> None:
+    """Award per-play team battle points; no-op for users without a team."""
+
+    svc = TeamBattleService()
+    member = svc.get_membership(db, user_id)
+    if not member:
+        return
+
+    season = svc.get_active_season(db, now=now) or svc.ensure_current_season(db, now=now, commit=commit)
+
+    meta = {
+        "feature_type": payload.get("feature_type"),
+        "result": payload.get("result"),
+        "reward_type": payload.get("reward_type"),
+        "reward_amount": payload.get("reward_amount"),
+    }
+
+    svc.add_points(
+        db,
+        team_id=member.team_id,
+        delta=svc.POINTS_PER_PLAY,
+        action="GAME_PLAY",
+        user_id=user_id,
+        season_id=season.id,
+        meta=meta,
+        enforce_usage=False,
+        now=now,
+        commit=commit,
+    )
+
+
+class SideEffectOutboxService:
+    RETRY_BASE_SECONDS = 30
+
+    def __init__(self, max_attempts: int | None = None) -> None:
+        self.max_attempts = max_attempts or int(get_settings().side_effect_max_attempts or 1)
+        self.season_pass_service = SeasonPassService()
+        self.survey_trigger_service = SurveyTriggerService()
+
+    def _claim_batch(self, db: Session, batch_size: int, now: datetime) -> list[SideEffectOutbox]:
+        stmt = (
+            select(SideEffectOutbox)
+            .where(SideEffectOutbox.status == STATUS_PENDING, SideEffectOutbox.available_at <= now)
+            .order_by(SideEffectOutbox.id)
+            .limit(batch_size)
+        )
+        if db.bind and db.bind.dialect.name != "sqlite":
+            # Several workers can run side by side; each claims a disjoint batch.
+            stmt = stmt.with_for_update(skip_locked=True)
+        return list(db.execute(stmt).scalars().all())
+
+    def _apply(self, db: Session, row: SideEffectOutbox) -> None:
+        payload = row.payload_json or {}
+        played_at = datetime.fromisoformat(payload["played_at"]) if payload.get("played_at") else None
+        if row.effect_type == EFFECT_TEAM_POINTS:
+            apply_team_battle_points(db, row.user_id, payload, now=played_at, commit=False)
+        elif row.effect_type == EFFECT_SEASON_PASS_INTERNAL_WIN:
+            play_date = date.fromisoformat(payload["play_date"]) if payload.get("play_date") else None
+            self.season_pass_service.maybe_add_internal_win_stamp(db, user_id=row.user_id, now=play_date, commit=False)
+        elif row.effect_type == EFFECT_SURVEY_GAME_RESULT:
+            self.survey_trigger_service.handle_game_result(
+                db,
+                user_id=row.user_id,
+                feature_type=str(payload.get("feature_type") or ""),
+                result=str(payload.get("result") or ""),
+                commit=False,
+            )
+        else:
+            raise ValueError(f"UNKNOWN_SIDE_EFFECT:{row.effect_type}")
+
+    def drain(self, db: Session, batch_size: int = 100, now: datetime | None = None) -> dict[str, int]:
+        """Apply one batch of due outbox rows and commit; returns counts by outcome."""
+
+        now = now or datetime.utcnow()
+        stats = {"claimed": 0, "done": 0, "retried": 0, "failed": 0}
+        rows = self._claim_batch(db, batch_size, now)
+        stats["claimed"] = len(rows)
+
+        for row in rows:
+            error: str | None = None
+            retryable = False
+            try:
+                with db.begin_nested():
+                    self._apply(db, row)
+            except HTTPException as exc:
+                if exc.status_code >= 500:
+                    error, retryable = str(exc.detail), True
+                else:
+                    # Business rejection (not in team, cap reached, ...): record and move on.
+                    error = str(exc.detail)
+            except Exception as exc:
+                error, retryable = f"{type(exc).__name__}: {exc}", True
+
+            row.last_error = error[:255] if error else None
+            if not retryable:
+                row.status = STATUS_DONE
+                row.processed_at = now
+                stats["done"] += 1
+                continue
+
+            row.attempts = int(row.attempts or 0) + 1
+            if row.attempts >= self.max_attempts:
+                row.status = STATUS_FAILED
+                row.processed_at = now
+                stats["failed"] += 1
+            else:
+                row.available_at = now + timedelta(seconds=self.RETRY_BASE_SECONDS * 2 ** (row.attempts - 1))
+                stats["retried"] += 1
+
+        db.commit()
+        return stats
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 from typing import Any
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.models.survey import Survey, SurveyResponse, SurveyRewardStatus
@@ -39,11 +40,23 @@ class SurveyRewardService:
             return False, None
 
         toast_message = reward_cfg.get("toast_message")
-        response.reward_status = SurveyRewardStatus.SCHEDULED
-        response.reward_payload = reward_cfg
-        db.add(response)
+        # Claim the reward with one conditional UPDATE; a concurrent caller that lost the race
+        # sees rowcount 0 and must not deliver again.
+        claimed = db.execute(
+            update(SurveyResponse)
+            .where(
+                SurveyResponse.id == response.id,
+                SurveyResponse.reward_status.in_((SurveyRewardStatus.NONE, SurveyRewardStatus.FAILED)),
+            )
+            .values(reward_status=SurveyRewardStatus.SCHEDULED, reward_payload=reward_cfg)
+            .execution_options(synchronize_session=False)
+        ).rowcount
         db.commit()
         db.refresh(response)
+        if not claimed:
+            if response.reward_status == SurveyRewardStatus.GRANTED:
+                return True, toast_message or "설문 보상이 지급되었습니다."
+            return False, None
 
         try:
             self.reward_service.deliver(db, user_id=response.user_id, reward_type=reward_type, reward_amount=amount, meta=reward_cfg)
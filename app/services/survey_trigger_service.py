@@ -55,7 +55,7 @@ class SurveyTriggerService:
                 return False
         return True
 
-    def _create_pending(self, db: Session, user_id: int, rule: SurveyTriggerRule) -> SurveyResponse:
+    def _create_pending(self, db: Session, user_id: int, rule: SurveyTriggerRule, commit: bool = True) -> SurveyResponse:
         response = SurveyResponse(
             survey_id=rule.survey_id,
             user_id=user_id,
@@ -64,8 +64,11 @@ class SurveyTriggerService:
             last_activity_at=self.now(),
         )
         db.add(response)
-        db.commit()
-        db.refresh(response)
+        if commit:
+            db.commit()
+            db.refresh(response)
+        else:
+            db.flush()
         return response
 
     def handle_level_up(self, db: Session, user_id: int, new_level: int) -> list[int]:
@@ -81,7 +84,7 @@ class SurveyTriggerService:
                 matched.append(resp.id)
         return matched
 
-    def handle_game_result(self, db: Session, user_id: int, feature_type: str, result: str) -> list[int]:
+    def handle_game_result(self, db: Session, user_id: int, feature_type: str, result: str, commit: bool = True) -> list[int]:
         matched: list[int] = []
         for rule in self._eligible_rules(db, SurveyTriggerType.GAME_RESULT):
             cfg = rule.trigger_config_json or {}
@@ -92,7 +95,7 @@ class SurveyTriggerService:
             if target_result and target_result != result:
                 continue
             if self._passes_cooldown(db, user_id, rule):
-                resp = self._create_pending(db, user_id, rule)
+                resp = self._create_pending(db, user_id, rule, commit=commit)
                 matched.append(resp.id)
         return matched
 
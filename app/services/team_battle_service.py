@@ -1,14 +1,18 @@
 """Team battle service: teams, seasons, scores, points logging."""
 from datetime import datetime, timedelta, date, timezone
-from typing import Optional, Sequence, Iterable
+from array import array
+from typing import Iterator, Optional, Sequence, Iterable
+import heapq
 import random
 from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException, status
-from sqlalchemy import and_, case, func, select
+from sqlalchemy import BigInteger, and_, case, cast, delete, func, insert, select, union_all, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
 
-from app.models.team_battle import TeamSeason, Team, TeamMember, TeamScore, TeamEventLog
+from app.models.team_battle import TeamSeason, Team, TeamMember, TeamScore, TeamScoreShard, TeamMemberScore, TeamDailyPoints, TeamEventLog
 from app.models.external_ranking import ExternalRankingData
 from app.models.game_wallet import GameTokenType
 from app.core.config import get_settings
@@ -17,6 +21,9 @@ from app.core.config import get_settings
 class TeamBattleService:
     POINTS_PER_PLAY = 10
     DAILY_POINT_CAP = 500  # 50 plays per day
+    SCORE_SHARDS = 8  # team_score_shard rows per team/season
+    BALANCE_FETCH_SIZE = 5000
+    BALANCE_WRITE_CHUNK_SIZE = 1000
     TEAM_SELECTION_WINDOW_HOURS = 24
     TEAM_MAX_MEMBERS = 7
     MIN_PLAYS_FOR_REWARD = 30
@@ -39,6 +46,10 @@ class TeamBattleService:
         end_utc = end_local.astimezone(utc).replace(tzinfo=None)
         return start_utc, end_utc
 
+    def _local_date(self, now: datetime) -> date:
+        base = now if now.tzinfo else now.replace(tzinfo=timezone.utc)
+        return base.astimezone(ZoneInfo(get_settings().timezone)).date()
+
     def _day_bounds_for_date(self, target_date: date) -> tuple[datetime, datetime]:
         settings = get_settings()
         tz = ZoneInfo(settings.timezone)
@@ -76,7 +87,7 @@ class TeamBattleService:
 
         return dt
 
-    def ensure_current_season(self, db: Session, now: datetime | None = None) -> TeamSeason:
+    def ensure_current_season(self, db: Session, now: datetime | None = None, commit: bool = True) -> TeamSeason:
         """Ensure a season exists covering `now`.
 
         If an active season is configured in DB, always respect it and never create
@@ -123,8 +134,9 @@ class TeamBattleService:
         db.add(season)
         db.flush()
         db.query(TeamSeason).filter(TeamSeason.id != season.id, TeamSeason.is_active == True).update({"is_active": False})  # noqa: E712
-        db.commit()
-        db.refresh(season)
+        if commit:
+            db.commit()
+            db.refresh(season)
         return season
 
     def get_active_season(self, db: Session, now: datetime | None = None) -> TeamSeason | None:
@@ -288,6 +300,8 @@ class TeamBattleService:
         # are not enforced in the target DB (or were created without CASCADE).
         db.query(TeamMember).filter(TeamMember.team_id == team_id).delete(synchronize_session=False)
         db.query(TeamScore).filter(TeamScore.team_id == team_id).delete(synchronize_session=False)
+        db.query(TeamScoreShard).filter(TeamScoreShard.team_id == team_id).delete(synchronize_session=False)
+        db.query(TeamMemberScore).filter(TeamMemberScore.team_id == team_id).delete(synchronize_session=False)
         db.query(TeamEventLog).filter(TeamEventLog.team_id == team_id).delete(synchronize_session=False)
         db.delete(team)
         db.commit()
@@ -323,6 +337,11 @@ class TeamBattleService:
         return member
 
     def _recompute_team_score_from_logs(self, db: Session, season_id: int, team_id: int) -> None:
+        # The log total replaces base + pending shards; lock the shards so no delta lands in between.
+        shard_filter = [TeamScoreShard.season_id == season_id, TeamScoreShard.team_id == team_id]
+        db.execute(select(TeamScoreShard.shard).where(*shard_filter).with_for_update()).all()
+        db.execute(delete(TeamScoreShard).where(*shard_filter).execution_options(synchronize_session=False))
+
         total = db.execute(
             select(func.coalesce(func.sum(TeamEventLog.delta), 0)).where(
                 TeamEventLog.season_id == season_id,
@@ -343,8 +362,310 @@ class TeamBattleService:
             db.flush()
 
         score.points = int(total or 0)
+        score.last_event_at = db.execute(
+            select(func.max(TeamEventLog.created_at)).where(
+                TeamEventLog.season_id == season_id,
+                TeamEventLog.team_id == team_id,
+            )
+        ).scalar_one()
         score.updated_at = self._now_utc()
 
+    def _claim_daily_points(self, db: Session, *, user_id: int, day: date, points: int) -> int:
+        """Atomically add up to `points` to the user's daily counter without passing DAILY_POINT_CAP.
+
+        The capped increment happens in a single upsert, so concurrent plays cannot both pass
+        the cap; returns the points actually granted (0 once the cap is reached).
+        """
+
+        cap = self.DAILY_POINT_CAP
+        grant = case(
+            (TeamDailyPoints.points >= cap, 0),
+            (TeamDailyPoints.points + points > cap, cap - TeamDailyPoints.points),
+            else_=points,
+        )
+        now = self._now_utc()
+        first = min(points, cap)
+        values = {"user_id": user_id, "day": day, "points": first, "last_grant": first, "updated_at": now}
+        dialect = db.bind.dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(TeamDailyPoints).values(**values)
+            # MySQL applies assignments left to right: last_grant must read the old points.
+            stmt = stmt.on_duplicate_key_update(
+                [("last_grant", grant), ("points", TeamDailyPoints.points + grant), ("updated_at", now)]
+            )
+            db.execute(stmt)
+        elif dialect == "sqlite":
+            stmt = sqlite_insert(TeamDailyPoints).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TeamDailyPoints.user_id, TeamDailyPoints.day],
+                set_={"last_grant": grant, "points": TeamDailyPoints.points + grant, "updated_at": now},
+            )
+            db.execute(stmt)
+        else:
+            result = db.execute(
+                update(TeamDailyPoints)
+                .where(TeamDailyPoints.user_id == user_id, TeamDailyPoints.day == day)
+                .ordered_values(
+                    (TeamDailyPoints.last_grant, grant),
+                    (TeamDailyPoints.points, TeamDailyPoints.points + grant),
+                    (TeamDailyPoints.updated_at, now),
+                )
+            )
+            if result.rowcount == 0:
+                db.add(TeamDailyPoints(**values))
+                db.flush()
+                return first
+
+        return int(
+            db.execute(
+                select(TeamDailyPoints.last_grant).where(TeamDailyPoints.user_id == user_id, TeamDailyPoints.day == day)
+            ).scalar_one()
+        )
+
+    def _score_shard(self, user_id: Optional[int]) -> int:
+        if user_id:
+            return user_id % self.SCORE_SHARDS
+        return random.randrange(self.SCORE_SHARDS)
+
+    def _bump_score_shard(self, db: Session, *, season_id: int, team_id: int, shard: int, delta: int, at: datetime) -> None:
+        """Add one event to a team_score_shard row (upsert); never locks team_score."""
+
+        values = {"season_id": season_id, "team_id": team_id, "shard": shard, "points": delta, "last_event_at": at}
+        dialect = db.bind.dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(TeamScoreShard).values(**values)
+            stmt = stmt.on_duplicate_key_update(
+                points=TeamScoreShard.points + stmt.inserted.points,
+                last_event_at=stmt.inserted.last_event_at,
+            )
+            db.execute(stmt)
+            return
+        if dialect == "sqlite":
+            stmt = sqlite_insert(TeamScoreShard).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TeamScoreShard.season_id, TeamScoreShard.team_id, TeamScoreShard.shard],
+                set_={
+                    "points": TeamScoreShard.points + stmt.excluded.points,
+                    "last_event_at": stmt.excluded.last_event_at,
+                },
+            )
+            db.execute(stmt)
+            return
+
+        result = db.execute(
+            update(TeamScoreShard)
+            .where(
+                TeamScoreShard.season_id == season_id,
+                TeamScoreShard.team_id == team_id,
+                TeamScoreShard.shard == shard,
+            )
+            .values(points=TeamScoreShard.points + delta, last_event_at=at)
+        )
+        if result.rowcount == 0:
+            db.add(TeamScoreShard(**values))
+            db.flush()
+
+    def _team_totals(self, season_id: int, team_id: Optional[int] = None):
+        """Subquery of (team_id, points, last_event_at): team_score plus its pending shards.
+
+        Pass team_id to total a single team; the filter is applied inside the union so only that
+        team's rows are read.
+        """
+
+        base = select(TeamScore.team_id, TeamScore.points, TeamScore.last_event_at).where(
+            TeamScore.season_id == season_id
+        )
+        shards = select(TeamScoreShard.team_id, TeamScoreShard.points, TeamScoreShard.last_event_at).where(
+            TeamScoreShard.season_id == season_id
+        )
+        if team_id is not None:
+            base = base.where(TeamScore.team_id == team_id)
+            shards = shards.where(TeamScoreShard.team_id == team_id)
+        merged = union_all(base, shards).subquery()
+        return (
+            select(
+                merged.c.team_id,
+                # CAST: MySQL returns SUM() as DECIMAL.
+                cast(func.sum(merged.c.points), BigInteger).label("points"),
+                func.max(merged.c.last_event_at).label("last_event_at"),
+            )
+            .group_by(merged.c.team_id)
+            .subquery("team_totals")
+        )
+
+    def get_team_score(self, db: Session, team_id: int, season_id: int) -> TeamScore:
+        """Return the team's current score (base + shards) as a detached, read-only TeamScore."""
+
+        totals = self._team_totals(season_id, team_id=team_id)
+        row = db.execute(select(totals.c.points, totals.c.last_event_at)).first()
+        return TeamScore(
+            team_id=team_id,
+            season_id=season_id,
+            points=int(row.points or 0) if row else 0,
+            last_event_at=row.last_event_at if row else None,
+        )
+
+    def compact_team_scores(self, db: Session, season_id: Optional[int] = None, commit: bool = True) -> dict:
+        """Fold team_score_shard rows into team_score.points; one short transaction per team."""
+
+        key_stmt = select(TeamScoreShard.season_id, TeamScoreShard.team_id).distinct()
+        if season_id:
+            key_stmt = key_stmt.where(TeamScoreShard.season_id == season_id)
+        keys = db.execute(key_stmt).all()
+
+        teams = 0
+        moved_total = 0
+        for sid, team_id in keys:
+            shard_filter = [TeamScoreShard.season_id == sid, TeamScoreShard.team_id == team_id]
+            shards = db.execute(
+                select(TeamScoreShard.points, TeamScoreShard.last_event_at)
+                .where(*shard_filter)
+                .order_by(TeamScoreShard.shard)
+                .with_for_update()
+            ).all()
+            if not shards:
+                continue
+            moved = sum(int(row.points or 0) for row in shards)
+            latest = max((row.last_event_at for row in shards if row.last_event_at), default=None)
+
+            score = db.execute(
+                select(TeamScore).where(TeamScore.season_id == sid, TeamScore.team_id == team_id).with_for_update()
+            ).scalar_one_or_none()
+            if not score:
+                score = TeamScore(team_id=team_id, season_id=sid, points=0)
+                db.add(score)
+            score.points = (score.points or 0) + moved
+            if latest and (score.last_event_at is None or latest > score.last_event_at):
+                score.last_event_at = latest
+            score.updated_at = self._now_utc()
+            db.execute(delete(TeamScoreShard).where(*shard_filter).execution_options(synchronize_session=False))
+
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+            teams += 1
+            moved_total += moved
+        return {"teams": teams, "points": moved_total}
+
+    def _bump_member_score(
+        self,
+        db: Session,
+        *,
+        season_id: int,
+        team_id: int,
+        user_id: int,
+        delta: int,
+        game_delta: int,
+        at: datetime,
+    ) -> None:
+        """Add one event to team_member_score (upsert)."""
+
+        values = {
+            "season_id": season_id,
+            "team_id": team_id,
+            "user_id": user_id,
+            "points": delta,
+            "game_points": game_delta,
+            "last_event_at": at,
+        }
+        dialect = db.bind.dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(TeamMemberScore).values(**values)
+            stmt = stmt.on_duplicate_key_update(
+                points=TeamMemberScore.points + stmt.inserted.points,
+                game_points=TeamMemberScore.game_points + stmt.inserted.game_points,
+                last_event_at=stmt.inserted.last_event_at,
+            )
+            db.execute(stmt)
+            return
+        if dialect == "sqlite":
+            stmt = sqlite_insert(TeamMemberScore).values(**values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[TeamMemberScore.season_id, TeamMemberScore.team_id, TeamMemberScore.user_id],
+                set_={
+                    "points": TeamMemberScore.points + stmt.excluded.points,
+                    "game_points": TeamMemberScore.game_points + stmt.excluded.game_points,
+                    "last_event_at": stmt.excluded.last_event_at,
+                },
+            )
+            db.execute(stmt)
+            return
+
+        result = db.execute(
+            update(TeamMemberScore)
+            .where(
+                TeamMemberScore.season_id == season_id,
+                TeamMemberScore.team_id == team_id,
+                TeamMemberScore.user_id == user_id,
+            )
+            .values(
+                points=TeamMemberScore.points + delta,
+                game_points=TeamMemberScore.game_points + game_delta,
+                last_event_at=at,
+            )
+        )
+        if result.rowcount == 0:
+            db.add(TeamMemberScore(**values))
+            db.flush()
+
+    def _rebuild_member_scores(self, db: Session, season_id: int, user_id: Optional[int] = None) -> int:
+        """Recompute team_member_score rows of a season (optionally one user) from team_event_log."""
+
+        log_filter = [TeamEventLog.season_id == season_id, TeamEventLog.user_id.isnot(None)]
+        score_filter = [TeamMemberScore.season_id == season_id]
+        if user_id is not None:
+            log_filter.append(TeamEventLog.user_id == user_id)
+            score_filter.append(TeamMemberScore.user_id == user_id)
+
+        db.execute(delete(TeamMemberScore).where(*score_filter).execution_options(synchronize_session=False))
+        totals = (
+            select(
+                TeamEventLog.season_id,
+                TeamEventLog.team_id,
+                TeamEventLog.user_id,
+                func.coalesce(func.sum(TeamEventLog.delta), 0),
+                func.coalesce(func.sum(case((TeamEventLog.action == "GAME_PLAY", TeamEventLog.delta), else_=0)), 0),
+                func.max(TeamEventLog.created_at),
+            )
+            .where(*log_filter)
+            .group_by(TeamEventLog.season_id, TeamEventLog.team_id, TeamEventLog.user_id)
+        )
+        result = db.execute(
+            insert(TeamMemberScore).from_select(
+                ["season_id", "team_id", "user_id", "points", "game_points", "last_event_at"],
+                totals,
+            )
+        )
+        return int(result.rowcount or 0)
+
+    def rebuild_contribution_totals(self, db: Session, season_id: Optional[int] = None, commit: bool = True) -> dict:
+        """Recompute team_member_score and team_score.last_event_at from team_event_log.
+
+        TeamScore.points is left alone (it can carry admin adjustments made outside the log).
+        """
+
+        season_ids = [season_id] if season_id else list(db.execute(select(TeamSeason.id)).scalars().all())
+        member_rows = 0
+        for sid in season_ids:
+            member_rows += self._rebuild_member_scores(db, sid)
+            latest = (
+                select(func.max(TeamEventLog.created_at))
+                .where(TeamEventLog.season_id == TeamScore.season_id, TeamEventLog.team_id == TeamScore.team_id)
+                .scalar_subquery()
+            )
+            db.execute(
+                update(TeamScore)
+                .where(TeamScore.season_id == sid)
+                .values(last_event_at=latest)
+                .execution_options(synchronize_session=False)
+            )
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return {"seasons": len(season_ids), "member_rows": member_rows}
+
     def move_member(
         self,
         db: Session,
@@ -405,6 +726,7 @@ class TeamBattleService:
         if keep_points and old_team_id and old_team_id != team_id:
             self._recompute_team_score_from_logs(db, season_id=season.id, team_id=old_team_id)
             self._recompute_team_score_from_logs(db, season_id=season.id, team_id=team_id)
+            self._rebuild_member_scores(db, season.id, user_id=user_id)
 
         db.commit()
         db.refresh(member)
@@ -468,7 +790,14 @@ class TeamBattleService:
         enforce_usage: bool = True,
         auto_join_if_missing: bool = False,
         now: datetime | None = None,
-    ) -> TeamScore:
+        commit: bool = True,
+    ) -> TeamEventLog:
+        """Credit points to a team and return the written event log.
+
+        This is the per-game-play hot path, so the team total is not read back here; callers that
+        need it (the admin route) use get_team_score.
+        """
+
         if delta == 0:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="ZERO_DELTA")
 
@@ -488,31 +817,20 @@ class TeamBattleService:
         if action == "GAME_PLAY" and user_id:
             if enforce_usage:
                 self._assert_today_usage(db, user_id=user_id, now=now)
-            delta = self.POINTS_PER_PLAY
-            start, end = self._day_bounds(now)
-            points_today = db.execute(
-                select(func.coalesce(func.sum(TeamEventLog.delta), 0)).where(
-                    TeamEventLog.user_id == user_id,
-                    TeamEventLog.action == "GAME_PLAY",
-                    TeamEventLog.created_at >= start,
-                    TeamEventLog.created_at < end,
-                )
-            ).scalar_one()
-            remaining = self.DAILY_POINT_CAP - points_today
-            if remaining <= 0:
+            delta = self._claim_daily_points(db, user_id=user_id, day=self._local_date(now), points=self.POINTS_PER_PLAY)
+            if delta <= 0:
                 raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="DAILY_POINT_CAP_REACHED")
-            delta = min(delta, remaining)
-
-        score = db.execute(
-            select(TeamScore).where(TeamScore.team_id == team_id, TeamScore.season_id == season.id)
-        ).scalar_one_or_none()
-        if not score:
-            score = TeamScore(team_id=team_id, season_id=season.id, points=0)
-            db.add(score)
-            db.flush()
 
-        score.points += delta
-        score.updated_at = self._now_utc()
+        # The play time, not the apply time: outbox-deferred plays are logged when they happened.
+        logged_at = now
+        self._bump_score_shard(
+            db,
+            season_id=season.id,
+            team_id=team_id,
+            shard=self._score_shard(user_id),
+            delta=delta,
+            at=logged_at,
+        )
 
         log = TeamEventLog(
             team_id=team_id,
@@ -521,30 +839,40 @@ class TeamBattleService:
             action=action,
             delta=delta,
             meta=meta,
+            created_at=logged_at,
         )
         db.add(log)
-        db.add(score)
-        db.commit()
-        db.refresh(score)
-        return score
+        if user_id:
+            self._bump_member_score(
+                db,
+                season_id=season.id,
+                team_id=team_id,
+                user_id=user_id,
+                delta=delta,
+                game_delta=delta if action == "GAME_PLAY" else 0,
+                at=logged_at,
+            )
+        if commit:
+            db.commit()
+        else:
+            db.flush()
+        return log
 
     def settle_daily_rewards(self, db: Session, season_id: int) -> dict:
         season = db.get(TeamSeason, season_id)
         if not season:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="SEASON_NOT_FOUND")
 
-        latest_event = func.max(TeamEventLog.created_at).label("latest_event")
+        totals = self._team_totals(season_id)
+        latest_event = totals.c.last_event_at.label("latest_event")
         standings = db.execute(
             select(
-                TeamScore.team_id,
-                TeamScore.points,
+                totals.c.team_id,
+                totals.c.points,
                 latest_event,
             )
-            .join(Team, Team.id == TeamScore.team_id)
-            .outerjoin(TeamEventLog, and_(TeamEventLog.team_id == TeamScore.team_id, TeamEventLog.season_id == TeamScore.season_id))
-            .where(TeamScore.season_id == season_id)
-            .group_by(TeamScore.team_id, TeamScore.points)
-            .order_by(TeamScore.points.desc(), latest_event.desc(), TeamScore.team_id.asc())
+            .join(Team, Team.id == totals.c.team_id)
+            .order_by(totals.c.points.desc(), totals.c.last_event_at.desc(), totals.c.team_id.asc())
         ).all()
 
         if not standings:
@@ -552,16 +880,10 @@ class TeamBattleService:
 
         contributions = db.execute(
             select(
-                TeamEventLog.team_id,
-                TeamEventLog.user_id,
-                func.coalesce(func.sum(TeamEventLog.delta), 0).label("points"),
-            )
-            .where(
-                TeamEventLog.season_id == season_id,
-                TeamEventLog.action == "GAME_PLAY",
-                TeamEventLog.user_id.isnot(None),
-            )
-            .group_by(TeamEventLog.team_id, TeamEventLog.user_id)
+                TeamMemberScore.team_id,
+                TeamMemberScore.user_id,
+                TeamMemberScore.game_points.label("points"),
+            ).where(TeamMemberScore.season_id == season_id)
         ).all()
 
         contrib_map: dict[int, dict[int, int]] = {}
@@ -640,36 +962,46 @@ class TeamBattleService:
 
     def _compute_activity_rows(
         self,
-        rows: Iterable[ExternalRankingData],
+        rows: Iterable[tuple],
         target_date: date,
         start: datetime,
         end: datetime,
-    ) -> list[dict]:
-        results: list[dict] = []
-        for row in rows:
-            if not row:
-                continue
+    ) -> Iterator[tuple[int, int, int]]:
+        """Yield (user_id, deposit, plays) for users active on target_date.
+
+        `rows` are (user_id, deposit_amount, play_count, daily_base_deposit, daily_base_play,
+        last_daily_reset, updated_at) tuples, streamed straight from the column select.
+        """
+
+        for user_id, deposit_amount, play_count, base_deposit, base_play, last_reset, updated_at in rows:
             deposit_delta = 0
             play_delta = 0
-            if row.last_daily_reset and row.last_daily_reset == target_date:
-                deposit_delta = max((row.deposit_amount or 0) - (row.daily_base_deposit or 0), 0)
-                play_delta = max((row.play_count or 0) - (row.daily_base_play or 0), 0)
-            elif row.updated_at and start <= row.updated_at < end:
+            touched = bool(updated_at and start <= updated_at < end)
+            if last_reset and last_reset == target_date:
+                deposit_delta = max((deposit_amount or 0) - (base_deposit or 0), 0)
+                play_delta = max((play_count or 0) - (base_play or 0), 0)
+            elif touched:
                 # Fallback: treat entire amounts as today's activity if updated during window
-                deposit_delta = max(row.deposit_amount or 0, 0)
-                play_delta = max(row.play_count or 0, 0)
+                deposit_delta = max(deposit_amount or 0, 0)
+                play_delta = max(play_count or 0, 0)
 
-            active = deposit_delta > 0 or play_delta > 0 or (row.updated_at and start <= row.updated_at < end)
-            if not active:
-                continue
-            results.append(
-                {
-                    "user_id": row.user_id,
-                    "deposit": int(deposit_delta),
-                    "plays": int(play_delta),
-                }
-            )
-        return results
+            if deposit_delta > 0 or play_delta > 0 or touched:
+                yield user_id, int(deposit_delta), int(play_delta)
+
+    def _balance_teams(self, db: Session, season_id: Optional[int], team_ids: Optional[Sequence[int]]) -> tuple[TeamSeason, list[int]]:
+        season = db.get(TeamSeason, season_id) if season_id else self._get_active_or_current(db)
+        if not season:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NO_ACTIVE_TEAM_SEASON")
+
+        stmt = select(Team.id).where(Team.is_active == True).order_by(Team.id)  # noqa: E712
+        if team_ids:
+            stmt = stmt.where(Team.id.in_(team_ids))
+        ids = list(db.execute(stmt).scalars().all())
+        if team_ids and len(ids) != len(set(team_ids)):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="TEAM_NOT_FOUND")
+        if len(ids) < 2:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="REQUIRES_TWO_ACTIVE_TEAMS")
+        return season, ids
 
     def compute_balanced_teams(
         self,
@@ -678,72 +1010,109 @@ class TeamBattleService:
         target_date: Optional[date] = None,
         weight_deposit: float = DEFAULT_WEIGHT_DEPOSIT,
         weight_play: float = DEFAULT_WEIGHT_PLAY,
+        team_ids: Optional[Sequence[int]] = None,
     ) -> dict:
-        season = db.get(TeamSeason, season_id) if season_id else self._get_active_or_current(db)
-        if not season:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NO_ACTIVE_TEAM_SEASON")
+        """Split yesterday's (or target_date's) active users over K teams with similar total scores.
 
-        teams = db.execute(select(Team).where(Team.is_active == True)).scalars().all()  # noqa: E712
-        if len(teams) != 2:
-            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="REQUIRES_TWO_ACTIVE_TEAMS")
+        Only the needed columns are streamed (BALANCE_FETCH_SIZE rows at a time) into flat
+        arrays; users are ranked by score and handed out greedily (LPT) to the team with the
+        lowest running total. `assignments` holds the user ids per team, in `teams` order.
+        """
+
+        season, ids = self._balance_teams(db, season_id, team_ids)
 
         target_date = target_date or (self._now_utc().date() - timedelta(days=1))
         start, end = self._day_bounds_for_date(target_date)
 
-        rows = db.execute(select(ExternalRankingData)).scalars().all()
-        activity = self._compute_activity_rows(rows, target_date=target_date, start=start, end=end)
-        if not activity:
+        rows = db.execute(
+            select(
+                ExternalRankingData.user_id,
+                ExternalRankingData.deposit_amount,
+                ExternalRankingData.play_count,
+                ExternalRankingData.daily_base_deposit,
+                ExternalRankingData.daily_base_play,
+                ExternalRankingData.last_daily_reset,
+                ExternalRankingData.updated_at,
+            ).execution_options(yield_per=self.BALANCE_FETCH_SIZE)
+        ).tuples()
+        user_ids = array("q")
+        deposits = array("q")
+        plays = array("q")
+        for user_id, deposit, play in self._compute_activity_rows(rows, target_date=target_date, start=start, end=end):
+            user_ids.append(user_id)
+            deposits.append(deposit)
+            plays.append(play)
+        if not user_ids:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="NO_ACTIVE_USERS")
 
-        deposits = [row["deposit"] for row in activity if row["deposit"] > 0]
-        plays = [row["plays"] for row in activity if row["plays"] > 0]
-        cap_deposit = self._percentile(deposits, 95) or max(deposits, default=0)
-        cap_plays = self._percentile(plays, 95) or max(plays, default=0)
+        positive_deposits = sorted(v for v in deposits if v > 0)
+        positive_plays = sorted(v for v in plays if v > 0)
+        cap_deposit = self._percentile(positive_deposits, 95) or (positive_deposits[-1] if positive_deposits else 0)
+        cap_plays = self._percentile(positive_plays, 95) or (positive_plays[-1] if positive_plays else 0)
+
+        scores = array(
+            "d",
+            (
+                weight_deposit * self._normalize(d, cap_deposit) + weight_play * self._normalize(p, cap_plays)
+                for d, p in zip(deposits, plays)
+            ),
+        )
+        order = sorted(range(len(user_ids)), key=lambda i: (-scores[i], -deposits[i], -plays[i], user_ids[i]))
 
+        # Shuffle users with identical scores (within epsilon) for opacity
         seed = int(f"{season.id}{target_date.strftime('%Y%m%d')}")
         rng = random.Random(seed)
-
-        scored = []
-        for row in activity:
-            deposit_norm = self._normalize(row["deposit"], cap_deposit)
-            play_norm = self._normalize(row["plays"], cap_plays)
-            score = (weight_deposit * deposit_norm) + (weight_play * play_norm)
-            scored.append({
-                "user_id": row["user_id"],
-                "deposit": row["deposit"],
-                "plays": row["plays"],
-                "score": score,
-            })
-
-        scored.sort(key=lambda x: (-x["score"], -x["deposit"], -x["plays"], x["user_id"]))
-
-        # Shuffle users with identical scores (within epsilon) for opacity
         epsilon = 1e-9
         i = 0
-        while i < len(scored):
+        while i < len(order):
             j = i + 1
-            while j < len(scored) and abs(scored[j]["score"] - scored[i]["score"]) <= epsilon:
+            while j < len(order) and abs(scores[order[j]] - scores[order[i]]) <= epsilon:
                 j += 1
             if j - i > 1:
-                rng.shuffle(scored[i:j])
+                block = order[i:j]
+                rng.shuffle(block)
+                order[i:j] = block
             i = j
 
-        team_totals = [0.0, 0.0]
-        team_members: list[list[dict]] = [[], []]
-
-        for row in scored:
-            idx = 0 if team_totals[0] <= team_totals[1] else 1
-            team_members[idx].append(row)
-            team_totals[idx] += row["score"]
+        # LPT: the next-highest score goes to the team with the lowest (total, size).
+        heap = [(0.0, 0, idx) for idx in range(len(ids))]
+        team_totals = [0.0] * len(ids)
+        team_members: list[list[int]] = [[] for _ in ids]
+        for i in order:
+            total, size, idx = heapq.heappop(heap)
+            total += scores[i]
+            team_members[idx].append(user_ids[i])
+            team_totals[idx] = total
+            heapq.heappush(heap, (total, size + 1, idx))
 
         return {
             "season_id": season.id,
             "target_date": target_date.isoformat(),
-            "teams": [teams[0].id, teams[1].id],
-            "assignments": [team_members[0], team_members[1]],
+            "teams": ids,
+            "assignments": team_members,
             "totals": team_totals,
+            "team_counts": [len(members) for members in team_members],
         }
 
+    def _upsert_memberships(self, db: Session, rows: list[dict]) -> None:
+        """Insert or re-team TeamMember rows (executemany of one cached upsert); existing roles are kept."""
+
+        table = TeamMember.__table__
+        dialect = db.bind.dialect.name
+        if dialect == "mysql":
+            stmt = mysql_insert(table)
+            db.execute(stmt.on_duplicate_key_update(team_id=stmt.inserted.team_id), rows)
+            return
+        if dialect == "sqlite":
+            stmt = sqlite_insert(table)
+            db.execute(stmt.on_conflict_do_update(index_elements=[table.c.user_id], set_={"team_id": stmt.excluded.team_id}), rows)
+            return
+
+        for row in rows:
+            result = db.execute(update(table).where(table.c.user_id == row["user_id"]).values(team_id=row["team_id"]))
+            if result.rowcount == 0:
+                db.execute(insert(table).values(**row))
+
     def apply_balanced_teams(
         self,
         db: Session,
@@ -751,6 +1120,7 @@ class TeamBattleService:
         target_date: Optional[date] = None,
         weight_deposit: float = DEFAULT_WEIGHT_DEPOSIT,
         weight_play: float = DEFAULT_WEIGHT_PLAY,
+        team_ids: Optional[Sequence[int]] = None,
     ) -> dict:
         plan = self.compute_balanced_teams(
             db,
@@ -758,29 +1128,30 @@ class TeamBattleService:
             target_date=target_date,
             weight_deposit=weight_deposit,
             weight_play=weight_play,
+            team_ids=team_ids,
         )
-        team_ids = plan["teams"]
-        assignments = plan["assignments"]
-
-        # Persist memberships (bypass selection window and allow moves)
-        for idx, rows in enumerate(assignments):
-            team_id = team_ids[idx]
-            for row in rows:
-                member = db.get(TeamMember, row["user_id"])
-                if member and member.team_id == team_id:
-                    continue
-                if member:
-                    member.team_id = team_id
-                    member.role = member.role or "member"
-                    db.add(member)
-                else:
-                    db.add(TeamMember(user_id=row["user_id"], team_id=team_id, role="member"))
+
+        # Persist memberships (bypass selection window and allow moves). Chunks bound the statement
+        # size only; the whole assignment commits once, so a failure leaves every user on their old team.
+        now = self._now_utc()
+        chunk: list[dict] = []
+        for team_id, user_ids in zip(plan["teams"], plan["assignments"]):
+            for user_id in user_ids:
+                chunk.append({"user_id": user_id, "team_id": team_id, "role": "member", "joined_at": now})
+                if len(chunk) >= self.BALANCE_WRITE_CHUNK_SIZE:
+                    self._upsert_memberships(db, chunk)
+                    chunk = []
+        if chunk:
+            self._upsert_memberships(db, chunk)
         db.commit()
+        # Memberships changed behind the identity map.
+        db.expire_all()
 
+        counts = plan["team_counts"]
         plan.update(
             {
-                "team1_count": len(assignments[0]),
-                "team2_count": len(assignments[1]),
+                "team1_count": counts[0],
+                "team2_count": counts[1],
             }
         )
         return plan
@@ -793,27 +1164,20 @@ class TeamBattleService:
         from app.models.user import User
 
         member_count = func.count(func.distinct(User.id)).label("member_count")
-        latest_event = func.max(TeamEventLog.created_at).label("latest_event_at")
-        latest_nulls_last = case((latest_event.is_(None), 1), else_=0)
+        totals = self._team_totals(season.id)
+        latest_event = totals.c.last_event_at.label("latest_event_at")
+        latest_nulls_last = case((totals.c.last_event_at.is_(None), 1), else_=0)
         stmt = (
-            select(TeamScore.team_id, Team.name, TeamScore.points, member_count, latest_event)
-            .join(Team, Team.id == TeamScore.team_id)
-            .outerjoin(TeamMember, TeamMember.team_id == TeamScore.team_id)
+            select(totals.c.team_id, Team.name, totals.c.points, member_count, latest_event)
+            .join(Team, Team.id == totals.c.team_id)
+            .outerjoin(TeamMember, TeamMember.team_id == totals.c.team_id)
             .outerjoin(User, and_(User.id == TeamMember.user_id, User.status == "ACTIVE"))
-            .outerjoin(
-                TeamEventLog,
-                and_(
-                    TeamEventLog.team_id == TeamScore.team_id,
-                    TeamEventLog.season_id == TeamScore.season_id,
-                ),
-            )
-            .where(TeamScore.season_id == season.id)
-            .group_by(TeamScore.team_id, Team.name, TeamScore.points)
+            .group_by(totals.c.team_id, Team.name, totals.c.points, totals.c.last_event_at)
             .order_by(
-                TeamScore.points.desc(),
+                totals.c.points.desc(),
                 latest_nulls_last,
-                latest_event.desc(),
-                TeamScore.team_id.asc(),
+                totals.c.last_event_at.desc(),
+                totals.c.team_id.asc(),
             )
             .offset(offset)
             .limit(limit)
@@ -847,26 +1211,25 @@ class TeamBattleService:
         if not season:
             return []
         # Include members with zero points so 참여자 목록 is visible even before 점수 적립
-        points_sum = func.coalesce(func.sum(TeamEventLog.delta), 0).label("points")
-        latest_event = func.max(TeamEventLog.created_at).label("latest_event_at")
-        latest_nulls_last = case((latest_event.is_(None), 1), else_=0)
+        points = func.coalesce(TeamMemberScore.points, 0).label("points")
+        latest_event = TeamMemberScore.last_event_at.label("latest_event_at")
+        latest_nulls_last = case((TeamMemberScore.last_event_at.is_(None), 1), else_=0)
         stmt = (
-            select(TeamMember.user_id, User.nickname, points_sum, latest_event)
+            select(TeamMember.user_id, User.nickname, points, latest_event)
             .join(User, User.id == TeamMember.user_id)
             .where(TeamMember.team_id == team_id, User.status == "ACTIVE")
             .outerjoin(
-                TeamEventLog,
+                TeamMemberScore,
                 and_(
-                    TeamEventLog.team_id == TeamMember.team_id,
-                    TeamEventLog.user_id == TeamMember.user_id,
-                    TeamEventLog.season_id == season.id,
+                    TeamMemberScore.season_id == season.id,
+                    TeamMemberScore.team_id == TeamMember.team_id,
+                    TeamMemberScore.user_id == TeamMember.user_id,
                 ),
             )
-            .group_by(TeamMember.user_id, User.nickname)
             .order_by(
-                points_sum.desc(),
+                points.desc(),
                 latest_nulls_last,
-                latest_event.desc(),
+                TeamMemberScore.last_event_at.desc(),
                 TeamMember.user_id.asc(),
             )
             .offset(offset)
@@ -881,11 +1244,11 @@ class TeamBattleService:
         if not season:
             return None
 
-        points_sum = func.coalesce(func.sum(TeamEventLog.delta), 0).label("points")
-        latest_event = func.max(TeamEventLog.created_at).label("latest_event_at")
+        points = func.coalesce(TeamMemberScore.points, 0).label("points")
+        latest_event = TeamMemberScore.last_event_at.label("latest_event_at")
 
         stmt = (
-            select(TeamMember.user_id, User.nickname, points_sum, latest_event)
+            select(TeamMember.user_id, User.nickname, points, latest_event)
             .join(User, User.id == TeamMember.user_id)
             .where(
                 TeamMember.team_id == team_id,
@@ -893,14 +1256,13 @@ class TeamBattleService:
                 User.status == "ACTIVE",
             )
             .outerjoin(
-                TeamEventLog,
+                TeamMemberScore,
                 and_(
-                    TeamEventLog.team_id == TeamMember.team_id,
-                    TeamEventLog.user_id == TeamMember.user_id,
-                    TeamEventLog.season_id == season.id,
+                    TeamMemberScore.season_id == season.id,
+                    TeamMemberScore.team_id == TeamMember.team_id,
+                    TeamMemberScore.user_id == TeamMember.user_id,
                 ),
             )
-            .group_by(TeamMember.user_id, User.nickname)
         )
 
         return db.execute(stmt).first()
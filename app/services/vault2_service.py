@@ -15,13 +15,15 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
-from app.models.vault2 import VaultProgram, VaultStatus
+from app.models.vault2 import VaultProgram, VaultStatus, VaultStatusEvent
 from app.models.admin_audit_log import AdminAuditLog
 from app.models.vault_earn_event import VaultEarnEvent
 from app.models.user_cash_ledger import UserCashLedger
 from app.models.user import User
-from sqlalchemy import func, select
+from sqlalchemy import JSON, func, insert, literal, select, update
 from app.services.audit_service import AuditService
+from app.core.metrics import VAULT2_SWEEP_ROWS, VAULT2_TRANSITIONS
+from app.services.config_cache import NS_VAULT, VaultProgramSnapshot, config_cache, invalidate_vault_config
 
 
 # Default config knobs for Vault program operations
@@ -73,11 +75,20 @@ class Vault2Service:
             return self._ensure_default_program(db)
         return db.query(VaultProgram).filter(VaultProgram.key == self.DEFAULT_PROGRAM_KEY).one_or_none()
 
+    def get_program_snapshot(self, db: Session, *, ensure: bool = False) -> VaultProgramSnapshot | None:
+        """Return the default program as a cached snapshot (reloaded after admin edits)."""
+
+        def load() -> VaultProgramSnapshot | None:
+            program = self.get_default_program(db, ensure=ensure)
+            return VaultProgramSnapshot.from_orm(program) if program is not None else None
+
+        return config_cache.get_or_load(NS_VAULT, self.DEFAULT_PROGRAM_KEY, load)
+
     def get_config_value(self, db: Session, key: str, default: Any = None) -> Any:
         """Helper to get value from the default program's config_json."""
-        program = self.get_default_program(db, ensure=False)
-        if program and isinstance(program.config_json, dict):
-            return program.config_json.get(key, default)
+        snapshot = self.get_program_snapshot(db)
+        if snapshot is not None:
+            return snapshot.config_json.get(key, default)
         return default
 
     def update_config_value(self, db: Session, *, program_key: str, key: str, value: Any, admin_id: int = 0) -> VaultProgram:
@@ -108,6 +119,7 @@ class Vault2Service:
 
         db.add(program)
         db.commit()
+        invalidate_vault_config()
         db.refresh(program)
         return program
 
@@ -156,6 +168,7 @@ class Vault2Service:
 
         db.add(program)
         db.commit()
+        invalidate_vault_config()
         db.refresh(program)
         return program
 
@@ -202,6 +215,7 @@ class Vault2Service:
         
         db.add(program)
         db.commit()
+        invalidate_vault_config()
         db.refresh(program)
         return program
 
@@ -221,6 +235,7 @@ class Vault2Service:
         
         db.add(program)
         db.commit()
+        invalidate_vault_config()
         db.refresh(program)
         return program
 
@@ -240,6 +255,7 @@ class Vault2Service:
         
         db.add(program)
         db.commit()
+        invalidate_vault_config()
         db.refresh(program)
         return program
 
@@ -254,16 +270,29 @@ class Vault2Service:
             return 0
 
     @staticmethod
-    def _append_event(status: VaultStatus, event: dict[str, Any]) -> None:
-        payload = status.progress_json or {}
-        if not isinstance(payload, dict):
-            payload = {}
-        events = payload.get("events")
-        if not isinstance(events, list):
-            events = []
-        events.append(event)
-        payload["events"] = events
-        status.progress_json = payload
+    def _append_event(
+        db: Session,
+        status: VaultStatus,
+        *,
+        event_type: str,
+        amount: int,
+        at: datetime,
+        trigger: str | None = None,
+        meta: dict[str, Any] | None = None,
+    ) -> VaultStatusEvent:
+        """Insert one row into the append-only history (never touches progress_json)."""
+        event = VaultStatusEvent(
+            status_id=status.id,
+            user_id=status.user_id,
+            program_id=status.program_id,
+            event_type=event_type,
+            amount=int(amount),
+            trigger=trigger,
+            meta_json=meta,
+            created_at=at,
+        )
+        db.add(event)
+        return event
 
     def get_or_create_status(self, db: Session, *, user_id: int, program: VaultProgram) -> VaultStatus:
         row = (
@@ -305,14 +334,7 @@ class Vault2Service:
         if status.locked_at is None:
             status.locked_at = now_dt
         status.expires_at = self.compute_expires_at(status.locked_at, int(program.duration_hours or 24))
-        self._append_event(
-            status,
-            {
-                "type": "ACCRUE_LOCKED",
-                "amount": int(amount),
-                "at": now_dt.isoformat(),
-            },
-        )
+        self._append_event(db, status, event_type="ACCRUE_LOCKED", amount=amount, at=now_dt)
 
         db.add(status)
         if commit:
@@ -333,7 +355,7 @@ class Vault2Service:
         now: datetime | None = None,
         commit: bool = True,
     ) -> VaultStatus:
-        """Record an unlock event in Vault2 status progress JSON (Phase 2 prep).
+        """Record an unlock event in the Vault2 event history (Phase 2 prep).
 
         In current v1 behavior, unlock is paid into cash immediately.
         This method only records the event for future migration/observability.
@@ -342,14 +364,13 @@ class Vault2Service:
         program = self._ensure_default_program(db)
         status = self.get_or_create_status(db, user_id=user_id, program=program)
         self._append_event(
+            db,
             status,
-            {
-                "type": "UNLOCK",
-                "amount": int(unlock_amount),
-                "trigger": trigger,
-                "meta": meta or {},
-                "at": now_dt.isoformat(),
-            },
+            event_type="UNLOCK",
+            amount=unlock_amount,
+            at=now_dt,
+            trigger=trigger,
+            meta=meta or {},
         )
         db.add(status)
         if commit:
@@ -365,75 +386,143 @@ class Vault2Service:
         locked -> available: when expires_at <= now.
         available -> expired: when `available_grace_hours` is set and the grace window passes.
 
-        Returns number of rows updated.
+        `limit` is the chunk size; the whole backlog is processed. Returns number of rows updated.
+        """
+        stats = self.sweep_transitions(db, now=now, chunk_size=limit, commit=commit)
+        return stats["available"] + stats["expired"]
+
+    def sweep_transitions(
+        self,
+        db: Session,
+        *,
+        now: datetime | None = None,
+        chunk_size: int = 500,
+        commit: bool = True,
+    ) -> dict[str, int]:
+        """Set-based transition sweep: one UPDATE per keyset chunk of ids (commits per chunk).
+
+        Each chunk first appends a TRANSITION vault_status_event per row (INSERT ... SELECT, amount
+        read before the UPDATE: the unlocked locked_amount or the forfeited available_amount).
+        ORM instances already loaded in `db` are not refreshed.
         """
         now_dt = now or datetime.utcnow()
-        updated = 0
+        chunk_size = max(int(chunk_size), 1)
 
         # 1) LOCKED -> AVAILABLE
-        locked_rows = (
-            db.query(VaultStatus, VaultProgram)
-            .join(VaultProgram, VaultProgram.id == VaultStatus.program_id)
-            .filter(VaultStatus.state == "LOCKED", VaultStatus.expires_at.isnot(None), VaultStatus.expires_at <= now_dt)
-            .limit(limit)
-            .all()
-        )
-        for status, program in locked_rows:
-            locked_amt = int(status.locked_amount or 0)
-            if locked_amt > 0:
-                status.available_amount = int(getattr(status, "available_amount", 0) or 0) + locked_amt
-            status.locked_amount = 0
-            status.state = "AVAILABLE"
-            self._append_event(status, {"type": "TRANSITION", "from": "LOCKED", "to": "AVAILABLE", "at": now_dt.isoformat()})
-            # Track available_since for optional expiry.
-            payload = status.progress_json or {}
-            if isinstance(payload, dict) and "available_since" not in payload:
-                payload["available_since"] = now_dt.isoformat()
-                status.progress_json = payload
-            db.add(status)
-            updated += 1
-
-        # 2) AVAILABLE -> EXPIRED (optional)
-        available_rows = (
-            db.query(VaultStatus, VaultProgram)
-            .join(VaultProgram, VaultProgram.id == VaultStatus.program_id)
-            .filter(VaultStatus.state == "AVAILABLE")
-            .limit(limit)
-            .all()
+        available = self._sweep_chunks(
+            db,
+            (VaultStatus.state == "LOCKED", VaultStatus.expires_at.isnot(None), VaultStatus.expires_at <= now_dt),
+            {
+                "available_amount": VaultStatus.available_amount + VaultStatus.locked_amount,
+                "locked_amount": 0,
+                "state": "AVAILABLE",
+                # Keep the first available_since for the optional expiry window.
+                "available_since": func.coalesce(VaultStatus.available_since, now_dt),
+                "updated_at": now_dt,
+            },
+            event=(VaultStatus.locked_amount, {"from": "LOCKED", "to": "AVAILABLE"}, now_dt),
+            chunk_size=chunk_size,
+            commit=commit,
         )
-        for status, program in available_rows:
+
+        # 2) AVAILABLE -> EXPIRED (optional, per program grace window)
+        expired = 0
+        for program in db.query(VaultProgram).order_by(VaultProgram.id.asc()).all():
             grace_hours = self._get_available_grace_hours(program)
             if grace_hours <= 0:
                 continue
+            expired += self._sweep_chunks(
+                db,
+                (
+                    VaultStatus.program_id == program.id,
+                    VaultStatus.state == "AVAILABLE",
+                    VaultStatus.available_since.isnot(None),
+                    VaultStatus.available_since <= now_dt - timedelta(hours=grace_hours),
+                ),
+                {"available_amount": 0, "state": "EXPIRED", "updated_at": now_dt},
+                event=(VaultStatus.available_amount, {"from": "AVAILABLE", "to": "EXPIRED"}, now_dt),
+                chunk_size=chunk_size,
+                commit=commit,
+            )
+
+        VAULT2_TRANSITIONS.inc(available, transition="LOCKED_TO_AVAILABLE")
+        VAULT2_TRANSITIONS.inc(expired, transition="AVAILABLE_TO_EXPIRED")
+        VAULT2_SWEEP_ROWS.observe(available + expired)
+        return {"available": available, "expired": expired}
 
-            payload = status.progress_json or {}
-            available_since_raw = payload.get("available_since") if isinstance(payload, dict) else None
-            if not available_since_raw:
-                continue
-
-            try:
-                available_since = datetime.fromisoformat(str(available_since_raw))
-            except ValueError:
-                continue
-
-            if available_since + timedelta(hours=grace_hours) <= now_dt:
-                expired_amt = int(getattr(status, "available_amount", 0) or 0)
-                status.available_amount = 0
-                status.state = "EXPIRED"
-                self._append_event(
-                    status,
-                    {"type": "TRANSITION", "from": "AVAILABLE", "to": "EXPIRED", "expired_amount": expired_amt, "at": now_dt.isoformat()},
+    @staticmethod
+    def _sweep_chunks(
+        db: Session,
+        conditions: tuple,
+        values: dict[str, Any],
+        *,
+        event: tuple[Any, dict[str, Any], datetime],
+        chunk_size: int,
+        commit: bool,
+    ) -> int:
+        amount, meta, at = event
+        moved = 0
+        last_id = 0
+        while True:
+            ids = (
+                db.execute(
+                    select(VaultStatus.id)
+                    .where(*conditions, VaultStatus.id > last_id)
+                    .order_by(VaultStatus.id.asc())
+                    .limit(chunk_size)
                 )
-                db.add(status)
-                updated += 1
-
-        if updated > 0:
+                .scalars()
+                .all()
+            )
+            if not ids:
+                break
+            # Conditions are re-checked so rows changed since the id scan are left alone.
+            in_chunk = (*conditions, VaultStatus.id > last_id, VaultStatus.id <= ids[-1])
+            db.execute(
+                insert(VaultStatusEvent).from_select(
+                    ["status_id", "user_id", "program_id", "event_type", "amount", "meta_json", "created_at"],
+                    select(
+                        VaultStatus.id,
+                        VaultStatus.user_id,
+                        VaultStatus.program_id,
+                        literal("TRANSITION"),
+                        amount,
+                        literal(meta, JSON),
+                        literal(at),
+                    ).where(*in_chunk),
+                )
+            )
+            result = db.execute(
+                update(VaultStatus)
+                .where(*in_chunk)
+                # MySQL applies SET assignments left to right; keep the caller's order.
+                .ordered_values(*values.items())
+                .execution_options(synchronize_session=False)
+            )
+            moved += int(result.rowcount or 0)
+            last_id = ids[-1]
             if commit:
                 db.commit()
             else:
                 db.flush()
+            if len(ids) < chunk_size:
+                break
+        return moved
 
-        return updated
+    def list_events(
+        self,
+        db: Session,
+        *,
+        user_id: int,
+        limit: int = 20,
+        before_id: int | None = None,
+    ) -> list[VaultStatusEvent]:
+        """Page a user's event history newest first; pass the last id seen as before_id."""
+        stmt = select(VaultStatusEvent).where(VaultStatusEvent.user_id == user_id)
+        if before_id is not None:
+            stmt = stmt.where(VaultStatusEvent.id < before_id)
+        stmt = stmt.order_by(VaultStatusEvent.id.desc()).limit(limit)
+        return list(db.execute(stmt).scalars().all())
 
     def list_programs(self, db: Session) -> list[VaultProgram]:
         return db.query(VaultProgram).order_by(VaultProgram.id.asc()).all()
@@ -7,23 +7,35 @@ Phase 1 rules implemented here:
 
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import select, update
 from sqlalchemy.orm import Session
 
+from app.core import metrics
 from app.core.config import get_settings
 from app.models.new_member_dice import NewMemberDiceEligibility
 from app.models.user import User
 from app.models.vault_earn_event import VaultEarnEvent
 from app.core.notifications import notify_vault_skip_error
+from app.db.idempotency import insert_if_absent
 from app.services.reward_service import RewardService
 from app.services.vault2_service import Vault2Service
 
 
+@lru_cache(maxsize=16)
+def _multiplier_window_utc(start_kst: date, end_kst: date, tz_name: str) -> tuple[datetime, datetime]:
+    """Inclusive local date window -> half-open naive-UTC datetime range [start, end)."""
+
+    tz = ZoneInfo(tz_name)
+    start = datetime.combine(start_kst, dt_time.min, tzinfo=tz).astimezone(timezone.utc)
+    end = datetime.combine(end_kst + timedelta(days=1), dt_time.min, tzinfo=tz).astimezone(timezone.utc)
+    return start.replace(tzinfo=None), end.replace(tzinfo=None)
+
+
 class VaultService:
     VAULT_SEED_AMOUNT = 10_000
     VAULT_FILL_AMOUNT = 5_000
@@ -47,18 +59,14 @@ class VaultService:
         """Return a multiplier for vault accrual amounts.
 
         Priority:
-        1. VaultProgram.config_json["accrual_multiplier"] (if db provided)
-        2. Settings (env) if enabled
+        1. VaultProgram.config_json["accrual_multiplier"] (if db provided; cached program snapshot)
+        2. Settings (env) if enabled and `now` falls inside the KST date window
         3. Default 1.0
         """
-        # Try DB first if session available
         if db is not None:
-            db_val = Vault2Service().get_config_value(db, "accrual_multiplier")
-            if db_val is not None:
-                try:
-                    return max(float(db_val), 1.0)
-                except (TypeError, ValueError):
-                    pass
+            snapshot = Vault2Service().get_program_snapshot(db)
+            if snapshot is not None and snapshot.accrual_multiplier is not None:
+                return snapshot.accrual_multiplier
 
         # Fallback to legacy settings
         settings = get_settings()
@@ -74,17 +82,16 @@ class VaultService:
         value = max(raw_value, 1.0)
 
         now_dt = now or datetime.utcnow()
-        if now_dt.tzinfo is None:
-            now_dt = now_dt.replace(tzinfo=timezone.utc)
-        tz = ZoneInfo(getattr(settings, "timezone", "Asia/Seoul"))
-        today_kst = now_dt.astimezone(tz).date()
+        if now_dt.tzinfo is not None:
+            now_dt = now_dt.astimezone(timezone.utc).replace(tzinfo=None)
+        window_start, window_end = _multiplier_window_utc(start_kst, end_kst, getattr(settings, "timezone", "Asia/Seoul"))
 
-        if start_kst <= today_kst <= end_kst:
+        if window_start <= now_dt < window_end:
             return value
         return 1.0
 
     @classmethod
-    def phase1_unlock_rules_json(cls, now: datetime | None = None) -> dict:
+    def phase1_unlock_rules_json(cls, now: datetime | None = None, db: Session | None = None) -> dict:
         """Return unlock rules JSON for UI.
 
         Keep Phase 1 deposit-unlock tiers for backward compatibility, while also exposing
@@ -92,10 +99,7 @@ class VaultService:
         """
 
         settings = get_settings()
-        # Note: phase1_unlock_rules_json doesn't have db here but it's called from vault.py status which has db
-        # If we want accuracy we should pass db here too. 
-        # For now I will keep it as is or update signature if needed.
-        mult = cls.vault_accrual_multiplier(now=now)
+        mult = cls.vault_accrual_multiplier(db, now)
         return {
             "version": 2,
             "program_key": cls.PROGRAM_KEY,
@@ -164,6 +168,68 @@ class VaultService:
         # Timer is already active; do NOT extend (Fixed window).
         return False
 
+    @staticmethod
+    def effective_locked(user: User, now: datetime) -> tuple[int, datetime | None]:
+        """Return (locked_balance, expires_at) as the expiry job will leave them.
+
+        Status reads use this instead of writing, so a due balance shows as expired even
+        before the job has reached the row.
+        """
+        locked = int(getattr(user, "vault_locked_balance", 0) or 0)
+        expires_at = getattr(user, "vault_locked_expires_at", None)
+        if expires_at is not None and expires_at <= now:
+            return 0, None
+        return locked, expires_at
+
+    @classmethod
+    def expire_due_locked_balances(
+        cls,
+        db: Session,
+        *,
+        now: datetime | None = None,
+        chunk_size: int = 500,
+        commit: bool = True,
+    ) -> dict[str, int]:
+        """Bulk-expire Phase 1 locked balances whose timer is due (commits per chunk).
+
+        Expired rows drop out of the `vault_locked_expires_at <= now` predicate, so re-running
+        (or resuming after a crash) only touches what is still due. ORM instances already
+        loaded in `db` are not refreshed.
+        """
+        now_dt = now or datetime.utcnow()
+        chunk_size = max(int(chunk_size), 1)
+        due = (User.vault_locked_expires_at.isnot(None), User.vault_locked_expires_at <= now_dt)
+
+        users = 0
+        amount = 0
+        while True:
+            rows = db.execute(
+                select(User.id, User.vault_locked_balance)
+                .where(*due)
+                .order_by(User.vault_locked_expires_at.asc(), User.id.asc())
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+            result = db.execute(
+                update(User)
+                .where(User.id.in_([row.id for row in rows]), *due)
+                .values(vault_locked_balance=0, vault_balance=0, vault_locked_expires_at=None)
+                .execution_options(synchronize_session=False)
+            )
+            users += int(result.rowcount or 0)
+            amount += sum(int(row.vault_locked_balance or 0) for row in rows)
+            if commit:
+                db.commit()
+            else:
+                db.flush()
+            if len(rows) < chunk_size:
+                break
+
+        metrics.VAULT_LOCKED_EXPIRED.inc(users)
+        metrics.VAULT_LOCKED_EXPIRED_AMOUNT.inc(amount)
+        return {"users": users, "amount": amount}
+
     @classmethod
     def _expire_locked_if_due(cls, user: User, now: datetime) -> bool:
         """Expire locked balance when `vault_locked_expires_at` is due.
@@ -239,12 +305,12 @@ class VaultService:
 
         Default: 모두 허용. 단, VaultProgram config_json에 allow/block 정책이 있으면 그것을 우선 적용한다.
         """
-        cfg_service = Vault2Service()
-        program = cfg_service.get_default_program(db, ensure=True)
-        cfg = {} if program is None else (program.config_json or {})
-        mode = (cfg.get("eligibility_mode") or "all").lower()
-        allow = set(cfg.get("eligibility_allow") or [])
-        block = set(cfg.get("eligibility_block") or [])
+        snapshot = Vault2Service().get_program_snapshot(db, ensure=True)
+        if snapshot is None:
+            return True
+        mode = snapshot.eligibility_mode
+        allow = snapshot.eligibility_allow
+        block = snapshot.eligibility_block
 
         if mode == "allowlist":
             return user_id in allow
@@ -259,15 +325,8 @@ class VaultService:
         eligible = self._eligible(db, user_id, now_dt)
         user = self._get_or_create_user(db, user_id)
 
-        # Expire due locked balance (Phase 1) without auto-seeding.
-        mutated = self._expire_locked_if_due(user, now_dt)
-        # Keep legacy mirror consistent even if other code wrote vault_balance directly.
-        # (This is a cheap assignment and helps avoid stale UI.)
-        self.sync_legacy_mirror(user)
-        if mutated:
-            db.add(user)
-            db.commit()
-            db.refresh(user)
+        # Pure read: due locked balances are cleared by expire_due_locked_balances
+        # (scripts/run_vault_locked_expiry.py); callers render them via effective_locked().
 
         # IMPORTANT UX POLICY:
         # Do not auto-seed on status fetch. The initial seed is granted on actual funnel events
@@ -357,8 +416,8 @@ class VaultService:
         tier = None
         
         # 1. Try DB-configured tiers
-        program = Vault2Service().get_default_program(db, ensure=False)
-        rules = getattr(program, "unlock_rules_json", {}) or {}
+        snapshot = Vault2Service().get_program_snapshot(db)
+        rules = (snapshot.unlock_rules_json if snapshot is not None else None) or {}
         p1_config = rules.get("phase1_deposit_unlock", {}) or {}
         tiers = p1_config.get("tiers", []) # List[dict] with min_deposit_delta, unlock_amount
         
@@ -454,6 +513,12 @@ class VaultService:
             db.flush()
         return unlock_amount
 
+    @staticmethod
+    def _record_accrual_metrics(earn_type: str, game_type: str, amount: int) -> None:
+        metrics.VAULT_ACCRUALS.inc(earn_type=earn_type, source=str(game_type).upper())
+        if amount > 0:
+            metrics.VAULT_ACCRUAL_AMOUNT.inc(int(amount), earn_type=earn_type)
+
     def record_game_play_earn_event(
         self,
         db: Session,
@@ -465,6 +530,7 @@ class VaultService:
         outcome: str | None = None,
         payout_raw: dict | None = None,
         now: datetime | None = None,
+        commit: bool = True,
     ) -> int:
         """Idempotently accrue Phase 1 vault locked balance for a game play.
 
@@ -472,6 +538,7 @@ class VaultService:
         - Amount: base +200 per play; for DICE LOSE add +100.
         - Eligibility required (same as Phase 1 vault funnel).
         - Expires-at is set only when absent/expired; never refreshed while active.
+        - The event row is inserted first (insert_if_absent); duplicates return before the user row is locked.
 
         Returns the amount actually added (0 if skipped / duplicate / not eligible).
         """
@@ -479,8 +546,8 @@ class VaultService:
         settings = get_settings()
 
         # DB 우선: VaultProgram config_json.enable_game_earn_events; 없으면 env 사용
-        cfg_service = Vault2Service()
-        db_flag = cfg_service.get_config_value(db, "enable_game_earn_events", None)
+        snapshot = Vault2Service().get_program_snapshot(db)
+        db_flag = snapshot.enable_game_earn_events if snapshot is not None else None
         enable_game_earn = bool(db_flag) if db_flag is not None else bool(getattr(settings, "enable_vault_game_earn_events", False))
         if not enable_game_earn:
             return 0
@@ -493,13 +560,6 @@ class VaultService:
 
         earn_event_id = f"GAME:{str(game_type).upper()}:{int(game_log_id)}"
 
-        # Fast path: already recorded.
-        exists = db.execute(
-            select(VaultEarnEvent.id).where(VaultEarnEvent.earn_event_id == earn_event_id)
-        ).first()
-        if exists is not None:
-            return 0
-
         base_amount = int(self.GAME_EARN_BASE_AMOUNT)
         bonus_amount = 0
         if str(game_type).upper() == "DICE" and str(outcome).upper() == "LOSE":
@@ -512,6 +572,31 @@ class VaultService:
         multiplier = float(self.vault_accrual_multiplier(db, now_dt))
         amount = max(int(round(amount_before_multiplier * multiplier)), amount_before_multiplier)
 
+        # Insert-first idempotency: a duplicate earn_event_id writes nothing and returns here.
+        reward_kind = "BASE" if bonus_amount == 0 else "BASE_PLUS_BONUS"
+        written = insert_if_absent(
+            db,
+            VaultEarnEvent,
+            {
+                "user_id": int(user_id),
+                "earn_event_id": earn_event_id,
+                "earn_type": "GAME_PLAY",
+                "amount": int(amount),
+                "source": str(game_type).upper(),
+                "reward_kind": reward_kind,
+                "game_type": str(game_type).upper(),
+                "token_type": token_type,
+                "payout_raw_json": {
+                    **(payout_raw or {}),
+                    "vault_accrual_multiplier": multiplier,
+                    "amount_before_multiplier": int(amount_before_multiplier),
+                },
+                "created_at": now_dt,
+            },
+        )
+        if not written:
+            return 0
+
         # Lock user row for update when supported.
         q = db.query(User).filter(User.id == user_id)
         if db.bind and db.bind.dialect.name != "sqlite":
@@ -520,8 +605,11 @@ class VaultService:
         if user is None and db.bind and db.bind.dialect.name == "sqlite":
             user = User(id=user_id, external_id=f"test-user-{user_id}")
             db.add(user)
-            db.commit()
-            db.refresh(user)
+            if commit:
+                db.commit()
+                db.refresh(user)
+            else:
+                db.flush()
         if user is None:
             return 0
 
@@ -531,26 +619,7 @@ class VaultService:
         self._ensure_locked_expiry(user, now_dt)
         self.sync_legacy_mirror(user)
 
-        reward_kind = "BASE" if bonus_amount == 0 else "BASE_PLUS_BONUS"
-        event = VaultEarnEvent(
-            user_id=user.id,
-            earn_event_id=earn_event_id,
-            earn_type="GAME_PLAY",
-            amount=int(amount),
-            source=str(game_type).upper(),
-            reward_kind=reward_kind,
-            game_type=str(game_type).upper(),
-            token_type=token_type,
-            payout_raw_json={
-                **(payout_raw or {}),
-                "vault_accrual_multiplier": multiplier,
-                "amount_before_multiplier": int(amount_before_multiplier),
-            },
-            created_at=now_dt,
-        )
-
         db.add(user)
-        db.add(event)
 
         # Phase 2/3-stage prep: record accrual into Vault2 bookkeeping (no v1 behavior change).
         try:
@@ -558,13 +627,12 @@ class VaultService:
         except Exception:
             pass
 
-        try:
+        if commit:
             db.commit()
-        except IntegrityError:
-            # Duplicate earn_event_id raced in; rollback and skip.
-            db.rollback()
-            return 0
+        else:
+            db.flush()
 
+        self._record_accrual_metrics("GAME_PLAY", game_type, amount)
         return int(amount)
 
     def record_trial_result_earn_event(
@@ -579,6 +647,7 @@ class VaultService:
         reward_amount: int | None,
         payout_raw: dict | None = None,
         now: datetime | None = None,
+        commit: bool = True,
     ) -> int:
         """Idempotently route a TRIAL play reward into Vault (Phase 1 locked).
 
@@ -607,10 +676,6 @@ class VaultService:
         reward_id = f"{rt}:{ra}"
         earn_event_id = f"TRIAL:{str(game_type).upper()}:{int(game_log_id)}:{reward_id}"
 
-        exists = db.execute(select(VaultEarnEvent.id).where(VaultEarnEvent.earn_event_id == earn_event_id)).first()
-        if exists is not None:
-            return 0
-
         amount = 0
         amount_before_multiplier = 0
         reward_kind: str | None = None
@@ -644,8 +709,34 @@ class VaultService:
         if amount > 0:
             amount = max(int(round(int(amount) * multiplier)), int(amount))
 
-        # Only mutate vault when amount > 0; still record a 0-amount SKIP event.
-        user = None
+        # Insert-first idempotency; a 0-amount SKIP event is still recorded.
+        written = insert_if_absent(
+            db,
+            VaultEarnEvent,
+            {
+                "user_id": int(user_id),
+                "earn_event_id": earn_event_id,
+                "earn_type": "TRIAL_PAYOUT",
+                "amount": int(amount),
+                "source": str(game_type).upper(),
+                "reward_kind": reward_kind,
+                "game_type": str(game_type).upper(),
+                "token_type": token_type,
+                "payout_raw_json": {
+                    **(payout_raw or {}),
+                    "reward_type": reward_type,
+                    "reward_amount": reward_amount,
+                    "reward_id": reward_id,
+                    "vault_accrual_multiplier": multiplier,
+                    "amount_before_multiplier": int(amount_before_multiplier),
+                },
+                "created_at": now_dt,
+            },
+        )
+        if not written:
+            return 0
+
+        # Only mutate vault when amount > 0.
         if amount > 0:
             q = db.query(User).filter(User.id == user_id)
             if db.bind and db.bind.dialect.name != "sqlite":
@@ -654,8 +745,11 @@ class VaultService:
             if user is None and db.bind and db.bind.dialect.name == "sqlite":
                 user = User(id=user_id, external_id=f"test-user-{user_id}")
                 db.add(user)
-                db.commit()
-                db.refresh(user)
+                if commit:
+                    db.commit()
+                    db.refresh(user)
+                else:
+                    db.flush()
             if user is None:
                 return 0
 
@@ -665,37 +759,16 @@ class VaultService:
             self.sync_legacy_mirror(user)
             db.add(user)
 
-        event = VaultEarnEvent(
-            user_id=int(user_id),
-            earn_event_id=earn_event_id,
-            earn_type="TRIAL_PAYOUT",
-            amount=int(amount),
-            source=str(game_type).upper(),
-            reward_kind=reward_kind,
-            game_type=str(game_type).upper(),
-            token_type=token_type,
-            payout_raw_json={
-                **(payout_raw or {}),
-                "reward_type": reward_type,
-                "reward_amount": reward_amount,
-                "reward_id": reward_id,
-                "vault_accrual_multiplier": multiplier,
-                "amount_before_multiplier": int(amount_before_multiplier),
-            },
-            created_at=now_dt,
-        )
-        db.add(event)
-
         if amount > 0:
             try:
                 Vault2Service().accrue_locked(db, user_id=int(user_id), amount=int(amount), now=now_dt, commit=False)
             except Exception:
                 pass
 
-        try:
+        if commit:
             db.commit()
-        except IntegrityError:
-            db.rollback()
-            return 0
+        else:
+            db.flush()
 
+        self._record_accrual_metrics("TRIAL_PAYOUT", game_type, amount)
         return int(amount) if amount > 0 else 0
@@ -0,0 +1,72 @@
+"""Weighted random selection using Vose's alias method.
+
+Building the table is O(n) in the number of items; each draw is O(1) in time and memory
+regardless of how large the admin-configured weights are (the previous approach expanded
+every item `weight` times into a list before calling random.choice).
+
+The RNG is pluggable: anything with a `random()` method returning a float in [0, 1) works,
+so audits can replay draws with a seeded `random.Random(seed)`.
+"""
+from __future__ import annotations
+
+import random
+from collections.abc import Sequence
+from typing import Generic, Protocol, TypeVar
+
+T = TypeVar("T")
+
+
+class RandomSource(Protocol):
+    def random(self) -> float: ...
+
+
+class AliasSampler(Generic[T]):
+    """Immutable alias table over `items` weighted by non-negative integer/float `weights`."""
+
+    __slots__ = ("items", "_prob", "_alias")
+
+    def __init__(self, items: Sequence[T], weights: Sequence[float]) -> None:
+        if len(items) != len(weights):
+            raise ValueError("items and weights must have the same length")
+        if any(w < 0 for w in weights):
+            raise ValueError("weights must be non-negative")
+        # Zero-weight items can never be drawn; leaving them out also keeps float leftovers
+        # from promoting them to probability 1.0 below.
+        pairs = [(item, w) for item, w in zip(items, weights) if w > 0]
+        total = float(sum(w for _, w in pairs))
+        if not pairs or total <= 0:
+            raise ValueError("total weight must be positive")
+
+        n = len(pairs)
+        scaled = [w * n / total for _, w in pairs]
+        prob = [0.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            s = small.pop()
+            l = large.pop()
+            prob[s] = scaled[s]
+            alias[s] = l
+            scaled[l] = (scaled[l] + scaled[s]) - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+
+        # Leftovers are 1.0 up to floating point error.
+        for i in large + small:
+            prob[i] = 1.0
+
+        self.items: tuple[T, ...] = tuple(item for item, _ in pairs)
+        self._prob = prob
+        self._alias = alias
+
+    def sample(self, rng: RandomSource | None = None) -> T:
+        """Draw one item using a single uniform variate."""
+
+        u = (rng or random).random() * len(self.items)
+        column = int(u)
+        if column >= len(self.items):  # guard against u == n from float rounding
+            column = len(self.items) - 1
+        if (u - column) < self._prob[column]:
+            return self.items[column]
+        return self.items[self._alias[column]]
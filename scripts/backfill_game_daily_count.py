@@ -0,0 +1,108 @@
+"""Backfill user_game_daily_count from existing game logs.
+
+Counts roulette_log / dice_log / lottery_log rows per (user, day) with the same
+DATE(created_at) bucketing the status endpoints used before the counter table, and
+raises counters to those values (counters never decrease, so it is safe to re-run
+while the new code is already incrementing them).
+
+Usage:
+  python scripts/backfill_game_daily_count.py --dry-run
+  python scripts/backfill_game_daily_count.py --apply
+  python scripts/backfill_game_daily_count.py --apply --since 2025-12-01
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from datetime import date, datetime
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.dice import DiceLog
+from app.models.feature import FeatureType
+from app.models.game_daily_count import UserGameDailyCount
+from app.models.lottery import LotteryLog
+from app.models.roulette import RouletteLog
+
+LOG_MODELS = {
+    FeatureType.ROULETTE: RouletteLog,
+    FeatureType.DICE: DiceLog,
+    FeatureType.LOTTERY: LotteryLog,
+}
+
+
+def _load_daily_counts(db: Session, model, since: date | None) -> dict[tuple[int, date], int]:
+    day = func.date(model.created_at)
+    stmt = select(model.user_id, day, func.count(model.id)).group_by(model.user_id, day)
+    if since is not None:
+        stmt = stmt.where(model.created_at >= datetime.combine(since, datetime.min.time()))
+
+    out: dict[tuple[int, date], int] = {}
+    for user_id, played_on, cnt in db.execute(stmt).all():
+        if isinstance(played_on, str):  # SQLite returns DATE() as text
+            played_on = date.fromisoformat(played_on)
+        out[(int(user_id), played_on)] = int(cnt or 0)
+    return out
+
+
+def backfill(db: Session, *, apply: bool, since: date | None = None) -> dict[str, int]:
+    created = 0
+    updated = 0
+    unchanged = 0
+
+    for feature_type, model in LOG_MODELS.items():
+        computed = _load_daily_counts(db, model, since)
+        existing_stmt = select(UserGameDailyCount).where(UserGameDailyCount.feature_type == feature_type)
+        if since is not None:
+            existing_stmt = existing_stmt.where(UserGameDailyCount.play_date >= since)
+        existing = {(row.user_id, row.play_date): row for row in db.execute(existing_stmt).scalars().all()}
+
+        for (user_id, played_on), cnt in computed.items():
+            row = existing.get((user_id, played_on))
+            if row is None:
+                created += 1
+                if apply:
+                    db.add(UserGameDailyCount(user_id=user_id, feature_type=feature_type, play_date=played_on, play_count=cnt))
+            elif int(row.play_count or 0) < cnt:
+                updated += 1
+                if apply:
+                    row.play_count = cnt
+            else:
+                unchanged += 1
+
+    if apply:
+        db.commit()
+
+    return {"created": created, "updated": updated, "unchanged": unchanged}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill user_game_daily_count from game logs")
+    parser.add_argument("--dry-run", action="store_true", help="Do not write DB changes")
+    parser.add_argument("--apply", action="store_true", help="Write DB changes")
+    parser.add_argument("--since", type=date.fromisoformat, default=None, help="Only backfill days on/after YYYY-MM-DD")
+    args = parser.parse_args()
+
+    if args.dry_run and args.apply:
+        raise SystemExit("Choose one: --dry-run or --apply")
+    apply = bool(args.apply) and not bool(args.dry_run)
+
+    db = SessionLocal()
+    try:
+        stats = backfill(db, apply=apply, since=args.since)
+    finally:
+        db.close()
+
+    mode = "APPLY" if apply else "DRY_RUN"
+    print(f"[{mode}] backfill_game_daily_count created={stats['created']} updated={stats['updated']} unchanged={stats['unchanged']}")
+
+
+if __name__ == "__main__":
+    main()
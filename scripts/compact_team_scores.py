@@ -0,0 +1,40 @@
+"""Fold team_score_shard rows into team_score.points.
+
+TeamBattleService.add_points writes team score deltas to sharded rows so concurrent players
+don't queue on one team_score row; leaderboard reads sum team_score and the shards. Run this
+periodically (e.g. every few minutes from cron) to keep the shard rows few and small.
+
+Usage:
+  python scripts/compact_team_scores.py
+  python scripts/compact_team_scores.py --season-id 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.team_battle_service import TeamBattleService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compact team_score_shard into team_score")
+    parser.add_argument("--season-id", type=int, default=None, help="Season id (default: all seasons)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = TeamBattleService().compact_team_scores(db, season_id=args.season_id)
+    finally:
+        db.close()
+
+    print(f"compact_team_scores teams={stats['teams']} points={stats['points']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Recompute team battle contribution aggregates from team_event_log.
+
+team_member_score (per-user points, GAME_PLAY points, last event) and
+team_score.last_event_at are maintained incrementally by TeamBattleService.add_points.
+Run this after writing team_event_log by hand (SQL seeds, manual fixes) or to verify
+drift. Team points (team_score.points) are not touched.
+
+Usage:
+  python scripts/rebuild_team_member_scores.py
+  python scripts/rebuild_team_member_scores.py --season-id 3
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.team_battle_service import TeamBattleService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rebuild team_member_score from team_event_log")
+    parser.add_argument("--season-id", type=int, default=None, help="Season id (default: all seasons)")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = TeamBattleService().rebuild_contribution_totals(db, season_id=args.season_id)
+    finally:
+        db.close()
+
+    print(f"rebuild_team_member_scores seasons={stats['seasons']} member_rows={stats['member_rows']}")
+
+
+if __name__ == "__main__":
+    main()
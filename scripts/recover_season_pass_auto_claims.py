@@ -0,0 +1,47 @@
+"""Grant missed season pass auto-claim rewards and resync claimed-level masks.
+
+Replaces the recovery that used to run inside GET /api/season-pass/status. Walks every
+progress row of the season (current season by default), grants unlocked auto-claim levels
+that have no reward log, and rewrites season_pass_progress.claimed_levels_mask from the
+reward logs. Safe to re-run; schedule it periodically (e.g. every 10 minutes).
+
+Usage:
+  python scripts/recover_season_pass_auto_claims.py
+  python scripts/recover_season_pass_auto_claims.py --season-id 3 --batch-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.season_pass_service import SeasonPassService
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Recover missed season pass auto-claims")
+    parser.add_argument("--season-id", type=int, default=None, help="Season id (default: current season)")
+    parser.add_argument("--batch-size", type=int, default=500, help="Progress rows per batch/commit")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        stats = SeasonPassService().recover_missing_auto_claims(
+            db, season_id=args.season_id, batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+
+    print(
+        f"recover_season_pass_auto_claims season_id={stats['season_id']} scanned={stats['scanned']} "
+        f"recovered={stats['recovered']} masks_synced={stats['masks_synced']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Roll up admin dashboard metrics per hour as a background job.
+
+Each pass recomputes the current hour and the LATE_EVENT_HOURS before it in
+dashboard_hourly_rollup, so events that land late (retries, outbox drains) are still
+counted; older hours are final. /admin/api/dashboard/metrics only sums these rows.
+
+Usage:
+  python scripts/run_dashboard_rollup.py
+  python scripts/run_dashboard_rollup.py --once
+  python scripts/run_dashboard_rollup.py --backfill-hours 336 --once
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.dashboard_rollup_service import DashboardRollupService
+
+logger = logging.getLogger("dashboard_rollup")
+
+
+def run(*, interval: float, once: bool, backfill_hours: int) -> None:
+    service = DashboardRollupService()
+    if backfill_hours:
+        db = SessionLocal()
+        try:
+            now = datetime.utcnow()
+            hours = service.refresh(db, now - timedelta(hours=backfill_hours), now, now=now, force=True)
+            logger.info("dashboard rollup backfilled %s hours", hours)
+        finally:
+            db.close()
+
+    while True:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            stats = service.run(db)
+            logger.info("dashboard rollup %s in %.2fs", stats, time.monotonic() - started)
+        except Exception:
+            db.rollback()
+            logger.exception("dashboard rollup failed")
+        finally:
+            db.close()
+
+        if once:
+            return
+        time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Maintain dashboard_hourly_rollup")
+    parser.add_argument("--interval", type=float, default=300.0, help="Seconds between runs")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    parser.add_argument("--backfill-hours", type=int, default=0, help="Recompute this many past hours first")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    run(interval=args.interval, once=args.once, backfill_hours=args.backfill_hours)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Drain the play side-effect outbox (team battle points, season pass stamps, survey triggers).
+
+Run as a separate long-lived process next to the API when
+ENABLE_ASYNC_PLAY_SIDE_EFFECTS=true. Several workers may run concurrently on MySQL
+(batches are claimed with FOR UPDATE SKIP LOCKED).
+
+Usage:
+  python scripts/run_side_effect_worker.py
+  python scripts/run_side_effect_worker.py --once
+  python scripts/run_side_effect_worker.py --batch-size 200 --idle-sleep 1.0
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.side_effect_outbox_service import SideEffectOutboxService
+
+logger = logging.getLogger("side_effect_worker")
+
+
+def run(*, batch_size: int, idle_sleep: float, once: bool) -> None:
+    service = SideEffectOutboxService()
+    while True:
+        db = SessionLocal()
+        try:
+            stats = service.drain(db, batch_size=batch_size)
+        except Exception:
+            db.rollback()
+            logger.exception("side effect batch failed")
+            stats = {"claimed": 0}
+        finally:
+            db.close()
+
+        if stats["claimed"]:
+            logger.info("side effects %s", stats)
+        if once:
+            return
+        if stats["claimed"] < batch_size:
+            time.sleep(idle_sleep)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Drain the play side-effect outbox")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--idle-sleep", type=float, default=2.0, help="Seconds to wait when the outbox is empty")
+    parser.add_argument("--once", action="store_true", help="Process a single batch and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    run(batch_size=args.batch_size, idle_sleep=args.idle_sleep, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
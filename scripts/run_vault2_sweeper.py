@@ -0,0 +1,63 @@
+"""Run the Vault2 transition sweeper (LOCKED -> AVAILABLE -> EXPIRED) as a background job.
+
+Each tick promotes every due row in keyset-paged chunks (one UPDATE + commit per chunk)
+and logs the rows moved; with METRICS_ENABLED the same counts feed
+vault2_transitions_total / vault2_sweep_rows in the process that runs the sweep.
+
+Usage:
+  python scripts/run_vault2_sweeper.py
+  python scripts/run_vault2_sweeper.py --once
+  python scripts/run_vault2_sweeper.py --interval 30 --chunk-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.vault2_service import Vault2Service
+
+logger = logging.getLogger("vault2_sweeper")
+
+
+def run(*, chunk_size: int, interval: float, once: bool) -> None:
+    service = Vault2Service()
+    while True:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            stats = service.sweep_transitions(db, chunk_size=chunk_size)
+        except Exception:
+            db.rollback()
+            logger.exception("vault2 sweep failed")
+            stats = None
+        finally:
+            db.close()
+
+        if stats and (stats["available"] or stats["expired"]):
+            logger.info("vault2 sweep moved %s in %.2fs", stats, time.monotonic() - started)
+        if once:
+            return
+        time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run the Vault2 transition sweeper")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per UPDATE/commit")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between ticks")
+    parser.add_argument("--once", action="store_true", help="Run a single tick and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    run(chunk_size=args.chunk_size, interval=args.interval, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Expire due Phase 1 vault locked balances as a background job.
+
+/api/vault/status no longer writes; this job clears `user.vault_locked_balance` once
+`vault_locked_expires_at` has passed, in chunks (one UPDATE + commit per chunk). Runs are
+idempotent and safe to resume: expired rows no longer match the due predicate.
+With METRICS_ENABLED the counts feed vault_locked_expired_total / _amount_total.
+
+Usage:
+  python scripts/run_vault_locked_expiry.py
+  python scripts/run_vault_locked_expiry.py --once
+  python scripts/run_vault_locked_expiry.py --interval 30 --chunk-size 1000
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+# Add project root to path (so `import app...` works when running as a script)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.vault_service import VaultService
+
+logger = logging.getLogger("vault_locked_expiry")
+
+
+def run(*, chunk_size: int, interval: float, once: bool) -> None:
+    while True:
+        started = time.monotonic()
+        db = SessionLocal()
+        try:
+            stats = VaultService.expire_due_locked_balances(db, chunk_size=chunk_size)
+        except Exception:
+            db.rollback()
+            logger.exception("vault locked expiry failed")
+            stats = None
+        finally:
+            db.close()
+
+        if stats and stats["users"]:
+            logger.info("vault locked expiry cleared %s in %.2fs", stats, time.monotonic() - started)
+        if once:
+            return
+        time.sleep(interval)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Expire due Phase 1 vault locked balances")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Rows per UPDATE/commit")
+    parser.add_argument("--interval", type=float, default=60.0, help="Seconds between runs")
+    parser.add_argument("--once", action="store_true", help="Run a single pass and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    run(chunk_size=args.chunk_size, interval=args.interval, once=args.once)
+
+
+if __name__ == "__main__":
+    main()
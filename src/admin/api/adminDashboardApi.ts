@@ -14,6 +14,8 @@ export type DashboardMetricsResponse = {
   unique_players: MetricValue;
   ticket_usage: MetricValue;
   avg_session_time_seconds: MetricValue;
+  missing_hours: number;
+  previous_missing_hours: number;
 };
 
 export async function fetchDashboardMetrics(rangeHours = 24): Promise<DashboardMetricsResponse> {
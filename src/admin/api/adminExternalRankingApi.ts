@@ -19,13 +19,27 @@ export interface ExternalRankingListResponse {
   items: ExternalRankingEntry[];
 }
 
+export interface ExternalRankingUpsertReport {
+  received: number;
+  created: number;
+  updated: number;
+  deposit_increased: number;
+  xp_users: number;
+  xp_added: number;
+  level_ups: number;
+  season_rewards: number;
+  vault_signals: number;
+  cooldown_deferred: number;
+  top10_stamps: number;
+}
+
 export async function fetchExternalRankingList() {
   const { data } = await adminApi.get<ExternalRankingListResponse>("/admin/api/external-ranking/");
   return data;
 }
 
 export async function upsertExternalRanking(payloads: ExternalRankingPayload[]) {
-  const { data } = await adminApi.post<ExternalRankingListResponse>("/admin/api/external-ranking/", payloads);
+  const { data } = await adminApi.post<ExternalRankingUpsertReport>("/admin/api/external-ranking/", payloads);
   return data;
 }
 
@@ -52,21 +52,8 @@ const ExternalRankingPage: React.FC = () => {
 
   const upsertMutation = useMutation({
     mutationFn: (payloads: ExternalRankingPayload[]) => upsertExternalRanking(payloads),
-    onSuccess: (res) => {
-      // 즉시 UI에 반영 후 서버 데이터도 새로고침
-      if (res?.items) {
-        queryClient.setQueryData(["admin", "external-ranking"], res);
-        setRows(
-          res.items.map((item) => ({
-            id: item.id,
-            user_id: item.user_id,
-            external_id: item.external_id,
-            deposit_amount: item.deposit_amount,
-            play_count: item.play_count,
-            memo: item.memo ?? "",
-          }))
-        );
-      }
+    onSuccess: () => {
+      // 업로드 응답은 요약 리포트이므로 목록은 서버에서 다시 불러옵니다.
       queryClient.invalidateQueries({ queryKey: ["admin", "external-ranking"] });
       setIsDirty(false);
     },
@@ -25,12 +25,13 @@ export interface TodayRankingResponse {
   readonly my_entry?: RankingEntryDto;
   readonly external_entries?: ExternalRankingEntryDto[];
   readonly my_external_entry?: ExternalRankingEntryDto;
+  readonly external_total?: number;
 }
 
-export const getTodayRanking = async (topN: number = 10): Promise<TodayRankingResponse> => {
+export const getTodayRanking = async (topN: number = 10, offset: number = 0): Promise<TodayRankingResponse> => {
   try {
     const response = await userApi.get<TodayRankingResponse>("/api/ranking/today", {
-      params: { top: topN },
+      params: { top: topN, offset },
     });
     return response.data;
   } catch (error) {
@@ -18,6 +18,7 @@ from app.api.deps import get_db, get_current_user_id, get_current_admin_id
 from app.models.game_wallet import GameTokenType, UserGameWallet
 from app.db.base import Base
 from app.main import app
+from app.services.config_cache import config_cache
 
 
 @pytest.fixture()
@@ -34,6 +35,8 @@ def client() -> Generator[TestClient, None, None]:
     )
     TestingSessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, expire_on_commit=False)
     Base.metadata.create_all(engine)
+    # Each test gets a fresh database, so drop config snapshots cached by earlier tests.
+    config_cache.clear()
 
     def override_get_db() -> Generator[Session, None, None]:
         db = TestingSessionLocal()
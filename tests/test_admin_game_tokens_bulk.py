@@ -0,0 +1,52 @@
+"""Admin bulk token grant: set-based upsert with per-row results."""
+from fastapi.testclient import TestClient
+
+from app.models.game_wallet import GameTokenType, UserGameWallet
+from app.models.game_wallet_ledger import UserGameWalletLedger
+from app.models.user import User
+
+
+def test_bulk_grant_upserts_wallets_and_reports_rows(client: TestClient, session_factory) -> None:
+    db = session_factory()
+    db.add_all([User(id=2, external_id="alice"), User(id=3, external_id="bob")])
+    db.add(UserGameWallet(user_id=2, token_type=GameTokenType.DICE_TOKEN, balance=5))
+    db.commit()
+    db.close()
+
+    payload = {
+        "items": [
+            {"external_id": "alice", "token_type": "DICE_TOKEN", "amount": 2},
+            {"external_id": "ghost", "token_type": "DICE_TOKEN", "amount": 1},
+        ],
+        "csv": "external_id,token_type,amount\nbob,LOTTERY_TICKET,3\nalice,DICE_TOKEN,4\nbob,NOPE,1\n",
+        "label": "EVENT_LAUNCH",
+    }
+    resp = client.post("/admin/api/game-tokens/bulk-grant", json=payload)
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert (data["total"], data["granted"], data["failed"]) == (5, 3, 2)
+    results = data["results"]
+    assert [r["status"] for r in results] == ["OK", "ERROR", "OK", "OK", "ERROR"]
+    assert results[1]["error"] == "USER_NOT_FOUND"
+    assert results[4]["error"] == "INVALID_TOKEN_TYPE"
+    assert results[0]["balance"] == 7
+    assert results[3]["balance"] == 11
+    assert results[2]["balance"] == 3
+
+    db = session_factory()
+    wallets = {(w.user_id, w.token_type): w.balance for w in db.query(UserGameWallet).filter(UserGameWallet.user_id.in_([2, 3]))}
+    assert wallets == {(2, GameTokenType.DICE_TOKEN): 11, (3, GameTokenType.LOTTERY_TICKET): 3}
+    ledger = db.query(UserGameWalletLedger).order_by(UserGameWalletLedger.id).all()
+    assert [(r.user_id, r.delta, r.balance_after, r.label) for r in ledger] == [
+        (2, 2, 7, "EVENT_LAUNCH"),
+        (3, 3, 3, "EVENT_LAUNCH"),
+        (2, 4, 11, "EVENT_LAUNCH"),
+    ]
+    db.close()
+
+
+def test_bulk_grant_rejects_csv_row_with_extra_fields(client: TestClient) -> None:
+    payload = {"csv": "external_id,token_type,amount\nalice,DICE_TOKEN,1\nbob,DICE_TOKEN,2,extra\n"}
+    resp = client.post("/admin/api/game-tokens/bulk-grant", json=payload)
+    assert resp.status_code == 400
+    assert "INVALID_CSV_ROW:3" in resp.text
@@ -0,0 +1,86 @@
+"""Stateless JWT auth: cached token versions, admin revocation and jti logout."""
+import pytest
+from fastapi import HTTPException
+from fastapi.security import HTTPAuthorizationCredentials
+
+from app.api.deps import get_current_user_id
+from app.core.auth_cache import auth_cache
+from app.core.security import create_access_token
+from app.models.user import User
+from app.schemas.admin_user import AdminUserUpdate
+from app.services.admin_user_service import AdminUserService
+
+
+@pytest.fixture(autouse=True)
+def clear_auth_cache():
+    auth_cache.clear()
+    yield
+    auth_cache.clear()
+
+
+def _issue_token(client, session_factory, user_id: int = 201) -> str:
+    db = session_factory()
+    db.add(User(id=user_id, external_id=f"ext-{user_id}", status="ACTIVE"))
+    db.commit()
+    db.close()
+    resp = client.post("/api/auth/token", json={"user_id": user_id})
+    assert resp.status_code == 200
+    return resp.json()["access_token"]
+
+
+def _auth(db, token: str) -> int:
+    return get_current_user_id(db=db, credentials=HTTPAuthorizationCredentials(scheme="Bearer", credentials=token))
+
+
+def test_cached_token_version_skips_user_lookup(client, session_factory) -> None:
+    token = _issue_token(client, session_factory)
+    db = session_factory()
+    assert _auth(db, token) == 201
+
+    # Remove the row behind the cache's back: the cached version still authenticates,
+    # proving no query ran.
+    db.query(User).filter(User.id == 201).delete()
+    db.commit()
+    assert _auth(db, token) == 201
+
+    auth_cache.invalidate_user(201)
+    with pytest.raises(HTTPException) as exc:
+        _auth(db, token)
+    assert exc.value.detail == "TOKEN_INVALID"
+    db.close()
+
+
+def test_admin_status_change_revokes_existing_tokens(client, session_factory) -> None:
+    token = _issue_token(client, session_factory)
+    db = session_factory()
+    assert _auth(db, token) == 201
+
+    AdminUserService.update_user(db, 201, AdminUserUpdate(status="INACTIVE"))
+    with pytest.raises(HTTPException) as exc:
+        _auth(db, token)
+    assert exc.value.detail == "TOKEN_REVOKED"
+    db.close()
+
+    # Deactivation is a lockout, not just a token reset.
+    resp = client.post("/api/auth/token", json={"user_id": 201})
+    assert resp.status_code == 401
+    assert "USER_INACTIVE" in resp.text
+
+    db = session_factory()
+    fresh = create_access_token(user_id=201, token_version=db.get(User, 201).token_version)
+    with pytest.raises(HTTPException) as exc:
+        _auth(db, fresh)
+    assert exc.value.status_code == 401 and exc.value.detail == "USER_INACTIVE"
+    db.close()
+
+
+def test_logout_revokes_token_jti(client, session_factory) -> None:
+    token = _issue_token(client, session_factory)
+    resp = client.post("/api/auth/logout", headers={"Authorization": f"Bearer {token}"})
+    assert resp.status_code == 200
+
+    db = session_factory()
+    with pytest.raises(HTTPException) as exc:
+        _auth(db, token)
+    assert exc.value.detail == "TOKEN_REVOKED"
+    db.close()
@@ -0,0 +1,87 @@
+"""Config cache: TTL/version semantics and admin-write invalidation."""
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.feature import FeatureConfig, FeatureType
+from app.models.roulette import RouletteConfig, RouletteSegment
+from app.services.config_cache import ConfigCache
+
+
+def test_config_cache_ttl_and_invalidate() -> None:
+    now = [100.0]
+    cache = ConfigCache(clock=lambda: now[0])
+    calls: list[int] = []
+
+    def load() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert cache.get_or_load("ns", "k", load) == 1
+    assert cache.get_or_load("ns", "k", load) == 1
+
+    now[0] += 31  # default TTL is 30s
+    assert cache.get_or_load("ns", "k", load) == 2
+
+    version = cache.version("ns")
+    cache.invalidate("ns")
+    assert cache.version("ns") == version + 1
+    assert cache.get_or_load("ns", "k", load) == 3
+
+    # Missing values are never cached.
+    assert cache.get_or_load("ns", "missing", lambda: None) is None
+    assert cache.get_or_load("ns", "missing", lambda: "found") == "found"
+
+
+def test_config_cache_namespace_limit_evicts_least_recently_used() -> None:
+    cache = ConfigCache(limits={"pages": 2})
+    loads: list[str] = []
+
+    def loader(key: str):
+        return lambda: loads.append(key) or key
+
+    cache.get_or_load("pages", "a", loader("a"))
+    cache.get_or_load("pages", "b", loader("b"))
+    cache.get_or_load("pages", "a", loader("a"))  # hit; "b" is now least recently used
+    cache.get_or_load("pages", "c", loader("c"))
+    assert loads == ["a", "b", "c"]
+
+    cache.get_or_load("pages", "a", loader("a"))
+    cache.get_or_load("pages", "b", loader("b"))
+    assert loads == ["a", "b", "c", "b"]
+
+
+def test_admin_roulette_update_busts_cached_segments(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add(FeatureConfig(feature_type=FeatureType.ROULETTE, title="ROULETTE", page_path="/roulette"))
+    cfg = RouletteConfig(name="CFG", is_active=True, max_daily_spins=0)
+    session.add(cfg)
+    session.flush()
+    session.add_all(
+        [
+            RouletteSegment(config=cfg, slot_index=i, label=f"S{i}", reward_type="POINT", reward_amount=1, weight=1)
+            for i in range(6)
+        ]
+    )
+    session.commit()
+    session.close()
+
+    first = client.get("/api/roulette/status")
+    assert first.status_code == 200, first.text
+    assert [s["label"] for s in first.json()["segments"]] == [f"S{i}" for i in range(6)]
+
+    payload = {
+        "name": "CFG_UPDATED",
+        "is_active": True,
+        "max_daily_spins": 0,
+        "segments": [
+            {"index": i, "label": f"N{i}", "weight": 1, "reward_type": "POINT", "reward_value": 2, "is_jackpot": False}
+            for i in range(6)
+        ],
+    }
+    resp = client.put(f"/admin/api/roulette-config/{cfg.id}", json=payload)
+    assert resp.status_code == 200, resp.text
+
+    second = client.get("/api/roulette/status")
+    assert second.status_code == 200, second.text
+    assert second.json()["name"] == "CFG_UPDATED"
+    assert [s["label"] for s in second.json()["segments"]] == [f"N{i}" for i in range(6)]
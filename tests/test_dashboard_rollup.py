@@ -0,0 +1,115 @@
+"""Admin dashboard metrics from hourly rollups with HyperLogLog unique counts."""
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.dashboard_rollup import DashboardHourlyRollup
+from app.models.game_wallet import GameTokenType
+from app.models.game_wallet_ledger import UserGameWalletLedger
+from app.models.lottery import LotteryLog
+from app.models.roulette import RouletteLog
+from app.models.user import User
+from app.models.user_activity_event import UserActivityEvent
+from app.services.dashboard_rollup_service import DashboardRollupService
+from app.services.hyperloglog import HyperLogLog
+
+
+def _spin(user_id: int, at: datetime) -> RouletteLog:
+    return RouletteLog(user_id=user_id, config_id=1, segment_id=1, reward_type="NONE", created_at=at)
+
+
+def test_hyperloglog_estimates_and_merges_within_error() -> None:
+    assert HyperLogLog().update([7, 7, 8, 9]).estimate() == 3
+    left = HyperLogLog().update(range(0, 6000))
+    right = HyperLogLog.from_bytes(HyperLogLog().update(range(3000, 9000)).to_bytes())
+    assert abs(left.merge(right).estimate() - 9000) < 9000 * 0.07
+
+
+def test_window_metrics_sum_hourly_rows_and_correct_late_events(session_factory) -> None:
+    session: Session = session_factory()
+    now = datetime(2025, 12, 26, 12, 30)
+    session.add_all([User(id=i, external_id=f"u{i}", status="ACTIVE") for i in range(1, 5)])
+    session.add(User(id=5, external_id="u5", status="ACTIVE", last_login_at=datetime(2025, 12, 26, 12, 10)))
+    session.add_all(
+        [
+            _spin(1, datetime(2025, 12, 26, 12, 5)),
+            _spin(2, datetime(2025, 12, 26, 12, 6)),
+            LotteryLog(user_id=2, config_id=1, prize_id=1, reward_type="NONE", created_at=datetime(2025, 12, 26, 12, 7)),
+            _spin(3, datetime(2025, 12, 26, 11, 15)),
+            UserGameWalletLedger(
+                user_id=1,
+                token_type=GameTokenType.ROULETTE_COIN,
+                delta=-3,
+                balance_after=0,
+                created_at=datetime(2025, 12, 26, 12, 5),
+            ),
+            UserActivityEvent(user_id=1, event_id="e1", event_type="PLAY_DURATION", duration_seconds=60, created_at=datetime(2025, 12, 26, 12, 1)),
+            UserActivityEvent(user_id=2, event_id="e2", event_type="PLAY_DURATION", duration_seconds=120, created_at=datetime(2025, 12, 26, 12, 2)),
+        ]
+    )
+    session.commit()
+    svc = DashboardRollupService()
+
+    # Reads only roll up the open hour; closed hours without a row are reported as missing.
+    current, previous = svc.window_metrics(session, hours=1, now=now)
+    assert current == {
+        "active_users": 1,
+        "game_participation": 3,
+        "unique_players": 2,
+        "ticket_usage": 3,
+        "avg_session_time_seconds": 90.0,
+        "missing_hours": 0,
+    }
+    assert (previous["game_participation"], previous["missing_hours"]) == (0, 1)
+    assert session.query(DashboardHourlyRollup).count() == 1
+
+    # The background job fills the open hour and the LATE_EVENT_HOURS before it.
+    assert svc.run(session, now=now) == {"hours": 4}
+    _, previous = svc.window_metrics(session, hours=1, now=now)
+    assert (previous["game_participation"], previous["missing_hours"]) == (1, 0)
+    assert previous["avg_session_time_seconds"] is None
+    current, _ = svc.window_metrics(session, hours=2, now=now)
+    assert (current["game_participation"], current["unique_players"]) == (4, 3)
+    # Never a bucket in the future.
+    assert session.query(DashboardHourlyRollup).count() == 4
+
+    # A late event for 11:00 is picked up by the next job run, not by reads.
+    session.add(_spin(4, datetime(2025, 12, 26, 11, 50)))
+    session.commit()
+    assert svc.window_metrics(session, hours=2, now=now + timedelta(minutes=10))[0]["game_participation"] == 4
+    svc.run(session, now=now + timedelta(minutes=10))
+    current, _ = svc.window_metrics(session, hours=2, now=now + timedelta(minutes=10))
+    assert (current["game_participation"], current["unique_players"]) == (5, 4)
+
+    # Hours more than LATE_EVENT_HOURS past their end are final; only a forced backfill changes them.
+    session.add(_spin(1, datetime(2025, 12, 26, 5, 10)))
+    session.commit()
+    assert svc.run(session, now=now + timedelta(minutes=20)) == {"hours": 4}
+    current, _ = svc.window_metrics(session, hours=8, now=now + timedelta(minutes=20))
+    assert (current["game_participation"], current["missing_hours"]) == (5, 4)
+    assert svc.refresh(session, datetime(2025, 12, 26, 5), datetime(2025, 12, 26, 6), force=True, now=now) == 1
+    current, _ = svc.window_metrics(session, hours=8, now=now + timedelta(minutes=20))
+    assert (current["game_participation"], current["missing_hours"]) == (6, 3)
+    session.close()
+
+
+def test_dashboard_metrics_endpoint_reads_rollups(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add(User(id=1, external_id="u1", status="ACTIVE", last_login_at=datetime.utcnow()))
+    session.add_all([_spin(1, datetime.utcnow()), _spin(1, datetime.utcnow())])
+    session.commit()
+    session.close()
+
+    resp = client.get("/admin/api/dashboard/metrics", params={"range_hours": 24})
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert data["range_hours"] == 24
+    assert data["game_participation"]["value"] == 2
+    assert data["unique_players"]["value"] == 1
+    assert data["active_users"]["value"] == 1
+    assert (data["missing_hours"], data["previous_missing_hours"]) == (23, 24)
+
+    session = session_factory()
+    assert session.query(DashboardHourlyRollup).count() == 1
+    session.close()
@@ -0,0 +1,48 @@
+"""Per-request SQL statement counting and pool stats."""
+from sqlalchemy import create_engine, text
+
+from app.db.instrumentation import (
+    InstrumentedQueuePool,
+    PoolStats,
+    current_request_stats,
+    end_request_stats,
+    instrument_engine,
+    pool_stats,
+    start_request_stats,
+)
+
+
+def test_statements_are_counted_only_inside_request_scope(tmp_path) -> None:
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}", poolclass=InstrumentedQueuePool, pool_size=2)
+    instrument_engine(engine)
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))  # outside any request: not attributed
+
+        stats, token = start_request_stats()
+        try:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+            assert current_request_stats() is stats
+        finally:
+            end_request_stats(token)
+        assert current_request_stats() is None
+
+    assert stats.statements == 2
+    assert stats.db_time_ms >= 0
+    snapshot = pool_stats.snapshot(engine)
+    assert snapshot["checkouts"] >= 1
+    assert {"in_use", "overflow", "wait_max_ms"} <= snapshot.keys()
+    engine.dispose()
+
+
+def test_pool_stats_tracks_in_use_and_wait() -> None:
+    stats = PoolStats()
+    stats.record_checkout()
+    stats.record_checkout()
+    stats.record_checkin()
+    stats.record_wait(0.004)
+    snapshot = stats.snapshot()
+    assert snapshot["checkouts"] == 2
+    assert snapshot["in_use"] == 1
+    assert snapshot["wait_max_ms"] == 4.0
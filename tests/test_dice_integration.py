@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 
 from app.models.dice import DiceConfig
 from app.models.feature import FeatureConfig, FeatureSchedule, FeatureType
+from app.models.game_daily_count import UserGameDailyCount
 from app.models.user import User
 
 
@@ -50,3 +51,18 @@ def test_dice_play_returns_result(client: TestClient) -> None:
     data = response.json()
     assert data["result"] == "OK"
     assert "game" in data
+
+
+@pytest.mark.usefixtures("seed_dice")
+def test_dice_status_counts_todays_plays_from_counter(client: TestClient, session_factory) -> None:
+    for _ in range(2):
+        assert client.post("/api/dice/play").status_code == 200
+
+    response = client.get("/api/dice/status")
+    assert response.status_code == 200
+    assert response.json()["today_plays"] == 2
+
+    session: Session = session_factory()
+    counter = session.get(UserGameDailyCount, (1, FeatureType.DICE, date.today()))
+    assert counter is not None and counter.play_count == 2
+    session.close()
@@ -0,0 +1,118 @@
+"""Bulk external ranking upload: batched user resolution, set-based XP, summary report."""
+from datetime import date, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.external_ranking import ExternalRankingData
+from app.models.season_pass import SeasonPassConfig, SeasonPassLevel, SeasonPassProgress, SeasonPassRewardLog
+from app.models.user import User
+from app.models.user_activity import UserActivity
+
+
+@pytest.fixture()
+def seeded(session_factory) -> None:
+    session: Session = session_factory()
+    today = date.today()
+    season = SeasonPassConfig(
+        season_name="UPLOAD",
+        start_date=today - timedelta(days=1),
+        end_date=today + timedelta(days=7),
+        max_level=5,
+        base_xp_per_stamp=0,  # keep the weekly TOP10 stamp out of the XP assertions
+        is_active=True,
+    )
+    session.add(season)
+    session.add_all(
+        [
+            SeasonPassLevel(season=season, level=i, required_xp=(i - 1) * 20, reward_type="NONE", reward_amount=0, auto_claim=True)
+            for i in range(1, 6)
+        ]
+    )
+    session.add_all([User(id=i, external_id=f"ext-{i}", status="ACTIVE", level=1) for i in range(1, 26)])
+    session.commit()
+    session.close()
+
+
+def test_bulk_upload_applies_xp_and_returns_report(client: TestClient, session_factory, seeded) -> None:
+    payload = [{"external_id": f"ext-{i}", "deposit_amount": 100_000 * (i % 3), "play_count": i} for i in range(1, 26)]
+    resp = client.post("/admin/api/external-ranking/", json=payload)
+    assert resp.status_code == 200, resp.text
+    report = resp.json()
+    assert report["received"] == 25
+    assert report["created"] == 25
+    assert report["updated"] == 0
+    # i % 3 == 0 -> no deposit; 1 -> 1 step; 2 -> 2 steps.
+    assert report["deposit_increased"] == 17
+    assert report["xp_users"] == 17
+    assert report["xp_added"] == 9 * 20 + 8 * 40
+
+    session: Session = session_factory()
+    progress = {p.user_id: p for p in session.query(SeasonPassProgress).all()}
+    assert progress[1].current_xp == 20 and progress[1].current_level == 2
+    assert progress[2].current_xp == 40 and progress[2].current_level == 3
+    assert 3 not in progress
+    assert {log.level for log in session.query(SeasonPassRewardLog).filter_by(user_id=2)} == {1, 2, 3}
+    assert session.get(User, 2).level == 3
+    assert session.query(UserActivity).count() == 17
+    session.close()
+
+    # Re-upload: deposits only grow for user 3 (0 -> 100k), everyone else unchanged.
+    payload[2]["deposit_amount"] = 100_000
+    again = client.post("/admin/api/external-ranking/", json=payload).json()
+    assert again["updated"] == 25
+    assert again["deposit_increased"] == 1
+    assert again["xp_added"] == 20
+
+
+def test_bulk_upload_unknown_external_id_writes_nothing(client: TestClient, session_factory, seeded) -> None:
+    resp = client.post(
+        "/admin/api/external-ranking/",
+        json=[
+            {"external_id": "ext-1", "deposit_amount": 100_000, "play_count": 0},
+            {"external_id": "missing", "deposit_amount": 100_000, "play_count": 0},
+        ],
+    )
+    assert resp.status_code == 404
+    assert "USER_NOT_FOUND" in resp.text
+
+    session: Session = session_factory()
+    assert session.query(ExternalRankingData).count() == 0
+    session.close()
+
+
+def test_bulk_upload_seeds_default_season_in_test_mode(client: TestClient, session_factory, monkeypatch) -> None:
+    monkeypatch.setenv("TEST_MODE", "true")
+    get_settings.cache_clear()
+    session: Session = session_factory()
+    session.add(User(id=1, external_id="ext-1", status="ACTIVE"))
+    session.commit()
+    session.close()
+
+    resp = client.post("/admin/api/external-ranking/", json=[{"user_id": 1, "deposit_amount": 300_000, "play_count": 0}])
+    get_settings.cache_clear()
+    assert resp.status_code == 200, resp.text
+    assert resp.json()["xp_added"] == 60
+
+    session = session_factory()
+    # 3 deposit steps (60 XP) + the weekly TOP10 stamp (base 10 XP of the default season).
+    assert session.query(SeasonPassProgress).filter_by(user_id=1).one().current_xp == 70
+    session.close()
+
+
+def test_bulk_upload_rejects_duplicate_users(client: TestClient, session_factory, seeded) -> None:
+    resp = client.post(
+        "/admin/api/external-ranking/",
+        json=[
+            {"external_id": "ext-1", "deposit_amount": 100_000, "play_count": 0},
+            {"user_id": 1, "deposit_amount": 200_000, "play_count": 0},
+        ],
+    )
+    assert resp.status_code == 400
+    assert "DUPLICATE_USER:1" in resp.text
+
+    session: Session = session_factory()
+    assert session.query(ExternalRankingData).count() == 0
+    session.close()
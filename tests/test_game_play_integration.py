@@ -1,11 +1,14 @@
 """Integration tests for roulette, dice, and lottery play endpoints."""
 from datetime import date
 
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
 from app.models.dice import DiceConfig, DiceLog
 from app.models.feature import FeatureConfig, FeatureSchedule, FeatureType, UserEventLog
+from app.models.game_wallet import GameTokenType, UserGameWallet
+from app.models.game_wallet_ledger import UserGameWalletLedger
 from app.models.lottery import LotteryConfig, LotteryLog, LotteryPrize
 from app.models.roulette import RouletteConfig, RouletteLog, RouletteSegment
 from app.models.user import User
@@ -112,3 +115,44 @@ def test_lottery_play_decrements_stock_and_logs(client: TestClient, session_fact
     assert verify.query(LotteryLog).count() == 1
     assert verify.query(UserEventLog).count() == 1
     verify.close()
+
+
+def test_roulette_play_rolls_back_all_writes_on_failure(client: TestClient, session_factory, monkeypatch) -> None:
+    session: Session = session_factory()
+    seed_common(session, FeatureType.ROULETTE)
+    cfg = RouletteConfig(name="ROU", is_active=True)
+    session.add(cfg)
+    session.flush()
+    for idx in range(6):
+        session.add(
+            RouletteSegment(
+                config_id=cfg.id,
+                slot_index=idx,
+                label=f"S{idx}",
+                reward_type="POINT",
+                reward_amount=10,
+                weight=1,
+            )
+        )
+    session.commit()
+    session.close()
+
+    def failing_deliver(*args, **kwargs):
+        raise RuntimeError("reward backend down")
+
+    monkeypatch.setattr("app.services.roulette_service.RewardService.deliver", failing_deliver)
+
+    with pytest.raises(RuntimeError):
+        client.post("/api/roulette/play")
+
+    verify: Session = session_factory()
+    wallet = (
+        verify.query(UserGameWallet)
+        .filter(UserGameWallet.user_id == 1, UserGameWallet.token_type == GameTokenType.ROULETTE_COIN)
+        .one()
+    )
+    assert wallet.balance == 10
+    assert verify.query(UserGameWalletLedger).count() == 0
+    assert verify.query(RouletteLog).count() == 0
+    assert verify.query(UserEventLog).count() == 0
+    verify.close()
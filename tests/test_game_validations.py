@@ -123,3 +123,29 @@ def test_dice_roll_range_guard():
     with pytest.raises(InvalidConfigError):
         DiceService._validate_dice_values([0, 7])
     DiceService._validate_dice_values([1, 6])
+
+
+def test_lottery_redraws_when_limited_prize_sold_out(db_session):
+    config = LotteryConfig(name="LOTTO", is_active=True)
+    db_session.add(config)
+    db_session.flush()
+    limited = LotteryPrize(
+        config_id=config.id, label="LIMITED", reward_type="POINT", reward_amount=100, weight=1000, stock=1, is_active=True
+    )
+    unlimited = LotteryPrize(
+        config_id=config.id, label="UNLIMITED", reward_type="POINT", reward_amount=1, weight=1, stock=None, is_active=True
+    )
+    db_session.add_all([limited, unlimited])
+    db_session.commit()
+
+    service = LotteryService()
+    prizes = service._eligible_prizes(db_session, config.id)  # type: ignore[attr-defined]
+
+    # Another play takes the last unit after this request read the prize table.
+    db_session.query(LotteryPrize).filter(LotteryPrize.id == limited.id).update({"stock": 0})
+    db_session.commit()
+
+    chosen = service._draw_and_reserve(db_session, config.id, prizes)  # type: ignore[attr-defined]
+    assert chosen.id == unlimited.id
+    db_session.refresh(limited)
+    assert limited.stock == 0
@@ -0,0 +1,67 @@
+"""Game wallet: conditional debit/credit and bundle grants."""
+import pytest
+
+from app.core.exceptions import NotEnoughTokensError
+from app.models.game_wallet import GameTokenType, UserGameWallet
+from app.models.game_wallet_ledger import UserGameWalletLedger
+from app.models.trial_token_bucket import TrialTokenBucket
+from app.services.game_wallet_service import GameWalletService
+
+
+def _balance(db, token_type: GameTokenType) -> int:
+    wallet = (
+        db.query(UserGameWallet)
+        .filter(UserGameWallet.user_id == 1, UserGameWallet.token_type == token_type)
+        .one_or_none()
+    )
+    return wallet.balance if wallet else 0
+
+
+def test_debit_never_overdraws_and_consumes_trial(client, session_factory):
+    db = session_factory()
+    service = GameWalletService()
+    service.grant_tokens(db, 1, GameTokenType.LOTTERY_TICKET, 2, reason="TEST")
+    db.add(TrialTokenBucket(user_id=1, token_type=GameTokenType.LOTTERY_TICKET, balance=1))
+    db.commit()
+
+    balance, consumed_trial = service.require_and_consume_token(db, 1, GameTokenType.LOTTERY_TICKET, 2)
+    assert balance == 0
+    assert consumed_trial is True
+
+    with pytest.raises(NotEnoughTokensError):
+        service.require_and_consume_token(db, 1, GameTokenType.LOTTERY_TICKET, 1)
+    db.rollback()
+    assert _balance(db, GameTokenType.LOTTERY_TICKET) == 0
+
+    bucket = db.query(TrialTokenBucket).filter(TrialTokenBucket.user_id == 1).one()
+    assert bucket.balance == 0
+    deltas = [
+        row.delta
+        for row in db.query(UserGameWalletLedger)
+        .filter(UserGameWalletLedger.token_type == GameTokenType.LOTTERY_TICKET)
+        .order_by(UserGameWalletLedger.id)
+    ]
+    assert deltas == [2, -2]
+    db.close()
+
+
+def test_grant_many_credits_each_type_with_ledger_rows(client, session_factory):
+    db = session_factory()
+    service = GameWalletService()
+    before = _balance(db, GameTokenType.DICE_TOKEN)
+
+    balances = service.grant_many(
+        db,
+        1,
+        [(GameTokenType.DICE_TOKEN, 2), (GameTokenType.LOTTERY_TICKET, 3)],
+        reason="LEVEL_REWARD",
+        label="AUTO_GRANT",
+    )
+    assert balances[GameTokenType.DICE_TOKEN] == before + 2
+    assert balances[GameTokenType.LOTTERY_TICKET] == _balance(db, GameTokenType.LOTTERY_TICKET)
+
+    rows = db.query(UserGameWalletLedger).filter(UserGameWalletLedger.reason == "LEVEL_REWARD").all()
+    assert sorted((r.token_type, r.delta) for r in rows) == sorted(
+        [(GameTokenType.DICE_TOKEN, 2), (GameTokenType.LOTTERY_TICKET, 3)]
+    )
+    db.close()
@@ -0,0 +1,59 @@
+"""Insert-first idempotency: one statement decides whether an event row is new."""
+from datetime import datetime
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.idempotency import insert_if_absent
+from app.models.user import User
+from app.models.vault_earn_event import VaultEarnEvent
+from app.services.vault_service import VaultService
+
+
+def test_insert_if_absent_reports_whether_row_was_written(session_factory) -> None:
+    session: Session = session_factory()
+    values = {"user_id": 1, "earn_event_id": "GAME:DICE:1", "earn_type": "GAME_PLAY", "amount": 200, "source": "DICE"}
+    assert insert_if_absent(session, VaultEarnEvent, values) is True
+    assert insert_if_absent(session, VaultEarnEvent, {**values, "amount": 999}) is False
+    session.commit()
+
+    row = session.query(VaultEarnEvent).one()
+    assert row.amount == 200
+    assert row.created_at is not None  # column defaults still apply
+    session.close()
+
+
+def test_duplicate_game_earn_skips_user_lock_and_writes(session_factory, monkeypatch) -> None:
+    monkeypatch.setenv("ENABLE_VAULT_GAME_EARN_EVENTS", "true")
+    get_settings.cache_clear()
+    session: Session = session_factory()
+    session.add(User(id=1, external_id="u1", status="ACTIVE"))
+    session.commit()
+    svc = VaultService()
+    now = datetime(2025, 12, 26, 12, 0, 0)
+
+    try:
+        assert svc.record_game_play_earn_event(session, user_id=1, game_type="DICE", game_log_id=7, outcome="WIN", now=now) == 200
+
+        statements: list[str] = []
+
+        def capture(_conn, _cursor, statement, _params, _context, _executemany) -> None:
+            statements.append(statement.split()[0].upper())
+
+        engine = session.get_bind()
+        event.listen(engine, "before_cursor_execute", capture)
+        try:
+            added = svc.record_game_play_earn_event(session, user_id=1, game_type="DICE", game_log_id=7, outcome="WIN", now=now)
+        finally:
+            event.remove(engine, "before_cursor_execute", capture)
+    finally:
+        get_settings.cache_clear()
+
+    assert added == 0
+    # Program config and eligibility come from the config cache; the duplicate costs one INSERT.
+    assert statements == ["INSERT"]
+    session.expire_all()
+    assert session.get(User, 1).vault_locked_balance == 200
+    assert session.query(VaultEarnEvent).count() == 1
+    session.close()
@@ -0,0 +1,62 @@
+"""/metrics exposition and hot-path counters."""
+import pytest
+from fastapi.testclient import TestClient
+
+from app.core import metrics
+from app.core.metrics import Counter, Histogram, MetricsRegistry
+
+
+@pytest.fixture()
+def metrics_enabled():
+    metrics.registry.enabled = True
+    metrics.registry.reset()
+    yield
+    metrics.registry.enabled = False
+    metrics.registry.reset()
+
+
+def test_metrics_endpoint_is_hidden_when_disabled(client: TestClient) -> None:
+    assert client.get("/metrics").status_code == 404
+    assert client.get("/health/db-pool").status_code == 404
+
+
+@pytest.mark.usefixtures("metrics_enabled")
+def test_metrics_endpoint_exports_request_and_wallet_metrics(client: TestClient, session_factory) -> None:
+    from app.core.exceptions import NotEnoughTokensError
+    from app.models.game_wallet import GameTokenType
+    from app.services.game_wallet_service import GameWalletService
+
+    assert client.get("/health").status_code == 200
+    db = session_factory()
+    with pytest.raises(NotEnoughTokensError):
+        GameWalletService().require_and_consume_token(db, 1, GameTokenType.CC_COIN, amount=1000)
+    db.close()
+
+    resp = client.get("/metrics")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = resp.text
+    assert 'http_request_duration_seconds_count{method="GET",route="/health",status="200"} 1' in body
+    assert 'wallet_debit_failures_total{token_type="CC_COIN"} 1' in body
+    assert "# TYPE db_pool_in_use gauge" in body
+    assert "# TYPE db_pool_checkouts_total counter" in body
+    assert "# TYPE db_pool_wait_seconds_total counter" in body
+    assert "in_use" in client.get("/health/db-pool").json()
+
+
+def test_histogram_buckets_are_cumulative(monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "registry", MetricsRegistry())
+    monkeypatch.setattr(metrics.registry, "enabled", True)
+    hist = Histogram("h_seconds", "test", ("route",), buckets=(0.1, 1.0))
+    counter = Counter("c_total", "test")
+    hist.observe(0.05, route="/a")
+    hist.observe(0.5, route="/a")
+    hist.observe(5, route="/a")
+    counter.inc(2)
+
+    text = metrics.registry.render()
+    assert 'h_seconds_bucket{route="/a",le="0.1"} 1' in text
+    assert 'h_seconds_bucket{route="/a",le="1"} 2' in text
+    assert 'h_seconds_bucket{route="/a",le="+Inf"} 3' in text
+    assert 'h_seconds_count{route="/a"} 3' in text
+    assert "c_total 2" in text
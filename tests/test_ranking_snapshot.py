@@ -0,0 +1,112 @@
+"""External ranking leaderboard: materialized snapshot, paging, caller rank and ETag/304."""
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.external_ranking import ExternalRankingData, ExternalRankingSnapshot
+from app.models.feature import FeatureConfig, FeatureSchedule, FeatureType
+from app.models.user import User
+from app.services.config_cache import NS_RANKING, config_cache
+
+
+@pytest.fixture(autouse=True)
+def ranking_enabled(session_factory) -> None:
+    session: Session = session_factory()
+    session.add(FeatureConfig(feature_type=FeatureType.RANKING, title="RANKING", page_path="/ranking"))
+    session.add(FeatureSchedule(date=date.today(), feature_type=FeatureType.RANKING, is_active=True))
+    session.commit()
+    session.close()
+
+
+def _upload(client: TestClient, amounts: dict[int, int]) -> None:
+    payload = [{"user_id": uid, "deposit_amount": amount, "play_count": 0} for uid, amount in amounts.items()]
+    resp = client.post("/admin/api/external-ranking/", json=payload)
+    assert resp.status_code == 200, resp.text
+
+
+def test_ranking_pages_snapshot_and_returns_caller_rank(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add_all([User(id=i, external_id=f"ext-{i}", nickname=f"N{i}", status="ACTIVE") for i in range(1, 31)])
+    session.commit()
+    session.close()
+
+    # User i deposits i * 1000, so user 30 is rank 1 and user 1 (the caller) is rank 30.
+    _upload(client, {i: i * 1000 for i in range(1, 31)})
+
+    resp = client.get("/api/ranking/today", params={"top": 5, "offset": 10})
+    assert resp.status_code == 200, resp.text
+    data = resp.json()
+    assert [e["rank"] for e in data["external_entries"]] == [11, 12, 13, 14, 15]
+    assert [e["user_id"] for e in data["external_entries"]] == [20, 19, 18, 17, 16]
+    assert data["external_entries"][0]["user_name"] == "N20"
+    assert data["external_total"] == 30
+    assert data["my_external_entry"]["rank"] == 30
+
+    session = session_factory()
+    assert session.query(ExternalRankingSnapshot).count() == 30
+    session.close()
+
+
+def test_ranking_etag_returns_304_until_next_upload(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add_all([User(id=1, external_id="ext-1", status="ACTIVE"), User(id=2, external_id="ext-2", status="ACTIVE")])
+    session.commit()
+    session.close()
+    _upload(client, {1: 100, 2: 200})
+
+    first = client.get("/api/ranking/today")
+    etag = first.headers["etag"]
+    assert first.json()["my_external_entry"]["rank"] == 2
+
+    cached = client.get("/api/ranking/today", headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    # Lists, "*" and strong/weak forms of the same tag all match.
+    for header in (f'"other", {etag}', "*", etag.removeprefix("W/")):
+        assert client.get("/api/ranking/today", headers={"If-None-Match": header}).status_code == 304
+    assert client.get("/api/ranking/today", headers={"If-None-Match": '"other", W/"nope"'}).status_code == 200
+
+    # Another page is a different representation.
+    assert client.get("/api/ranking/today", params={"offset": 1}, headers={"If-None-Match": etag}).status_code == 200
+
+    _upload(client, {1: 300})
+    changed = client.get("/api/ranking/today", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+    assert changed.json()["my_external_entry"]["rank"] == 1
+
+
+def test_ranking_builds_missing_snapshot_on_first_read(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add(User(id=1, external_id="ext-1", status="ACTIVE"))
+    session.add(ExternalRankingData(user_id=1, deposit_amount=500, play_count=3))
+    session.commit()
+    session.close()
+
+    data = client.get("/api/ranking/today").json()
+    assert data["external_total"] == 1
+    assert data["my_external_entry"]["user_name"] == "ext-1"
+
+
+def test_ranking_page_cache_skips_out_of_range_offsets_and_drops_old_versions(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add_all([User(id=1, external_id="ext-1", status="ACTIVE"), User(id=2, external_id="ext-2", status="ACTIVE")])
+    session.commit()
+    session.close()
+    _upload(client, {1: 100, 2: 200})
+
+    def ranking_keys() -> list:
+        return [key for ns, key in config_cache._entries if ns == NS_RANKING]
+
+    assert len(client.get("/api/ranking/today").json()["external_entries"]) == 2
+    for offset in (2, 50, 10_000):
+        data = client.get("/api/ranking/today", params={"offset": offset}).json()
+        assert data["external_entries"] == [] and data["external_total"] == 2
+    version = ranking_keys()[0][0]
+    assert {key[1:] for key in ranking_keys()} == {("total",), (0, 10)}
+
+    _upload(client, {1: 300})
+    assert ranking_keys() == []
+    client.get("/api/ranking/today")
+    assert all(key[0] != version for key in ranking_keys())
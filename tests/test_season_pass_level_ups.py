@@ -0,0 +1,76 @@
+"""Season pass level-up resolution: many levels crossed at once settle in one transaction."""
+from datetime import date, timedelta
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.models.game_wallet import GameTokenType, UserGameWallet
+from app.models.season_pass import SeasonPassConfig, SeasonPassLevel, SeasonPassProgress, SeasonPassRewardLog
+from app.models.user import User
+from app.services.season_pass_service import SeasonPassService
+
+
+def _seed(session: Session) -> None:
+    today = date.today()
+    season = SeasonPassConfig(
+        season_name="LEVEL_UPS",
+        start_date=today - timedelta(days=1),
+        end_date=today + timedelta(days=7),
+        max_level=10,
+        base_xp_per_stamp=10,
+        is_active=True,
+    )
+    session.add(User(id=1, external_id="tester", status="ACTIVE", level=1))
+    session.add(season)
+    session.add_all(
+        [
+            SeasonPassLevel(
+                season=season,
+                level=i,
+                required_xp=(i - 1) * 10,
+                reward_type="TICKET_DICE",
+                reward_amount=1,
+                auto_claim=i != 5,
+            )
+            for i in range(1, 11)
+        ]
+    )
+    session.commit()
+
+
+def test_bonus_xp_crossing_many_levels_commits_once(session_factory) -> None:
+    session: Session = session_factory()
+    _seed(session)
+    service = SeasonPassService()
+    service.get_or_create_progress(session, user_id=1, season_id=service.get_current_season(session, date.today()).id)
+
+    commits: list[int] = []
+
+    def on_end(_session: Session, transaction) -> None:
+        # Per-reward savepoints are fine; only count top-level transactions.
+        if transaction.parent is None:
+            commits.append(1)
+
+    event.listen(session, "after_transaction_end", on_end)
+    result = service.add_bonus_xp(session, user_id=1, xp_amount=90)
+    event.remove(session, "after_transaction_end", on_end)
+
+    assert len(commits) == 1
+    assert result["current_level"] == 10
+    assert result["leveled_up"] is True
+    # Levels 2..10 except the manual level 5.
+    assert [r["level"] for r in result["rewards"]] == [2, 3, 4, 6, 7, 8, 9, 10]
+
+    session.expire_all()
+    logged = {log.level for log in session.query(SeasonPassRewardLog).all()}
+    assert logged == {1, 2, 3, 4, 6, 7, 8, 9, 10}
+    wallet = session.query(UserGameWallet).filter_by(user_id=1, token_type=GameTokenType.DICE_TOKEN).one()
+    assert wallet.balance == 9
+    assert session.get(User, 1).level == 10
+    progress = session.query(SeasonPassProgress).one()
+    assert progress.claimed_levels_mask == sum(1 << lvl for lvl in logged)
+
+    # Re-running with no new levels must not double-grant.
+    again = service.add_bonus_xp(session, user_id=1, xp_amount=5)
+    assert again["rewards"] == []
+    session.close()
@@ -0,0 +1,124 @@
+"""Season pass status read model: cached level table, claimed mask, batch auto-claim recovery."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.season_pass import (
+    SeasonPassConfig,
+    SeasonPassLevel,
+    SeasonPassProgress,
+    SeasonPassRewardLog,
+)
+from app.models.user import User
+from app.services.season_pass_service import SeasonPassService
+
+
+@pytest.fixture()
+def season_id(session_factory) -> int:
+    session: Session = session_factory()
+    today = date.today()
+    season = SeasonPassConfig(
+        season_name="READ_MODEL",
+        start_date=today - timedelta(days=1),
+        end_date=today + timedelta(days=7),
+        max_level=4,
+        base_xp_per_stamp=10,
+        is_active=True,
+    )
+    session.add_all(
+        [
+            User(id=1, external_id="tester", status="ACTIVE"),
+            season,
+            SeasonPassLevel(season=season, level=1, required_xp=0, reward_type="NONE", reward_amount=0, auto_claim=True),
+            SeasonPassLevel(season=season, level=2, required_xp=10, reward_type="NONE", reward_amount=0, auto_claim=True),
+            SeasonPassLevel(season=season, level=3, required_xp=20, reward_type="NONE", reward_amount=0, auto_claim=False),
+        ]
+    )
+    session.commit()
+    sid = season.id
+    session.close()
+    return sid
+
+
+def _claimed(data: dict) -> set[int]:
+    return {lvl["level"] for lvl in data["levels"] if lvl["is_claimed"]}
+
+
+def test_status_rebuilds_legacy_mask_and_tracks_stamps(client: TestClient, session_factory, season_id: int) -> None:
+    session: Session = session_factory()
+    progress = SeasonPassProgress(user_id=1, season_id=season_id, current_level=1, current_xp=0, total_stamps=0)
+    session.add(progress)
+    session.flush()
+    session.add(
+        SeasonPassRewardLog(
+            user_id=1, season_id=season_id, progress_id=progress.id, level=1, reward_type="NONE", reward_amount=0,
+            claimed_at=datetime.utcnow(),
+        )
+    )
+    session.commit()
+    session.close()
+
+    first = client.get("/api/season-pass/status")
+    assert first.status_code == 200, first.text
+    assert _claimed(first.json()) == {1}
+    assert first.json()["today"]["stamped"] is False
+
+    session = session_factory()
+    assert session.query(SeasonPassProgress).one().claimed_levels_mask == 1 << 1
+    session.close()
+
+    stamp = client.post("/api/season-pass/stamp", json={"source_feature_type": "ROULETTE", "xp_bonus": 0})
+    assert stamp.status_code == 200, stamp.text
+
+    second = client.get("/api/season-pass/status")
+    assert second.status_code == 200, second.text
+    assert _claimed(second.json()) == {1, 2}
+    assert second.json()["today"]["stamped"] is True
+
+    session = session_factory()
+    progress = session.query(SeasonPassProgress).one()
+    assert progress.last_checkin_date == date.today()
+    assert progress.claimed_levels_mask == (1 << 1) | (1 << 2)
+    session.close()
+
+
+def test_status_does_not_heal_and_batch_recovery_does(client: TestClient, session_factory, season_id: int) -> None:
+    session: Session = session_factory()
+    session.add(
+        SeasonPassProgress(
+            user_id=1, season_id=season_id, current_level=2, current_xp=15, total_stamps=1, claimed_levels_mask=0
+        )
+    )
+    session.commit()
+    session.close()
+
+    resp = client.get("/api/season-pass/status")
+    assert resp.status_code == 200, resp.text
+    assert _claimed(resp.json()) == set()
+
+    session = session_factory()
+    assert session.query(SeasonPassRewardLog).count() == 0
+    stats = SeasonPassService().recover_missing_auto_claims(session, season_id=season_id, batch_size=1)
+    assert stats["scanned"] == 1
+    assert stats["recovered"] == 2
+    logs = session.query(SeasonPassRewardLog).all()
+    assert {log.level for log in logs} == {1, 2}
+    assert session.query(SeasonPassProgress).one().claimed_levels_mask == (1 << 1) | (1 << 2)
+
+    # Idempotent on re-run.
+    assert SeasonPassService().recover_missing_auto_claims(session, season_id=season_id)["recovered"] == 0
+    session.close()
+
+    resp = client.get("/api/season-pass/status")
+    assert _claimed(resp.json()) == {1, 2}
+
+
+def test_admin_season_update_busts_cached_season(client: TestClient, season_id: int) -> None:
+    assert client.get("/api/season-pass/status").json()["season"]["season_name"] == "READ_MODEL"
+
+    resp = client.put(f"/admin/api/seasons/{season_id}", json={"season_name": "RENAMED"})
+    assert resp.status_code == 200, resp.text
+
+    assert client.get("/api/season-pass/status").json()["season"]["season_name"] == "RENAMED"
@@ -0,0 +1,156 @@
+"""Play side effects routed through the outbox and drained by the worker."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.dice import DiceConfig
+from app.models.feature import FeatureConfig, FeatureSchedule, FeatureType
+from app.models.side_effect_outbox import SideEffectOutbox
+from app.models.survey import Survey, SurveyResponse, SurveyStatus, SurveyTriggerRule, SurveyTriggerType
+from app.models.team_battle import Team, TeamDailyPoints, TeamEventLog, TeamMember, TeamScore, TeamSeason
+from app.models.user import User
+from app.services import side_effect_outbox_service
+from app.services.side_effect_outbox_service import SideEffectOutboxService
+from app.services.team_battle_service import TeamBattleService
+
+
+@pytest.fixture()
+def async_side_effects(monkeypatch):
+    monkeypatch.setenv("ENABLE_ASYNC_PLAY_SIDE_EFFECTS", "true")
+    get_settings.cache_clear()
+    yield
+    monkeypatch.delenv("ENABLE_ASYNC_PLAY_SIDE_EFFECTS")
+    get_settings.cache_clear()
+
+
+@pytest.fixture()
+def seed_dice_with_team(session_factory) -> int:
+    session: Session = session_factory()
+    now = datetime.utcnow()
+    session.add_all(
+        [
+            User(id=1, external_id="tester", status="ACTIVE"),
+            FeatureSchedule(date=date.today(), feature_type=FeatureType.DICE, is_active=True),
+            FeatureConfig(feature_type=FeatureType.DICE, title="Dice Day", page_path="/dice", is_enabled=True),
+            DiceConfig(name="TEST_DICE", is_active=True, max_daily_plays=0),
+        ]
+    )
+    season = TeamSeason(name="S1", starts_at=now - timedelta(hours=1), ends_at=now + timedelta(days=1), is_active=True)
+    team = Team(name="Alpha", is_active=True)
+    session.add_all([season, team])
+    session.commit()
+    session.add_all([TeamMember(user_id=1, team_id=team.id), TeamScore(team_id=team.id, season_id=season.id, points=0)])
+    session.commit()
+    team_id = team.id
+    session.close()
+    return team_id
+
+
+@pytest.mark.usefixtures("async_side_effects")
+def test_play_enqueues_side_effects_and_worker_applies_them(client: TestClient, session_factory, seed_dice_with_team) -> None:
+    assert client.post("/api/dice/play").status_code == 200
+
+    session: Session = session_factory()
+    rows = session.query(SideEffectOutbox).order_by(SideEffectOutbox.id).all()
+    assert {r.effect_type for r in rows} >= {"TEAM_POINTS", "SURVEY_GAME_RESULT"}
+    assert all(r.status == "PENDING" for r in rows)
+    season_id = session.query(TeamSeason.id).scalar()
+    assert TeamBattleService().get_team_score(session, seed_dice_with_team, season_id).points == 0
+
+    stats = SideEffectOutboxService().drain(session)
+    assert stats["claimed"] == len(rows)
+    assert stats["done"] == len(rows)
+    assert TeamBattleService().get_team_score(session, seed_dice_with_team, season_id).points == 10
+    assert {r.status for r in session.query(SideEffectOutbox)} == {"DONE"}
+    session.close()
+
+
+def _seed_game_result_survey(session_factory) -> None:
+    session: Session = session_factory()
+    survey = Survey(
+        title="After play",
+        status=SurveyStatus.ACTIVE,
+        channel="GLOBAL",
+        start_at=datetime.utcnow() - timedelta(days=1),
+        end_at=datetime.utcnow() + timedelta(days=1),
+    )
+    session.add_all([survey, SurveyTriggerRule(survey=survey, trigger_type=SurveyTriggerType.GAME_RESULT, trigger_config_json={})])
+    session.commit()
+    session.close()
+
+
+@pytest.mark.parametrize("async_mode", [False, True])
+def test_game_result_survey_fires_in_both_modes(client: TestClient, session_factory, seed_dice_with_team, monkeypatch, async_mode) -> None:
+    monkeypatch.setenv("ENABLE_ASYNC_PLAY_SIDE_EFFECTS", "true" if async_mode else "false")
+    get_settings.cache_clear()
+    _seed_game_result_survey(session_factory)
+    try:
+        assert client.post("/api/dice/play").status_code == 200
+    finally:
+        get_settings.cache_clear()
+
+    session: Session = session_factory()
+    if async_mode:
+        assert session.query(SurveyResponse).count() == 0
+        SideEffectOutboxService().drain(session)
+    else:
+        assert session.query(SideEffectOutbox).count() == 0
+    assert session.query(SurveyResponse).filter_by(user_id=1).count() == 1
+    session.close()
+
+
+def test_failed_side_effect_is_retried_with_backoff_then_failed(client: TestClient, session_factory, monkeypatch) -> None:
+    def boom(*args, **kwargs):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr(side_effect_outbox_service, "apply_team_battle_points", boom)
+    session: Session = session_factory()
+    session.add(SideEffectOutbox(user_id=1, effect_type="TEAM_POINTS", payload_json={}))
+    session.commit()
+
+    service = SideEffectOutboxService(max_attempts=2)
+    now = datetime.utcnow()
+    assert service.drain(session, now=now)["retried"] == 1
+    row = session.query(SideEffectOutbox).one()
+    assert (row.status, row.attempts) == ("PENDING", 1)
+    assert row.available_at > now
+    assert "db down" in row.last_error
+
+    # Not due yet, so nothing is claimed until the backoff elapses.
+    assert service.drain(session, now=now)["claimed"] == 0
+    assert service.drain(session, now=row.available_at)["failed"] == 1
+    assert session.query(SideEffectOutbox).one().status == "FAILED"
+    session.close()
+
+
+def test_deferred_play_is_charged_to_the_day_it_was_played(session_factory) -> None:
+    session: Session = session_factory()
+    svc = TeamBattleService()
+    drained_at = datetime.utcnow()
+    # 23:59 local time on the day before the drain.
+    local_day = svc._local_date(drained_at) - timedelta(days=1)
+    _, day_end = svc._day_bounds_for_date(local_day)
+    played_at = day_end - timedelta(minutes=1)
+
+    season = TeamSeason(name="S1", starts_at=played_at - timedelta(days=1), ends_at=drained_at + timedelta(days=1), is_active=True)
+    team = Team(name="Alpha", is_active=True)
+    session.add_all([User(id=1, external_id="tester", status="ACTIVE"), season, team])
+    session.commit()
+    session.add(TeamMember(user_id=1, team_id=team.id))
+    session.add(
+        SideEffectOutbox(
+            user_id=1,
+            effect_type="TEAM_POINTS",
+            payload_json={"played_at": played_at.isoformat()},
+            available_at=played_at,
+        )
+    )
+    session.commit()
+
+    assert SideEffectOutboxService().drain(session, now=drained_at)["done"] == 1
+    assert {(row.day, row.points) for row in session.query(TeamDailyPoints)} == {(local_day, svc.POINTS_PER_PLAY)}
+    assert session.query(TeamEventLog).one().created_at == played_at
+    session.close()
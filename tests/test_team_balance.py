@@ -0,0 +1,104 @@
+"""Team auto-balance: streamed activity, K-team LPT split, chunked membership upserts."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.external_ranking import ExternalRankingData
+from app.models.team_battle import Team, TeamMember, TeamSeason
+from app.models.user import User
+from app.services.team_battle_service import TeamBattleService
+
+
+def _seed(session_factory, target: date) -> list[int]:
+    session: Session = session_factory()
+    now = datetime.utcnow()
+    session.add(TeamSeason(name="S", starts_at=now - timedelta(days=1), ends_at=now + timedelta(days=7), is_active=True))
+    teams = [Team(name=name, is_active=True) for name in ("A", "B", "C")]
+    session.add_all(teams + [Team(name="Closed", is_active=False)])
+    session.add_all([User(id=i, external_id=f"u{i}", status="ACTIVE") for i in range(1, 42)])
+    session.commit()
+    for i in range(1, 41):
+        session.add(
+            ExternalRankingData(
+                user_id=i,
+                deposit_amount=10_000 + i * 1_000,
+                play_count=i % 7,
+                daily_base_deposit=10_000,
+                daily_base_play=0,
+                last_daily_reset=target,
+                updated_at=datetime(2000, 1, 1),
+            )
+        )
+    # Inactive on the target day: neither reset that day nor updated within it.
+    session.add(ExternalRankingData(user_id=41, deposit_amount=999_999, last_daily_reset=target - timedelta(days=3), updated_at=datetime(2000, 1, 1)))
+    session.add(TeamMember(user_id=1, team_id=teams[2].id, role="leader"))
+    session.commit()
+    ids = [t.id for t in teams]
+    session.close()
+    return ids
+
+
+def test_auto_balance_splits_active_users_over_k_teams(client: TestClient, session_factory, monkeypatch) -> None:
+    target = date(2025, 12, 25)
+    team_ids = _seed(session_factory, target)
+
+    preview = client.post("/admin/api/team-battle/teams/auto-balance", json={"target_date": target.isoformat()})
+    assert preview.status_code == 200, preview.text
+    data = preview.json()
+    assert data["teams"] == team_ids
+    assert sum(data["team_counts"]) == 40
+    # Greedy LPT keeps the spread under one user's maximum score (1.0).
+    assert max(data["totals"]) - min(data["totals"]) < 1.0
+    assert (data["team1_count"], data["team2_count"]) == tuple(data["team_counts"][:2])
+
+    session: Session = session_factory()
+    plan = TeamBattleService().compute_balanced_teams(session, target_date=target)
+    assert sorted(uid for members in plan["assignments"] for uid in members) == list(range(1, 41))
+    session.close()
+
+    monkeypatch.setattr(TeamBattleService, "BALANCE_WRITE_CHUNK_SIZE", 7)
+    applied = client.post(
+        "/admin/api/team-battle/teams/auto-balance",
+        json={"target_date": target.isoformat(), "apply": True, "team_ids": team_ids[:2]},
+    )
+    assert applied.status_code == 200, applied.text
+    assert applied.json()["teams"] == team_ids[:2]
+    assert applied.json()["team_counts"] == [20, 20]
+
+    session = session_factory()
+    members = {m.user_id: m for m in session.query(TeamMember).all()}
+    assert set(members) == set(range(1, 41))
+    assert {m.team_id for m in members.values()} == set(team_ids[:2])
+    assert members[1].role == "leader" and members[2].role == "member"
+    session.close()
+
+    assert client.post(
+        "/admin/api/team-battle/teams/auto-balance", json={"target_date": target.isoformat(), "team_ids": [team_ids[0], 999]}
+    ).status_code == 404
+
+
+def test_auto_balance_failure_midway_keeps_old_memberships(session_factory, monkeypatch) -> None:
+    target = date(2025, 12, 25)
+    team_ids = _seed(session_factory, target)
+    monkeypatch.setattr(TeamBattleService, "BALANCE_WRITE_CHUNK_SIZE", 7)
+    upsert = TeamBattleService._upsert_memberships
+    calls = []
+
+    def fail_on_third_chunk(self, db, rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError("db down")
+        return upsert(self, db, rows)
+
+    monkeypatch.setattr(TeamBattleService, "_upsert_memberships", fail_on_third_chunk)
+    session: Session = session_factory()
+    with pytest.raises(RuntimeError):
+        TeamBattleService().apply_balanced_teams(session, target_date=target, team_ids=team_ids[:2])
+    session.rollback()
+    session.close()
+
+    session = session_factory()
+    assert [(m.user_id, m.team_id) for m in session.query(TeamMember).all()] == [(1, team_ids[2])]
+    session.close()
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from app.models.team_battle import TeamSeason, Team, TeamMember, TeamScore, TeamEventLog
 from app.models.user import User
 from app.models.game_wallet import GameTokenType, UserGameWallet
+from app.services.team_battle_service import TeamBattleService
 
 
 @pytest.fixture()
@@ -143,6 +144,8 @@ def test_admin_create_activate_and_award_points(client: TestClient, session_fact
     member = session.get(TeamMember, seed_leader_user)
     assert member is not None and member.role == "leader" and member.team_id == team_id
 
+    # The delta sits in a score shard until compaction folds it into team_score.
+    assert TeamBattleService().compact_team_scores(session) == {"teams": 1, "points": 25}
     score = session.query(TeamScore).filter_by(team_id=team_id, season_id=season_id).one()
     assert score.points == 25
 
@@ -205,6 +208,8 @@ def test_settle_rewards_with_tiebreaker(client: TestClient, session_factory) ->
         ]
     )
     session.commit()
+    # Logs written directly (not via add_points) need the aggregates rebuilt.
+    TeamBattleService().rebuild_contribution_totals(session, season_id=season.id)
     session.close()
 
     resp = client.post(f"/admin/api/team-battle/seasons/{season.id}/settle")
@@ -242,6 +247,7 @@ def test_contributor_me_returns_my_points(client: TestClient, session_factory) -
         ]
     )
     session.commit()
+    TeamBattleService().rebuild_contribution_totals(session, season_id=season_id)
     session.close()
 
     resp = client.get(f"/api/team-battle/teams/{team_id}/contributors/me", params={"season_id": season_id})
@@ -0,0 +1,43 @@
+"""Team battle daily cap: a running per-user per-KST-day counter with a capped upsert."""
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.models.team_battle import Team, TeamDailyPoints, TeamMember, TeamSeason
+from app.models.user import User
+from app.services.team_battle_service import TeamBattleService
+
+
+def test_daily_cap_counter_grants_partial_then_rejects_and_resets_next_kst_day(session_factory, monkeypatch) -> None:
+    session: Session = session_factory()
+    now = datetime(2025, 12, 26, 3, 0, 0)  # 12:00 KST
+    season = TeamSeason(name="S", starts_at=now - timedelta(days=1), ends_at=now + timedelta(days=3), is_active=True)
+    team = Team(name="Alpha", is_active=True)
+    session.add_all([season, team, User(id=1, external_id="u1", status="ACTIVE")])
+    session.commit()
+    session.add(TeamMember(user_id=1, team_id=team.id))
+    session.commit()
+
+    svc = TeamBattleService()
+    monkeypatch.setattr(TeamBattleService, "DAILY_POINT_CAP", 25)
+
+    def play(at: datetime) -> int:
+        # Returns the team's total after the play.
+        svc.add_points(session, team.id, 1, "GAME_PLAY", 1, season.id, None, enforce_usage=False, now=at)
+        return svc.get_team_score(session, team.id, season.id).points
+
+    assert play(now) == 10
+    assert play(now) == 20
+    assert play(now) == 25  # only 5 of the 10 points fit under the cap
+    with pytest.raises(HTTPException) as exc:
+        play(now)
+    assert exc.value.status_code == 429 and exc.value.detail == "DAILY_POINT_CAP_REACHED"
+    session.rollback()
+
+    # 15:00 UTC is midnight KST: a new counter row starts.
+    assert play(datetime(2025, 12, 26, 15, 0, 0)) == 35
+    counters = {row.day: row.points for row in session.query(TeamDailyPoints).all()}
+    assert counters == {date(2025, 12, 26): 25, date(2025, 12, 27): 10}
+    session.close()
@@ -0,0 +1,61 @@
+"""Team battle contribution totals: maintained in add_points, moved with members, rebuildable."""
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models.team_battle import Team, TeamMember, TeamMemberScore, TeamScore, TeamSeason
+from app.models.user import User
+from app.services.team_battle_service import TeamBattleService
+
+
+def _seed(session: Session) -> tuple[int, int, int]:
+    now = datetime.utcnow()
+    season = TeamSeason(name="S", starts_at=now - timedelta(hours=1), ends_at=now + timedelta(days=1), is_active=True)
+    alpha = Team(name="Alpha", is_active=True)
+    beta = Team(name="Beta", is_active=True)
+    session.add_all([season, alpha, beta])
+    session.add_all([User(id=i, external_id=f"u{i}", nickname=f"N{i}", status="ACTIVE") for i in (1, 2, 3)])
+    session.commit()
+    session.add_all([TeamMember(user_id=i, team_id=alpha.id) for i in (1, 2, 3)])
+    session.commit()
+    return season.id, alpha.id, beta.id
+
+
+def test_add_points_maintains_member_totals_and_views(session_factory) -> None:
+    session: Session = session_factory()
+    season_id, alpha_id, beta_id = _seed(session)
+    svc = TeamBattleService()
+
+    for _ in range(3):
+        svc.add_points(session, alpha_id, 1, "GAME_PLAY", 1, season_id, None, enforce_usage=False)
+    svc.add_points(session, alpha_id, 5, "BONUS", 2, season_id, None)
+    svc.add_points(session, alpha_id, 7, "ADMIN", None, season_id, None)
+
+    rows = {r.user_id: r for r in session.query(TeamMemberScore).all()}
+    assert (rows[1].points, rows[1].game_points) == (30, 30)
+    assert (rows[2].points, rows[2].game_points) == (5, 0)
+    assert 3 not in rows
+
+    contributors = svc.contributors(session, alpha_id, season_id, limit=10, offset=0)
+    assert [(r.user_id, r.points) for r in contributors] == [(1, 30), (2, 5), (3, 0)]
+    me = svc.contributor_me(session, alpha_id, season_id, user_id=2)
+    assert me.points == 5 and me.latest_event_at == rows[2].last_event_at
+
+    svc.compact_team_scores(session)
+    score = session.query(TeamScore).filter_by(team_id=alpha_id).one()
+    assert score.points == 42 and score.last_event_at is not None
+    board = svc.leaderboard(session, season_id, limit=10, offset=0)
+    assert board[0].team_id == alpha_id and board[0].member_count == 3
+
+    # Moving a member carries their contribution with them.
+    svc.move_member(session, team_id=beta_id, user_id=1)
+    moved = {(r.team_id, r.user_id): r.points for r in session.query(TeamMemberScore).all()}
+    assert moved == {(beta_id, 1): 30, (alpha_id, 2): 5}
+
+    # A full rebuild from team_event_log agrees with the incremental totals.
+    before = {(r.team_id, r.user_id, r.points, r.game_points) for r in session.query(TeamMemberScore).all()}
+    stats = svc.rebuild_contribution_totals(session, season_id=season_id)
+    session.expire_all()
+    assert stats["member_rows"] == 2
+    assert {(r.team_id, r.user_id, r.points, r.game_points) for r in session.query(TeamMemberScore).all()} == before
+    session.close()
@@ -0,0 +1,60 @@
+"""Team scores: add_points writes sharded counters, reads sum them, compaction folds them."""
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.models.team_battle import Team, TeamMember, TeamScore, TeamScoreShard, TeamSeason
+from app.models.user import User
+from app.services.team_battle_service import TeamBattleService
+
+
+def test_add_points_spreads_over_shards_and_leaderboard_sums_them(session_factory) -> None:
+    session: Session = session_factory()
+    now = datetime.utcnow()
+    season = TeamSeason(name="S", starts_at=now - timedelta(hours=1), ends_at=now + timedelta(days=1), is_active=True)
+    alpha = Team(name="Alpha", is_active=True)
+    beta = Team(name="Beta", is_active=True)
+    session.add_all([season, alpha, beta])
+    session.add_all([User(id=i, external_id=f"u{i}", status="ACTIVE") for i in range(1, 6)])
+    session.commit()
+    session.add_all([TeamMember(user_id=i, team_id=alpha.id) for i in (1, 2, 3)])
+    session.add_all([TeamMember(user_id=i, team_id=beta.id) for i in (4, 5)])
+    # Beta starts ahead on its compacted base score.
+    session.add(TeamScore(team_id=beta.id, season_id=season.id, points=25))
+    session.commit()
+    svc = TeamBattleService()
+
+    for user_id in (1, 2, 3, 1):
+        svc.add_points(session, alpha.id, 1, "GAME_PLAY", user_id, season.id, None, enforce_usage=False)
+    log = svc.add_points(session, beta.id, 5, "BONUS", 4, season.id, None)
+    assert (log.team_id, log.delta) == (beta.id, 5)
+    assert svc.get_team_score(session, beta.id, season.id).points == 30
+    assert svc.get_team_score(session, alpha.id, season.id).points == 40
+
+    # The hot path never touched team_score: alpha has no row, beta's base is unchanged.
+    assert session.query(TeamScore).filter_by(team_id=alpha.id).count() == 0
+    session.expire_all()
+    assert session.query(TeamScore).filter_by(team_id=beta.id).one().points == 25
+    shards = {(s.team_id, s.shard): s.points for s in session.query(TeamScoreShard).all()}
+    assert shards == {(alpha.id, 1): 20, (alpha.id, 2): 10, (alpha.id, 3): 10, (beta.id, 4): 5}
+
+    board = svc.leaderboard(session, season.id, limit=10, offset=0)
+    assert [(r.team_id, r.points) for r in board] == [(alpha.id, 40), (beta.id, 30)]
+    assert board[0].member_count == 3 and board[0].latest_event_at is not None
+    assert svc.settle_daily_rewards(session, season.id)["rank1"]["points"] == 40
+
+    assert svc.compact_team_scores(session, season_id=season.id) == {"teams": 2, "points": 45}
+    assert session.query(TeamScoreShard).count() == 0
+    scores = {s.team_id: s.points for s in session.query(TeamScore).all()}
+    assert scores == {alpha.id: 40, beta.id: 30}
+    after = svc.leaderboard(session, season.id, limit=10, offset=0)
+    assert [(r.team_id, r.points, r.latest_event_at) for r in after] == [
+        (r.team_id, r.points, r.latest_event_at) for r in board
+    ]
+
+    # Moving a member recomputes both teams from the log and drops their pending shards.
+    svc.add_points(session, alpha.id, 1, "GAME_PLAY", 2, season.id, None, enforce_usage=False)
+    svc.move_member(session, team_id=beta.id, user_id=2)
+    assert session.query(TeamScoreShard).count() == 0
+    assert svc.get_team_score(session, alpha.id, season.id).points == 30
+    session.close()
@@ -0,0 +1,41 @@
+"""Vault2 event history: append-only rows instead of progress_json, keyset-paged API."""
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.user import User
+from app.models.vault2 import VaultStatus, VaultStatusEvent
+from app.services.vault2_service import Vault2Service
+
+
+def test_accruals_append_rows_and_page_newest_first(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    session.add_all([User(id=1, external_id="u1", status="ACTIVE"), User(id=2, external_id="u2", status="ACTIVE")])
+    session.commit()
+
+    svc = Vault2Service()
+    start = datetime(2025, 12, 26, 9, 0, 0)
+    for i in range(5):
+        svc.accrue_locked(session, user_id=1, amount=100 + i, now=start + timedelta(minutes=i))
+    svc.record_unlock_event(session, user_id=1, unlock_amount=50, trigger="CHARGE", meta={"tier": "A"}, now=start)
+    svc.accrue_locked(session, user_id=2, amount=7, now=start)
+
+    status = session.query(VaultStatus).filter_by(user_id=1).one()
+    assert status.locked_amount == sum(100 + i for i in range(5))
+    assert status.progress_json is None
+    assert session.query(VaultStatusEvent).filter_by(user_id=1).count() == 6
+    session.close()
+
+    first = client.get("/api/vault/events", params={"limit": 4})
+    assert first.status_code == 200, first.text
+    page = first.json()
+    assert [item["event_type"] for item in page["items"]] == ["UNLOCK", "ACCRUE_LOCKED", "ACCRUE_LOCKED", "ACCRUE_LOCKED"]
+    assert page["items"][0]["trigger"] == "CHARGE"
+    assert page["items"][0]["meta_json"] == {"tier": "A"}
+    assert [item["amount"] for item in page["items"][1:]] == [104, 103, 102]
+    assert page["next_before_id"] == page["items"][-1]["id"]
+
+    rest = client.get("/api/vault/events", params={"limit": 4, "before_id": page["next_before_id"]}).json()
+    assert [item["amount"] for item in rest["items"]] == [101, 100]
+    assert rest["next_before_id"] is None
@@ -0,0 +1,70 @@
+"""Vault2 transition sweeper: set-based chunks over the whole backlog."""
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.core.metrics import VAULT2_TRANSITIONS, registry
+from app.models.user import User
+from app.models.vault2 import VaultStatus, VaultStatusEvent
+from app.services.vault2_service import Vault2Service
+
+
+def test_sweeper_promotes_backlog_larger_than_chunk_and_expires_after_grace(session_factory) -> None:
+    session: Session = session_factory()
+    now = datetime(2025, 12, 26, 12, 0, 0)
+    svc = Vault2Service()
+    program = svc.get_default_program(session, ensure=True)
+    program.unlock_rules_json = {"available_grace_hours": 24}
+    session.add_all([User(id=i, external_id=f"u{i}", status="ACTIVE") for i in range(1, 13)])
+    session.flush()
+    for i in range(1, 13):
+        session.add(
+            VaultStatus(
+                user_id=i,
+                program_id=program.id,
+                state="LOCKED",
+                locked_amount=100,
+                available_amount=5,
+                locked_at=now - timedelta(hours=30),
+                # Users 11 and 12 are not due yet.
+                expires_at=now - timedelta(hours=1) if i <= 10 else now + timedelta(hours=1),
+            )
+        )
+    session.commit()
+
+    registry.enabled = True
+    VAULT2_TRANSITIONS.reset()
+    try:
+        stats = svc.sweep_transitions(session, now=now, chunk_size=3)
+        moved = VAULT2_TRANSITIONS.value(transition="LOCKED_TO_AVAILABLE")
+    finally:
+        registry.enabled = False
+        VAULT2_TRANSITIONS.reset()
+
+    assert stats == {"available": 10, "expired": 0}
+    assert moved == 10
+    session.expire_all()
+    rows = {row.user_id: row for row in session.query(VaultStatus).all()}
+    assert all(rows[i].state == "AVAILABLE" for i in range(1, 11))
+    assert rows[1].available_amount == 105 and rows[1].locked_amount == 0
+    assert rows[1].available_since == now
+    assert rows[11].state == "LOCKED" and rows[11].locked_amount == 100
+
+    # 11 and 12 come due; 1..10 are still inside their 24h grace window.
+    mid = now + timedelta(hours=23)
+    assert svc.apply_transitions(session, now=mid, limit=3) == 2
+
+    stats = svc.sweep_transitions(session, now=now + timedelta(hours=25), chunk_size=3)
+    assert stats == {"available": 0, "expired": 10}
+    session.expire_all()
+    rows = {row.user_id: row for row in session.query(VaultStatus).all()}
+    assert rows[1].state == "EXPIRED" and rows[1].available_amount == 0
+    assert rows[12].state == "AVAILABLE" and rows[12].available_since == mid
+
+    events = session.query(VaultStatusEvent).filter_by(event_type="TRANSITION", user_id=1).order_by(VaultStatusEvent.id).all()
+    assert [(e.amount, e.meta_json, e.created_at) for e in events] == [
+        (100, {"from": "LOCKED", "to": "AVAILABLE"}, now),
+        (105, {"from": "AVAILABLE", "to": "EXPIRED"}, now + timedelta(hours=25)),
+    ]
+    assert session.query(VaultStatusEvent).filter_by(event_type="TRANSITION").count() == 12 + 10
+    session.close()
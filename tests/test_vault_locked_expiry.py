@@ -0,0 +1,55 @@
+"""Phase 1 locked-balance expiry: pure-read status plus an idempotent bulk expiry job."""
+from datetime import datetime, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.metrics import VAULT_LOCKED_EXPIRED, registry
+from app.models.user import User
+from app.services.vault_service import VaultService
+
+
+def test_status_does_not_write_and_job_expires_due_rows(client: TestClient, session_factory) -> None:
+    now = datetime.utcnow()
+    session: Session = session_factory()
+    for i in range(1, 8):
+        due = i <= 5
+        session.add(
+            User(
+                id=i,
+                external_id=f"u{i}",
+                status="ACTIVE",
+                vault_locked_balance=10_000 + i,
+                vault_balance=10_000 + i,
+                vault_locked_expires_at=now - timedelta(minutes=i) if due else now + timedelta(hours=1),
+            )
+        )
+    session.commit()
+    session.close()
+
+    data = client.get("/api/vault/status").json()
+    assert data["locked_balance"] == 0
+    assert data["vault_balance"] == 0
+    session = session_factory()
+    assert session.get(User, 1).vault_locked_balance == 10_001  # the read left the row alone
+
+    registry.enabled = True
+    VAULT_LOCKED_EXPIRED.reset()
+    try:
+        stats = VaultService.expire_due_locked_balances(session, now=now, chunk_size=2)
+        counted = VAULT_LOCKED_EXPIRED.value()
+    finally:
+        registry.enabled = False
+        VAULT_LOCKED_EXPIRED.reset()
+
+    assert stats == {"users": 5, "amount": sum(10_000 + i for i in range(1, 6))}
+    assert counted == 5
+    session.expire_all()
+    rows = {u.id: u for u in session.query(User).all()}
+    assert all(rows[i].vault_locked_balance == 0 and rows[i].vault_locked_expires_at is None for i in range(1, 6))
+    assert rows[1].vault_balance == 0
+    assert rows[6].vault_locked_balance == 10_006
+
+    # Re-running is a no-op.
+    assert VaultService.expire_due_locked_balances(session, now=now, chunk_size=2) == {"users": 0, "amount": 0}
+    session.close()
@@ -0,0 +1,50 @@
+"""Vault program config served from the config cache; admin edits invalidate it."""
+from datetime import date, datetime
+
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.vault2 import VaultProgram
+from app.services.vault2_service import Vault2Service
+from app.services.vault_service import VaultService
+
+
+def test_multiplier_is_cached_until_admin_config_update(client: TestClient, session_factory) -> None:
+    session: Session = session_factory()
+    Vault2Service().update_config_value(session, program_key="NEW_MEMBER_VAULT", key="accrual_multiplier", value=2)
+    assert VaultService.vault_accrual_multiplier(session) == 2.0
+
+    # A write that bypasses the admin service is not seen until the cache is invalidated.
+    session.execute(update(VaultProgram).values(config_json={"accrual_multiplier": 3}))
+    session.commit()
+    assert VaultService.vault_accrual_multiplier(session) == 2.0
+    session.close()
+
+    resp = client.put(
+        "/admin/api/vault-programs/NEW_MEMBER_VAULT/config",
+        json={"config_json": {"accrual_multiplier": 4, "enable_game_earn_events": False}},
+    )
+    assert resp.status_code == 200, resp.text
+
+    session = session_factory()
+    assert VaultService.vault_accrual_multiplier(session) == 4.0
+    assert Vault2Service().get_program_snapshot(session).enable_game_earn_events is False
+    session.close()
+
+
+def test_settings_multiplier_window_uses_kst_day_bounds(monkeypatch) -> None:
+    monkeypatch.setenv("VAULT_ACCRUAL_MULTIPLIER_ENABLED", "true")
+    monkeypatch.setenv("VAULT_ACCRUAL_MULTIPLIER_VALUE", "1.5")
+    monkeypatch.setenv("VAULT_ACCRUAL_MULTIPLIER_START_KST", date(2025, 12, 25).isoformat())
+    monkeypatch.setenv("VAULT_ACCRUAL_MULTIPLIER_END_KST", date(2025, 12, 25).isoformat())
+    get_settings.cache_clear()
+    try:
+        # KST is UTC+9: 2025-12-25 KST spans 2025-12-24T15:00Z .. 2025-12-25T15:00Z.
+        assert VaultService.vault_accrual_multiplier(now=datetime(2025, 12, 24, 14, 59)) == 1.0
+        assert VaultService.vault_accrual_multiplier(now=datetime(2025, 12, 24, 15, 0)) == 1.5
+        assert VaultService.vault_accrual_multiplier(now=datetime(2025, 12, 25, 14, 59)) == 1.5
+        assert VaultService.vault_accrual_multiplier(now=datetime(2025, 12, 25, 15, 0)) == 1.0
+    finally:
+        get_settings.cache_clear()
@@ -0,0 +1,34 @@
+"""Alias-method weighted sampler used by roulette and lottery draws."""
+import random
+from collections import Counter
+
+import pytest
+
+from app.services.weighted_sampler import AliasSampler
+
+
+def test_alias_sampler_matches_weights_and_skips_zero_weight() -> None:
+    sampler = AliasSampler(["a", "b", "c", "zero"], [1, 3, 6, 0])
+    rng = random.Random(1234)
+    draws = Counter(sampler.sample(rng) for _ in range(20_000))
+
+    assert draws["zero"] == 0
+    assert abs(draws["a"] / 20_000 - 0.1) < 0.01
+    assert abs(draws["b"] / 20_000 - 0.3) < 0.015
+    assert abs(draws["c"] / 20_000 - 0.6) < 0.015
+
+
+def test_alias_sampler_is_reproducible_with_seeded_rng() -> None:
+    sampler = AliasSampler(list(range(6)), [30, 25, 20, 15, 8, 2])
+    first = [sampler.sample(random.Random(7)) for _ in range(5)]
+    second = [sampler.sample(random.Random(7)) for _ in range(5)]
+    assert first == second
+
+
+def test_alias_sampler_rejects_invalid_weights() -> None:
+    with pytest.raises(ValueError):
+        AliasSampler(["a"], [-1])
+    with pytest.raises(ValueError):
+        AliasSampler(["a", "b"], [0, 0])
+    with pytest.raises(ValueError):
+        AliasSampler(["a"], [1, 2])